@@ -2,12 +2,23 @@ import logging
 import json
 import re
 import requests
-import pandas as pd
 import io
 import csv
-from flask import Flask, session, request, render_template, send_file, send_from_directory, redirect, url_for
-from datetime import datetime, timezone
+import base64
+import click
+import binascii
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from flask import Flask, Response, session, request, render_template, send_file, send_from_directory, redirect, url_for, jsonify, stream_with_context
+from datetime import datetime
 from zoneinfo import ZoneInfo
+from xml.sax.saxutils import escape as xml_escape
 from werkzeug.exceptions import HTTPException
 
 # ----------------------------------------------------
@@ -47,13 +58,33 @@ from modules.entity_risk_policies import compare_entity_risk_policies
 from modules.post_auth_session_policies import compare_post_auth_session_policies
 from modules.agents import compare_agents
 from modules.oktasnapshot_guide import build_oktasnapshot_guide
+from modules.oktaevaluate import (
+    CHECK_PREFIX_LEGEND,
+    build_evaluate_summary,
+    build_fleet_posture_matrix,
+    plan_security_checks,
+    resolve_evaluate_thresholds,
+    selected_check_ids,
+)
+from modules.oktasnapshot_pdf import (
+    pdf_merge_available,
+    plan_pdf_parts,
+    layout_parts,
+    layout_overlay,
+    merge_pdf_parts,
+)
+from modules.run_store import save_run, get_run, latest_run, list_runs, run_metadata, register_eviction_hook
+from modules.compare_rows import compact_rows, diff_only_matches, match_count, match_rows, row_json_default
 
 # ----------------------------------------------------
 # Extractor modules
 # ----------------------------------------------------
 from scripts.extract_groups import get_groups
 from scripts.extract_applications import get_applications as get_all_applications
-from scripts.extract_users import get_users_with_security_context
+from scripts.extract_authorization_servers import get_authorization_server_tree
+from scripts.extract_brands import get_brand_tree
+from scripts.extract_users import get_users_with_security_context, get_sampled_users_with_security_context
+from scripts.oktasnapshot_utils import host_request_count
 from scripts.extract_api_tokens import get_api_tokens_with_metadata
 from scripts.extract_admin_roles import (
     get_custom_admin_roles,
@@ -63,10 +94,10 @@ from scripts.extract_admin_roles import (
 
 app = Flask(__name__)
 app.secret_key = "okta_compare_secret_key"
-LAST_EXPORT = {"diffs": [], "matches": []}
+LAST_EXPORT = {"diffs": [], "matches": [], "run_id": None, "match_count": 0, "sampled_match_count": None}
 OKTASNAPSHOT_EXPORT = {"rows": []}
-OKTASNAPSHOT_GUIDE = {"sections": [], "domain": ""}
-OKTAEVALUATE_EXPORT = {"evaluation": None}
+OKTASNAPSHOT_GUIDE = {"sections": [], "domain": "", "run_id": None, "pdf_key": None}
+OKTAEVALUATE_EXPORT = {"evaluation": None, "run_id": None, "pdf_key": None}
 OKTAMIGRATE_EXPORT = {
     "plan": None,
     "group_sync": None,
@@ -135,4180 +166,757 @@ def _validate_okta_api_token(domain, api_token):
     return False, message
 
 
-def _as_dict(value):
-    if isinstance(value, dict):
-        return value
-    if isinstance(value, str):
-        try:
-            parsed = json.loads(value)
-            return parsed if isinstance(parsed, dict) else {}
-        except Exception:
-            return {}
-    return {}
-
-
-def _walk_nested(value, path=""):
-    if isinstance(value, dict):
-        for key, nested in value.items():
-            next_path = f"{path}.{key}" if path else str(key)
-            yield from _walk_nested(nested, next_path)
-    elif isinstance(value, list):
-        for idx, nested in enumerate(value):
-            next_path = f"{path}[{idx}]"
-            yield from _walk_nested(nested, next_path)
-    else:
-        yield path, value
-
-
-def _is_deny_action(actions):
-    for path, value in _walk_nested(actions):
-        if isinstance(value, str) and value.strip().lower() == "deny":
-            return True, path
-    for path, value in _walk_nested(actions):
-        if isinstance(value, str) and "deny" in value.strip().lower():
-            return True, path
-    return False, ""
-
-
-def _extract_session_timeout_findings(actions, threshold_minutes=120):
-    findings = []
-    for path, value in _walk_nested(actions):
-        if not isinstance(value, (int, float)):
-            continue
-        p = path.lower()
-        if "session" not in p and "idle" not in p and "lifetime" not in p:
-            continue
-
-        minutes = None
-        unit = None
-        if "minute" in p:
-            minutes = float(value)
-            unit = "minutes"
-        elif "second" in p:
-            minutes = float(value) / 60.0
-            unit = "seconds"
-        elif "hour" in p:
-            minutes = float(value) * 60.0
-            unit = "hours"
-        elif any(k in p for k in ["maxsession", "idle", "lifetime"]):
-            # Fallback heuristic: assume minutes for session timeout-like fields without explicit unit
-            minutes = float(value)
-            unit = "assumed-minutes"
-
-        if minutes is not None and minutes > threshold_minutes:
-            findings.append(
-                {
-                    "path": path,
-                    "value": value,
-                    "unit": unit,
-                    "minutes": round(minutes, 2),
-                }
-            )
-    return findings
-
-
-def _find_setting_value(rows, setting_name):
-    for row in rows or []:
-        if (row.get("Setting") or "").strip().lower() == setting_name.strip().lower():
-            return row.get("Value")
-    return None
+def _build_migration_plan(form_data):
+    source_domain = form_data.get("source_domain", "").strip()
+    target_domain = form_data.get("target_domain", "").strip()
+    in_scope = {
+        "groups": form_data.get("scope_groups") == "on",
+        "apps": form_data.get("scope_apps") == "on",
+        "policies": form_data.get("scope_policies") == "on",
+        "idp": form_data.get("scope_idp") == "on",
+        "branding": form_data.get("scope_branding") == "on",
+        "admin": form_data.get("scope_admin") == "on",
+    }
 
+    scope_labels = []
+    if in_scope["groups"]:
+        scope_labels.append("Groups")
+    if in_scope["apps"]:
+        scope_labels.append("Applications")
+    if in_scope["policies"]:
+        scope_labels.append("Policies")
+    if in_scope["idp"]:
+        scope_labels.append("Identity Providers")
+    if in_scope["branding"]:
+        scope_labels.append("Branding")
+    if in_scope["admin"]:
+        scope_labels.append("Admin Delegation")
 
-def _status_from_boolish_enabled(value):
-    if value is None:
-        return "Info"
-    normalized = str(value).strip().lower()
-    if normalized in {"enabled", "yes", "true"}:
-        return "Pass"
-    if normalized in {"disabled", "not enabled", "no", "false"}:
-        return "Fail"
-    return "Info"
-
-
-CHECK_PREFIX_LEGEND = [
-    {"prefix": "ORG", "meaning": "Organization Settings"},
-    {"prefix": "SEC", "meaning": "Security General Settings"},
-    {"prefix": "GRP", "meaning": "Groups"},
-    {"prefix": "GRR", "meaning": "Group Rules"},
-    {"prefix": "NET", "meaning": "Network Zones"},
-    {"prefix": "AUT", "meaning": "Authenticators"},
-    {"prefix": "MFA", "meaning": "Authenticator Enrollment Policies"},
-    {"prefix": "PWD", "meaning": "Password Policies"},
-    {"prefix": "APP", "meaning": "Applications and App Sign-On"},
-    {"prefix": "SES", "meaning": "Global Session Policies"},
-    {"prefix": "POL", "meaning": "Cross-Policy and Risk Policy Checks"},
-    {"prefix": "IDP", "meaning": "Identity Providers and IdP Discovery"},
-    {"prefix": "AS", "meaning": "Authorization Servers"},
-    {"prefix": "CAR", "meaning": "Custom Admin Roles"},
-    {"prefix": "RST", "meaning": "Resource Sets"},
-    {"prefix": "ADM", "meaning": "Admin Accounts and Admin Governance"},
-    {"prefix": "GAD", "meaning": "Global Admin Accounts"},
-    {"prefix": "API", "meaning": "API Tokens"},
-    {"prefix": "BRD", "meaning": "Brand Settings"},
-    {"prefix": "TOR", "meaning": "Trusted Origins"},
-    {"prefix": "EVH", "meaning": "Event Hooks"},
-    {"prefix": "INH", "meaning": "Inline Hooks"},
-    {"prefix": "ATP", "meaning": "Attack Protection"},
-    {"prefix": "RLM", "meaning": "Realms"},
-    {"prefix": "PRF", "meaning": "Profile Schema and Mappings"},
-    {"prefix": "GPM", "meaning": "Group Push Mappings"},
-    {"prefix": "USR", "meaning": "User and Service Account Risk"},
-]
+    phases = [
+        {
+            "phase": "1. Discovery & Baseline",
+            "objective": "Capture current-state configuration and confirm migration scope.",
+            "tasks": [
+                f"Run OktaSnapshot for source tenant ({source_domain}) and export PDF/DOCX baseline.",
+                "Document in-scope apps, policies, integrations, and business owners.",
+                "Confirm cutover constraints, freeze windows, and rollback expectations.",
+            ],
+            "outputs": ["Source snapshot baseline", "Scope inventory", "Owner map"],
+        },
+        {
+            "phase": "2. Target Readiness",
+            "objective": "Prepare target tenant and validate prerequisite controls.",
+            "tasks": [
+                f"Run OktaSnapshot for target tenant ({target_domain}) to capture starting state.",
+                "Validate org/security settings, trusted origins, authenticator posture, and admin access.",
+                "Define target baseline and naming conventions for migrated objects.",
+            ],
+            "outputs": ["Target readiness checklist", "Target baseline snapshot"],
+        },
+        {
+            "phase": "3. Build / Migration Execution",
+            "objective": "Migrate in-scope configuration in controlled waves.",
+            "tasks": [
+                "Migrate by dependency order (foundational settings -> policies -> apps -> branding).",
+                "Track exceptions, unsupported settings, and manual remediation items.",
+                "Validate each wave with owners before proceeding.",
+            ],
+            "outputs": ["Wave tracker", "Issue log", "Validation sign-offs"],
+        },
+        {
+            "phase": "4. Compare & Validate",
+            "objective": "Confirm parity and identify residual drift before cutover.",
+            "tasks": [
+                f"Run OktaCompare between source ({source_domain}) and target ({target_domain}).",
+                "Review Critical/Medium findings and remediate before cutover approval.",
+                "Export CSV comparison report for approval and audit trail.",
+            ],
+            "outputs": ["Comparison report", "Remediation list", "Cutover readiness decision"],
+        },
+        {
+            "phase": "5. Cutover & Hypercare",
+            "objective": "Execute cutover safely and verify production behavior.",
+            "tasks": [
+                "Execute cutover checklist during approved maintenance window.",
+                "Run post-cutover OktaCompare/OktaSnapshot validation and confirm no unexpected drift.",
+                "Track incidents, user impact, and stabilization actions during hypercare.",
+            ],
+            "outputs": ["Cutover log", "Post-cutover validation", "Hypercare summary"],
+        },
+    ]
 
+    risks = [
+        {
+            "name": "Policy/Rule Drift",
+            "severity": "High" if in_scope["policies"] else "Medium",
+            "mitigation": "Use OktaCompare before cutover and remediate Critical/Medium findings.",
+        },
+        {
+            "name": "App Assignment / Integration Gaps",
+            "severity": "High" if in_scope["apps"] else "Low",
+            "mitigation": "Validate application owners, assignments, and test sign-on flows by wave.",
+        },
+        {
+            "name": "Federation / IdP Differences",
+            "severity": "High" if in_scope["idp"] else "Low",
+            "mitigation": "Validate IdP discovery policies, profile mappings, and routing rules in test flows.",
+        },
+        {
+            "name": "Branding / User Experience Regression",
+            "severity": "Medium" if in_scope["branding"] else "Low",
+            "mitigation": "Snapshot and validate brand pages, email templates, and sign-in UX before go-live.",
+        },
+        {
+            "name": "Admin Access / Operational Readiness",
+            "severity": "Medium" if in_scope["admin"] else "Low",
+            "mitigation": "Confirm admin assignments, roles, and break-glass access in target tenant.",
+        },
+    ]
 
-CHECK_ID_BY_TITLE = {
-    "Organization Support Metadata Completeness": "ORG-01",
-    "Password Changed Notifications": "SEC-01",
-    "Suspicious Activity Reporting for End Users": "SEC-02",
-    "New Sign-On Notifications": "SEC-03",
-    "Factor Enrollment Notifications": "SEC-04",
-    "Factor Reset Notifications": "SEC-05",
-    "ThreatInsight Blocking": "SEC-06",
-    "Groups Missing Description": "GRP-01",
-    "Disabled Group Rules": "GRR-01",
-    "Blocklisted Network Zone Presence": "NET-01",
-    "Network Zones Defined But Not Used In Policies": "NET-02",
-    "Trusted Network Zones Without Entries": "NET-03",
-    "Weak Authenticators Enabled": "AUT-01",
-    "Phishing-Resistant Authenticator Availability": "AUT-02",
-    "Weaker Factors in MFA Enrollment Policies": "MFA-01",
-    "Optional Factors in MFA Enrollment Policies": "MFA-02",
-    "Required Authenticator in MFA Enrollment Policies": "MFA-03",
-    "Password Policy Strength": "PWD-01",
-    "SAML Authentication Supported but Disabled Apps": "APP-01",
-    "Applications Assigned to Everyone": "APP-02",
-    "Password-Based Application Sign-On Modes Present": "APP-03",
-    "App Sign-On Policy Catch-All Deny": "APP-04",
-    "Session Lifetime <= 2 Hours": "SES-01",
-    "High-Risk Request MFA Every Sign-In": "POL-01",
-    "New Device MFA Every Sign-In": "POL-02",
-    "Admin Console MFA Every Sign-In": "POL-03",
-    "Entity Risk Policy Rule Coverage": "POL-04",
-    "Identity Threat Protection Policy Rule Coverage": "POL-05",
-    "Inactive Identity Providers": "IDP-01",
-    "Inactive IdP Discovery Rules": "IDP-02",
-    "Authorization Servers Without Automatic Key Rotation": "AS-01",
-    "Authorization Server Access Rules With Broad Client Scope": "AS-02",
-    "Custom Admin Roles Missing Description": "CAR-01",
-    "Resource Sets Without Resources": "RST-01",
-    "Resource Sets Without Bindings": "RST-02",
-    "Admin Public Client Applications Present": "ADM-01",
-    "No MFA - Admin Account": "ADM-02",
-    "Pending MFA - Admin Account": "ADM-03",
-    "No MFA Enforced - Admin Account": "ADM-04",
-    "SSO Bypass - Admin": "ADM-05",
-    "SSO Bypass + No MFA - Admin": "ADM-06",
-    "Old Password - Admin Account": "ADM-07",
-    "Old Password - Admin Service Account": "ADM-08",
-    "Unused Admin Account": "ADM-09",
-    "Unused Admin Service Account": "ADM-10",
-    "Unused Administrative Roles": "ADM-11",
-    "Service Account with Console Access - Admin": "ADM-12",
-    "Old Password, No MFA, Unused Admin Accounts": "ADM-13",
-    "Old Password, No MFA, Unused Admin Service Accounts": "ADM-14",
-    "Unrotated and Unused Keys and Tokens - Admin": "ADM-15",
-    "Unrotated Keys and Tokens - Admin": "ADM-16",
-    "Unused Keys and Tokens - Admins": "ADM-17",
-    "No MFA - Global Admin Account": "GAD-01",
-    "Pending MFA - Global Admin Account": "GAD-02",
-    "No MFA Enforced - Global Admin Account": "GAD-03",
-    "Old Password - Global Admin Account": "GAD-04",
-    "Old Password - Global Admin Service Account": "GAD-05",
-    "Unused Global Admin Account": "GAD-06",
-    "Unused Global Admin Service Account": "GAD-07",
-    "Excessive Number of Super Admins": "GAD-08",
-    "Super Admin with API Token": "GAD-09",
-    "API Tokens Without Network Restrictions": "API-01",
-    "Brands Missing Custom Privacy Policy URL": "BRD-01",
-    "Insecure Trusted Origins": "TOR-01",
-    "Unverified Event Hooks": "EVH-01",
-    "Event Hooks Without Authentication Scheme": "EVH-02",
-    "Inactive Event Hooks": "EVH-03",
-    "Inline Hooks Without Authentication Scheme": "INH-01",
-    "Inactive Inline Hooks": "INH-02",
-    "Attack Protection Controls Not Enforcing": "ATP-01",
-    "Inactive Realms": "RLM-01",
-    "Realm Default Assignment Coverage": "RLM-02",
-    "Sensitive Writable Profile Attributes": "PRF-01",
-    "Empty Profile Mappings": "PRF-02",
-    "Inactive Group Push Mappings": "GPM-01",
-    "Stale Group Push Mappings": "GPM-02",
-    "No MFA - Account": "USR-01",
-    "Pending MFA": "USR-02",
-    "SSO Bypass - Account": "USR-03",
-    "SSO Bypass + No MFA - Account": "USR-04",
-    "Old Password - Account": "USR-05",
-    "Old Password - Service Account": "USR-06",
-    "Unused Account": "USR-07",
-    "Unused Service Account": "USR-08",
-    "Partially Off-boarded User": "USR-09",
-    "Service Account with Console Access - Account": "USR-10",
-    "Old Password, No MFA, Unused Accounts": "USR-11",
-    "Old Password, No MFA, Unused Service Accounts": "USR-12",
-    "Unrotated and Unused Keys and Tokens - Account": "USR-13",
-    "Unrotated Keys and Tokens - Account": "USR-14",
-    "Unused Keys and Tokens - Account": "USR-15",
-}
+    workflow_name = "Extract Source -> Compare with Target -> Update Missing/Different"
 
+    assumptions = [
+        f"In scope: {', '.join(scope_labels) if scope_labels else 'No scopes selected (select at least one for a stronger plan).'}",
+    ]
 
-def _validation(title, status, summary, items=None, severity=None):
-    check_id = CHECK_ID_BY_TITLE.get(title, "")
     return {
-        "check_id": check_id,
-        "title": title,
-        "status": status,
-        "severity": severity,
-        "summary": summary,
-        "items": items or [],
+        "generated_at": datetime.now(ZoneInfo("Australia/Brisbane")).strftime("%Y-%m-%d %H:%M:%S %Z"),
+        "source_domain": source_domain,
+        "target_domain": target_domain,
+        "workflow_name": workflow_name,
+        "in_scope": scope_labels,
+        "phases": phases,
+        "risks": risks,
+        "assumptions": assumptions,
     }
 
 
-def _extract_minutes_from_label(text):
-    if text is None:
-        return None
-    s = str(text).strip().lower()
-    if not s:
-        return None
-    m = re.search(r"(\d+)\s*hour", s)
-    if m:
-        return int(m.group(1)) * 60
-    m = re.search(r"(\d+)\s*minute", s)
-    if m:
-        return int(m.group(1))
-    return None
+def _build_group_sync_summary(source_groups, target_groups):
+    source_groups = [g for g in (source_groups or []) if str(g.get("type") or "").upper() == "OKTA_GROUP"]
+    target_groups = [g for g in (target_groups or []) if str(g.get("type") or "").upper() == "OKTA_GROUP"]
 
+    src_by_name = {((g.get("profile") or {}).get("name") or ""): g for g in source_groups if (g.get("profile") or {}).get("name")}
+    tgt_by_name = {((g.get("profile") or {}).get("name") or ""): g for g in target_groups if (g.get("profile") or {}).get("name")}
 
-def _password_policy_weaknesses(policy_row):
-    weaknesses = []
-    complexity = str(policy_row.get("Complexity Settings") or "")
-    age = str(policy_row.get("Age Settings") or "")
-    lockout = str(policy_row.get("Lockout Settings") or "")
-
-    min_len = None
-    m = re.search(r"Minimum length:\s*(\d+)", complexity, re.IGNORECASE)
-    if m:
-        min_len = int(m.group(1))
-        if min_len < 12:
-            weaknesses.append(f"minimum length {min_len} (< 12)")
-
-    for label in ["Lower case letters", "Upper case letters", "Numbers", "Symbols"]:
-        m = re.search(rf"{re.escape(label)}:\s*(\d+)", complexity, re.IGNORECASE)
-        if m and int(m.group(1)) == 0:
-            weaknesses.append(f"{label.lower()} requirement is 0")
-
-    if "Restrict use of common passwords: Disabled" in complexity:
-        weaknesses.append("common password restriction disabled")
-    if "Does not contain part of username: No" in complexity:
-        weaknesses.append("username exclusion disabled")
-
-    min_age = _extract_minutes_from_label(re.search(r"Minimum password age:\s*([^;]+)", age, re.IGNORECASE).group(1)) if re.search(r"Minimum password age:\s*([^;]+)", age, re.IGNORECASE) else None
-    if min_age is not None and min_age == 0:
-        weaknesses.append("minimum password age is 0")
-
-    history_count = re.search(r"Enforce password history \(count\):\s*(\d+)", age, re.IGNORECASE)
-    if history_count and int(history_count.group(1)) < 24:
-        weaknesses.append(f"password history {history_count.group(1)} (< 24)")
-
-    lockout_attempts = re.search(r"Lock out after failed attempts:\s*(\d+)", lockout, re.IGNORECASE)
-    if lockout_attempts and int(lockout_attempts.group(1)) > 10:
-        weaknesses.append(f"lockout attempts threshold {lockout_attempts.group(1)} (> 10)")
-
-    return weaknesses
-
-
-def _mfa_policy_has_optional_factors(policy_row):
-    settings = _as_dict(policy_row.get("Settings"))
-    for _, value in _walk_nested(settings):
-        if isinstance(value, str) and value.strip().upper() == "OPTIONAL":
-            return True
-    return False
-
-
-def _mfa_policy_weak_factors(policy_row):
-    settings = _as_dict(policy_row.get("Settings"))
-    weak_factor_hits = set()
-    weak_tokens = {
-        "sms": "SMS",
-        "voice": "Voice",
-        "call": "Voice",
-        "security_question": "Security Question",
-        "question": "Security Question",
-        "email": "Email",
-    }
-    for path, value in _walk_nested(settings):
-        p = path.lower()
-        matched = None
-        for token, label in weak_tokens.items():
-            if token in p:
-                matched = label
-                break
-        if not matched:
-            continue
-        if isinstance(value, str):
-            v = value.strip().upper()
-            if v in {"OPTIONAL", "REQUIRED", "ACTIVE", "ENABLED"}:
-                weak_factor_hits.add(matched)
-        elif isinstance(value, bool) and value:
-            weak_factor_hits.add(matched)
-    return sorted(weak_factor_hits)
-
-
-def _section_rows(section_by_id, section_id, entry_type=None):
-    rows = (section_by_id.get(section_id) or {}).get("rows") or []
-    if entry_type is None:
-        return rows
-    return [row for row in rows if str(row.get("Entry Type") or "").strip() == entry_type]
+    missing = []
+    different = []
+    matched = 0
+    extra = 0
+    all_groups = []
 
+    for name, src in src_by_name.items():
+        src_profile = src.get("profile") or {}
+        src_desc = src_profile.get("description") or ""
+        tgt = tgt_by_name.get(name)
+        if not tgt:
+            missing.append({
+                "name": name,
+                "description": src_desc,
+            })
+            all_groups.append({
+                "name": name,
+                "source_description": src_desc,
+                "target_description": "",
+                "status": "Missing in Target",
+            })
+            continue
+        tgt_profile = tgt.get("profile") or {}
+        tgt_desc = tgt_profile.get("description") or ""
+        if (src_desc or "") != (tgt_desc or ""):
+            different.append({
+                "name": name,
+                "source_description": src_desc,
+                "target_description": tgt_desc,
+                "target_id": tgt.get("id"),
+            })
+            all_groups.append({
+                "name": name,
+                "source_description": src_desc,
+                "target_description": tgt_desc,
+                "status": "Different",
+            })
+        else:
+            matched += 1
+            all_groups.append({
+                "name": name,
+                "source_description": src_desc,
+                "target_description": tgt_desc,
+                "status": "Match",
+            })
 
-def _row_map(rows, key_field="Setting", value_field="Value"):
-    mapping = {}
-    for row in rows or []:
-        key = row.get(key_field)
-        if key:
-            mapping[str(key)] = row.get(value_field)
-    return mapping
+    for name in tgt_by_name:
+        if name not in src_by_name:
+            extra += 1
+            tgt_desc = ((tgt_by_name.get(name) or {}).get("profile") or {}).get("description") or ""
+            all_groups.append({
+                "name": name,
+                "source_description": "",
+                "target_description": tgt_desc,
+                "status": "Extra in Target",
+            })
 
+    all_groups.sort(key=lambda g: ((g.get("name") or "").lower(), g.get("status") or ""))
 
-def _blankish(value):
-    if value is None:
-        return True
-    if isinstance(value, str):
-        return value.strip() == "" or value.strip().lower() in {"not available", "none", "null"}
-    if isinstance(value, (list, dict, tuple, set)):
-        return len(value) == 0
-    return False
+    return {
+        "source_count": len(src_by_name),
+        "target_count": len(tgt_by_name),
+        "missing": missing,
+        "different": different,
+        "all_groups": all_groups,
+        "matched_count": matched,
+        "extra_count": extra,
+        "pending_count": len(missing) + len(different),
+    }
 
 
-def _text(value):
-    if isinstance(value, (dict, list)):
-        return json.dumps(value, sort_keys=True, default=str)
-    return str(value or "")
+def _okta_headers(api_token):
+    return {
+        "Authorization": f"SSWS {api_token}",
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
 
 
-def _contains_token(value, tokens):
-    haystack = _text(value).lower()
-    return any(token.lower() in haystack for token in tokens)
+def _create_group(domain, api_token, name, description=""):
+    url = f"{_ensure_https_domain(domain).rstrip('/')}/api/v1/groups"
+    payload = {"profile": {"name": name, "description": description or ""}}
+    return requests.post(url, headers=_okta_headers(api_token), json=payload, timeout=30)
 
 
-def _looks_like_inactive(status):
-    return str(status or "").strip().upper() not in {"ACTIVE", "ENABLED", "VERIFIED"}
+def _update_group_description(domain, api_token, group_id, name, description=""):
+    url = f"{_ensure_https_domain(domain).rstrip('/')}/api/v1/groups/{group_id}"
+    payload = {"profile": {"name": name, "description": description or ""}}
+    return requests.put(url, headers=_okta_headers(api_token), json=payload, timeout=30)
 
 
-def _parse_iso_datetime(value):
-    if value in (None, ""):
-        return None
-    text = str(value).strip()
-    if not text:
-        return None
-    if text.endswith("Z"):
-        text = f"{text[:-1]}+00:00"
-    try:
-        parsed = datetime.fromisoformat(text)
-    except ValueError:
-        return None
-    if parsed.tzinfo is None:
-        parsed = parsed.replace(tzinfo=timezone.utc)
-    return parsed
-
-
-def _days_since(value):
-    parsed = _parse_iso_datetime(value)
-    if not parsed:
-        return None
-    return (datetime.now(timezone.utc) - parsed.astimezone(timezone.utc)).days
-
-
-def _user_display_name(user):
-    profile = user.get("profile") or {}
-    display_name = (profile.get("displayName") or "").strip()
-    if display_name:
-        return display_name
-    full_name = " ".join(
-        part.strip()
-        for part in [profile.get("firstName") or "", profile.get("lastName") or ""]
-        if str(part).strip()
-    ).strip()
-    if full_name:
-        return full_name
-    return str(profile.get("login") or user.get("id") or "Unknown User")
-
-
-def _user_identifier(user):
-    profile = user.get("profile") or {}
-    login = profile.get("login") or profile.get("email") or user.get("id") or "Unknown User"
-    display_name = _user_display_name(user)
-    if display_name and display_name != login:
-        return f"{login} ({display_name})"
-    return str(login)
-
-
-def _user_provider_type(user):
-    credentials = user.get("credentials") or {}
-    provider = credentials.get("provider") or {}
-    return str(provider.get("type") or "").strip().upper()
-
-
-def _user_role_types(user):
-    role_types = set()
-    for role in user.get("roles") or []:
-        role_type = str(role.get("type") or role.get("label") or role.get("name") or "").strip().upper()
-        if role_type:
-            role_types.add(role_type)
-    return role_types
-
-
-def _active_factor_types(user):
-    factor_types = set()
-    for factor in user.get("factors") or []:
-        status = str(factor.get("status") or "").strip().upper()
-        if status != "ACTIVE":
-            continue
-        factor_type = str(factor.get("factorType") or factor.get("factor") or "").strip()
-        provider = str(factor.get("provider") or "").strip()
-        label = f"{factor_type} ({provider})" if provider else factor_type
-        if label:
-            factor_types.add(label)
-    return factor_types
-
-
-def _pending_factor_types(user):
-    factor_types = set()
-    for factor in user.get("factors") or []:
-        status = str(factor.get("status") or "").strip().upper()
-        if status not in {"PENDING", "PENDING_ACTIVATION"}:
-            continue
-        factor_type = str(factor.get("factorType") or factor.get("factor") or "").strip()
-        provider = str(factor.get("provider") or "").strip()
-        label = f"{factor_type} ({provider})" if provider else factor_type
-        if label:
-            factor_types.add(label)
-    return factor_types
+def _oktaevaluate_csv_bytes(evaluation):
+    output = io.StringIO()
+    writer = csv.DictWriter(
+        output,
+        fieldnames=["Check ID", "What Was Checked", "Result", "Severity", "Summary", "Details"],
+    )
+    writer.writeheader()
+    for check in (evaluation or {}).get("security_validations", []) or []:
+        writer.writerow(
+            {
+                "Check ID": check.get("check_id", ""),
+                "What Was Checked": check.get("title", ""),
+                "Result": check.get("status", ""),
+                "Severity": check.get("severity", ""),
+                "Summary": check.get("summary", ""),
+                "Details": " | ".join([str(i) for i in (check.get("items") or [])]),
+            }
+        )
+    return output.getvalue().encode("utf-8")
 
 
-def _has_mfa(user):
-    return bool(_active_factor_types(user))
+# ---------------------------------------------------
+# Compare Groups (unchanged logic)
+# ---------------------------------------------------
+def compare_groups(groupsA, groupsB):
+    diffs = []
+    matches = match_rows()
 
+    dictA = {g["profile"]["name"]: g for g in groupsA}
+    dictB = {g["profile"]["name"]: g for g in groupsB}
 
-def _has_pending_mfa(user):
-    return (not _has_mfa(user)) and bool(_pending_factor_types(user))
+    for name, grpA in dictA.items():
+        descA = grpA["profile"].get("description", "")
 
+        if name not in dictB:
+            diffs.append({
+                "Category": "Groups",
+                "Object": name,
+                "Attribute": "-",
+                "Env A Value": "Exists",
+                "Env B Value": "Missing",
+                "Difference Type": "Missing in Env B",
+                "Impact": "Access",
+                "Recommended Action": f"Create group '{name}' in Env B",
+                "Priority": "🔴 Critical"
+            })
+        else:
+            descB = dictB[name]["profile"].get("description", "")
+            if descA != descB:
+                diffs.append({
+                    "Category": "Groups",
+                    "Object": name,
+                    "Attribute": "Description",
+                    "Env A Value": descA,
+                    "Env B Value": descB,
+                    "Difference Type": "Mismatch",
+                    "Impact": "Configuration Drift",
+                    "Recommended Action": f"Align description for group '{name}'",
+                    "Priority": "🟠 Medium"
+                })
+            else:
+                matches.append({
+                    "Category": "Groups",
+                    "Object": name,
+                    "Attribute": "Description",
+                    "Value": descA
+                })
 
-def _is_direct_access_user(user):
-    provider_type = _user_provider_type(user)
-    if provider_type in {"FEDERATION", "SOCIAL"}:
-        return False
-    if provider_type:
-        return True
-    return bool((user.get("credentials") or {}).get("password"))
-
-
-def _is_service_account(user, active_token_count=0):
-    profile = user.get("profile") or {}
-    searchable = " ".join(
-        str(value or "")
-        for value in [
-            profile.get("login"),
-            profile.get("email"),
-            profile.get("displayName"),
-            profile.get("firstName"),
-            profile.get("lastName"),
-            profile.get("title"),
-            profile.get("department"),
-        ]
-    ).lower()
-    patterns = [
-        r"(^|[\W_])(svc|service|bot|automation|api|daemon|integration|system|noreply|nonhuman|robot)([\W_]|$)",
-        r"(^|[\W_])(ci|cd|etl|job)([\W_]|$)",
-    ]
-    if any(re.search(pattern, searchable) for pattern in patterns):
-        return True
-    if active_token_count > 0 and not str(profile.get("firstName") or "").strip() and not str(profile.get("lastName") or "").strip():
-        return True
-    return False
-
-
-def _is_unused_user(user, threshold_days=91):
-    status = str(user.get("status") or "").strip().upper()
-    if status not in {"ACTIVE", "PROVISIONED", "RECOVERY", "LOCKED_OUT", "PASSWORD_EXPIRED", "STAGED"}:
-        return False
-    days_since_last_login = _days_since(user.get("lastLogin"))
-    if days_since_last_login is not None:
-        return days_since_last_login >= threshold_days
-    created_or_activated_days = _days_since(user.get("activated")) or _days_since(user.get("created"))
-    return created_or_activated_days is not None and created_or_activated_days >= threshold_days
-
-
-def _has_old_password(user, threshold_days=90):
-    if _user_provider_type(user) in {"FEDERATION", "SOCIAL"}:
-        return False
-    age_days = _days_since(user.get("passwordChanged"))
-    return age_days is not None and age_days >= threshold_days
-
-
-def _token_rotation_age_days(token):
-    for candidate in [token.get("lastUpdated"), token.get("created")]:
-        days = _days_since(candidate)
-        if days is not None:
-            return days
-    return None
-
-
-def _is_active_token(token):
-    return str(token.get("status") or "").strip().upper() == "ACTIVE"
-
-
-def _token_name(token):
-    return str(token.get("name") or token.get("label") or token.get("id") or "Unknown Token")
-
-
-def _token_inventory(tokens):
-    active_by_user = {}
-    for token in tokens or []:
-        if not _is_active_token(token):
-            continue
-        user_id = token.get("userId")
-        if not user_id:
-            continue
-        active_by_user.setdefault(user_id, []).append(token)
-    return active_by_user
-
-
-def _token_findings_for_user(user_tokens, owner_unused=False, rotation_days=90):
-    unrotated = []
-    unused = []
-    for token in user_tokens or []:
-        age_days = _token_rotation_age_days(token)
-        if age_days is not None and age_days >= rotation_days:
-            unrotated.append((token, age_days))
-        if owner_unused:
-            unused.append(token)
-    return unrotated, unused
-
-
-def _format_token_item(user, token, suffix=None):
-    base = f"{_user_identifier(user)}: {_token_name(token)}"
-    if suffix:
-        return f"{base} ({suffix})"
-    return base
-
-
-def _role_binding_keys(binding_role):
-    keys = set()
-    if isinstance(binding_role, dict):
-        for value in [binding_role.get("id"), binding_role.get("type"), binding_role.get("label"), binding_role.get("name")]:
-            if value:
-                keys.add(str(value).strip())
-                keys.add(str(value).strip().upper())
-    elif binding_role:
-        keys.add(str(binding_role).strip())
-        keys.add(str(binding_role).strip().upper())
-    return keys
-
-
-def _custom_role_usage_map(custom_roles, resource_set_bindings):
-    usage = {}
-    for role in custom_roles or []:
-        keys = set()
-        for value in [role.get("id"), role.get("label"), role.get("name")]:
-            if value:
-                keys.add(str(value).strip())
-                keys.add(str(value).strip().upper())
-        usage[str(role.get("id") or role.get("label") or role.get("name") or "")] = {
-            "role": role,
-            "keys": keys,
-            "used": False,
-        }
-
-    for binding in resource_set_bindings or []:
-        binding_keys = _role_binding_keys(binding.get("role"))
-        if not binding_keys:
-            continue
-        for role_usage in usage.values():
-            if role_usage["keys"] & binding_keys:
-                role_usage["used"] = True
-
-    return usage
-
-
-def _actions_reference_mfa(actions):
-    positive_strings = {
-        "mfa",
-        "multifactor",
-        "promptforfactor",
-        "phishing_resistant",
-        "authenticator",
-        "factor",
-        "password / idp + another factor",
-    }
-    positive_paths = {"mfa", "factor", "authenticator", "challenge"}
-    for path, value in _walk_nested(actions):
-        path_l = path.lower()
-        value_l = str(value).strip().lower()
-        if any(token in path_l for token in positive_paths):
-            return True
-        if any(token in value_l for token in positive_strings):
-            return True
-    return False
-
-
-def _actions_reference_every_sign_in(actions):
-    positive_values = {
-        "every sign in",
-        "every sign-in",
-        "every sign-in attempt",
-        "at every sign in",
-        "at every sign-in",
-        "always",
-        "every_time",
-        "everytime",
-        "per_session",
-    }
-    for path, value in _walk_nested(actions):
-        path_l = path.lower()
-        value_l = str(value).strip().lower()
-        if any(token in path_l for token in ["prompt", "reauth", "factorlifetime", "mfalifetime"]):
-            if any(token in value_l for token in positive_values):
-                return True
-        if any(token in value_l for token in positive_values):
-            return True
-    return False
-
-
-def _conditions_reference_new_device(conditions):
-    return _contains_token(conditions, ["new device", "new_device", "behavior", "device"])
-
-
-def _conditions_reference_high_risk(conditions):
-    return _contains_token(conditions, ['"high"', "risk", "high"])
-
-
-def _policy_has_required_authenticator(policy_row):
-    settings = _as_dict(policy_row.get("Settings"))
-    for _, value in _walk_nested(settings):
-        if isinstance(value, str) and value.strip().upper() == "REQUIRED":
-            return True
-    return False
-
-
-def _tenant_mfa_enforcement_gaps(section_by_id):
-    mfa_rows = (section_by_id.get("mfa-enrollment-policies") or {}).get("rows") or []
-    auth_rows = (section_by_id.get("authentication-policies") or {}).get("rows") or []
-    mfa_policy_rows = [r for r in mfa_rows if r.get("Entry Type") == "Policy"]
-    auth_rule_rows = [r for r in auth_rows if r.get("Entry Type") == "Rule"]
-
-    optional_enrollment = any(_mfa_policy_has_optional_factors(row) for row in mfa_policy_rows)
-    auth_requires_mfa = any(_actions_reference_mfa(_as_dict(row.get("Actions"))) for row in auth_rule_rows)
-
-    return {
-        "optional_enrollment": optional_enrollment,
-        "auth_requires_mfa": auth_requires_mfa,
-        "has_data": bool(mfa_policy_rows or auth_rule_rows),
-    }
-
-
-def _identity_validation(title, severity, records, warning_summary, pass_summary, empty_summary=None, data_available=True):
-    if records:
-        return _validation(title, "Fail", warning_summary(records), records[:20], severity=severity)
-    if not data_available and empty_summary:
-        return _validation(title, "Pass", empty_summary, severity=severity)
-    return _validation(title, "Pass", pass_summary, severity=severity)
-
-
-def _unsupported_ispm_validations():
-    return []
-
-
-def _run_security_validations(sections, extra_context=None):
-    section_by_id = _section_map(sections)
-    extra_context = extra_context or {}
-    validations = []
-
-    # Validation 1: Catch-all/default rule deny posture in authentication/app sign-on policies
-    auth_section = section_by_id.get("authentication-policies") or {}
-    auth_rows = auth_section.get("rows") or []
-    auth_rule_rows = [r for r in auth_rows if (r.get("Entry Type") == "Rule")]
-
-    policy_map = {}
-    for row in auth_rule_rows:
-        policy_name = row.get("Policy Name") or "Unknown Policy"
-        rule_name = (row.get("Rule Name") or "").strip()
-        if not rule_name:
-            continue
-        bucket = policy_map.setdefault(policy_name, {"catch_all_found": False, "catch_all_denied": False, "details": []})
-        is_catch_all = any(token in rule_name.lower() for token in ["catch", "default", "all"])
-        actions = _as_dict(row.get("Actions"))
-        is_deny, deny_path = _is_deny_action(actions)
-        if is_catch_all:
-            bucket["catch_all_found"] = True
-            if is_deny:
-                bucket["catch_all_denied"] = True
-            bucket["details"].append(
-                {
-                    "rule_name": rule_name,
-                    "status": row.get("Status"),
-                    "deny": is_deny,
-                    "deny_path": deny_path,
-                }
-            )
-
-    missing_or_not_deny = []
-    passing = []
-    for policy_name, result in policy_map.items():
-        if result["catch_all_found"] and result["catch_all_denied"]:
-            passing.append(policy_name)
-        else:
-            missing_or_not_deny.append(
-                {
-                    "policy": policy_name,
-                    "issue": "Catch-all/default rule not found or not set to deny",
-                    "details": result["details"],
-                }
-            )
-
-    if not policy_map:
-        validations.append(_validation(
-            "App Sign-On Policy Catch-All Deny",
-            "Pass",
-            "No authentication/app sign-on policy rule data was available to validate catch-all deny posture.",
-            severity="High",
-        ))
-    elif missing_or_not_deny:
-        validations.append(_validation(
-            "App Sign-On Policy Catch-All Deny",
-            "Fail",
-            f"{len(missing_or_not_deny)} policy(s) may not have a catch-all/default deny rule configured.",
-            [f"{item['policy']}: {item['issue']}" for item in missing_or_not_deny],
-            severity="High",
-        ))
-    else:
-        validations.append(_validation(
-            "App Sign-On Policy Catch-All Deny",
-            "Pass",
-            f"Validated catch-all/default deny posture for {len(passing)} authentication/app sign-on policy(ies).",
-            [f"{name}: catch-all/default deny detected" for name in passing[:8]],
-            severity="High",
-        ))
-
-    # Validation 2: Session timeout > 2 hours in global session policies
-    session_section = section_by_id.get("global-session-policies") or {}
-    session_rows = session_section.get("rows") or []
-    session_rule_rows = [r for r in session_rows if r.get("Entry Type") == "Rule"]
-    timeout_violations = []
-    for row in session_rule_rows:
-        actions = _as_dict(row.get("Actions"))
-        for finding in _extract_session_timeout_findings(actions, threshold_minutes=120):
-            timeout_violations.append(
-                {
-                    "policy": row.get("Policy Name") or "Unknown Policy",
-                    "rule": row.get("Rule Name") or "Unnamed Rule",
-                    "path": finding["path"],
-                    "minutes": finding["minutes"],
-                    "raw": f"{finding['value']} ({finding['unit']})",
-                }
-            )
-
-    if not session_rule_rows:
-        validations.append(_validation(
-            "Session Lifetime <= 2 Hours",
-            "Pass",
-            "No global session policy rule data was available to validate session timeout settings.",
-            severity="High",
-        ))
-    elif timeout_violations:
-        policy_count = len({(v["policy"]) for v in timeout_violations})
-        validations.append(_validation(
-            "Session Lifetime <= 2 Hours",
-            "Fail",
-            f"Session lifetime duration is more than 2 hours on {policy_count} policy(s).",
-            [
-                f"{v['policy']} / {v['rule']}: {v['path']} = {v['raw']} (~{int(v['minutes'])} min)"
-                for v in timeout_violations[:20]
-            ],
-            severity="High",
-        ))
-    else:
-        validations.append(_validation(
-            "Session Lifetime <= 2 Hours",
-            "Pass",
-            "No session timeout values above 2 hours were detected in global session policy rules.",
-            severity="High",
-        ))
-
-    # Security notifications checks (High)
-    sec_rows = (section_by_id.get("security-settings") or {}).get("rows") or []
-    notification_checks = [
-        ("Password Changed Notifications", "Password changed notification email"),
-        ("Suspicious Activity Reporting for End Users", "Report suspicious activity via email"),
-        ("New Sign-On Notifications", "New sign-on notification email"),
-        ("Factor Enrollment Notifications", "Authenticator enrolled notification email"),
-        ("Factor Reset Notifications", "Authenticator reset notification email"),
-    ]
-    for title, setting_name in notification_checks:
-        if not sec_rows:
-            validations.append(_validation(
-                title,
-                "Pass",
-                f"No security settings data was available to validate {title.lower()}.",
-                severity="High",
-            ))
-            continue
-        value = _find_setting_value(sec_rows, setting_name)
-        status = _status_from_boolish_enabled(value)
-        if status == "Pass":
-            summary = f"{title} are enabled."
-        elif status == "Fail":
-            summary = f"{title} are disabled."
-        else:
-            summary = f"{title} setting was not available in tenant response."
-        validations.append(_validation(title, status, summary, severity="High"))
-
-    threatinsight_action = _find_setting_value(sec_rows, "Action")
-    if not sec_rows:
-        validations.append(_validation(
-            "ThreatInsight Blocking",
-            "Pass",
-            "No security settings data was available to validate ThreatInsight blocking.",
-            severity="High",
-        ))
-    elif threatinsight_action is None:
-        validations.append(_validation(
-            "ThreatInsight Blocking",
-            "Info",
-            "ThreatInsight action setting was not available in tenant response.",
-            severity="High",
-        ))
-    elif "enforce" in str(threatinsight_action).lower() or "block" in str(threatinsight_action).lower():
-        validations.append(_validation(
-            "ThreatInsight Blocking",
-            "Pass",
-            "ThreatInsight is configured to block or enforce security on suspicious IP activity.",
-            severity="High",
-        ))
-    else:
-        validations.append(_validation(
-            "ThreatInsight Blocking",
-            "Fail",
-            "ThreatInsight is not configured in blocking/enforcement mode.",
-            [str(threatinsight_action)],
-            severity="High",
-        ))
-
-    # Weak password policies (Moderate)
-    pwd_rows = (section_by_id.get("password-policies") or {}).get("rows") or []
-    pwd_policy_rows = [r for r in pwd_rows if r.get("Entry Type") == "Policy"]
-    weak_pwd = []
-    for row in pwd_policy_rows:
-        weaknesses = _password_policy_weaknesses(row)
-        if weaknesses:
-            weak_pwd.append((row.get("Name") or row.get("Policy Name") or "Unnamed Policy", weaknesses))
-    if not pwd_policy_rows:
-        validations.append(_validation(
-            "Password Policy Strength",
-            "Pass",
-            "No password policy data was available for password strength validation.",
-            severity="Moderate",
-        ))
-    elif weak_pwd:
-        validations.append(_validation(
-            "Password Policy Strength",
-            "Fail",
-            f"Password policies for {len(weak_pwd)} policy(s) are weak.",
-            [f"{name}: {', '.join(issues[:3])}" for name, issues in weak_pwd],
-            severity="Moderate",
-        ))
-    else:
-        validations.append(_validation(
-            "Password Policy Strength",
-            "Pass",
-            "No weak password policy patterns were detected using current heuristics.",
-            severity="Moderate",
-        ))
-
-    # Network zones blocklist presence (Moderate)
-    zone_rows = (section_by_id.get("network-zones") or {}).get("rows") or []
-    has_block_zone = any(
-        "block" in str((z.get("Usage") or "")).lower() or "block" in str((z.get("Name") or "")).lower()
-        for z in zone_rows
-    )
-    if not zone_rows:
-        validations.append(_validation(
-            "Blocklisted Network Zone Presence",
-            "Pass",
-            "No network zone data was available to validate blocklisted zone configuration.",
-            severity="Moderate",
-        ))
-    elif not has_block_zone:
-        validations.append(_validation(
-            "Blocklisted Network Zone Presence",
-            "Fail",
-            "Network Zones do not contain a block listed zone.",
-            severity="Moderate",
-        ))
-    else:
-        validations.append(_validation(
-            "Blocklisted Network Zone Presence",
-            "Pass",
-            "At least one blocklisted network zone was detected.",
-            severity="Moderate",
-        ))
-
-    # MFA enrollment policies: weaker factors + optional factors
-    mfa_rows = (section_by_id.get("mfa-enrollment-policies") or {}).get("rows") or []
-    mfa_policy_rows = [r for r in mfa_rows if r.get("Entry Type") == "Policy"]
-    weak_factor_policies = []
-    optional_factor_policies = []
-    for row in mfa_policy_rows:
-        name = row.get("Name") or row.get("Policy Name") or "Unnamed Policy"
-        weak_factors = _mfa_policy_weak_factors(row)
-        if weak_factors:
-            weak_factor_policies.append((name, weak_factors))
-        if _mfa_policy_has_optional_factors(row):
-            optional_factor_policies.append(name)
-    policies_without_required_factor = [
-        row.get("Name") or row.get("Policy Name") or "Unnamed Policy"
-        for row in mfa_policy_rows
-        if not _policy_has_required_authenticator(row)
-    ]
-
-    if not mfa_policy_rows:
-        validations.append(_validation(
-            "Weaker Factors in MFA Enrollment Policies",
-            "Pass",
-            "No MFA enrollment policy data was available to evaluate weaker factor usage.",
-            severity="High",
-        ))
-        validations.append(_validation(
-            "Optional Factors in MFA Enrollment Policies",
-            "Pass",
-            "No MFA enrollment policy data was available to evaluate optional factor enrollment.",
-            severity="Moderate",
-        ))
-        validations.append(_validation(
-            "Required Authenticator in MFA Enrollment Policies",
-            "Pass",
-            "No MFA enrollment policy data was available to evaluate required authenticator posture.",
-            severity="High",
-        ))
-    else:
-        validations.append(_validation(
-            "Weaker Factors in MFA Enrollment Policies",
-            "Fail" if weak_factor_policies else "Pass",
-            (f"Weaker factors are set in {len(weak_factor_policies)} policies."
-             if weak_factor_policies else "No weaker factors detected in MFA enrollment policy settings."),
-            [f"{name}: {', '.join(factors)}" for name, factors in weak_factor_policies[:20]],
-            severity="High",
-        ))
-        validations.append(_validation(
-            "Optional Factors in MFA Enrollment Policies",
-            "Fail" if optional_factor_policies else "Pass",
-            (f"Factors are optional for {len(optional_factor_policies)} Factor Enrollment policies."
-             if optional_factor_policies else "No optional factor enrollment settings detected in MFA enrollment policies."),
-            optional_factor_policies[:20],
-            severity="Moderate",
-        ))
-        validations.append(_validation(
-            "Required Authenticator in MFA Enrollment Policies",
-            "Fail" if policies_without_required_factor else "Pass",
-            (
-                f"{len(policies_without_required_factor)} MFA enrollment policy(ies) do not appear to require any authenticator."
-                if policies_without_required_factor
-                else "Every MFA enrollment policy appears to require at least one authenticator."
-            ),
-            policies_without_required_factor[:20],
-            severity="High",
-        ))
-
-    # SAML apps disabled (High) using full app inventory (including inactive)
-    all_apps = extra_context.get("all_apps") or []
-    if not all_apps:
-        validations.append(_validation(
-            "SAML Authentication Supported but Disabled Apps",
-            "Pass",
-            "No full application inventory was available to validate disabled SAML apps.",
-            severity="High",
-        ))
-    else:
-        disabled_saml = [
-            app for app in all_apps
-            if str(app.get("signOnMode") or "").upper() == "SAML_2_0"
-            and str(app.get("status") or "").upper() != "ACTIVE"
-        ]
-        validations.append(_validation(
-            "SAML Authentication Supported but Disabled Apps",
-            "Fail" if disabled_saml else "Pass",
-            (f"SAML authentication is supported but disabled for {len(disabled_saml)} apps."
-             if disabled_saml else "No disabled SAML applications were detected."),
-            [str(app.get("label") or app.get("name") or app.get("id")) for app in disabled_saml[:20]],
-            severity="High",
-        ))
-
-    # Org settings readiness checks
-    org_setting_map = _row_map(_section_rows(section_by_id, "org-settings"))
-    org_missing = [
-        label for label in [
-            "Company Name",
-            "Website",
-            "End User Support Help URL",
-            "Billing Contact Email",
-            "Technical Contact Email",
-        ]
-        if _blankish(org_setting_map.get(label))
-    ]
-    validations.append(_identity_validation(
-        "Organization Support Metadata Completeness",
-        "Moderate",
-        org_missing,
-        lambda items: f"{len(items)} important org support/contact setting(s) are missing.",
-        "Core org support and contact metadata are populated.",
-        "Organization settings were not available for validation.",
-        data_available=bool(_section_rows(section_by_id, "org-settings")),
-    ))
-
-    # Group hygiene checks
-    group_rows = _section_rows(section_by_id, "groups")
-    groups_missing_description = [
-        str(row.get("Group Name") or "Unnamed Group")
-        for row in group_rows
-        if _blankish(row.get("Description"))
-    ]
-    validations.extend([
-        _identity_validation(
-            "Groups Missing Description",
-            "Low",
-            groups_missing_description,
-            lambda items: f"{len(items)} group(s) do not have a description.",
-            "All Okta groups have descriptions.",
-            "No group data was available for group description validation.",
-            data_available=bool(group_rows),
-        ),
-    ])
-
-    # Group rule hygiene
-    group_rule_rows = _section_rows(section_by_id, "group-rules")
-    disabled_group_rules = [
-        str(row.get("Rule Name") or "Unnamed Rule")
-        for row in group_rule_rows
-        if _looks_like_inactive(row.get("Status"))
-    ]
-    validations.extend([
-        _identity_validation(
-            "Disabled Group Rules",
-            "Low",
-            disabled_group_rules,
-            lambda items: f"{len(items)} group rule(s) are not active.",
-            "All group rules are active.",
-            "No group rule data was available for rule status validation.",
-            data_available=bool(group_rule_rows),
-        ),
-    ])
-
-    # Network zones
-    zone_rows = _section_rows(section_by_id, "network-zones")
-    network_policy_rows = _section_rows(section_by_id, "global-session-policies", entry_type="Rule") + _section_rows(
-        section_by_id,
-        "authentication-policies",
-        entry_type="Rule",
-    )
-    zone_usage_blob = " ".join(
-        json.dumps(row.get("Conditions Network"), sort_keys=True, default=str)
-        for row in network_policy_rows
-    )
-    unused_network_zones = [
-        str(row.get("Name") or "Unnamed Zone")
-        for row in zone_rows
-        if str(row.get("Name") or "").strip()
-        and str(row.get("Name")).lower() not in zone_usage_blob.lower()
-    ]
-    empty_trusted_zones = [
-        str(row.get("Name") or "Unnamed Zone")
-        for row in zone_rows
-        if str(row.get("Usage") or "").strip().upper() == "TRUSTED"
-        and _blankish(row.get("Gateways"))
-        and _blankish(row.get("Proxies"))
-    ]
-    validations.extend([
-        _identity_validation(
-            "Network Zones Defined But Not Used In Policies",
-            "Low",
-            unused_network_zones,
-            lambda items: f"{len(items)} network zone(s) are defined but not referenced by extracted session or app sign-on policy rules.",
-            "All defined network zones are referenced by extracted session or app sign-on policy rules, or no network zones are configured.",
-            "No network zone data was available for validation.",
-            data_available=bool(zone_rows),
-        ),
-        _identity_validation(
-            "Trusted Network Zones Without Entries",
-            "Moderate",
-            empty_trusted_zones,
-            lambda items: f"{len(items)} trusted network zone(s) do not list gateways or proxies.",
-            "All trusted network zones contain gateway or proxy entries.",
-            "No network zone data was available for trusted-zone validation.",
-            data_available=bool(zone_rows),
-        ),
-    ])
-
-    # Authenticators
-    authenticator_rows = _section_rows(section_by_id, "authenticators")
-    weak_authenticators = [
-        f"{row.get('Name')}: {row.get('Status')}"
-        for row in authenticator_rows
-        if str(row.get("Status") or "").strip().upper() == "ACTIVE"
-        and _contains_token(row.get("Key"), ["email", "phone", "security_question"])
-    ]
-    strong_authenticator_present = any(
-        str(row.get("Status") or "").strip().upper() == "ACTIVE"
-        and _contains_token(row.get("Key"), ["okta_verify", "webauthn", "security_key"])
-        for row in authenticator_rows
-    )
-    validations.extend([
-        _identity_validation(
-            "Weak Authenticators Enabled",
-            "High",
-            weak_authenticators,
-            lambda items: f"{len(items)} weaker authenticator(s) are active.",
-            "No weaker authenticators were detected as active.",
-            "No authenticator data was available for validation.",
-            data_available=bool(authenticator_rows),
-        ),
-        _identity_validation(
-            "Phishing-Resistant Authenticator Availability",
-            "High",
-            [] if strong_authenticator_present else ["No active Okta Verify / WebAuthn / security key authenticator detected"],
-            lambda items: items[0],
-            "At least one phishing-resistant authenticator is available.",
-            "No authenticator data was available for phishing-resistant authenticator validation.",
-            data_available=bool(authenticator_rows),
-        ),
-    ])
-
-    # Applications
-    application_rows = _section_rows(section_by_id, "applications")
-    everyone_assigned_apps = [
-        str(row.get("Name") or "Unnamed App")
-        for row in application_rows
-        if _contains_token(row.get("Groups"), ["Everyone"])
-    ]
-    password_based_apps = [
-        str(row.get("Name") or "Unnamed App")
-        for row in application_rows
-        if str(row.get("Type") or "").upper() in {"AUTO_LOGIN", "BROWSER_PLUGIN", "SECURE_PASSWORD_STORE"}
-    ]
-    validations.extend([
-        _identity_validation(
-            "Applications Assigned to Everyone",
-            "Moderate",
-            everyone_assigned_apps,
-            lambda items: f"{len(items)} application(s) are assigned to the Everyone group.",
-            "No applications were found assigned to Everyone.",
-            "No application data was available for assignment validation.",
-            data_available=bool(application_rows),
-        ),
-        _identity_validation(
-            "Password-Based Application Sign-On Modes Present",
-            "Low",
-            password_based_apps,
-            lambda items: f"{len(items)} application(s) use password-based or SWA-style sign-on modes.",
-            "No password-based or SWA-style application sign-on modes were detected.",
-            "No application data was available for sign-on-mode validation.",
-            data_available=bool(application_rows),
-        ),
-    ])
-
-    # Identity providers and discovery
-    idp_rows = _section_rows(section_by_id, "identity-providers")
-    inactive_idps = [
-        str(row.get("Name") or "Unnamed IdP")
-        for row in idp_rows
-        if _looks_like_inactive(row.get("Status"))
-    ]
-    idp_discovery_rows = _section_rows(section_by_id, "idp-discovery-policies", entry_type="Rule")
-    inactive_idp_discovery_rules = [
-        f"{row.get('Policy Name')}: {row.get('Rule Name')}"
-        for row in idp_discovery_rows
-        if _looks_like_inactive(row.get("Status"))
-    ]
-    validations.extend([
-        _identity_validation(
-            "Inactive Identity Providers",
-            "Low",
-            inactive_idps,
-            lambda items: f"{len(items)} identity provider(s) are not active.",
-            "All identity providers are active.",
-            "No identity provider data was available for validation.",
-            data_available=True,
-        ),
-        _identity_validation(
-            "Inactive IdP Discovery Rules",
-            "Low",
-            inactive_idp_discovery_rules,
-            lambda items: f"{len(items)} IdP discovery rule(s) are not active.",
-            "All IdP discovery rules are active.",
-            "No IdP discovery policy rule data was available for validation.",
-            data_available=True,
-        ),
-    ])
-
-    # Authorization server checks
-    authz_server_rows = _section_rows(section_by_id, "authz-servers")
-    authz_access_rule_rows = _section_rows(section_by_id, "authz-access-policies", entry_type="Rule")
-    manual_rotation_servers = [
-        str(row.get("Name") or "Unnamed Authorization Server")
-        for row in authz_server_rows
-        if str(row.get("Credentials Rotation Mode") or "").strip().upper() not in {"AUTO", "AUTOMATIC"}
-    ]
-    authz_any_client_rules = [
-        f"{row.get('Authorization Server')} / {row.get('Policy Name')} / {row.get('Rule Name')}"
-        for row in authz_access_rule_rows
-        if _contains_token(row.get("Conditions"), ["Any client", "Any"])
-    ]
-    validations.extend([
-        _identity_validation(
-            "Authorization Servers Without Automatic Key Rotation",
-            "Moderate",
-            manual_rotation_servers,
-            lambda items: f"{len(items)} authorization server(s) do not report automatic credential rotation.",
-            "All authorization servers report automatic credential rotation.",
-            "No authorization server settings were available for rotation validation.",
-            data_available=bool(authz_server_rows),
-        ),
-        _identity_validation(
-            "Authorization Server Access Rules With Broad Client Scope",
-            "Moderate",
-            authz_any_client_rules,
-            lambda items: f"{len(items)} authorization server access rule(s) appear to apply to any client.",
-            "No authorization server access rules were found with broad any-client scope.",
-            "No authorization server access policy rule data was available for validation.",
-            data_available=bool(authz_access_rule_rows),
-        ),
-    ])
-
-    # Admin governance
-    custom_role_rows = _section_rows(section_by_id, "custom-admin-roles")
-    custom_roles_missing_description = [
-        str(row.get("Label") or "Unnamed Role")
-        for row in custom_role_rows
-        if _blankish(row.get("Description"))
-    ]
-    resource_set_rows = _section_rows(section_by_id, "resource-sets")
-    resource_sets = {}
-    for row in resource_set_rows:
-        entry_type = str(row.get("Entry Type") or "")
-        label = row.get("Label") or row.get("Resource Set")
-        if not label:
-            continue
-        bucket = resource_sets.setdefault(str(label), {"resource": 0, "binding": 0})
-        if entry_type == "Resource":
-            bucket["resource"] += 1
-        elif entry_type == "Binding":
-            bucket["binding"] += 1
-    resource_sets_without_resources = [name for name, counts in sorted(resource_sets.items()) if counts["resource"] == 0]
-    resource_sets_without_bindings = [name for name, counts in sorted(resource_sets.items()) if counts["binding"] == 0]
-    admin_app_rows = _section_rows(section_by_id, "admin-assignments-apps")
-    validations.extend([
-        _identity_validation(
-            "Custom Admin Roles Missing Description",
-            "Low",
-            custom_roles_missing_description,
-            lambda items: f"{len(items)} custom admin role(s) do not have a description.",
-            "All custom admin roles have descriptions.",
-            "No custom admin role data was available for validation.",
-            data_available=bool(custom_role_rows),
-        ),
-        _identity_validation(
-            "Resource Sets Without Resources",
-            "Moderate",
-            resource_sets_without_resources,
-            lambda items: f"{len(items)} resource set(s) do not contain any resources.",
-            "All resource sets contain at least one resource.",
-            "No resource set data was available for validation.",
-            data_available=bool(resource_set_rows),
-        ),
-        _identity_validation(
-            "Resource Sets Without Bindings",
-            "Moderate",
-            resource_sets_without_bindings,
-            lambda items: f"{len(items)} resource set(s) do not contain any bindings.",
-            "All resource sets contain at least one binding.",
-            "No resource set data was available for validation.",
-            data_available=bool(resource_set_rows),
-        ),
-        _identity_validation(
-            "Admin Public Client Applications Present",
-            "Moderate",
-            [str(row.get("Display Name") or row.get("App Name") or "Unnamed Admin App") for row in admin_app_rows],
-            lambda items: f"{len(items)} admin public client application(s) are configured and should be reviewed.",
-            "No admin public client applications were detected.",
-            "No admin app assignment data was available for validation.",
-            data_available=bool(admin_app_rows) or bool(_section_rows(section_by_id, "admin-assignments-apps")),
-        ),
-    ])
-
-    api_token_rows = _section_rows(section_by_id, "api-tokens")
-    tokens_without_network_restrictions = []
-    for row in api_token_rows:
-        network = row.get("Network")
-        if isinstance(network, dict):
-            connection = str(network.get("connection") or "").strip().upper()
-            include = network.get("include") or []
-            exclude = network.get("exclude") or []
-            if connection in {"", "ANYWHERE", "ANY_NETWORK"} and not include and not exclude:
-                tokens_without_network_restrictions.append(str(row.get("Name") or row.get("Token ID") or "Unnamed Token"))
-        elif _blankish(network):
-            tokens_without_network_restrictions.append(str(row.get("Name") or row.get("Token ID") or "Unnamed Token"))
-    validations.append(_identity_validation(
-        "API Tokens Without Network Restrictions",
-        "High",
-        tokens_without_network_restrictions,
-        lambda items: f"{len(items)} API token(s) do not show network restrictions.",
-        "All extracted API tokens show some form of network restriction.",
-        "No API token data was available for network restriction validation.",
-        data_available=bool(api_token_rows),
-    ))
-
-    # Brand and UX
-    brand_setting_rows = _section_rows(section_by_id, "brand-settings")
-    brands_missing_privacy = [
-        str(row.get("Brand Name") or "Unnamed Brand")
-        for row in brand_setting_rows
-        if _blankish(row.get("Custom Privacy Policy URL"))
-    ]
-    validations.extend([
-        _identity_validation(
-            "Brands Missing Custom Privacy Policy URL",
-            "Low",
-            brands_missing_privacy,
-            lambda items: f"{len(items)} brand(s) do not define a custom privacy policy URL.",
-            "All brands define a custom privacy policy URL.",
-            "No brand settings were available for validation.",
-            data_available=bool(brand_setting_rows),
-        ),
-    ])
-
-    # Trusted origins and hooks
-    trusted_origin_rows = _section_rows(section_by_id, "trusted-origins")
-    insecure_origins = [
-        str(row.get("Origin") or row.get("Name") or "Unnamed Origin")
-        for row in trusted_origin_rows
-        if str(row.get("Origin") or "").strip().lower().startswith("http://")
-    ]
-    event_hook_rows = _section_rows(section_by_id, "event-hooks")
-    unverified_event_hooks = [
-        str(row.get("Name") or "Unnamed Event Hook")
-        for row in event_hook_rows
-        if str(row.get("Verification Status") or "").strip().upper() != "VERIFIED"
-    ]
-    weak_event_hook_auth = [
-        str(row.get("Name") or "Unnamed Event Hook")
-        for row in event_hook_rows
-        if _blankish(row.get("Auth Scheme"))
-    ]
-    inactive_event_hooks = [
-        str(row.get("Name") or "Unnamed Event Hook")
-        for row in event_hook_rows
-        if _looks_like_inactive(row.get("Status"))
-    ]
-    inline_hook_rows = _section_rows(section_by_id, "inline-hooks")
-    inactive_inline_hooks = [
-        str(row.get("Name") or "Unnamed Inline Hook")
-        for row in inline_hook_rows
-        if _looks_like_inactive(row.get("Status"))
-    ]
-    weak_inline_hook_auth = [
-        str(row.get("Name") or "Unnamed Inline Hook")
-        for row in inline_hook_rows
-        if _blankish(row.get("Auth Scheme"))
-    ]
-    validations.extend([
-        _identity_validation(
-            "Insecure Trusted Origins",
-            "High",
-            insecure_origins,
-            lambda items: f"{len(items)} trusted origin(s) use HTTP instead of HTTPS.",
-            "No HTTP trusted origins were detected.",
-            "No trusted origin data was available for protocol validation.",
-            data_available=bool(trusted_origin_rows),
-        ),
-        _identity_validation(
-            "Unverified Event Hooks",
-            "High",
-            unverified_event_hooks,
-            lambda items: f"{len(items)} event hook(s) are not verified.",
-            "All event hooks are verified, or no event hooks are configured.",
-            "No event hook data was available for verification-status validation.",
-            data_available=True,
-        ),
-        _identity_validation(
-            "Event Hooks Without Authentication Scheme",
-            "High",
-            weak_event_hook_auth,
-            lambda items: f"{len(items)} event hook(s) do not report an authentication scheme.",
-            "All event hooks report an authentication scheme, or no event hooks are configured.",
-            "No event hook data was available for auth-scheme validation.",
-            data_available=True,
-        ),
-        _identity_validation(
-            "Inactive Event Hooks",
-            "Low",
-            inactive_event_hooks,
-            lambda items: f"{len(items)} event hook(s) are not active.",
-            "All event hooks are active, or no event hooks are configured.",
-            "No event hook data was available for status validation.",
-            data_available=True,
-        ),
-        _identity_validation(
-            "Inline Hooks Without Authentication Scheme",
-            "High",
-            weak_inline_hook_auth,
-            lambda items: f"{len(items)} inline hook(s) do not report an authentication scheme.",
-            "All inline hooks report an authentication scheme.",
-            "No inline hook data was available for auth-scheme validation.",
-            data_available=bool(inline_hook_rows),
-        ),
-        _identity_validation(
-            "Inactive Inline Hooks",
-            "Low",
-            inactive_inline_hooks,
-            lambda items: f"{len(items)} inline hook(s) are not active.",
-            "All inline hooks are active, or no inline hooks are configured.",
-            "No inline hook data was available for status validation.",
-            data_available=True,
-        ),
-    ])
-
-    # Attack protection
-    attack_rows = _section_rows(section_by_id, "attack-protection")
-    weak_attack_protection_rows = [
-        f"{row.get('Component')} / {row.get('Field')}: {row.get('Value')}"
-        for row in attack_rows
-        if _contains_token(row.get("Field"), ["enabled", "mode", "status", "action"])
-        and _contains_token(row.get("Value"), ["disabled", "false", "none", "log"])
-    ]
-    validations.append(_identity_validation(
-        "Attack Protection Controls Not Enforcing",
-        "High",
-        weak_attack_protection_rows,
-        lambda items: f"{len(items)} attack-protection setting(s) appear disabled or monitor-only.",
-        "No extracted attack-protection settings appeared disabled or monitor-only.",
-        "No attack-protection data was available for validation.",
-        data_available=bool(attack_rows),
-    ))
-
-    # Realms
-    realm_rows = _section_rows(section_by_id, "realms")
-    inactive_realms = [
-        str(row.get("Name") or "Unnamed Realm")
-        for row in realm_rows
-        if _looks_like_inactive(row.get("Status"))
-    ]
-    realm_assignment_rows = _section_rows(section_by_id, "realm-assignments")
-    default_realm_assignments = [
-        str(row.get("Name") or "Unnamed Assignment")
-        for row in realm_assignment_rows
-        if str(row.get("Is Default") or "").strip().lower() == "true"
-    ]
-    validations.extend([
-        _identity_validation(
-            "Inactive Realms",
-            "Low",
-            inactive_realms,
-            lambda items: f"{len(items)} realm(s) are not active.",
-            "All realms are active.",
-            "No realm data was available for validation.",
-            data_available=True,
-        ),
-        _identity_validation(
-            "Realm Default Assignment Coverage",
-            "High",
-            [] if len(default_realm_assignments) == 1 else [f"Default assignments found: {len(default_realm_assignments)}"],
-            lambda items: "Realm assignments should contain exactly one default assignment.",
-            "Realm assignments contain exactly one default assignment.",
-            "No realm assignment data was available for default-assignment validation.",
-            data_available=bool(realm_assignment_rows),
-        ),
-    ])
-
-    # Profile schema and mappings
-    schema_rows = _section_rows(section_by_id, "profile-schema-user")
-    sensitive_writable_attrs = [
-        f"{row.get('Attribute')}: {row.get('Mutability')}"
-        for row in schema_rows
-        if _contains_token(row.get("Attribute"), ["password", "secret", "token", "ssn", "salary"])
-        and _contains_token(row.get("Mutability"), ["read_write", "write"])
-    ]
-    profile_mapping_rows = _section_rows(section_by_id, "profile-mappings")
-    empty_profile_mappings = [
-        f"{row.get('Source Name')} -> {row.get('Target Name')}"
-        for row in profile_mapping_rows
-        if _blankish(row.get("Properties")) or _text(row.get("Properties")) == "{}"
-    ]
-    validations.extend([
-        _identity_validation(
-            "Sensitive Writable Profile Attributes",
-            "High",
-            sensitive_writable_attrs,
-            lambda items: f"{len(items)} sensitive profile attribute(s) appear writable.",
-            "No sensitive writable profile attributes were detected by name heuristic.",
-            "No user profile schema data was available for validation.",
-            data_available=bool(schema_rows),
-        ),
-        _identity_validation(
-            "Empty Profile Mappings",
-            "Moderate",
-            empty_profile_mappings,
-            lambda items: f"{len(items)} profile mapping(s) do not contain extracted property mappings.",
-            "All extracted profile mappings contain property mappings.",
-            "No profile mapping data was available for validation.",
-            data_available=bool(profile_mapping_rows),
-        ),
-    ])
-
-    # Group push mappings
-    group_push_rows = _section_rows(section_by_id, "group-push-mappings")
-    inactive_group_push = [
-        f"{row.get('App Name')}: {row.get('Source Group')} -> {row.get('Target Group')}"
-        for row in group_push_rows
-        if _looks_like_inactive(row.get("Status"))
-    ]
-    stale_group_push = [
-        f"{row.get('App Name')}: {row.get('Source Group')} -> {row.get('Target Group')}"
-        for row in group_push_rows
-        if (_days_since(row.get("Last Updated")) or 0) >= 90
-    ]
-    validations.extend([
-        _identity_validation(
-            "Inactive Group Push Mappings",
-            "Low",
-            inactive_group_push,
-            lambda items: f"{len(items)} group push mapping(s) are not active.",
-            "All group push mappings are active, or no group push mappings are configured.",
-            "No group push mapping data was available for validation.",
-            data_available=True,
-        ),
-        _identity_validation(
-            "Stale Group Push Mappings",
-            "Low",
-            stale_group_push,
-            lambda items: f"{len(items)} group push mapping(s) have not been updated in at least 90 days.",
-            "No stale group push mappings were detected using the 90-day age heuristic.",
-            "No group push mapping data was available for age validation.",
-            data_available=bool(group_push_rows),
-        ),
-    ])
-
-    # Risk-aware policies
-    entity_risk_rule_rows = _section_rows(section_by_id, "entity-risk-policies", entry_type="Rule")
-    post_auth_rule_rows = _section_rows(section_by_id, "post-auth-session-policies", entry_type="Rule")
-    active_entity_risk_rules = [
-        row for row in entity_risk_rule_rows
-        if not _looks_like_inactive(row.get("Status"))
-    ]
-    active_post_auth_rules = [
-        row for row in post_auth_rule_rows
-        if not _looks_like_inactive(row.get("Status"))
-    ]
-    validations.extend([
-        _identity_validation(
-            "Entity Risk Policy Rule Coverage",
-            "High",
-            [] if active_entity_risk_rules else ["No active entity risk policy rules detected"],
-            lambda items: items[0],
-            "Active entity risk policy rules were detected.",
-            "No entity risk policy data was available for validation.",
-            data_available=bool(_section_rows(section_by_id, "entity-risk-policies")),
-        ),
-        _identity_validation(
-            "Identity Threat Protection Policy Rule Coverage",
-            "High",
-            [] if active_post_auth_rules else ["No active identity threat protection policy rules detected"],
-            lambda items: items[0],
-            "Active identity threat protection policy rules were detected.",
-            "No identity threat protection policy data was available for validation.",
-            data_available=bool(_section_rows(section_by_id, "post-auth-session-policies")),
-        ),
-    ])
-
-    # HealthInsight-specific policy heuristics
-    auth_policy_rule_rows = _section_rows(section_by_id, "authentication-policies", entry_type="Rule")
-    session_policy_rule_rows = _section_rows(section_by_id, "global-session-policies", entry_type="Rule")
-    risk_based_mfa_gaps = []
-    new_device_mfa_gaps = []
-    for row in auth_policy_rule_rows + session_policy_rule_rows:
-        conditions = {
-            "people": row.get("Conditions People"),
-            "network": row.get("Conditions Network"),
-            "authContext": row.get("Conditions AuthContext"),
-            "risk": row.get("Conditions Risk"),
-            "riskScore": row.get("Conditions RiskScore"),
-            "identityProvider": row.get("Conditions IdentityProvider"),
-        }
-        actions = _as_dict(row.get("Actions"))
-        if _conditions_reference_high_risk(conditions) and not (
-            _actions_reference_mfa(actions) and _actions_reference_every_sign_in(actions)
-        ):
-            risk_based_mfa_gaps.append(f"{row.get('Policy Name')} / {row.get('Rule Name')}")
-        if _conditions_reference_new_device(conditions) and not (
-            _actions_reference_mfa(actions) and _actions_reference_every_sign_in(actions)
-        ):
-            new_device_mfa_gaps.append(f"{row.get('Policy Name')} / {row.get('Rule Name')}")
-
-    admin_console_apps = [
-        row for row in application_rows
-        if str(row.get("Name") or "").strip().lower() == "okta admin console"
-    ]
-    admin_console_mfa_gap = []
-    if admin_console_apps:
-        for app_row in admin_console_apps:
-            policy_name = str(app_row.get("Access Policy Name") or "").strip()
-            if not policy_name:
-                admin_console_mfa_gap.append(
-                    f"{app_row.get('Name')}: no app sign-on policy is assigned"
-                )
-                continue
-            matching_rules = [
-                row for row in auth_policy_rule_rows
-                if str(row.get("Policy Name") or "").strip() == policy_name
-            ]
-            if not matching_rules:
-                admin_console_mfa_gap.append(
-                    f"{app_row.get('Name')}: no app sign-on policy rules found for assigned policy '{policy_name}'"
-                )
-                continue
-            if not any(
-                _actions_reference_mfa(_as_dict(rule.get("Actions")))
-                and _actions_reference_every_sign_in(_as_dict(rule.get("Actions")))
-                for rule in matching_rules
-                if not _looks_like_inactive(rule.get("Status"))
-            ):
-                admin_console_mfa_gap.append(
-                    f"{app_row.get('Name')}: assigned policy '{policy_name}' has no active rule requiring MFA at every sign-in"
-                )
-    else:
-        admin_console_mfa_gap.append("Okta Admin Console application was not found in the extracted active applications")
-
-    validations.extend([
-        _identity_validation(
-            "High-Risk Request MFA Every Sign-In",
-            "High",
-            risk_based_mfa_gaps,
-            lambda items: f"{len(items)} policy rule(s) reference risk conditions without clear MFA-at-every-sign-in actions.",
-            "All extracted high-risk policy rules appear to require MFA at every sign-in.",
-            "No policy rule data was available to evaluate high-risk request MFA posture.",
-            data_available=bool(auth_policy_rule_rows or session_policy_rule_rows),
-        ),
-        _identity_validation(
-            "New Device MFA Every Sign-In",
-            "Moderate",
-            new_device_mfa_gaps,
-            lambda items: f"{len(items)} policy rule(s) reference device/new-device conditions without clear MFA-at-every-sign-in actions.",
-            "All extracted device/new-device policy rules appear to require MFA at every sign-in.",
-            "No policy rule data was available to evaluate new-device MFA posture.",
-            data_available=bool(auth_policy_rule_rows or session_policy_rule_rows),
-        ),
-        _identity_validation(
-            "Admin Console MFA Every Sign-In",
-            "High",
-            admin_console_mfa_gap,
-            lambda items: f"{len(items)} admin-console application policy path(s) do not show clear MFA-at-every-sign-in enforcement.",
-            "Admin Console application policies appear to require MFA at every sign-in.",
-            "Admin Console application or authentication policy data was not available for validation.",
-            data_available=bool(application_rows and auth_policy_rule_rows),
-        ),
-    ])
-
-    # Identity-risk detections aligned to Okta ISPM where data is available from native Okta APIs
-    users = extra_context.get("all_users") or []
-    api_tokens = extra_context.get("api_tokens") or []
-    custom_admin_roles = extra_context.get("custom_admin_roles") or []
-    resource_set_bindings = extra_context.get("resource_set_bindings") or []
-    user_inventory_available = "all_users" in extra_context
-    token_inventory_available = "api_tokens" in extra_context
-    admin_role_inventory_available = (
-        "custom_admin_roles" in extra_context and "resource_set_bindings" in extra_context
-    )
-    token_map = _token_inventory(api_tokens)
-    mfa_enforcement = _tenant_mfa_enforcement_gaps(section_by_id)
-
-    no_mfa_accounts = []
-    no_mfa_admin_accounts = []
-    no_mfa_global_admin_accounts = []
-    pending_mfa_accounts = []
-    pending_mfa_admin_accounts = []
-    pending_mfa_global_admin_accounts = []
-    no_mfa_enforced_admin_accounts = []
-    no_mfa_enforced_global_admin_accounts = []
-    old_password_accounts = []
-    old_password_service_accounts = []
-    old_password_admin_accounts = []
-    old_password_admin_service_accounts = []
-    old_password_global_admin_accounts = []
-    old_password_global_admin_service_accounts = []
-    unused_accounts = []
-    unused_service_accounts = []
-    unused_admin_accounts = []
-    unused_admin_service_accounts = []
-    unused_global_admin_accounts = []
-    unused_global_admin_service_accounts = []
-    sso_bypass_accounts = []
-    sso_bypass_admin_accounts = []
-    sso_bypass_no_mfa_accounts = []
-    sso_bypass_no_mfa_admin_accounts = []
-    old_no_mfa_unused_accounts = []
-    old_no_mfa_unused_admin_accounts = []
-    old_no_mfa_unused_service_accounts = []
-    old_no_mfa_unused_admin_service_accounts = []
-    partially_offboarded_users = []
-    super_admin_with_api_token = []
-    service_account_console_access_accounts = []
-    service_account_console_access_admin_accounts = []
-    unrotated_tokens_account = []
-    unrotated_tokens_admin = []
-    unused_tokens_account = []
-    unused_tokens_admin = []
-    unrotated_unused_tokens_account = []
-    unrotated_unused_tokens_admin = []
-    super_admins = []
-
-    for user in users:
-        user_id = user.get("id")
-        label = _user_identifier(user)
-        role_types = _user_role_types(user)
-        is_admin = bool(role_types)
-        is_super_admin = "SUPER_ADMIN" in role_types
-        active_tokens = token_map.get(user_id, [])
-        token_count = len(active_tokens)
-        is_service_account = _is_service_account(user, active_token_count=token_count)
-        has_mfa = _has_mfa(user)
-        pending_mfa = _has_pending_mfa(user)
-        direct_access = _is_direct_access_user(user)
-        old_password = _has_old_password(user, threshold_days=90)
-        unused_user = _is_unused_user(user, threshold_days=91)
-        no_mfa = not has_mfa
-        status = str(user.get("status") or "").strip().upper()
-        org_mfa_gap = mfa_enforcement["has_data"] and (
-            mfa_enforcement["optional_enrollment"] or not mfa_enforcement["auth_requires_mfa"]
-        )
-
-        if is_super_admin:
-            super_admins.append(label)
-
-        if no_mfa:
-            no_mfa_accounts.append(label)
-            if is_admin:
-                no_mfa_admin_accounts.append(label)
-            if is_super_admin:
-                no_mfa_global_admin_accounts.append(label)
-
-        if pending_mfa:
-            pending_mfa_accounts.append(f"{label}: pending factors {', '.join(sorted(_pending_factor_types(user)))}")
-            if is_admin:
-                pending_mfa_admin_accounts.append(f"{label}: pending factors {', '.join(sorted(_pending_factor_types(user)))}")
-            if is_super_admin:
-                pending_mfa_global_admin_accounts.append(f"{label}: pending factors {', '.join(sorted(_pending_factor_types(user)))}")
-
-        if old_password:
-            old_password_accounts.append(f"{label}: password age {_days_since(user.get('passwordChanged'))}d")
-            if is_service_account:
-                old_password_service_accounts.append(f"{label}: password age {_days_since(user.get('passwordChanged'))}d")
-            if is_admin:
-                old_password_admin_accounts.append(f"{label}: password age {_days_since(user.get('passwordChanged'))}d")
-            if is_admin and is_service_account:
-                old_password_admin_service_accounts.append(f"{label}: password age {_days_since(user.get('passwordChanged'))}d")
-            if is_super_admin:
-                old_password_global_admin_accounts.append(f"{label}: password age {_days_since(user.get('passwordChanged'))}d")
-            if is_super_admin and is_service_account:
-                old_password_global_admin_service_accounts.append(f"{label}: password age {_days_since(user.get('passwordChanged'))}d")
-
-        if unused_user:
-            days_text = _days_since(user.get("lastLogin"))
-            suffix = f"last login {days_text}d ago" if days_text is not None else "no recent interactive login"
-            unused_accounts.append(f"{label}: {suffix}")
-            if is_service_account:
-                unused_service_accounts.append(f"{label}: {suffix}")
-            if is_admin:
-                unused_admin_accounts.append(f"{label}: {suffix}")
-            if is_admin and is_service_account:
-                unused_admin_service_accounts.append(f"{label}: {suffix}")
-            if is_super_admin:
-                unused_global_admin_accounts.append(f"{label}: {suffix}")
-            if is_super_admin and is_service_account:
-                unused_global_admin_service_accounts.append(f"{label}: {suffix}")
-
-        if direct_access:
-            sso_bypass_accounts.append(f"{label}: provider {_user_provider_type(user) or 'unknown'}")
-            if is_admin:
-                sso_bypass_admin_accounts.append(f"{label}: provider {_user_provider_type(user) or 'unknown'}")
-
-        if direct_access and no_mfa:
-            sso_bypass_no_mfa_accounts.append(f"{label}: provider {_user_provider_type(user) or 'unknown'}")
-            if is_admin:
-                sso_bypass_no_mfa_admin_accounts.append(f"{label}: provider {_user_provider_type(user) or 'unknown'}")
-
-        if old_password and no_mfa and unused_user:
-            old_no_mfa_unused_accounts.append(label)
-            if is_admin:
-                old_no_mfa_unused_admin_accounts.append(label)
-            if is_service_account:
-                old_no_mfa_unused_service_accounts.append(label)
-            if is_admin and is_service_account:
-                old_no_mfa_unused_admin_service_accounts.append(label)
-
-        if org_mfa_gap and is_admin:
-            no_mfa_enforced_admin_accounts.append(label)
-        if org_mfa_gap and is_super_admin:
-            no_mfa_enforced_global_admin_accounts.append(label)
-
-        if status in {"SUSPENDED", "DEPROVISIONED"} and (is_admin or active_tokens or direct_access):
-            indicators = []
-            if is_admin:
-                indicators.append("admin role assignment")
-            if active_tokens:
-                indicators.append(f"{len(active_tokens)} active API token(s)")
-            if direct_access:
-                indicators.append(f"provider {_user_provider_type(user) or 'unknown'}")
-            partially_offboarded_users.append(f"{label}: status {status}; remaining access via {', '.join(indicators)}")
-
-        if is_service_account and direct_access:
-            service_account_console_access_accounts.append(f"{label}: provider {_user_provider_type(user) or 'unknown'}")
-            if is_admin:
-                service_account_console_access_admin_accounts.append(f"{label}: provider {_user_provider_type(user) or 'unknown'}")
-
-        if is_super_admin and active_tokens:
-            for token in active_tokens:
-                age_days = _token_rotation_age_days(token)
-                suffix = f"age {age_days}d" if age_days is not None else "active token"
-                super_admin_with_api_token.append(_format_token_item(user, token, suffix))
-
-        unrotated_tokens, unused_tokens = _token_findings_for_user(active_tokens, owner_unused=unused_user, rotation_days=90)
-        for token, age_days in unrotated_tokens:
-            item = _format_token_item(user, token, f"rotation age {age_days}d")
-            if is_admin:
-                unrotated_tokens_admin.append(item)
-            else:
-                unrotated_tokens_account.append(item)
-        for token in unused_tokens:
-            item = _format_token_item(user, token, "owner inactive >=91d")
-            if is_admin:
-                unused_tokens_admin.append(item)
-            else:
-                unused_tokens_account.append(item)
-        for token, age_days in unrotated_tokens:
-            if token in unused_tokens:
-                item = _format_token_item(user, token, f"rotation age {age_days}d; owner inactive >=91d")
-                if is_admin:
-                    unrotated_unused_tokens_admin.append(item)
-                else:
-                    unrotated_unused_tokens_account.append(item)
-
-    role_usage = _custom_role_usage_map(custom_admin_roles, resource_set_bindings)
-    unused_custom_roles = [
-        str(
-            details["role"].get("label")
-            or details["role"].get("name")
-            or details["role"].get("id")
-            or "Unnamed Role"
-        )
-        for details in role_usage.values()
-        if not details.get("used")
-    ]
-
-    validations.extend([
-        _identity_validation(
-            "Old Password, No MFA, Unused Accounts",
-            "High",
-            old_no_mfa_unused_accounts,
-            lambda items: f"{len(items)} account(s) have passwords older than 90 days, no active MFA, and no recent interactive use for at least 91 days.",
-            "No accounts matched the old-password, no-MFA, unused-account combination heuristic.",
-            "User inventory was not available to assess old-password, no-MFA, unused-account combinations.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password, No MFA, Unused Admin Accounts",
-            "High",
-            old_no_mfa_unused_admin_accounts,
-            lambda items: f"{len(items)} admin account(s) have passwords older than 90 days, no active MFA, and no recent interactive use for at least 91 days.",
-            "No admin accounts matched the old-password, no-MFA, unused-account combination heuristic.",
-            "User inventory was not available to assess old-password, no-MFA, unused admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password, No MFA, Unused Service Accounts",
-            "High",
-            old_no_mfa_unused_service_accounts,
-            lambda items: f"{len(items)} potential service account(s) have old passwords, no active MFA, and no recent interactive use.",
-            "No potential service accounts matched the old-password, no-MFA, unused heuristic.",
-            "User inventory was not available to assess old-password, no-MFA, unused service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password, No MFA, Unused Admin Service Accounts",
-            "High",
-            old_no_mfa_unused_admin_service_accounts,
-            lambda items: f"{len(items)} potential admin service account(s) have old passwords, no active MFA, and no recent interactive use.",
-            "No potential admin service accounts matched the old-password, no-MFA, unused heuristic.",
-            "User inventory was not available to assess old-password, no-MFA, unused admin service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "SSO Bypass + No MFA - Admin",
-            "High",
-            sso_bypass_no_mfa_admin_accounts,
-            lambda items: f"{len(items)} admin account(s) appear to have direct access that can bypass federated SSO and have no active MFA.",
-            "No admin accounts matched the direct-access plus no-active-MFA heuristic.",
-            "User inventory was not available to assess SSO bypass plus no MFA for admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "No MFA - Global Admin Account",
-            "High",
-            no_mfa_global_admin_accounts,
-            lambda items: f"{len(items)} super admin account(s) do not have an active enrolled factor.",
-            "All detected super admin accounts have at least one active enrolled factor.",
-            "User inventory was not available to assess MFA enrollment for super admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Pending MFA - Global Admin Account",
-            "High",
-            pending_mfa_global_admin_accounts,
-            lambda items: f"{len(items)} super admin account(s) appear to have pending factor enrollment without an active enrolled factor.",
-            "No super admin accounts were found with only pending factor enrollment.",
-            "User inventory was not available to assess pending MFA for super admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password - Global Admin Account",
-            "High",
-            old_password_global_admin_accounts,
-            lambda items: f"{len(items)} super admin account(s) have passwords older than 90 days.",
-            "No super admin accounts were found with passwords older than 90 days.",
-            "User inventory was not available to assess password age for super admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password - Global Admin Service Account",
-            "High",
-            old_password_global_admin_service_accounts,
-            lambda items: f"{len(items)} potential super admin service account(s) have passwords older than 90 days.",
-            "No potential super admin service accounts were found with passwords older than 90 days.",
-            "User inventory was not available to assess password age for super admin service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Global Admin Account",
-            "High",
-            unused_global_admin_accounts,
-            lambda items: f"{len(items)} super admin account(s) have not logged in interactively for at least 91 days.",
-            "No unused super admin accounts were detected using the 91-day inactivity heuristic.",
-            "User inventory was not available to assess unused super admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Global Admin Service Account",
-            "High",
-            unused_global_admin_service_accounts,
-            lambda items: f"{len(items)} potential super admin service account(s) have not logged in interactively for at least 91 days.",
-            "No unused potential super admin service accounts were detected using the 91-day inactivity heuristic.",
-            "User inventory was not available to assess unused super admin service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Partially Off-boarded User",
-            "High",
-            partially_offboarded_users,
-            lambda items: f"{len(items)} suspended or deprovisioned user(s) still appear to retain direct access, admin roles, or active API tokens.",
-            "No partially off-boarded users were detected with remaining privileged or direct access indicators.",
-            "User inventory was not available to assess partially off-boarded users.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "No MFA - Admin Account",
-            "High",
-            no_mfa_admin_accounts,
-            lambda items: f"{len(items)} admin account(s) do not have an active enrolled factor.",
-            "All detected admin accounts have at least one active enrolled factor.",
-            "User inventory was not available to assess MFA enrollment for admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Pending MFA - Admin Account",
-            "High",
-            pending_mfa_admin_accounts,
-            lambda items: f"{len(items)} admin account(s) appear to have pending factor enrollment without an active enrolled factor.",
-            "No admin accounts were found with only pending factor enrollment.",
-            "User inventory was not available to assess pending MFA for admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "No MFA Enforced - Global Admin Account",
-            "High",
-            no_mfa_enforced_global_admin_accounts if mfa_enforcement["has_data"] else [],
-            lambda items: f"{len(items)} super admin account(s) may not be covered by enforced MFA requirements based on tenant-wide enrollment/authentication policy heuristics.",
-            "Tenant-wide policy heuristics suggest MFA enforcement is present for super admin accounts.",
-            "Policy data was insufficient to infer tenant-wide MFA enforcement posture for super admin accounts.",
-            data_available=mfa_enforcement["has_data"],
-        ),
-        _identity_validation(
-            "Excessive Number of Super Admins",
-            "High",
-            super_admins if len(super_admins) > 3 else [],
-            lambda items: f"{len(items)} super admin accounts were detected. The heuristic threshold is more than 3.",
-            f"{len(super_admins)} super admin account(s) were detected, which is within the heuristic threshold of 3.",
-            "User inventory was not available to assess the number of super admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "SSO Bypass - Admin",
-            "High",
-            sso_bypass_admin_accounts,
-            lambda items: f"{len(items)} admin account(s) appear to support direct access outside federated SSO based on their credential provider.",
-            "No admin accounts matched the direct-access credential provider heuristic.",
-            "User inventory was not available to assess SSO bypass for admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "SSO Bypass + No MFA - Account",
-            "High",
-            sso_bypass_no_mfa_accounts,
-            lambda items: f"{len(items)} account(s) appear to support direct access outside federated SSO and have no active MFA.",
-            "No accounts matched the direct-access plus no-active-MFA heuristic.",
-            "User inventory was not available to assess SSO bypass plus no MFA for accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password - Admin Account",
-            "High",
-            old_password_admin_accounts,
-            lambda items: f"{len(items)} admin account(s) have passwords older than 90 days.",
-            "No admin accounts were found with passwords older than 90 days.",
-            "User inventory was not available to assess password age for admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password - Admin Service Account",
-            "High",
-            old_password_admin_service_accounts,
-            lambda items: f"{len(items)} potential admin service account(s) have passwords older than 90 days.",
-            "No potential admin service accounts were found with passwords older than 90 days.",
-            "User inventory was not available to assess password age for admin service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Super Admin with API Token",
-            "High",
-            super_admin_with_api_token,
-            lambda items: f"{len(items)} active API token(s) are owned by super admin accounts.",
-            "No active API tokens owned by super admin accounts were detected.",
-            "API token or user inventory was not available to assess super admin token ownership.",
-            data_available=user_inventory_available and token_inventory_available,
-        ),
-        _identity_validation(
-            "Unrotated and Unused Keys and Tokens - Admin",
-            "High",
-            unrotated_unused_tokens_admin,
-            lambda items: f"{len(items)} active API token(s) owned by admin accounts are older than 90 days and the owning account has been inactive for at least 91 days.",
-            "No admin-owned active API tokens matched the unrotated-and-owner-inactive heuristic.",
-            "API token or user inventory was not available to assess unrotated and unused admin tokens.",
-            data_available=user_inventory_available and token_inventory_available,
-        ),
-        _identity_validation(
-            "Unrotated Keys and Tokens - Admin",
-            "High",
-            unrotated_tokens_admin,
-            lambda items: f"{len(items)} active API token(s) owned by admin accounts are older than 90 days.",
-            "No admin-owned active API tokens older than 90 days were detected.",
-            "API token or user inventory was not available to assess token rotation age for admin accounts.",
-            data_available=user_inventory_available and token_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Admin Account",
-            "High",
-            unused_admin_accounts,
-            lambda items: f"{len(items)} admin account(s) have not logged in interactively for at least 91 days.",
-            "No unused admin accounts were detected using the 91-day inactivity heuristic.",
-            "User inventory was not available to assess unused admin accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Admin Service Account",
-            "High",
-            unused_admin_service_accounts,
-            lambda items: f"{len(items)} potential admin service account(s) have not logged in interactively for at least 91 days.",
-            "No unused potential admin service accounts were detected using the 91-day inactivity heuristic.",
-            "User inventory was not available to assess unused admin service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Keys and Tokens - Admins",
-            "High",
-            unused_tokens_admin,
-            lambda items: f"{len(items)} active API token(s) are owned by admin accounts that have been inactive for at least 91 days.",
-            "No admin-owned active API tokens matched the owner-inactive heuristic.",
-            "API token or user inventory was not available to assess unused admin tokens.",
-            data_available=user_inventory_available and token_inventory_available,
-        ),
-        _identity_validation(
-            "Service Account with Console Access - Admin",
-            "High",
-            service_account_console_access_admin_accounts,
-            lambda items: f"{len(items)} potential admin service account(s) appear to have direct console access based on their credential provider.",
-            "No potential admin service accounts matched the direct-console-access heuristic.",
-            "User inventory was not available to assess direct console access for admin service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Administrative Roles",
-            "High",
-            unused_custom_roles,
-            lambda items: f"{len(items)} custom admin role(s) were found without a matching resource-set binding.",
-            "All discovered custom admin roles were referenced by at least one resource-set binding.",
-            "Custom admin role inventory was not available to assess unused administrative roles.",
-            data_available=admin_role_inventory_available,
-        ),
-        _identity_validation(
-            "No MFA Enforced - Admin Account",
-            "Moderate",
-            no_mfa_enforced_admin_accounts if mfa_enforcement["has_data"] else [],
-            lambda items: f"{len(items)} admin account(s) may not be covered by enforced MFA requirements based on tenant-wide enrollment/authentication policy heuristics.",
-            "Tenant-wide policy heuristics suggest MFA enforcement is present for admin accounts.",
-            "Policy data was insufficient to infer tenant-wide MFA enforcement posture for admin accounts.",
-            data_available=mfa_enforcement["has_data"],
-        ),
-        _identity_validation(
-            "No MFA - Account",
-            "Moderate",
-            no_mfa_accounts,
-            lambda items: f"{len(items)} account(s) do not have an active enrolled factor.",
-            "All assessed accounts have at least one active enrolled factor.",
-            "User inventory was not available to assess MFA enrollment for accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Pending MFA",
-            "Moderate",
-            pending_mfa_accounts,
-            lambda items: f"{len(items)} account(s) appear to have pending factor enrollment without an active enrolled factor.",
-            "No accounts were found with only pending factor enrollment.",
-            "User inventory was not available to assess pending MFA for accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "SSO Bypass - Account",
-            "Moderate",
-            sso_bypass_accounts,
-            lambda items: f"{len(items)} account(s) appear to support direct access outside federated SSO based on their credential provider.",
-            "No accounts matched the direct-access credential provider heuristic.",
-            "User inventory was not available to assess SSO bypass for accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password - Account",
-            "Moderate",
-            old_password_accounts,
-            lambda items: f"{len(items)} account(s) have passwords older than 90 days.",
-            "No accounts were found with passwords older than 90 days.",
-            "User inventory was not available to assess password age for accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Old Password - Service Account",
-            "Moderate",
-            old_password_service_accounts,
-            lambda items: f"{len(items)} potential service account(s) have passwords older than 90 days.",
-            "No potential service accounts were found with passwords older than 90 days.",
-            "User inventory was not available to assess password age for potential service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unrotated and Unused Keys and Tokens - Account",
-            "Moderate",
-            unrotated_unused_tokens_account,
-            lambda items: f"{len(items)} active API token(s) owned by non-admin accounts are older than 90 days and the owning account has been inactive for at least 91 days.",
-            "No non-admin active API tokens matched the unrotated-and-owner-inactive heuristic.",
-            "API token or user inventory was not available to assess unrotated and unused tokens for accounts.",
-            data_available=user_inventory_available and token_inventory_available,
-        ),
-        _identity_validation(
-            "Unrotated Keys and Tokens - Account",
-            "Moderate",
-            unrotated_tokens_account,
-            lambda items: f"{len(items)} active API token(s) owned by non-admin accounts are older than 90 days.",
-            "No non-admin active API tokens older than 90 days were detected.",
-            "API token or user inventory was not available to assess token rotation age for accounts.",
-            data_available=user_inventory_available and token_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Account",
-            "Low",
-            unused_accounts,
-            lambda items: f"{len(items)} account(s) have not logged in interactively for at least 91 days.",
-            "No unused accounts were detected using the 91-day inactivity heuristic.",
-            "User inventory was not available to assess unused accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Service Account",
-            "Low",
-            unused_service_accounts,
-            lambda items: f"{len(items)} potential service account(s) have not logged in interactively for at least 91 days.",
-            "No unused potential service accounts were detected using the 91-day inactivity heuristic.",
-            "User inventory was not available to assess unused service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Service Account with Console Access - Account",
-            "Low",
-            service_account_console_access_accounts,
-            lambda items: f"{len(items)} potential service account(s) appear to have direct console access based on their credential provider.",
-            "No potential service accounts matched the direct-console-access heuristic.",
-            "User inventory was not available to assess direct console access for service accounts.",
-            data_available=user_inventory_available,
-        ),
-        _identity_validation(
-            "Unused Keys and Tokens - Account",
-            "Low",
-            unused_tokens_account,
-            lambda items: f"{len(items)} active API token(s) are owned by non-admin accounts that have been inactive for at least 91 days.",
-            "No non-admin active API tokens matched the owner-inactive heuristic.",
-            "API token or user inventory was not available to assess unused tokens for accounts.",
-            data_available=user_inventory_available and token_inventory_available,
-        ),
-    ])
-    validations.extend(_unsupported_ispm_validations())
-
-    return validations
-
-
-def _build_validation_summary(validations):
-    summary = {
-        "assessed": 0,
-        "high": 0,
-        "medium": 0,
-        "low": 0,
-        "high_passed": 0,
-        "medium_passed": 0,
-        "low_passed": 0,
-        "high_failed": 0,
-        "medium_failed": 0,
-        "low_failed": 0,
-        "passed": 0,
-        "pass_pct": 0,
-        "high_pass_pct": 0,
-        "medium_pass_pct": 0,
-        "low_pass_pct": 0,
-    }
-    for check in validations or []:
-        summary["assessed"] += 1
-
-        severity = str(check.get("severity") or "").strip().lower()
-        status = str(check.get("status") or "").strip().lower()
-        if severity == "high":
-            summary["high"] += 1
-            if status == "pass":
-                summary["high_passed"] += 1
-            if status == "fail":
-                summary["high_failed"] += 1
-        elif severity in {"moderate", "medium"}:
-            summary["medium"] += 1
-            if status == "pass":
-                summary["medium_passed"] += 1
-            if status == "fail":
-                summary["medium_failed"] += 1
-        elif severity == "low":
-            summary["low"] += 1
-            if status == "pass":
-                summary["low_passed"] += 1
-            if status == "fail":
-                summary["low_failed"] += 1
-
-        if status == "pass":
-            summary["passed"] += 1
-
-    if summary["assessed"]:
-        summary["pass_pct"] = round((summary["passed"] / summary["assessed"]) * 100)
-    if summary["high"]:
-        summary["high_pass_pct"] = round((summary["high_passed"] / summary["high"]) * 100)
-    if summary["medium"]:
-        summary["medium_pass_pct"] = round((summary["medium_passed"] / summary["medium"]) * 100)
-    if summary["low"]:
-        summary["low_pass_pct"] = round((summary["low_passed"] / summary["low"]) * 100)
-
-    return summary
-
-
-def _build_evaluate_summary(sections, domain, extra_context=None):
-    section_by_id = _section_map(sections)
-    total_sections = len(sections or [])
-    populated_sections = sum(1 for s in (sections or []) if s.get("rows"))
-    empty_sections = total_sections - populated_sections
-    total_rows = sum(len(s.get("rows") or []) for s in (sections or []))
-
-    readiness_groups = [
-        {
-            "name": "Core Access Controls",
-            "section_ids": [
-                "groups",
-                "group-rules",
-                "network-zones",
-                "authenticators",
-                "password-policies",
-                "global-session-policies",
-                "authentication-policies",
-                "mfa-enrollment-policies",
-            ],
-        },
-        {
-            "name": "Identity Federation",
-            "section_ids": [
-                "identity-providers",
-                "idp-discovery-policies",
-                "profile-mappings",
-            ],
-        },
-        {
-            "name": "Platform Security & Settings",
-            "section_ids": [
-                "org-settings",
-                "security-settings",
-                "trusted-origins",
-            ],
-        },
-        {
-            "name": "Admin Delegation",
-            "section_ids": [
-                "custom-admin-roles",
-                "resource-sets",
-                "admin-assignments-users",
-                "admin-assignments-groups",
-                "admin-assignments-apps",
-            ],
-        },
-        {
-            "name": "Branding & End-User Experience",
-            "section_ids": [
-                "brand-settings",
-                "brand-pages",
-                "brand-email-templates",
-            ],
-        },
-    ]
-
-    group_results = []
-    score_total = 0
-    score_max = 0
-    for group in readiness_groups:
-        items = []
-        present = 0
-        for section_id in group["section_ids"]:
-            section = section_by_id.get(section_id) or {}
-            row_count = len(section.get("rows") or [])
-            has_data = row_count > 0
-            present += int(has_data)
-            items.append(
-                {
-                    "id": section_id,
-                    "title": section.get("title") or section_id,
-                    "row_count": row_count,
-                    "status": "Present" if has_data else "Not Found / Empty",
-                }
-            )
-        total = len(group["section_ids"])
-        pct = round((present / total) * 100) if total else 0
-        score_total += present
-        score_max += total
-        if pct >= 85:
-            risk = "Low"
-        elif pct >= 60:
-            risk = "Medium"
-        else:
-            risk = "High"
-        group_results.append(
-            {
-                "name": group["name"],
-                "present": present,
-                "total": total,
-                "pct": pct,
-                "risk": risk,
-                "items": items,
-            }
-        )
-
-    overall_score = round((score_total / score_max) * 100) if score_max else 0
-    if overall_score >= 85:
-        readiness_band = "Ready"
-    elif overall_score >= 65:
-        readiness_band = "Needs Review"
-    else:
-        readiness_band = "High Attention"
-
-    recommendations = []
-    if empty_sections:
-        recommendations.append(
-            f"{empty_sections} snapshot sections returned no data. Verify API permissions and tenant feature availability."
-        )
-    if overall_score < 85:
-        recommendations.append(
-            "Run OktaCompare against the target environment before cutover to confirm policy, app, and IdP parity."
-        )
-    if not (section_by_id.get("custom-admin-roles") or {}).get("rows"):
-        recommendations.append(
-            "Review admin delegation model manually if custom admin roles/resource sets are not configured in this tenant."
-        )
-    if not (section_by_id.get("brand-pages") or {}).get("rows"):
-        recommendations.append(
-            "Validate end-user branding pages and email templates before go-live if branded experiences are in scope."
-        )
-    if not recommendations:
-        recommendations.append("Tenant configuration coverage looks healthy. Proceed with detailed migration validation.")
-
-    security_validations = _run_security_validations(sections or [], extra_context=extra_context)
-    validation_summary = _build_validation_summary(security_validations)
-
-    return {
-        "domain": domain,
-        "generated_at": datetime.now(ZoneInfo("Australia/Brisbane")).strftime("%Y-%m-%d %H:%M:%S %Z"),
-        "total_sections": total_sections,
-        "populated_sections": populated_sections,
-        "empty_sections": empty_sections,
-        "total_rows": total_rows,
-        "overall_score": overall_score,
-        "readiness_band": readiness_band,
-        "groups": group_results,
-        "check_prefix_legend": CHECK_PREFIX_LEGEND,
-        "security_validations": security_validations,
-        "validation_summary": validation_summary,
-        "recommendations": recommendations,
-    }
-
-
-def _build_migration_plan(form_data):
-    source_domain = form_data.get("source_domain", "").strip()
-    target_domain = form_data.get("target_domain", "").strip()
-    in_scope = {
-        "groups": form_data.get("scope_groups") == "on",
-        "apps": form_data.get("scope_apps") == "on",
-        "policies": form_data.get("scope_policies") == "on",
-        "idp": form_data.get("scope_idp") == "on",
-        "branding": form_data.get("scope_branding") == "on",
-        "admin": form_data.get("scope_admin") == "on",
-    }
-
-    scope_labels = []
-    if in_scope["groups"]:
-        scope_labels.append("Groups")
-    if in_scope["apps"]:
-        scope_labels.append("Applications")
-    if in_scope["policies"]:
-        scope_labels.append("Policies")
-    if in_scope["idp"]:
-        scope_labels.append("Identity Providers")
-    if in_scope["branding"]:
-        scope_labels.append("Branding")
-    if in_scope["admin"]:
-        scope_labels.append("Admin Delegation")
-
-    phases = [
-        {
-            "phase": "1. Discovery & Baseline",
-            "objective": "Capture current-state configuration and confirm migration scope.",
-            "tasks": [
-                f"Run OktaSnapshot for source tenant ({source_domain}) and export PDF/DOCX baseline.",
-                "Document in-scope apps, policies, integrations, and business owners.",
-                "Confirm cutover constraints, freeze windows, and rollback expectations.",
-            ],
-            "outputs": ["Source snapshot baseline", "Scope inventory", "Owner map"],
-        },
-        {
-            "phase": "2. Target Readiness",
-            "objective": "Prepare target tenant and validate prerequisite controls.",
-            "tasks": [
-                f"Run OktaSnapshot for target tenant ({target_domain}) to capture starting state.",
-                "Validate org/security settings, trusted origins, authenticator posture, and admin access.",
-                "Define target baseline and naming conventions for migrated objects.",
-            ],
-            "outputs": ["Target readiness checklist", "Target baseline snapshot"],
-        },
-        {
-            "phase": "3. Build / Migration Execution",
-            "objective": "Migrate in-scope configuration in controlled waves.",
-            "tasks": [
-                "Migrate by dependency order (foundational settings -> policies -> apps -> branding).",
-                "Track exceptions, unsupported settings, and manual remediation items.",
-                "Validate each wave with owners before proceeding.",
-            ],
-            "outputs": ["Wave tracker", "Issue log", "Validation sign-offs"],
-        },
-        {
-            "phase": "4. Compare & Validate",
-            "objective": "Confirm parity and identify residual drift before cutover.",
-            "tasks": [
-                f"Run OktaCompare between source ({source_domain}) and target ({target_domain}).",
-                "Review Critical/Medium findings and remediate before cutover approval.",
-                "Export CSV comparison report for approval and audit trail.",
-            ],
-            "outputs": ["Comparison report", "Remediation list", "Cutover readiness decision"],
-        },
-        {
-            "phase": "5. Cutover & Hypercare",
-            "objective": "Execute cutover safely and verify production behavior.",
-            "tasks": [
-                "Execute cutover checklist during approved maintenance window.",
-                "Run post-cutover OktaCompare/OktaSnapshot validation and confirm no unexpected drift.",
-                "Track incidents, user impact, and stabilization actions during hypercare.",
-            ],
-            "outputs": ["Cutover log", "Post-cutover validation", "Hypercare summary"],
-        },
-    ]
-
-    risks = [
-        {
-            "name": "Policy/Rule Drift",
-            "severity": "High" if in_scope["policies"] else "Medium",
-            "mitigation": "Use OktaCompare before cutover and remediate Critical/Medium findings.",
-        },
-        {
-            "name": "App Assignment / Integration Gaps",
-            "severity": "High" if in_scope["apps"] else "Low",
-            "mitigation": "Validate application owners, assignments, and test sign-on flows by wave.",
-        },
-        {
-            "name": "Federation / IdP Differences",
-            "severity": "High" if in_scope["idp"] else "Low",
-            "mitigation": "Validate IdP discovery policies, profile mappings, and routing rules in test flows.",
-        },
-        {
-            "name": "Branding / User Experience Regression",
-            "severity": "Medium" if in_scope["branding"] else "Low",
-            "mitigation": "Snapshot and validate brand pages, email templates, and sign-in UX before go-live.",
-        },
-        {
-            "name": "Admin Access / Operational Readiness",
-            "severity": "Medium" if in_scope["admin"] else "Low",
-            "mitigation": "Confirm admin assignments, roles, and break-glass access in target tenant.",
-        },
-    ]
-
-    workflow_name = "Extract Source -> Compare with Target -> Update Missing/Different"
-
-    assumptions = [
-        f"In scope: {', '.join(scope_labels) if scope_labels else 'No scopes selected (select at least one for a stronger plan).'}",
-    ]
-
-    return {
-        "generated_at": datetime.now(ZoneInfo("Australia/Brisbane")).strftime("%Y-%m-%d %H:%M:%S %Z"),
-        "source_domain": source_domain,
-        "target_domain": target_domain,
-        "workflow_name": workflow_name,
-        "in_scope": scope_labels,
-        "phases": phases,
-        "risks": risks,
-        "assumptions": assumptions,
-    }
-
-
-def _build_group_sync_summary(source_groups, target_groups):
-    source_groups = [g for g in (source_groups or []) if str(g.get("type") or "").upper() == "OKTA_GROUP"]
-    target_groups = [g for g in (target_groups or []) if str(g.get("type") or "").upper() == "OKTA_GROUP"]
-
-    src_by_name = {((g.get("profile") or {}).get("name") or ""): g for g in source_groups if (g.get("profile") or {}).get("name")}
-    tgt_by_name = {((g.get("profile") or {}).get("name") or ""): g for g in target_groups if (g.get("profile") or {}).get("name")}
-
-    missing = []
-    different = []
-    matched = 0
-    extra = 0
-    all_groups = []
-
-    for name, src in src_by_name.items():
-        src_profile = src.get("profile") or {}
-        src_desc = src_profile.get("description") or ""
-        tgt = tgt_by_name.get(name)
-        if not tgt:
-            missing.append({
-                "name": name,
-                "description": src_desc,
-            })
-            all_groups.append({
-                "name": name,
-                "source_description": src_desc,
-                "target_description": "",
-                "status": "Missing in Target",
-            })
-            continue
-        tgt_profile = tgt.get("profile") or {}
-        tgt_desc = tgt_profile.get("description") or ""
-        if (src_desc or "") != (tgt_desc or ""):
-            different.append({
-                "name": name,
-                "source_description": src_desc,
-                "target_description": tgt_desc,
-                "target_id": tgt.get("id"),
-            })
-            all_groups.append({
-                "name": name,
-                "source_description": src_desc,
-                "target_description": tgt_desc,
-                "status": "Different",
-            })
-        else:
-            matched += 1
-            all_groups.append({
-                "name": name,
-                "source_description": src_desc,
-                "target_description": tgt_desc,
-                "status": "Match",
-            })
-
-    for name in tgt_by_name:
-        if name not in src_by_name:
-            extra += 1
-            tgt_desc = ((tgt_by_name.get(name) or {}).get("profile") or {}).get("description") or ""
-            all_groups.append({
-                "name": name,
-                "source_description": "",
-                "target_description": tgt_desc,
-                "status": "Extra in Target",
-            })
-
-    all_groups.sort(key=lambda g: ((g.get("name") or "").lower(), g.get("status") or ""))
-
-    return {
-        "source_count": len(src_by_name),
-        "target_count": len(tgt_by_name),
-        "missing": missing,
-        "different": different,
-        "all_groups": all_groups,
-        "matched_count": matched,
-        "extra_count": extra,
-        "pending_count": len(missing) + len(different),
-    }
-
-
-def _okta_headers(api_token):
-    return {
-        "Authorization": f"SSWS {api_token}",
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-
-
-def _create_group(domain, api_token, name, description=""):
-    url = f"{_ensure_https_domain(domain).rstrip('/')}/api/v1/groups"
-    payload = {"profile": {"name": name, "description": description or ""}}
-    return requests.post(url, headers=_okta_headers(api_token), json=payload, timeout=30)
-
-
-def _update_group_description(domain, api_token, group_id, name, description=""):
-    url = f"{_ensure_https_domain(domain).rstrip('/')}/api/v1/groups/{group_id}"
-    payload = {"profile": {"name": name, "description": description or ""}}
-    return requests.put(url, headers=_okta_headers(api_token), json=payload, timeout=30)
-
-
-def _oktaevaluate_csv_bytes(evaluation):
-    output = io.StringIO()
-    writer = csv.DictWriter(
-        output,
-        fieldnames=["Check ID", "What Was Checked", "Result", "Severity", "Summary", "Details"],
-    )
-    writer.writeheader()
-    for check in (evaluation or {}).get("security_validations", []) or []:
-        writer.writerow(
-            {
-                "Check ID": check.get("check_id", ""),
-                "What Was Checked": check.get("title", ""),
-                "Result": check.get("status", ""),
-                "Severity": check.get("severity", ""),
-                "Summary": check.get("summary", ""),
-                "Details": " | ".join([str(i) for i in (check.get("items") or [])]),
-            }
-        )
-    return output.getvalue().encode("utf-8")
-
-
-# ---------------------------------------------------
-# Compare Groups (unchanged logic)
-# ---------------------------------------------------
-def compare_groups(groupsA, groupsB):
-    diffs = []
-    matches = []
-
-    dictA = {g["profile"]["name"]: g for g in groupsA}
-    dictB = {g["profile"]["name"]: g for g in groupsB}
-
-    for name, grpA in dictA.items():
-        descA = grpA["profile"].get("description", "")
-
-        if name not in dictB:
-            diffs.append({
-                "Category": "Groups",
-                "Object": name,
-                "Attribute": "-",
-                "Env A Value": "Exists",
-                "Env B Value": "Missing",
-                "Difference Type": "Missing in Env B",
-                "Impact": "Access",
-                "Recommended Action": f"Create group '{name}' in Env B",
-                "Priority": "🔴 Critical"
-            })
-        else:
-            descB = dictB[name]["profile"].get("description", "")
-            if descA != descB:
-                diffs.append({
-                    "Category": "Groups",
-                    "Object": name,
-                    "Attribute": "Description",
-                    "Env A Value": descA,
-                    "Env B Value": descB,
-                    "Difference Type": "Mismatch",
-                    "Impact": "Configuration Drift",
-                    "Recommended Action": f"Align description for group '{name}'",
-                    "Priority": "🟠 Medium"
-                })
-            else:
-                matches.append({
-                    "Category": "Groups",
-                    "Object": name,
-                    "Attribute": "Description",
-                    "Value": descA
-                })
-
-    # Extra in Env B
-    for name in dictB:
-        if name not in dictA:
-            diffs.append({
-                "Category": "Groups",
-                "Object": name,
-                "Attribute": "-",
-                "Env A Value": "Missing",
-                "Env B Value": "Exists",
-                "Difference Type": "Extra in Env B",
-                "Impact": "Configuration Drift",
-                "Recommended Action": f"Review/remove group '{name}' in Env B",
-                "Priority": "🟡 Low"
-            })
-
-    return diffs, matches
-
-
-
-# ---------------------------------------------------
-# Main Page
-# ---------------------------------------------------
-@app.route("/", methods=["GET", "POST"])
-def index():
-    logger.info("Index request received: method=%s", request.method)
-    if request.method == "POST":
-        session.clear()
-
-        # -------------
-        # Inputs
-        # -------------
-        logger.info("Collecting input values.")
-        envA_domain = request.form.get("envA_domain", "").strip()
-        envA_token  = request.form.get("envA_token", "").strip()
-        envB_domain = request.form.get("envB_domain", "").strip()
-        envB_token  = request.form.get("envB_token", "").strip()
-
-        if not all([envA_domain, envA_token, envB_domain, envB_token]):
-            logger.warning("Missing required comparison inputs.")
-            return render_template(
-                "oktacompare_error.html",
-                title="Missing Required Input",
-                message="Please provide Env A and Env B domains and API tokens.",
-            ), 400
-
-        env_a_valid, env_a_message = _validate_okta_api_token(envA_domain, envA_token)
-        if not env_a_valid:
-            return render_template(
-                "oktacompare_error.html",
-                title="Invalid Env A API Token",
-                message=env_a_message,
-            ), 400
-
-        env_b_valid, env_b_message = _validate_okta_api_token(envB_domain, envB_token)
-        if not env_b_valid:
-            return render_template(
-                "oktacompare_error.html",
-                title="Invalid Env B API Token",
-                message=env_b_message,
-            ), 400
-
-
-        # ===================================================
-        # GROUPS
-        # ===================================================
-        logger.info("Fetching groups for envA and envB.")
-        groupsA = get_groups(envA_domain, envA_token)
-        groupsB = get_groups(envB_domain, envB_token)
-
-        logger.info("Comparing groups.")
-        group_diffs, group_matches_raw = compare_groups(groupsA, groupsB)
-
-        group_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            }
-            for m in group_matches_raw
-        ]
-
-        group_df = pd.DataFrame(group_diffs + group_matches_display)
-        group_summary_counts = pd.DataFrame(group_diffs)["Priority"].value_counts().to_dict() if group_diffs else {}
-        group_total_diff = len(group_diffs)
-        logger.info("Groups comparison complete: diffs=%s matches=%s", len(group_diffs), len(group_matches_raw))
-
-
-        # ===================================================
-        # GROUP RULES
-        # ===================================================
-        logger.info("Comparing group rules.")
-        rule_diffs, rule_matches_raw = compare_group_rules(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        rule_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in rule_matches_raw
-        ]
-
-        rule_df = pd.DataFrame(rule_diffs + rule_matches_display)
-        rule_summary_counts = pd.DataFrame(rule_diffs)["Priority"].value_counts().to_dict() if rule_diffs else {}
-        rule_total_diff = len(rule_diffs)
-        logger.info("Group rules comparison complete: diffs=%s matches=%s", len(rule_diffs), len(rule_matches_raw))
-
-
-        # ===================================================
-        # NETWORK ZONES
-        # ===================================================
-        logger.info("Comparing network zones.")
-        zone_diffs, zone_matches_raw = compare_network_zones(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        zone_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m.get("Value", ""),
-                "Env B Value": m.get("Value", ""),
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in zone_matches_raw
-        ]
-
-        zone_df = pd.DataFrame(zone_diffs + zone_matches_display)
-        zone_summary_counts = pd.DataFrame(zone_diffs)["Priority"].value_counts().to_dict() if zone_diffs else {}
-        zone_total_diff = len(zone_diffs)
-        logger.info("Network zones comparison complete: diffs=%s matches=%s", len(zone_diffs), len(zone_matches_raw))
-
-
-        # ===================================================
-        # APPLICATIONS
-        # ===================================================
-        logger.info("Comparing applications.")
-        app_diffs, app_matches_raw = compare_applications(
-            envA_domain, envA_token,
-            envB_domain, envB_token,
-            compare_group_assignments=False,
-        )
-
-        app_matches_display = [
-            {
-                "Category": m.get("Category", "Applications"),
-                "Object": m.get("Object"),
-                "Attribute": m.get("Attribute"),
-                "Env A Value": m.get("Value", ""),
-                "Env B Value": m.get("Value", ""),
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in app_matches_raw
-        ]
-
-        apps_df = pd.DataFrame(app_diffs + app_matches_display)
-        app_summary_counts = pd.DataFrame(app_diffs)["Priority"].value_counts().to_dict() if app_diffs else {}
-        app_total_diff = len(app_diffs)
-        logger.info("Applications comparison complete: diffs=%s matches=%s", len(app_diffs), len(app_matches_raw))
-
-        # ===================================================
-        # AUTHENTICATORS
-        # ===================================================
-        logger.info("Comparing authenticators.")
-        auth_diffs, auth_matches_raw = compare_authenticators(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        auth_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in auth_matches_raw
-        ]
-
-        auth_df = pd.DataFrame(auth_diffs + auth_matches_display)
-        auth_summary_counts = pd.DataFrame(auth_diffs)["Priority"].value_counts().to_dict() if auth_diffs else {}
-        auth_total_diff = len(auth_diffs)
-        logger.info("Authenticators comparison complete: diffs=%s matches=%s", len(auth_diffs), len(auth_matches_raw))
-
-        # ===================================================
-        # AUTHENTICATOR ENROLLMENT POLICIES (MFA)
-        # ===================================================
-        logger.info("Comparing authenticator enrollment policies.")
-        mfa_diffs, mfa_matches_raw = compare_mfa_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        mfa_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in mfa_matches_raw
-        ]
-
-        mfa_df = pd.DataFrame(mfa_diffs + mfa_matches_display)
-        mfa_summary_counts = pd.DataFrame(mfa_diffs)["Priority"].value_counts().to_dict() if mfa_diffs else {}
-        mfa_total_diff = len(mfa_diffs)
-        logger.info("MFA policies comparison complete: diffs=%s matches=%s", len(mfa_diffs), len(mfa_matches_raw))
-
-        # ===================================================
-        # PASSWORD POLICIES
-        # ===================================================
-        logger.info("Comparing password policies.")
-        pwd_diffs, pwd_matches_raw = compare_password_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        pwd_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in pwd_matches_raw
-        ]
-
-        pwd_df = pd.DataFrame(pwd_diffs + pwd_matches_display)
-        pwd_summary_counts = pd.DataFrame(pwd_diffs)["Priority"].value_counts().to_dict() if pwd_diffs else {}
-        pwd_total_diff = len(pwd_diffs)
-        logger.info("Password policies comparison complete: diffs=%s matches=%s", len(pwd_diffs), len(pwd_matches_raw))
-
-        # ===================================================
-        # APP SIGN-ON POLICIES (ACCESS_POLICY)
-        # ===================================================
-        logger.info("Comparing app sign-on policies.")
-        access_diffs, access_matches_raw = compare_access_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        access_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in access_matches_raw
-        ]
-
-        access_df = pd.DataFrame(access_diffs + access_matches_display)
-        access_summary_counts = pd.DataFrame(access_diffs)["Priority"].value_counts().to_dict() if access_diffs else {}
-        access_total_diff = len(access_diffs)
-        logger.info("App sign-on policies comparison complete: diffs=%s matches=%s", len(access_diffs), len(access_matches_raw))
-
-        # ===================================================
-        # IDP DISCOVERY POLICIES
-        # ===================================================
-        logger.info("Comparing IDP discovery policies.")
-        idp_diffs, idp_matches_raw = compare_idp_discovery_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        idp_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in idp_matches_raw
-        ]
-
-        idp_df = pd.DataFrame(idp_diffs + idp_matches_display)
-        idp_summary_counts = pd.DataFrame(idp_diffs)["Priority"].value_counts().to_dict() if idp_diffs else {}
-        idp_total_diff = len(idp_diffs)
-        logger.info("IDP discovery policies comparison complete: diffs=%s matches=%s", len(idp_diffs), len(idp_matches_raw))
-
-        # ===================================================
-        # PROFILE ENROLLMENT POLICIES
-        # ===================================================
-        logger.info("Comparing profile enrollment policies.")
-        profile_diffs, profile_matches_raw = compare_profile_enrollment_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        profile_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in profile_matches_raw
-        ]
-
-        profile_df = pd.DataFrame(profile_diffs + profile_matches_display)
-        profile_summary_counts = pd.DataFrame(profile_diffs)["Priority"].value_counts().to_dict() if profile_diffs else {}
-        profile_total_diff = len(profile_diffs)
-        logger.info(
-            "Profile enrollment policies comparison complete: diffs=%s matches=%s",
-            len(profile_diffs),
-            len(profile_matches_raw),
-        )
-
-        # ===================================================
-        # ENTITY RISK POLICIES
-        # ===================================================
-        logger.info("Comparing entity risk policies.")
-        entity_risk_diffs, entity_risk_matches_raw = compare_entity_risk_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-        entity_risk_matches_display = [
-            {
-                "Category": m["Category"], "Object": m["Object"], "Attribute": m["Attribute"],
-                "Env A Value": m["Value"], "Env B Value": m["Value"], "Difference Type": "Match",
-                "Impact": "", "Recommended Action": "", "Priority": "🟢 Match"
-            } for m in entity_risk_matches_raw
-        ]
-        entity_risk_df = pd.DataFrame(entity_risk_diffs + entity_risk_matches_display)
-        entity_risk_summary_counts = pd.DataFrame(entity_risk_diffs)["Priority"].value_counts().to_dict() if entity_risk_diffs else {}
-        entity_risk_total_diff = len(entity_risk_diffs)
-        logger.info("Entity risk policies comparison complete: diffs=%s matches=%s", len(entity_risk_diffs), len(entity_risk_matches_raw))
-
-        # ===================================================
-        # IDENTITY THREAT PROTECTION POLICIES
-        # ===================================================
-        logger.info("Comparing identity threat protection policies.")
-        post_auth_diffs, post_auth_matches_raw = compare_post_auth_session_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-        post_auth_matches_display = [
-            {
-                "Category": m["Category"], "Object": m["Object"], "Attribute": m["Attribute"],
-                "Env A Value": m["Value"], "Env B Value": m["Value"], "Difference Type": "Match",
-                "Impact": "", "Recommended Action": "", "Priority": "🟢 Match"
-            } for m in post_auth_matches_raw
-        ]
-        post_auth_df = pd.DataFrame(post_auth_diffs + post_auth_matches_display)
-        post_auth_summary_counts = pd.DataFrame(post_auth_diffs)["Priority"].value_counts().to_dict() if post_auth_diffs else {}
-        post_auth_total_diff = len(post_auth_diffs)
-        logger.info("Identity threat protection policies comparison complete: diffs=%s matches=%s", len(post_auth_diffs), len(post_auth_matches_raw))
-
-        # ===================================================
-        # BRAND SETTINGS
-        # ===================================================
-        logger.info("Comparing brand settings.")
-        brand_diffs, brand_matches_raw = compare_brand_settings(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        brand_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in brand_matches_raw
-        ]
-
-        brand_df = pd.DataFrame(brand_diffs + brand_matches_display)
-        brand_summary_counts = pd.DataFrame(brand_diffs)["Priority"].value_counts().to_dict() if brand_diffs else {}
-        brand_total_diff = len(brand_diffs)
-        logger.info("Brand settings comparison complete: diffs=%s matches=%s", len(brand_diffs), len(brand_matches_raw))
-
-        # ===================================================
-        # BRAND PAGES
-        # ===================================================
-        logger.info("Comparing brand pages.")
-        brand_pages_diffs, brand_pages_matches_raw = compare_brand_pages(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        brand_pages_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in brand_pages_matches_raw
-        ]
-
-        brand_pages_df = pd.DataFrame(brand_pages_diffs + brand_pages_matches_display)
-        brand_pages_summary_counts = (
-            pd.DataFrame(brand_pages_diffs)["Priority"].value_counts().to_dict() if brand_pages_diffs else {}
-        )
-        brand_pages_total_diff = len(brand_pages_diffs)
-        logger.info(
-            "Brand pages comparison complete: diffs=%s matches=%s",
-            len(brand_pages_diffs),
-            len(brand_pages_matches_raw),
-        )
-
-        # ===================================================
-        # BRAND EMAIL TEMPLATES
-        # ===================================================
-        logger.info("Comparing brand email templates.")
-        brand_email_diffs, brand_email_matches_raw = compare_brand_email_templates(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        brand_email_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in brand_email_matches_raw
-        ]
-
-        brand_email_df = pd.DataFrame(brand_email_diffs + brand_email_matches_display)
-        brand_email_summary_counts = (
-            pd.DataFrame(brand_email_diffs)["Priority"].value_counts().to_dict() if brand_email_diffs else {}
-        )
-        brand_email_total_diff = len(brand_email_diffs)
-        logger.info(
-            "Brand email templates comparison complete: diffs=%s matches=%s",
-            len(brand_email_diffs),
-            len(brand_email_matches_raw),
-        )
-
-        # ===================================================
-        # AUTHORIZATION SERVERS - SETTINGS
-        # ===================================================
-        logger.info("Comparing authorization servers settings.")
-        authz_diffs, authz_matches_raw = compare_authorization_servers_settings(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        authz_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in authz_matches_raw
-        ]
-
-        authz_df = pd.DataFrame(authz_diffs + authz_matches_display)
-        authz_summary_counts = pd.DataFrame(authz_diffs)["Priority"].value_counts().to_dict() if authz_diffs else {}
-        authz_total_diff = len(authz_diffs)
-        logger.info("Authorization servers settings comparison complete: diffs=%s matches=%s", len(authz_diffs), len(authz_matches_raw))
-
-        # ===================================================
-        # AUTHORIZATION SERVERS - ACCESS POLICIES
-        # ===================================================
-        logger.info("Comparing authorization servers access policies.")
-        authz_policy_diffs, authz_policy_matches_raw = compare_authorization_servers_access_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        authz_policy_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in authz_policy_matches_raw
-        ]
-
-        authz_policy_df = pd.DataFrame(authz_policy_diffs + authz_policy_matches_display)
-        authz_policy_summary_counts = (
-            pd.DataFrame(authz_policy_diffs)["Priority"].value_counts().to_dict() if authz_policy_diffs else {}
-        )
-        authz_policy_total_diff = len(authz_policy_diffs)
-        logger.info(
-            "Authorization servers access policies comparison complete: diffs=%s matches=%s",
-            len(authz_policy_diffs),
-            len(authz_policy_matches_raw),
-        )
-
-        # ===================================================
-        # CUSTOM ADMIN ROLES
-        # ===================================================
-        logger.info("Comparing custom admin roles.")
-        admin_role_diffs, admin_role_matches_raw = compare_custom_admin_roles(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        admin_role_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in admin_role_matches_raw
-        ]
-
-        admin_role_df = pd.DataFrame(admin_role_diffs + admin_role_matches_display)
-        admin_role_summary_counts = (
-            pd.DataFrame(admin_role_diffs)["Priority"].value_counts().to_dict() if admin_role_diffs else {}
-        )
-        admin_role_total_diff = len(admin_role_diffs)
-        logger.info(
-            "Custom admin roles comparison complete: diffs=%s matches=%s",
-            len(admin_role_diffs),
-            len(admin_role_matches_raw),
-        )
-
-        # ===================================================
-        # RESOURCE SETS
-        # ===================================================
-        logger.info("Comparing resource sets.")
-        resource_set_diffs, resource_set_matches_raw = compare_resource_sets(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
-
-        resource_set_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in resource_set_matches_raw
-        ]
-
-        resource_set_df = pd.DataFrame(resource_set_diffs + resource_set_matches_display)
-        resource_set_summary_counts = (
-            pd.DataFrame(resource_set_diffs)["Priority"].value_counts().to_dict() if resource_set_diffs else {}
-        )
-        resource_set_total_diff = len(resource_set_diffs)
-        logger.info(
-            "Resource sets comparison complete: diffs=%s matches=%s",
-            len(resource_set_diffs),
-            len(resource_set_matches_raw),
-        )
+    # Extra in Env B
+    for name in dictB:
+        if name not in dictA:
+            diffs.append({
+                "Category": "Groups",
+                "Object": name,
+                "Attribute": "-",
+                "Env A Value": "Missing",
+                "Env B Value": "Exists",
+                "Difference Type": "Extra in Env B",
+                "Impact": "Configuration Drift",
+                "Recommended Action": f"Review/remove group '{name}' in Env B",
+                "Priority": "🟡 Low"
+            })
 
-        # ===================================================
-        # ADMIN ASSIGNMENTS
-        # ===================================================
-        logger.info("Comparing admin assignments.")
-        admin_assign_diffs, admin_assign_matches_raw = compare_admin_assignments(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
+    return diffs, matches
 
-        admin_assign_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in admin_assign_matches_raw
-        ]
 
-        admin_assign_df = pd.DataFrame(admin_assign_diffs + admin_assign_matches_display)
-        admin_assign_summary_counts = (
-            pd.DataFrame(admin_assign_diffs)["Priority"].value_counts().to_dict() if admin_assign_diffs else {}
-        )
-        admin_assign_total_diff = len(admin_assign_diffs)
-        logger.info(
-            "Admin assignments comparison complete: diffs=%s matches=%s",
-            len(admin_assign_diffs),
-            len(admin_assign_matches_raw),
-        )
+def _compare_groups_between(envA_domain, envA_token, envB_domain, envB_token):
+    groupsA = get_groups(envA_domain, envA_token)
+    groupsB = get_groups(envB_domain, envB_token)
+    return compare_groups(groupsA, groupsB)
 
-        # ===================================================
-        # API TOKENS
-        # ===================================================
-        logger.info("Comparing API tokens.")
-        api_token_diffs, api_token_matches_raw = compare_api_tokens(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
 
-        api_token_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in api_token_matches_raw
-        ]
+def _compare_applications_between(envA_domain, envA_token, envB_domain, envB_token):
+    return compare_applications(
+        envA_domain, envA_token,
+        envB_domain, envB_token,
+    )
 
-        api_token_df = pd.DataFrame(api_token_diffs + api_token_matches_display)
-        api_token_summary_counts = (
-            pd.DataFrame(api_token_diffs)["Priority"].value_counts().to_dict() if api_token_diffs else {}
-        )
-        api_token_total_diff = len(api_token_diffs)
-        logger.info(
-            "API tokens comparison complete: diffs=%s matches=%s",
-            len(api_token_diffs),
-            len(api_token_matches_raw),
-        )
 
-        # ===================================================
-        # SECURITY GENERAL SETTINGS
-        # ===================================================
-        logger.info("Comparing security general settings.")
-        sec_diffs, sec_matches_raw = compare_security_general_settings(
-            envA_domain, envA_token,
-            envB_domain, envB_token
+def _authorization_server_trees(envA_domain, envA_token, envB_domain, envB_token, inventories):
+    """Env A and Env B authorization server trees, crawled once per compare run."""
+    if "authz_trees" not in inventories:
+        inventories["authz_trees"] = (
+            get_authorization_server_tree(f"https://{envA_domain}", envA_token),
+            get_authorization_server_tree(f"https://{envB_domain}", envB_token),
         )
+    return inventories["authz_trees"]
 
-        sec_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in sec_matches_raw
-        ]
-
-        sec_df = pd.DataFrame(sec_diffs + sec_matches_display)
-        sec_summary_counts = (
-            pd.DataFrame(sec_diffs)["Priority"].value_counts().to_dict() if sec_diffs else {}
-        )
-        sec_total_diff = len(sec_diffs)
-        logger.info(
-            "Security general settings comparison complete: diffs=%s matches=%s",
-            len(sec_diffs),
-            len(sec_matches_raw),
-        )
 
-        # ===================================================
-        # ORG GENERAL SETTINGS
-        # ===================================================
-        logger.info("Comparing org general settings.")
-        org_diffs, org_matches_raw = compare_org_settings(
-            envA_domain, envA_token,
-            envB_domain, envB_token
+def _brand_trees(envA_domain, envA_token, envB_domain, envB_token, inventories):
+    """Env A and Env B brand trees, crawled once per compare run."""
+    if "brand_trees" not in inventories:
+        inventories["brand_trees"] = (
+            get_brand_tree(f"https://{envA_domain}", envA_token),
+            get_brand_tree(f"https://{envB_domain}", envB_token),
         )
+    return inventories["brand_trees"]
 
-        org_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in org_matches_raw
-        ]
 
-        org_df = pd.DataFrame(org_diffs + org_matches_display)
-        org_summary_counts = (
-            pd.DataFrame(org_diffs)["Priority"].value_counts().to_dict() if org_diffs else {}
-        )
-        org_total_diff = len(org_diffs)
-        logger.info(
-            "Org general settings comparison complete: diffs=%s matches=%s",
-            len(org_diffs),
-            len(org_matches_raw),
-        )
+def _compare_brand_settings_between(envA_domain, envA_token, envB_domain, envB_token, inventories):
+    treeA, treeB = _brand_trees(envA_domain, envA_token, envB_domain, envB_token, inventories)
+    return compare_brand_settings(envA_domain, envA_token, envB_domain, envB_token, treeA=treeA, treeB=treeB)
 
-        # ===================================================
-        # IDENTITY PROVIDERS
-        # ===================================================
-        logger.info("Comparing identity providers.")
-        idp_provider_diffs, idp_provider_matches_raw = compare_identity_providers(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
 
-        idp_provider_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in idp_provider_matches_raw
-        ]
+def _compare_brand_pages_between(envA_domain, envA_token, envB_domain, envB_token, inventories):
+    treeA, treeB = _brand_trees(envA_domain, envA_token, envB_domain, envB_token, inventories)
+    return compare_brand_pages(envA_domain, envA_token, envB_domain, envB_token, treeA=treeA, treeB=treeB)
 
-        idp_provider_df = pd.DataFrame(idp_provider_diffs + idp_provider_matches_display)
-        idp_provider_summary_counts = (
-            pd.DataFrame(idp_provider_diffs)["Priority"].value_counts().to_dict() if idp_provider_diffs else {}
-        )
-        idp_provider_total_diff = len(idp_provider_diffs)
-        logger.info(
-            "Identity providers comparison complete: diffs=%s matches=%s",
-            len(idp_provider_diffs),
-            len(idp_provider_matches_raw),
-        )
 
-        # ===================================================
-        # REALMS
-        # ===================================================
-        logger.info("Comparing realms.")
-        realm_diffs, realm_matches_raw = compare_realms(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
+def _compare_brand_email_templates_between(envA_domain, envA_token, envB_domain, envB_token, inventories):
+    treeA, treeB = _brand_trees(envA_domain, envA_token, envB_domain, envB_token, inventories)
+    return compare_brand_email_templates(envA_domain, envA_token, envB_domain, envB_token, treeA=treeA, treeB=treeB)
 
-        realm_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in realm_matches_raw
-        ]
 
-        realm_df = pd.DataFrame(realm_diffs + realm_matches_display)
-        realm_summary_counts = (
-            pd.DataFrame(realm_diffs)["Priority"].value_counts().to_dict() if realm_diffs else {}
-        )
-        realm_total_diff = len(realm_diffs)
-        logger.info(
-            "Realms comparison complete: diffs=%s matches=%s",
-            len(realm_diffs),
-            len(realm_matches_raw),
-        )
+def _compare_authorization_servers_settings_between(envA_domain, envA_token, envB_domain, envB_token, inventories):
+    treeA, treeB = _authorization_server_trees(envA_domain, envA_token, envB_domain, envB_token, inventories)
+    return compare_authorization_servers_settings(
+        envA_domain, envA_token,
+        envB_domain, envB_token,
+        treeA=treeA, treeB=treeB,
+    )
 
-        # ===================================================
-        # REALM ASSIGNMENTS
-        # ===================================================
-        logger.info("Comparing realm assignments.")
-        realm_assign_diffs, realm_assign_matches_raw = compare_realm_assignments(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
 
-        realm_assign_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in realm_assign_matches_raw
-        ]
+def _compare_authorization_servers_access_policies_between(
+    envA_domain, envA_token, envB_domain, envB_token, inventories
+):
+    treeA, treeB = _authorization_server_trees(envA_domain, envA_token, envB_domain, envB_token, inventories)
+    return compare_authorization_servers_access_policies(
+        envA_domain, envA_token,
+        envB_domain, envB_token,
+        treeA=treeA, treeB=treeB,
+    )
 
-        realm_assign_df = pd.DataFrame(realm_assign_diffs + realm_assign_matches_display)
-        realm_assign_summary_counts = (
-            pd.DataFrame(realm_assign_diffs)["Priority"].value_counts().to_dict() if realm_assign_diffs else {}
-        )
-        realm_assign_total_diff = len(realm_assign_diffs)
-        logger.info(
-            "Realm assignments comparison complete: diffs=%s matches=%s",
-            len(realm_assign_diffs),
-            len(realm_assign_matches_raw),
-        )
 
-        # ===================================================
-        # PROFILE SCHEMA - USER
-        # ===================================================
-        logger.info("Comparing user profile schema.")
-        schema_diffs, schema_matches_raw = compare_user_profile_schema(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
+# ---------------------------------------------------
+# OktaCompare categories, in report order.
+#   key         -> stored run category key
+#   prefix      -> report section id prefix (toggleSection / viewDetails)
+#   inventories -> compare also takes the per-run dict of inventories shared between categories
+# ---------------------------------------------------
+COMPARE_CATEGORIES = [
+    {"key": "group", "prefix": "groups", "title": "Groups", "empty": "No group differences detected.", "compare": _compare_groups_between},
+    {"key": "rule", "prefix": "rules", "title": "Group Rules", "empty": "No group rule differences detected.", "compare": compare_group_rules},
+    {"key": "zone", "prefix": "zones", "title": "Network Zones", "empty": "No network zone differences detected.", "compare": compare_network_zones},
+    {"key": "app", "prefix": "apps", "title": "Applications", "empty": "No application differences detected.", "compare": _compare_applications_between},
+    {"key": "auth", "prefix": "authenticators", "title": "Authenticators", "empty": "No authenticator differences detected.", "compare": compare_authenticators},
+    {"key": "mfa", "prefix": "mfa", "title": "Authenticator Enrollment Policies", "empty": "No authenticator enrollment policy differences detected.", "compare": compare_mfa_policies},
+    {"key": "pwd", "prefix": "pwd", "title": "Password Policies", "empty": "No password policy differences detected.", "compare": compare_password_policies},
+    {"key": "access", "prefix": "access", "title": "App Sign-On Policies", "empty": "No app sign-on policy differences detected.", "compare": compare_access_policies},
+    {"key": "idp", "prefix": "idp", "title": "IDP Discovery Policies", "empty": "No IDP discovery policy differences detected.", "compare": compare_idp_discovery_policies},
+    {"key": "profile", "prefix": "profile", "title": "Profile Enrollment Policies", "empty": "No profile enrollment policy differences detected.", "compare": compare_profile_enrollment_policies},
+    {"key": "entity_risk", "prefix": "entityrisk", "title": "Entity Risk Policies", "empty": "No entity risk policy differences detected.", "compare": compare_entity_risk_policies},
+    {"key": "post_auth", "prefix": "postauth", "title": "Identity Threat Protection Policies", "empty": "No identity threat protection policy differences detected.", "compare": compare_post_auth_session_policies},
+    {"key": "brand", "prefix": "brand", "title": "Brand Settings", "empty": "No brand settings differences detected.", "compare": _compare_brand_settings_between, "inventories": True},
+    {"key": "brand_pages", "prefix": "brandpages", "title": "Brand Pages", "empty": "No brand pages differences detected.", "compare": _compare_brand_pages_between, "inventories": True},
+    {"key": "brand_email", "prefix": "brandemail", "title": "Brand Email Templates", "empty": "No brand email template differences detected.", "compare": _compare_brand_email_templates_between, "inventories": True},
+    {"key": "authz", "prefix": "authz", "title": "Authorization Servers - Settings", "detail_title": "Authorization Servers – Settings Comparison", "empty": "No authorization server settings differences detected.", "compare": _compare_authorization_servers_settings_between, "inventories": True},
+    {"key": "authz_policy", "prefix": "authzpol", "title": "Authorization Servers - Access Policies", "detail_title": "Authorization Servers – Access Policies Comparison", "empty": "No authorization server access policy differences detected.", "compare": _compare_authorization_servers_access_policies_between, "inventories": True},
+    {"key": "admin_role", "prefix": "adminroles", "title": "Custom Admin Roles", "empty": "No custom admin role differences detected.", "compare": compare_custom_admin_roles},
+    {"key": "resource_set", "prefix": "resourcesets", "title": "Resource Sets", "empty": "No resource set differences detected.", "compare": compare_resource_sets},
+    {"key": "admin_assign", "prefix": "adminassign", "title": "Admin Assignments", "empty": "No admin assignment differences detected.", "compare": compare_admin_assignments},
+    {"key": "api_token", "prefix": "apitokens", "title": "API Tokens", "empty": "No API token differences detected.", "compare": compare_api_tokens},
+    {"key": "sec", "prefix": "security", "title": "Security General Settings", "empty": "No security general settings differences detected.", "compare": compare_security_general_settings},
+    {"key": "org", "prefix": "orgsettings", "title": "Org General Settings", "empty": "No org general settings differences detected.", "compare": compare_org_settings},
+    {"key": "idp_provider", "prefix": "idpproviders", "title": "Identity Providers", "empty": "No identity provider differences detected.", "compare": compare_identity_providers},
+    {"key": "realm", "prefix": "realms", "title": "Realms", "empty": "No realm differences detected.", "compare": compare_realms},
+    {"key": "realm_assign", "prefix": "realmassign", "title": "Realm Assignments", "empty": "No realm assignment differences detected.", "compare": compare_realm_assignments},
+    {"key": "schema", "prefix": "profileschema", "title": "Profile Schema - User", "detail_title": "Profile Schema – User Detailed Comparison", "empty": "No user profile schema differences detected.", "compare": compare_user_profile_schema},
+    {"key": "mapping", "prefix": "profilemappings", "title": "Profile Mappings", "empty": "No profile mapping differences detected.", "compare": compare_profile_mappings},
+    {"key": "origin", "prefix": "origins", "title": "Trusted Origins", "empty": "No trusted origin differences detected.", "compare": compare_trusted_origins},
+    {"key": "event_hook", "prefix": "eventhooks", "title": "Event Hooks", "empty": "No event hook differences detected.", "compare": compare_event_hooks},
+    {"key": "inline_hook", "prefix": "inlinehooks", "title": "Inline Hooks", "empty": "No inline hook differences detected.", "compare": compare_inline_hooks},
+    {"key": "attack_protection", "prefix": "attackprotection", "title": "Access Controls - Attack Protection", "empty": "No attack protection differences detected.", "compare": compare_attack_protection},
+    {"key": "group_push", "prefix": "grouppush", "title": "Group Push Mappings", "empty": "No group push mapping differences detected.", "compare": compare_group_push_mappings},
+    {"key": "agent", "prefix": "agents", "title": "Agents", "empty": "No agent differences detected.", "compare": compare_agents},
+    {"key": "session", "prefix": "sessionpol", "title": "Session Policies", "empty": "No session policy differences detected.", "compare": compare_session_policies},
+]
+COMPARE_CATEGORY_BY_KEY = {category["key"]: category for category in COMPARE_CATEGORIES}
+
+# Rows rendered server-side per category; the rest load from /api/v1/runs/<run_id>/report/<key>.
+REPORT_PAGE_SIZE = 50
+REPORT_COLUMNS = [
+    "Category",
+    "Object",
+    "Attribute",
+    "Env A Value",
+    "Env B Value",
+    "Difference Type",
+    "Impact",
+    "Recommended Action",
+    "Priority",
+]
 
-        schema_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in schema_matches_raw
-        ]
 
-        schema_df = pd.DataFrame(schema_diffs + schema_matches_display)
-        schema_summary_counts = (
-            pd.DataFrame(schema_diffs)["Priority"].value_counts().to_dict() if schema_diffs else {}
-        )
-        schema_total_diff = len(schema_diffs)
-        logger.info(
-            "User profile schema comparison complete: diffs=%s matches=%s",
-            len(schema_diffs),
-            len(schema_matches_raw),
-        )
+def _match_display_row(match):
+    return {
+        "Category": match.get("Category"),
+        "Object": match.get("Object"),
+        "Attribute": match.get("Attribute"),
+        "Env A Value": match.get("Value", ""),
+        "Env B Value": match.get("Value", ""),
+        "Difference Type": "Match",
+        "Impact": "",
+        "Recommended Action": "",
+        "Priority": "🟢 Match",
+    }
 
-        # ===================================================
-        # PROFILE MAPPINGS
-        # ===================================================
-        logger.info("Comparing profile mappings.")
-        mapping_diffs, mapping_matches_raw = compare_profile_mappings(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
 
-        mapping_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in mapping_matches_raw
-        ]
+def _priority_counts(diffs):
+    counts = {}
+    for diff in diffs:
+        priority = diff.get("Priority")
+        if priority is not None:
+            counts[priority] = counts.get(priority, 0) + 1
+    return counts
+
+
+def _category_display_rows(diffs, matches, offset=0, limit=None, query=""):
+    """
+    Diff rows followed by match rows (in display form), sliced without building
+    the full display list. query filters case-insensitively across all columns.
+    Returns (rows, total).
+    """
+    query = str(query or "").strip().lower()
+    if query:
+        def _hit(row):
+            return any(query in str(row.get(col, "")).lower() for col in REPORT_COLUMNS)
+
+        filtered = [row for row in diffs if _hit(row)]
+        filtered.extend(row for row in map(_match_display_row, matches) if _hit(row))
+        end = None if limit is None else offset + limit
+        return filtered[offset:end], len(filtered)
+
+    total = len(diffs) + len(matches)
+    end = total if limit is None else min(total, offset + limit)
+    rows = list(diffs[offset:end])
+    match_start = max(0, offset - len(diffs))
+    match_end = max(0, end - len(diffs))
+    rows.extend(_match_display_row(m) for m in matches[match_start:match_end])
+    return rows, total
+
+
+def _compare_input_error(envA_domain, envA_token, envB_domain, envB_token):
+    """(title, message) describing why the compare inputs are unusable, or None."""
+    if not all([envA_domain, envA_token, envB_domain, envB_token]):
+        logger.warning("Missing required comparison inputs.")
+        return "Missing Required Input", "Please provide Env A and Env B domains and API tokens."
+
+    env_a_valid, env_a_message = _validate_okta_api_token(envA_domain, envA_token)
+    if not env_a_valid:
+        return "Invalid Env A API Token", env_a_message
+
+    env_b_valid, env_b_message = _validate_okta_api_token(envB_domain, envB_token)
+    if not env_b_valid:
+        return "Invalid Env B API Token", env_b_message
+    return None
 
-        mapping_df = pd.DataFrame(mapping_diffs + mapping_matches_display)
-        mapping_summary_counts = (
-            pd.DataFrame(mapping_diffs)["Priority"].value_counts().to_dict() if mapping_diffs else {}
-        )
-        mapping_total_diff = len(mapping_diffs)
-        logger.info(
-            "Profile mappings comparison complete: diffs=%s matches=%s",
-            len(mapping_diffs),
-            len(mapping_matches_raw),
-        )
 
-        # ===================================================
-        # TRUSTED ORIGINS
-        # ===================================================
-        logger.info("Comparing trusted origins.")
-        origin_diffs, origin_matches_raw = compare_trusted_origins(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
+def _compare_report_category(category, result, diff_only=False):
+    """Report card / first page of one compare category's stored result."""
+    first_page, total_rows = _category_display_rows(
+        result["diffs"], result["matches"], limit=REPORT_PAGE_SIZE
+    )
+    return {
+        "key": category["key"],
+        "prefix": category["prefix"],
+        "title": category["title"],
+        "detail_title": category.get("detail_title") or f"{category['title']} – Detailed Comparison",
+        "empty": category["empty"],
+        "summary_counts": _priority_counts(result["diffs"]),
+        "total_diff": len(result["diffs"]),
+        "match_count": result.get("match_count", len(result["matches"])),
+        "sampled_matches": len(result["matches"]) if diff_only else None,
+        "total_rows": total_rows,
+        "rows": first_page,
+    }
 
-        origin_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in origin_matches_raw
-        ]
 
-        origin_df = pd.DataFrame(origin_diffs + origin_matches_display)
-        origin_summary_counts = (
-            pd.DataFrame(origin_diffs)["Priority"].value_counts().to_dict() if origin_diffs else {}
-        )
-        origin_total_diff = len(origin_diffs)
+def _run_compare(envA_domain, envA_token, envB_domain, envB_token, diff_only=False, on_event=None):
+    """
+    Compare every COMPARE_CATEGORIES category, store the run (and LAST_EXPORT) and
+    return its run_id. on_event(event, payload) is called with "category_start"
+    before and "category" (the report card) after each category.
+    """
+    on_event = on_event or (lambda event, payload: None)
+    category_results = {}
+    all_diffs = []
+    all_matches_raw = []
+    total_matches = 0
+    inventories = {}
+    for position, category in enumerate(COMPARE_CATEGORIES, start=1):
+        logger.info("Comparing %s.", category["title"])
+        on_event("category_start", {"key": category["key"], "title": category["title"], "position": position})
+        started = time.perf_counter()
+        # Diff-only runs count matches and keep a sample of them (COMPARE_MATCH_SAMPLE_SIZE).
+        with diff_only_matches() if diff_only else nullcontext():
+            diffs, matches_raw = category["compare"](
+                envA_domain, envA_token,
+                envB_domain, envB_token,
+                **({"inventories": inventories} if category.get("inventories") else {})
+            )
+        matched = match_count(matches_raw)
+        total_matches += matched
+        # Kept as compact rows from here on; dicts are only rebuilt for JSON output.
+        diffs, matches_raw = compact_rows(diffs), compact_rows(matches_raw)
+        result = {"diffs": diffs, "matches": matches_raw, "match_count": matched}
+        category_results[category["key"]] = result
+        all_diffs.extend(diffs)
+        all_matches_raw.extend(matches_raw)
         logger.info(
-            "Trusted origins comparison complete: diffs=%s matches=%s",
-            len(origin_diffs),
-            len(origin_matches_raw),
-        )
-
-        # ===================================================
-        # EVENT HOOKS
-        # ===================================================
-        logger.info("Comparing event hooks.")
-        event_hook_diffs, event_hook_matches_raw = compare_event_hooks(
-            envA_domain, envA_token,
-            envB_domain, envB_token
+            "%s comparison complete: diffs=%s matches=%s",
+            category["title"],
+            len(diffs),
+            matched,
         )
-
-        event_hook_matches_display = [
+        on_event(
+            "category",
             {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in event_hook_matches_raw
-        ]
-
-        event_hook_df = pd.DataFrame(event_hook_diffs + event_hook_matches_display)
-        event_hook_summary_counts = (
-            pd.DataFrame(event_hook_diffs)["Priority"].value_counts().to_dict() if event_hook_diffs else {}
-        )
-        event_hook_total_diff = len(event_hook_diffs)
-        logger.info(
-            "Event hooks comparison complete: diffs=%s matches=%s",
-            len(event_hook_diffs),
-            len(event_hook_matches_raw),
-        )
-
-        # ===================================================
-        # INLINE HOOKS
-        # ===================================================
-        logger.info("Comparing inline hooks.")
-        inline_hook_diffs, inline_hook_matches_raw = compare_inline_hooks(
-            envA_domain, envA_token,
-            envB_domain, envB_token
+                **_compare_report_category(category, result, diff_only),
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+            },
         )
 
-        inline_hook_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in inline_hook_matches_raw
-        ]
+    logger.info("Storing session results.")
+    LAST_EXPORT["diffs"] = all_diffs
+    LAST_EXPORT["matches"] = all_matches_raw
+    LAST_EXPORT["match_count"] = total_matches
+    LAST_EXPORT["sampled_match_count"] = len(all_matches_raw) if diff_only else None
+    LAST_EXPORT["run_id"] = save_run(
+        "compare",
+        {"diffs": all_diffs, "matches": all_matches_raw, "categories": category_results},
+        env_a=envA_domain,
+        env_b=envB_domain,
+        diff_count=len(all_diffs),
+        match_count=total_matches,
+        diff_only=diff_only,
+        sampled_match_count=LAST_EXPORT["sampled_match_count"],
+    )
+    export_bytes = (
+        len(json.dumps(all_diffs, default=row_json_default).encode("utf-8"))
+        + len(json.dumps(all_matches_raw, default=row_json_default).encode("utf-8"))
+    )
+    logger.info("Export payload size: %.2f KB", export_bytes / 1024)
+    return LAST_EXPORT["run_id"]
 
-        inline_hook_df = pd.DataFrame(inline_hook_diffs + inline_hook_matches_display)
-        inline_hook_summary_counts = (
-            pd.DataFrame(inline_hook_diffs)["Priority"].value_counts().to_dict() if inline_hook_diffs else {}
-        )
-        inline_hook_total_diff = len(inline_hook_diffs)
-        logger.info(
-            "Inline hooks comparison complete: diffs=%s matches=%s",
-            len(inline_hook_diffs),
-            len(inline_hook_matches_raw),
-        )
 
-        # ===================================================
-        # ACCESS CONTROLS - ATTACK PROTECTION
-        # ===================================================
-        logger.info("Comparing attack protection controls.")
-        attack_protection_diffs, attack_protection_matches_raw = compare_attack_protection(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
+def _render_compare_report(run):
+    categories = run["data"]["categories"]
+    report_categories = [
+        _compare_report_category(category, categories[category["key"]], run.get("diff_only"))
+        for category in COMPARE_CATEGORIES
+        if category["key"] in categories
+    ]
+    generated_at = datetime.fromisoformat(run["created_at"]).astimezone(ZoneInfo("Australia/Brisbane"))
+    logger.info("Rendering report for envA=%s envB=%s.", run.get("env_a"), run.get("env_b"))
+    return render_template(
+        "oktacompare_report.html",
+        report_categories=report_categories,
+        report_columns=REPORT_COLUMNS,
+        report_page_size=REPORT_PAGE_SIZE,
+        run_id=run["run_id"],
+        envA=run.get("env_a"),
+        envB=run.get("env_b"),
+        generated_at=generated_at.strftime("%Y-%m-%d %H:%M:%S %Z"),
+    )
 
-        attack_protection_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in attack_protection_matches_raw
-        ]
 
-        attack_protection_df = pd.DataFrame(attack_protection_diffs + attack_protection_matches_display)
-        attack_protection_summary_counts = (
-            pd.DataFrame(attack_protection_diffs)["Priority"].value_counts().to_dict() if attack_protection_diffs else {}
-        )
-        attack_protection_total_diff = len(attack_protection_diffs)
-        logger.info(
-            "Attack protection comparison complete: diffs=%s matches=%s",
-            len(attack_protection_diffs),
-            len(attack_protection_matches_raw),
-        )
+# ---------------------------------------------------
+# Main Page
+# ---------------------------------------------------
+@app.route("/", methods=["GET", "POST"])
+def index():
+    logger.info("Index request received: method=%s", request.method)
+    if request.method == "POST":
+        session.clear()
 
-        # ===================================================
-        # GROUP PUSH MAPPINGS
-        # ===================================================
-        logger.info("Comparing group push mappings.")
-        group_push_diffs, group_push_matches_raw = compare_group_push_mappings(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
+        # -------------
+        # Inputs
+        # -------------
+        logger.info("Collecting input values.")
+        envA_domain = request.form.get("envA_domain", "").strip()
+        envA_token  = request.form.get("envA_token", "").strip()
+        envB_domain = request.form.get("envB_domain", "").strip()
+        envB_token  = request.form.get("envB_token", "").strip()
+        diff_only = bool(request.form.get("diff_only"))
 
-        group_push_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in group_push_matches_raw
-        ]
+        input_error = _compare_input_error(envA_domain, envA_token, envB_domain, envB_token)
+        if input_error:
+            return render_template(
+                "oktacompare_error.html",
+                title=input_error[0],
+                message=input_error[1],
+            ), 400
 
-        group_push_df = pd.DataFrame(group_push_diffs + group_push_matches_display)
-        group_push_summary_counts = (
-            pd.DataFrame(group_push_diffs)["Priority"].value_counts().to_dict() if group_push_diffs else {}
-        )
-        group_push_total_diff = len(group_push_diffs)
-        logger.info(
-            "Group push mappings comparison complete: diffs=%s matches=%s",
-            len(group_push_diffs),
-            len(group_push_matches_raw),
-        )
+        run_id = _run_compare(envA_domain, envA_token, envB_domain, envB_token, diff_only=diff_only)
+        return _render_compare_report(get_run(run_id))
 
-        # ===================================================
-        # AGENTS
-        # ===================================================
-        logger.info("Comparing agents.")
-        agent_diffs, agent_matches_raw = compare_agents(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
 
-        agent_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            } for m in agent_matches_raw
-        ]
+    logger.info("Rendering input form.")
+    return render_template("oktacompare_form.html")
 
-        agent_df = pd.DataFrame(agent_diffs + agent_matches_display)
-        agent_summary_counts = (
-            pd.DataFrame(agent_diffs)["Priority"].value_counts().to_dict() if agent_diffs else {}
-        )
-        agent_total_diff = len(agent_diffs)
-        logger.info(
-            "Agents comparison complete: diffs=%s matches=%s",
-            len(agent_diffs),
-            len(agent_matches_raw),
-        )
 
+# Seconds between progress events while a streamed category is still running.
+COMPARE_STREAM_PROGRESS_SECONDS = 1.0
 
-        # ===================================================
-        # GLOBAL SESSION POLICIES (policies + rules together)
-        # ===================================================
-        logger.info("Comparing session policies.")
-        session_diffs, session_matches_raw = compare_session_policies(
-            envA_domain, envA_token,
-            envB_domain, envB_token
-        )
 
-        session_matches_display = [
-            {
-                "Category": m["Category"],
-                "Object": m["Object"],
-                "Attribute": m["Attribute"],
-                "Env A Value": m["Value"],
-                "Env B Value": m["Value"],
-                "Difference Type": "Match",
-                "Impact": "",
-                "Recommended Action": "",
-                "Priority": "🟢 Match"
-            }
-            for m in session_matches_raw
-        ]
+def _sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload, default=row_json_default)}\n\n"
 
-        session_df = pd.DataFrame(session_diffs + session_matches_display)
-        session_summary_counts = pd.DataFrame(session_diffs)["Priority"].value_counts().to_dict() if session_diffs else {}
-        session_total_diff = len(session_diffs)
-        logger.info("Session policies comparison complete: diffs=%s matches=%s", len(session_diffs), len(session_matches_raw))
-
-
-        # ===================================================
-        # SESSION STORAGE
-        # ===================================================
-        logger.info("Storing session results.")
-        all_diffs = (
-            group_diffs
-            + rule_diffs
-            + zone_diffs
-            + app_diffs
-            + session_diffs
-            + auth_diffs
-            + mfa_diffs
-            + pwd_diffs
-            + access_diffs
-            + idp_diffs
-            + profile_diffs
-            + entity_risk_diffs
-            + post_auth_diffs
-            + brand_diffs
-            + brand_pages_diffs
-            + brand_email_diffs
-            + authz_diffs
-            + authz_policy_diffs
-            + admin_role_diffs
-            + resource_set_diffs
-            + admin_assign_diffs
-            + api_token_diffs
-            + sec_diffs
-            + org_diffs
-            + idp_provider_diffs
-            + realm_diffs
-            + realm_assign_diffs
-            + schema_diffs
-            + mapping_diffs
-            + origin_diffs
-            + event_hook_diffs
-            + inline_hook_diffs
-            + attack_protection_diffs
-            + group_push_diffs
-            + agent_diffs
-        )
-        all_matches_raw = (
-            group_matches_raw
-            + rule_matches_raw
-            + zone_matches_raw
-            + app_matches_raw
-            + session_matches_raw
-            + auth_matches_raw
-            + mfa_matches_raw
-            + pwd_matches_raw
-            + access_matches_raw
-            + idp_matches_raw
-            + profile_matches_raw
-            + entity_risk_matches_raw
-            + post_auth_matches_raw
-            + brand_matches_raw
-            + brand_pages_matches_raw
-            + brand_email_matches_raw
-            + authz_matches_raw
-            + authz_policy_matches_raw
-            + admin_role_matches_raw
-            + resource_set_matches_raw
-            + admin_assign_matches_raw
-            + api_token_matches_raw
-            + sec_matches_raw
-            + org_matches_raw
-            + idp_provider_matches_raw
-            + realm_matches_raw
-            + realm_assign_matches_raw
-            + schema_matches_raw
-            + mapping_matches_raw
-            + origin_matches_raw
-            + event_hook_matches_raw
-            + inline_hook_matches_raw
-            + attack_protection_matches_raw
-            + group_push_matches_raw
-            + agent_matches_raw
-        )
-        LAST_EXPORT["diffs"] = all_diffs
-        LAST_EXPORT["matches"] = all_matches_raw
-        export_bytes = (
-            len(json.dumps(all_diffs, default=str).encode("utf-8"))
-            + len(json.dumps(all_matches_raw, default=str).encode("utf-8"))
-        )
-        logger.info("Export payload size: %.2f KB", export_bytes / 1024)
 
+@app.route("/compare/stream", methods=["POST"])
+def compare_stream():
+    """
+    Run a compare and stream it as Server-Sent Events: "start" (the categories),
+    "progress" (elapsed seconds and Okta requests of the running category), "category"
+    (its report card and first rows once complete), then "done" (run_id, report_url)
+    or "error".
+    """
+    envA_domain = request.form.get("envA_domain", "").strip()
+    envA_token = request.form.get("envA_token", "").strip()
+    envB_domain = request.form.get("envB_domain", "").strip()
+    envB_token = request.form.get("envB_token", "").strip()
+    diff_only = bool(request.form.get("diff_only"))
+    input_error = _compare_input_error(envA_domain, envA_token, envB_domain, envB_token)
+    if input_error:
+        return _api_error(f"{input_error[0]}: {input_error[1]}", 400)
 
-        # ===================================================
-        # Render Report
-        # ===================================================
-        logger.info("Rendering report for envA=%s envB=%s.", envA_domain, envB_domain)
-        return render_template(
-            "oktacompare_report.html",
-
-            # Groups
-            group_df=group_df.to_dict(orient="records"),
-            group_summary_counts=group_summary_counts,
-            group_total_diff=group_total_diff,
-
-            # Group Rules
-            rule_df=rule_df.to_dict(orient="records"),
-            rule_summary_counts=rule_summary_counts,
-            rule_total_diff=rule_total_diff,
-
-            # Network Zones
-            zone_df=zone_df.to_dict(orient="records"),
-            zone_summary_counts=zone_summary_counts,
-            zone_total_diff=zone_total_diff,
-
-            # Applications
-            apps_df=apps_df.to_dict(orient="records"),
-            app_summary_counts=app_summary_counts,
-            app_total_diff=app_total_diff,
-
-            # Authenticators
-            auth_df=auth_df.to_dict(orient="records"),
-            auth_summary_counts=auth_summary_counts,
-            auth_total_diff=auth_total_diff,
-
-            # Authenticator Enrollment Policies (MFA)
-            mfa_df=mfa_df.to_dict(orient="records"),
-            mfa_summary_counts=mfa_summary_counts,
-            mfa_total_diff=mfa_total_diff,
-
-            # Password Policies
-            pwd_df=pwd_df.to_dict(orient="records"),
-            pwd_summary_counts=pwd_summary_counts,
-            pwd_total_diff=pwd_total_diff,
-
-            # App Sign-On Policies
-            access_df=access_df.to_dict(orient="records"),
-            access_summary_counts=access_summary_counts,
-            access_total_diff=access_total_diff,
-
-            # IDP Discovery Policies
-            idp_df=idp_df.to_dict(orient="records"),
-            idp_summary_counts=idp_summary_counts,
-            idp_total_diff=idp_total_diff,
-
-            # Profile Enrollment Policies
-            profile_df=profile_df.to_dict(orient="records"),
-            profile_summary_counts=profile_summary_counts,
-            profile_total_diff=profile_total_diff,
-
-            # Entity Risk Policies
-            entity_risk_df=entity_risk_df.to_dict(orient="records"),
-            entity_risk_summary_counts=entity_risk_summary_counts,
-            entity_risk_total_diff=entity_risk_total_diff,
-
-            # Identity Threat Protection Policies
-            post_auth_df=post_auth_df.to_dict(orient="records"),
-            post_auth_summary_counts=post_auth_summary_counts,
-            post_auth_total_diff=post_auth_total_diff,
-
-            # Brand Settings
-            brand_df=brand_df.to_dict(orient="records"),
-            brand_summary_counts=brand_summary_counts,
-            brand_total_diff=brand_total_diff,
-
-            # Brand Pages
-            brand_pages_df=brand_pages_df.to_dict(orient="records"),
-            brand_pages_summary_counts=brand_pages_summary_counts,
-            brand_pages_total_diff=brand_pages_total_diff,
-
-            # Brand Email Templates
-            brand_email_df=brand_email_df.to_dict(orient="records"),
-            brand_email_summary_counts=brand_email_summary_counts,
-            brand_email_total_diff=brand_email_total_diff,
-
-            # Authorization Servers - Settings
-            authz_df=authz_df.to_dict(orient="records"),
-            authz_summary_counts=authz_summary_counts,
-            authz_total_diff=authz_total_diff,
-
-            # Authorization Servers - Access Policies
-            authz_policy_df=authz_policy_df.to_dict(orient="records"),
-            authz_policy_summary_counts=authz_policy_summary_counts,
-            authz_policy_total_diff=authz_policy_total_diff,
-
-            # Custom Admin Roles
-            admin_role_df=admin_role_df.to_dict(orient="records"),
-            admin_role_summary_counts=admin_role_summary_counts,
-            admin_role_total_diff=admin_role_total_diff,
-
-            # Resource Sets
-            resource_set_df=resource_set_df.to_dict(orient="records"),
-            resource_set_summary_counts=resource_set_summary_counts,
-            resource_set_total_diff=resource_set_total_diff,
-
-            # Admin Assignments
-            admin_assign_df=admin_assign_df.to_dict(orient="records"),
-            admin_assign_summary_counts=admin_assign_summary_counts,
-            admin_assign_total_diff=admin_assign_total_diff,
-
-            # API Tokens
-            api_token_df=api_token_df.to_dict(orient="records"),
-            api_token_summary_counts=api_token_summary_counts,
-            api_token_total_diff=api_token_total_diff,
-
-            # Security General Settings
-            sec_df=sec_df.to_dict(orient="records"),
-            sec_summary_counts=sec_summary_counts,
-            sec_total_diff=sec_total_diff,
-
-            # Org General Settings
-            org_df=org_df.to_dict(orient="records"),
-            org_summary_counts=org_summary_counts,
-            org_total_diff=org_total_diff,
-
-            # Identity Providers
-            idp_provider_df=idp_provider_df.to_dict(orient="records"),
-            idp_provider_summary_counts=idp_provider_summary_counts,
-            idp_provider_total_diff=idp_provider_total_diff,
-
-            # Realms
-            realm_df=realm_df.to_dict(orient="records"),
-            realm_summary_counts=realm_summary_counts,
-            realm_total_diff=realm_total_diff,
-
-            # Realm Assignments
-            realm_assign_df=realm_assign_df.to_dict(orient="records"),
-            realm_assign_summary_counts=realm_assign_summary_counts,
-            realm_assign_total_diff=realm_assign_total_diff,
-
-            # Profile Schema - User
-            schema_df=schema_df.to_dict(orient="records"),
-            schema_summary_counts=schema_summary_counts,
-            schema_total_diff=schema_total_diff,
-
-            # Profile Mappings
-            mapping_df=mapping_df.to_dict(orient="records"),
-            mapping_summary_counts=mapping_summary_counts,
-            mapping_total_diff=mapping_total_diff,
-
-            # Trusted Origins
-            origin_df=origin_df.to_dict(orient="records"),
-            origin_summary_counts=origin_summary_counts,
-            origin_total_diff=origin_total_diff,
-
-            # Event Hooks
-            event_hook_df=event_hook_df.to_dict(orient="records"),
-            event_hook_summary_counts=event_hook_summary_counts,
-            event_hook_total_diff=event_hook_total_diff,
-
-            # Inline Hooks
-            inline_hook_df=inline_hook_df.to_dict(orient="records"),
-            inline_hook_summary_counts=inline_hook_summary_counts,
-            inline_hook_total_diff=inline_hook_total_diff,
-
-            # Access Controls - Attack Protection
-            attack_protection_df=attack_protection_df.to_dict(orient="records"),
-            attack_protection_summary_counts=attack_protection_summary_counts,
-            attack_protection_total_diff=attack_protection_total_diff,
-
-            # Group Push Mappings
-            group_push_df=group_push_df.to_dict(orient="records"),
-            group_push_summary_counts=group_push_summary_counts,
-            group_push_total_diff=group_push_total_diff,
-
-            # Agents
-            agent_df=agent_df.to_dict(orient="records"),
-            agent_summary_counts=agent_summary_counts,
-            agent_total_diff=agent_total_diff,
-
-            # Global Session Policies (combined)
-            session_df=session_df.to_dict(orient="records"),
-            session_summary_counts=session_summary_counts,
-            session_total_diff=session_total_diff,
-
-            envA=envA_domain,
-            envB=envB_domain,
-            generated_at=datetime.now(ZoneInfo("Australia/Brisbane")).strftime(
-                "%Y-%m-%d %H:%M:%S %Z"
-            ),
-        )
+    events = queue.Queue()
 
+    def requests_sent():
+        return sum(host_request_count(domain) for domain in {envA_domain.lower(), envB_domain.lower()})
+
+    def publish(event, payload):
+        # Counters are read on the compare thread so they line up with the category's work.
+        events.put((event, payload, time.perf_counter(), requests_sent()))
+
+    def run():
+        try:
+            run_id = _run_compare(
+                envA_domain,
+                envA_token,
+                envB_domain,
+                envB_token,
+                diff_only=diff_only,
+                on_event=publish,
+            )
+            publish("done", {"run_id": run_id})
+        except Exception as exc:
+            logger.exception("Streamed compare failed.")
+            publish("error", {"error": str(exc) or exc.__class__.__name__})
+
+    def stream():
+        yield _sse_event(
+            "start",
+            {"categories": [{"key": c["key"], "title": c["title"]} for c in COMPARE_CATEGORIES]},
+        )
+        worker = threading.Thread(target=run, name="compare-stream", daemon=True)
+        worker.start()
+        running = None
+        while True:
+            try:
+                event, payload, at, requests_at = events.get(timeout=COMPARE_STREAM_PROGRESS_SECONDS)
+            except queue.Empty:
+                if running:
+                    yield _sse_event(
+                        "progress",
+                        {
+                            "key": running["key"],
+                            "elapsed_seconds": round(time.perf_counter() - running["started"], 1),
+                            "requests": requests_sent() - running["requests"],
+                        },
+                    )
+                continue
+            if event == "category_start":
+                running = {"key": payload["key"], "started": at, "requests": requests_at}
+                payload = {**payload, "elapsed_seconds": 0, "requests": 0}
+                event = "progress"
+            elif event == "category":
+                payload = {
+                    **payload,
+                    "requests": requests_at - running["requests"],
+                    "columns": REPORT_COLUMNS,
+                    "rows": [[row.get(col, "") for col in REPORT_COLUMNS] for row in payload["rows"]],
+                }
+                running = None
+            elif event == "done":
+                payload = {**payload, "report_url": url_for("compare_report", run_id=payload["run_id"])}
+            yield _sse_event(event, payload)
+            if event in ("done", "error"):
+                return
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-    logger.info("Rendering input form.")
-    return render_template("oktacompare_form.html")
+
+@app.route("/compare/report/<run_id>")
+def compare_report(run_id):
+    run = _api_resolve_run(run_id, "categories")
+    if not run or "categories" not in (run.get("data") or {}):
+        return render_template(
+            "oktacompare_error.html",
+            title="Comparison Not Found",
+            message=f"No stored comparison run '{run_id}'.",
+        ), 404
+    return _render_compare_report(run)
 
 
 def _export_rows(rows, export_type):
@@ -4414,6 +1022,14 @@ def _export_comparison_rows(diffs, matches):
     return output
 
 
+def _matches_download_name(stem):
+    """CSV file name; diff-only runs name the match sample size and the full match count."""
+    sampled = LAST_EXPORT.get("sampled_match_count")
+    if sampled is None:
+        return f"{stem}.csv"
+    return f"{stem}_match_sample_{sampled}_of_{LAST_EXPORT.get('match_count') or 0}.csv"
+
+
 @app.route("/export_report")
 def export_report():
     diffs = LAST_EXPORT.get("diffs", [])
@@ -4425,7 +1041,7 @@ def export_report():
         io.BytesIO(output.getvalue().encode("utf-8")),
         mimetype="text/csv",
         as_attachment=True,
-        download_name="okta_compare_report.csv",
+        download_name=_matches_download_name("okta_compare_report"),
     )
 
 
@@ -4453,7 +1069,7 @@ def export_matches():
         io.BytesIO(output.getvalue().encode("utf-8")),
         mimetype="text/csv",
         as_attachment=True,
-        download_name="okta_compare_matches.csv",
+        download_name=_matches_download_name("okta_compare_matches"),
     )
 
 @app.errorhandler(requests.exceptions.ReadTimeout)
@@ -4524,6 +1140,16 @@ def oktasnapshot_generate():
     OKTASNAPSHOT_EXPORT["rows"] = export_rows
     OKTASNAPSHOT_GUIDE["sections"] = sections
     OKTASNAPSHOT_GUIDE["domain"] = domain
+    OKTASNAPSHOT_GUIDE["pdf_key"] = _pdf_content_key("snapshot", {"domain": domain, "sections": sections})
+    OKTASNAPSHOT_GUIDE["run_id"] = save_run(
+        "snapshot",
+        {"sections": sections},
+        domain=domain,
+        section_count=len(sections),
+        pdf_key=OKTASNAPSHOT_GUIDE["pdf_key"],
+    )
+    if _weasyprint_available():
+        _schedule_pdf_export(OKTASNAPSHOT_GUIDE["pdf_key"], _render_snapshot_pdf, sections, domain)
 
     return redirect(url_for("oktasnapshot_guide"))
 
@@ -4542,28 +1168,197 @@ def oktasnapshot_guide():
     )
 
 
+# ---------------------------------------------------
+# PDF exports (rendered in the background when a run completes)
+# ---------------------------------------------------
+PDF_EXPORT_CACHE = {}
+PDF_EXPORT_JOBS = {}
+_PDF_EXPORT_LOCK = threading.Lock()
+_PDF_EXPORT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-export")
+
+EMPTY_EVALUATION = {
+    "domain": "",
+    "generated_at": "",
+    "security_validations": [],
+    "overall_score": "",
+    "readiness_band": "",
+    "check_prefix_legend": CHECK_PREFIX_LEGEND,
+    "validation_summary": {
+        "assessed": 0,
+        "passed": 0,
+        "high": 0,
+        "medium": 0,
+        "low": 0,
+        "high_passed": 0,
+        "medium_passed": 0,
+        "low_passed": 0,
+        "pass_pct": 0,
+        "high_pass_pct": 0,
+        "medium_pass_pct": 0,
+        "low_pass_pct": 0,
+    },
+}
+
+
+def _pdf_content_key(kind, payload):
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{kind}:{digest}"
+
+
+def _render_snapshot_pdf(sections, domain):
+    parts = plan_pdf_parts(sections) if pdf_merge_available() else []
+    if len(parts) < 2:
+        from weasyprint import HTML
+
+        html = render_template(
+            "oktasnapshot_pdf.html",
+            guide_sections=sections,
+            guide_domain=domain,
+        )
+        return HTML(string=html).write_pdf()
+
+    logger.info("Rendering OktaSnapshot PDF in %s parallel part(s).", len(parts))
+    stylesheet = render_template("oktasnapshot_pdf.css")
+    laid_out = layout_parts(
+        [render_template("oktasnapshot_pdf_part.html", guide_parts=part) for part in parts],
+        stylesheet,
+    )
+
+    # Start page of each section, counted from the first page after the contents.
+    section_pages = {}
+    page_offset = 0
+    for _, page_count, anchors in laid_out:
+        for anchor, page_index in anchors.items():
+            if anchor.startswith("section-"):
+                section_pages.setdefault(anchor[len("section-"):], page_offset + page_index)
+        page_offset += page_count
+
+    # Sections that left no anchor in the laid-out parts have no page to point at.
+    toc_sections = [section for section in sections if section.get("id") in section_pages]
+
+    # The contents' own length shifts every entry; re-lay it out until it is stable. A
+    # longer contents only raises page numbers, so its page count never shrinks and
+    # settles after a few passes.
+    toc_pages = 1
+    while True:
+        toc_entries = [
+            {
+                "title": section.get("title") or section.get("id"),
+                "page": section_pages[section.get("id")] + toc_pages + 1,
+            }
+            for section in toc_sections
+        ]
+        toc_pdf, toc_page_count, _ = layout_parts(
+            [render_template("oktasnapshot_pdf_toc.html", guide_domain=domain, toc_entries=toc_entries)],
+            stylesheet,
+        )[0]
+        if toc_page_count == toc_pages:
+            break
+        toc_pages = toc_page_count
+
+    total_pages = toc_page_count + page_offset
+    return merge_pdf_parts(
+        [toc_pdf] + [pdf for pdf, _, _ in laid_out],
+        overlay_pdf=layout_overlay(total_pages, stylesheet),
+        outline=[("Contents", 0)] + [(entry["title"], entry["page"] - 1) for entry in toc_entries],
+    )
+
+
+def _render_evaluate_pdf(evaluation):
+    from weasyprint import HTML
+
+    html = render_template("okta_evaluate_pdf.html", evaluation=evaluation)
+    return HTML(string=html).write_pdf()
+
+
+def _pdf_export_job(pdf_key, render, args):
+    try:
+        with app.app_context():
+            pdf = render(*args)
+    except Exception:
+        with _PDF_EXPORT_LOCK:
+            PDF_EXPORT_JOBS.pop(pdf_key, None)
+        raise
+    # Cache the bytes and retire the job together, so no caller sees neither and re-renders.
+    with _PDF_EXPORT_LOCK:
+        PDF_EXPORT_CACHE[pdf_key] = pdf
+        PDF_EXPORT_JOBS.pop(pdf_key, None)
+    logger.info("Background PDF ready: %s (%.1f KB)", pdf_key, len(pdf) / 1024)
+    return pdf
+
+
+def _schedule_pdf_export(pdf_key, render, *args):
+    """Start rendering a PDF in the background unless it is cached or already running."""
+    with _PDF_EXPORT_LOCK:
+        if pdf_key in PDF_EXPORT_CACHE or pdf_key in PDF_EXPORT_JOBS:
+            return
+        PDF_EXPORT_JOBS[pdf_key] = _PDF_EXPORT_EXECUTOR.submit(_pdf_export_job, pdf_key, render, args)
+    logger.info("Scheduled background PDF render: %s", pdf_key)
+
+
+def _get_pdf_export(pdf_key, render, *args):
+    """
+    Cached PDF bytes for pdf_key. Waits for an in-flight background render and
+    falls back to rendering synchronously if none was scheduled (or it failed).
+    """
+    with _PDF_EXPORT_LOCK:
+        pdf = PDF_EXPORT_CACHE.get(pdf_key)
+        job = PDF_EXPORT_JOBS.get(pdf_key)
+    if pdf is not None:
+        logger.info("Serving cached PDF: %s", pdf_key)
+        return pdf
+    if job is not None:
+        try:
+            return job.result()
+        except Exception:
+            logger.exception("Background PDF render failed for %s; retrying inline.", pdf_key)
+    pdf = render(*args)
+    with _PDF_EXPORT_LOCK:
+        PDF_EXPORT_CACHE[pdf_key] = pdf
+    return pdf
+
+
+@register_eviction_hook
+def _evict_pdf_export(run):
+    pdf_key = run.get("pdf_key")
+    if not pdf_key:
+        return
+    # Identical content can be shared by a newer run; keep it while any live run refers to it.
+    if any(meta.get("pdf_key") == pdf_key for meta in list_runs()):
+        return
+    with _PDF_EXPORT_LOCK:
+        PDF_EXPORT_CACHE.pop(pdf_key, None)
+    logger.info("Evicted cached PDF: %s", pdf_key)
+
+
+def _weasyprint_available():
+    try:
+        import weasyprint  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
 @app.route("/snapshot/export", methods=["GET"])
 def oktasnapshot_export():
     sections = OKTASNAPSHOT_GUIDE.get("sections") or []
     domain = OKTASNAPSHOT_GUIDE.get("domain") or ""
     if not sections:
         logger.warning("No OktaSnapshot guide data found for export.")
-    try:
-        from weasyprint import HTML
-    except Exception:
-        logger.exception("WeasyPrint not available for PDF export.")
+    if not _weasyprint_available():
+        logger.error("WeasyPrint not available for PDF export.")
         return render_template(
             "oktacompare_error.html",
             title="PDF Export Unavailable",
             message="PDF export requires WeasyPrint. Please install it and retry.",
         ), 500
 
-    html = render_template(
-        "oktasnapshot_pdf.html",
-        guide_sections=sections,
-        guide_domain=domain,
+    pdf_key = OKTASNAPSHOT_GUIDE.get("pdf_key") or _pdf_content_key(
+        "snapshot", {"domain": domain, "sections": sections}
     )
-    pdf = HTML(string=html).write_pdf()
+    pdf = _get_pdf_export(pdf_key, _render_snapshot_pdf, sections, domain)
     return send_file(
         io.BytesIO(pdf),
         mimetype="application/pdf",
@@ -4572,6 +1367,45 @@ def oktasnapshot_export():
     )
 
 
+# ---------------------------------------------------
+# Word export: table XML is generated in bulk per section and striped by
+# a table style (header row + horizontal banding) instead of per-cell shading.
+# ---------------------------------------------------
+DOCX_TABLE_STYLE_ID = "OktaSnapshotTable"
+DOCX_TABLE_STYLE_XML = (
+    '<w:style xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'w:type="table" w:customStyle="1" w:styleId="OktaSnapshotTable">'
+    '<w:name w:val="OktaSnapshot Table"/>'
+    '<w:basedOn w:val="TableNormal"/>'
+    '<w:uiPriority w:val="99"/>'
+    '<w:pPr><w:spacing w:after="0" w:line="240" w:lineRule="auto"/></w:pPr>'
+    '<w:tblPr>'
+    '<w:tblStyleRowBandSize w:val="1"/>'
+    '<w:tblBorders>'
+    '<w:top w:val="single" w:sz="4" w:space="0" w:color="D9DDE5"/>'
+    '<w:left w:val="single" w:sz="4" w:space="0" w:color="D9DDE5"/>'
+    '<w:bottom w:val="single" w:sz="4" w:space="0" w:color="D9DDE5"/>'
+    '<w:right w:val="single" w:sz="4" w:space="0" w:color="D9DDE5"/>'
+    '<w:insideH w:val="single" w:sz="4" w:space="0" w:color="D9DDE5"/>'
+    '<w:insideV w:val="single" w:sz="4" w:space="0" w:color="D9DDE5"/>'
+    '</w:tblBorders>'
+    '</w:tblPr>'
+    '<w:tblStylePr w:type="firstRow">'
+    '<w:rPr><w:b/><w:color w:val="1F2937"/></w:rPr>'
+    '<w:tcPr><w:shd w:val="clear" w:color="auto" w:fill="D9E2F3"/></w:tcPr>'
+    '</w:tblStylePr>'
+    '<w:tblStylePr w:type="band1Horz">'
+    '<w:tcPr><w:shd w:val="clear" w:color="auto" w:fill="EFF5FF"/></w:tcPr>'
+    '</w:tblStylePr>'
+    '</w:style>'
+)
+DOCX_TWO_COLUMN_WIDTHS = (2765, 5875)
+# Record tables are parsed in batches so one huge section never becomes one huge XML string.
+DOCX_TABLES_PER_BATCH = 500
+_DOCX_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_DOCX_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
 def _docx_cell_value(value):
     if value is None:
         return ""
@@ -4580,48 +1414,77 @@ def _docx_cell_value(value):
     return str(value)
 
 
-def _docx_set_cell_shading(cell, fill):
-    from docx.oxml import OxmlElement
-    from docx.oxml.ns import qn
-
-    shading = OxmlElement("w:shd")
-    shading.set(qn("w:val"), "clear")
-    shading.set(qn("w:color"), "auto")
-    shading.set(qn("w:fill"), fill)
-    cell._tc.get_or_add_tcPr().append(shading)
-
-
-def _docx_style_header_cell(cell, text, fill="D9E2F3"):
-    from docx.shared import RGBColor
-
-    cell.text = text
-    for paragraph in cell.paragraphs:
-        for run in paragraph.runs:
-            run.bold = True
-            run.font.color.rgb = RGBColor(31, 41, 55)
-    _docx_set_cell_shading(cell, fill)
+def _docx_cell_xml(text, width):
+    text = _DOCX_INVALID_XML_CHARS.sub("", text)
+    runs = "<w:br/>".join(
+        f'<w:t xml:space="preserve">{xml_escape(line)}</w:t>' for line in text.split("\n")
+    )
+    return (
+        f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+        f"<w:p><w:r>{runs}</w:r></w:p></w:tc>"
+    )
 
 
-def _docx_stripe_row(table, row_idx, fill):
-    for cell in table.rows[row_idx].cells:
-        _docx_set_cell_shading(cell, fill)
+def _docx_table_xml(header, pairs):
+    """One two-column table (header row + value rows) using the banded table style."""
+    widths = DOCX_TWO_COLUMN_WIDTHS
+    parts = [
+        "<w:tbl><w:tblPr>",
+        f'<w:tblStyle w:val="{DOCX_TABLE_STYLE_ID}"/>',
+        '<w:tblW w:w="0" w:type="auto"/>',
+        '<w:tblLook w:val="0420" w:firstRow="1" w:lastRow="0" w:firstColumn="0" '
+        'w:lastColumn="0" w:noHBand="0" w:noVBand="1"/>',
+        "</w:tblPr><w:tblGrid>",
+        "".join(f'<w:gridCol w:w="{width}"/>' for width in widths),
+        "</w:tblGrid>",
+        '<w:tr><w:trPr><w:tblHeader/></w:trPr>',
+        _docx_cell_xml(header[0], widths[0]),
+        _docx_cell_xml(header[1], widths[1]),
+        "</w:tr>",
+    ]
+    for field, value in pairs:
+        parts.append("<w:tr>")
+        parts.append(_docx_cell_xml(_docx_cell_value(field), widths[0]))
+        parts.append(_docx_cell_xml(_docx_cell_value(value), widths[1]))
+        parts.append("</w:tr>")
+    parts.append("</w:tbl>")
+    return "".join(parts)
+
+
+def _docx_append_xml(document, fragments):
+    """Parse a batch of body-level XML fragments once and append them before sectPr."""
+    from docx.oxml import parse_xml
+
+    container = parse_xml(f'<w:body xmlns:w="{_DOCX_W_NS}">{"".join(fragments)}</w:body>')
+    body = document.element.body
+    anchor = body.sectPr
+    for element in list(container):
+        if anchor is not None:
+            anchor.addprevious(element)
+        else:
+            body.append(element)
 
 
-def _docx_set_table_borders(table):
-    from docx.oxml import OxmlElement
-    from docx.oxml.ns import qn
+def _docx_section_tables(document, section):
+    rows = section.get("rows") or []
+    if section.get("id") in ["org-settings", "security-settings"]:
+        _docx_append_xml(
+            document,
+            [_docx_table_xml(("Setting", "Value"), [(row.get("Setting", ""), row.get("Value", "")) for row in rows])],
+        )
+        return
 
-    tbl = table._tbl
-    tbl_pr = tbl.tblPr
-    borders = OxmlElement("w:tblBorders")
-    for edge in ("top", "left", "bottom", "right", "insideH", "insideV"):
-        element = OxmlElement(f"w:{edge}")
-        element.set(qn("w:val"), "single")
-        element.set(qn("w:sz"), "4")
-        element.set(qn("w:space"), "0")
-        element.set(qn("w:color"), "D9DDE5")
-        borders.append(element)
-    tbl_pr.append(borders)
+    batch = []
+    for row in rows:
+        columns = row.keys() if section.get("id") == "applications" else section.get("columns") or row.keys()
+        batch.append(_docx_table_xml(("Field", "Value"), [(col, row.get(col, "")) for col in columns]))
+        # Keep consecutive record tables from merging into one table in Word.
+        batch.append("<w:p/>")
+        if len(batch) >= DOCX_TABLES_PER_BATCH * 2:
+            _docx_append_xml(document, batch)
+            batch = []
+    if batch:
+        _docx_append_xml(document, batch)
 
 
 @app.route("/snapshot/export/docx", methods=["GET"])
@@ -4632,6 +1495,7 @@ def oktasnapshot_export_docx():
         logger.warning("No OktaSnapshot guide data found for Word export.")
     try:
         from docx import Document
+        from docx.oxml import parse_xml
         from docx.shared import RGBColor
     except Exception:
         logger.exception("python-docx not available for Word export.")
@@ -4642,6 +1506,7 @@ def oktasnapshot_export_docx():
         ), 500
 
     document = Document()
+    document.styles.element.append(parse_xml(DOCX_TABLE_STYLE_XML))
     document.add_heading("OktaSnapshot Configuration", level=0)
     document.add_paragraph(f"Generated for {domain}.")
 
@@ -4659,37 +1524,14 @@ def oktasnapshot_export_docx():
 
     for section in sections:
         document.add_heading(section.get("title") or section.get("id") or "Section", level=1)
-        rows = section.get("rows") or []
-        if not rows:
+        if not section.get("rows"):
             document.add_paragraph("No data available.")
             continue
-
-        if section.get("id") in ["org-settings", "security-settings"]:
-            table = document.add_table(rows=len(rows) + 1, cols=2)
-            table.style = "Light Shading Accent 1"
-            _docx_set_table_borders(table)
-            _docx_style_header_cell(table.cell(0, 0), "Setting")
-            _docx_style_header_cell(table.cell(0, 1), "Value")
-            for idx, row in enumerate(rows, start=1):
-                table.cell(idx, 0).text = _docx_cell_value(row.get("Setting", ""))
-                table.cell(idx, 1).text = _docx_cell_value(row.get("Value", ""))
-                _docx_stripe_row(table, idx, "EFF5FF" if idx % 2 == 1 else "FFFFFF")
-        else:
-            for row in rows:
-                columns = row.keys() if section.get("id") == "applications" else section.get("columns") or row.keys()
-                table = document.add_table(rows=len(columns) + 1, cols=2)
-                table.style = "Light Shading Accent 1"
-                _docx_set_table_borders(table)
-                _docx_style_header_cell(table.cell(0, 0), "Field")
-                _docx_style_header_cell(table.cell(0, 1), "Value")
-                for idx, col in enumerate(columns, start=1):
-                    table.cell(idx, 0).text = _docx_cell_value(col)
-                    table.cell(idx, 1).text = _docx_cell_value(row.get(col, ""))
-                    _docx_stripe_row(table, idx, "EFF5FF" if idx % 2 == 1 else "FFFFFF")
-
+        _docx_section_tables(document, section)
         document.add_paragraph("")
 
-    output = io.BytesIO()
+    # Spool to disk past a few MB and let send_file stream it in chunks.
+    output = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
     document.save(output)
     output.seek(0)
     return send_file(
@@ -4700,6 +1542,94 @@ def oktasnapshot_export_docx():
     )
 
 
+def _collect_evaluate_inventories(domain, api_token, keys, datasets=None, user_sample_size=None, fields=None):
+    """
+    Fetch the extra_context inventories named in keys (see plan_security_checks).
+    Inventories already present in datasets (collected by the snapshot builder) are reused.
+    With user_sample_size, only a stratified sample of users (plus every admin) is enriched.
+    fields: {key: field paths} projection of the fetched items (plan["fields"]).
+    """
+    fields = fields or {}
+    extra_context = {key: value for key, value in (datasets or {}).items() if key in keys}
+    keys = [key for key in keys if key not in extra_context]
+    if "all_apps" in keys:
+        extra_context["all_apps"] = get_all_applications(
+            domain, api_token, limit=200, fields=fields.get("all_apps")
+        ) or []
+    if "all_users" in keys and user_sample_size:
+        extra_context["all_users"], extra_context["user_sample"] = get_sampled_users_with_security_context(
+            domain, api_token, user_sample_size, limit=200, fields=fields.get("all_users")
+        )
+    elif "all_users" in keys:
+        extra_context["all_users"] = get_users_with_security_context(
+            domain, api_token, limit=200, fields=fields.get("all_users")
+        ) or []
+    if "api_tokens" in keys:
+        extra_context["api_tokens"] = get_api_tokens_with_metadata(domain, api_token, limit=200) or []
+    if "custom_admin_roles" in keys:
+        extra_context["custom_admin_roles"] = get_custom_admin_roles(domain, api_token, limit=200) or []
+    if "resource_set_bindings" in keys:
+        resource_set_bindings = []
+        for resource_set in get_resource_sets(domain, api_token, limit=200) or []:
+            resource_set_id = resource_set.get("id")
+            if not resource_set_id:
+                continue
+            resource_set_bindings.extend(
+                get_resource_set_bindings(domain, api_token, resource_set_id, limit=200) or []
+            )
+        extra_context["resource_set_bindings"] = resource_set_bindings
+    return extra_context
+
+
+def _run_evaluation(domain, api_token, check_selection, plan, thresholds=None, user_sample_size=None):
+    """Collect, evaluate and store one org; returns (evaluation, run_id, pdf_key)."""
+    # A full assessment collects every section for the readiness summary; a check
+    # selection only collects what the selected checks read.
+    snapshot_datasets = {}
+    sections, _ = build_oktasnapshot_guide(
+        domain,
+        api_token,
+        section_ids=plan["sections"] if check_selection else None,
+        datasets=snapshot_datasets,
+    )
+    extra_context = _collect_evaluate_inventories(
+        domain,
+        api_token,
+        plan["context"],
+        datasets=snapshot_datasets,
+        user_sample_size=user_sample_size,
+        fields=plan["fields"],
+    )
+    check_timings = {}
+    result = build_evaluate_summary(
+        sections,
+        domain,
+        extra_context=extra_context,
+        selection=check_selection,
+        timings=check_timings,
+        thresholds=thresholds,
+    )
+    pdf_key = _pdf_content_key("evaluate", result)
+    run_id = save_run(
+        "evaluate",
+        {
+            "sections": sections,
+            "validations": result.get("security_validations") or [],
+            "evaluation": result,
+            "datasets": extra_context,
+        },
+        domain=domain,
+        section_count=len(sections),
+        validation_count=len(result.get("security_validations") or []),
+        check_selection=check_selection,
+        check_timings=check_timings,
+        threshold_overrides=result.get("threshold_overrides") or {},
+        user_sample_size=user_sample_size,
+        pdf_key=pdf_key,
+    )
+    return result, run_id, pdf_key
+
+
 @app.route("/evaluate", methods=["GET", "POST"])
 @app.route("/validate", methods=["GET", "POST"])
 def okta_evaluate():
@@ -4710,7 +1640,24 @@ def okta_evaluate():
             return render_template(
                 "okta_evaluate.html",
                 form_error="Please provide the Okta domain and API token before running evaluation.",
-                form_values={"domain": domain},
+                form_values={"domain": domain, "checks": request.form.get("checks") or ""},
+            ), 400
+
+        check_selection = (request.form.get("checks") or "").strip()
+        user_sample = (request.form.get("user_sample") or "").strip()
+        form_values = {"domain": domain, "checks": check_selection, "user_sample": user_sample}
+        if user_sample and (not user_sample.isdigit() or int(user_sample) < 1):
+            return render_template(
+                "okta_evaluate.html",
+                form_error="User sample size must be a positive whole number, or empty to evaluate every user.",
+                form_values=form_values,
+            ), 400
+        plan = plan_security_checks(check_selection)
+        if not plan["checks"]:
+            return render_template(
+                "okta_evaluate.html",
+                form_error=f"No OktaEvaluate checks match '{check_selection}'. Use check IDs or prefixes such as APP, POL-01.",
+                form_values=form_values,
             ), 400
 
         token_valid, token_message = _validate_okta_api_token(domain, api_token)
@@ -4718,40 +1665,32 @@ def okta_evaluate():
             return render_template(
                 "okta_evaluate.html",
                 form_error=token_message,
-                form_values={"domain": domain},
+                form_values=form_values,
             ), 400
 
-        logger.info("Running OktaEvaluate readiness assessment for %s.", domain)
-        sections, _ = build_oktasnapshot_guide(domain, api_token)
-        all_apps = get_all_applications(domain, api_token, limit=200) or []
-        all_users = get_users_with_security_context(domain, api_token, limit=200) or []
-        api_tokens = get_api_tokens_with_metadata(domain, api_token, limit=200) or []
-        custom_admin_roles = get_custom_admin_roles(domain, api_token, limit=200) or []
-        resource_sets = get_resource_sets(domain, api_token, limit=200) or []
-        resource_set_bindings = []
-        for resource_set in resource_sets:
-            resource_set_id = resource_set.get("id")
-            if not resource_set_id:
-                continue
-            resource_set_bindings.extend(
-                get_resource_set_bindings(domain, api_token, resource_set_id, limit=200) or []
-            )
-        result = _build_evaluate_summary(
-            sections,
+        logger.info(
+            "Running OktaEvaluate readiness assessment for %s (%s check group(s), %s section(s), inventories: %s).",
             domain,
-            extra_context={
-                "all_apps": all_apps,
-                "all_users": all_users,
-                "api_tokens": api_tokens,
-                "custom_admin_roles": custom_admin_roles,
-                "resource_set_bindings": resource_set_bindings,
-            },
+            len(plan["checks"]),
+            len(plan["sections"]) if check_selection else "all",
+            ", ".join(plan["context"]) or "none",
+        )
+        result, run_id, pdf_key = _run_evaluation(
+            domain,
+            api_token,
+            check_selection,
+            plan,
+            user_sample_size=int(user_sample) if user_sample else None,
         )
         OKTAEVALUATE_EXPORT["evaluation"] = result
+        OKTAEVALUATE_EXPORT["pdf_key"] = pdf_key
+        OKTAEVALUATE_EXPORT["run_id"] = run_id
+        if _weasyprint_available():
+            _schedule_pdf_export(OKTAEVALUATE_EXPORT["pdf_key"], _render_evaluate_pdf, result)
         return render_template(
             "okta_evaluate.html",
             evaluation=result,
-            form_values={"domain": domain},
+            form_values=form_values,
         )
 
     logger.info("Rendering OktaEvaluate page.")
@@ -4776,42 +1715,17 @@ def okta_evaluate_export_pdf():
     evaluation = OKTAEVALUATE_EXPORT.get("evaluation")
     if not evaluation:
         logger.warning("No OktaEvaluate data found for PDF export.")
-    try:
-        from weasyprint import HTML
-    except Exception:
-        logger.exception("WeasyPrint not available for OktaEvaluate PDF export.")
+    if not _weasyprint_available():
+        logger.error("WeasyPrint not available for OktaEvaluate PDF export.")
         return render_template(
             "oktacompare_error.html",
             title="PDF Export Unavailable",
             message="PDF export requires WeasyPrint. Please install it and retry.",
         ), 500
 
-    html = render_template(
-        "okta_evaluate_pdf.html",
-        evaluation=evaluation or {
-            "domain": "",
-            "generated_at": "",
-            "security_validations": [],
-            "overall_score": "",
-            "readiness_band": "",
-            "check_prefix_legend": CHECK_PREFIX_LEGEND,
-            "validation_summary": {
-                "assessed": 0,
-                "passed": 0,
-                "high": 0,
-                "medium": 0,
-                "low": 0,
-                "high_passed": 0,
-                "medium_passed": 0,
-                "low_passed": 0,
-                "pass_pct": 0,
-                "high_pass_pct": 0,
-                "medium_pass_pct": 0,
-                "low_pass_pct": 0,
-            },
-        },
-    )
-    pdf = HTML(string=html).write_pdf()
+    evaluation = evaluation or EMPTY_EVALUATION
+    pdf_key = OKTAEVALUATE_EXPORT.get("pdf_key") or _pdf_content_key("evaluate", evaluation)
+    pdf = _get_pdf_export(pdf_key, _render_evaluate_pdf, evaluation)
     return send_file(
         io.BytesIO(pdf),
         mimetype="application/pdf",
@@ -4820,6 +1734,535 @@ def okta_evaluate_export_pdf():
     )
 
 
+# ---------------------------------------------------
+# Fleet evaluation: one evaluate run per org, aggregated into a check x org matrix.
+# Orgs run concurrently up to FLEET_WORKERS; requests to each org share that org's
+# rate limit budget (see scripts/oktasnapshot_utils.rate_limited_get).
+# ---------------------------------------------------
+FLEET_WORKERS = int(os.environ.get("OKTAVERSE_FLEET_WORKERS") or 0) or 4
+
+
+def _fleet_org_labels(orgs):
+    """Unique matrix column label per org: its name, else its domain (suffixed when repeated)."""
+    labels = []
+    seen = {}
+    for org in orgs:
+        label = str(org.get("name") or org.get("domain") or "org").strip()
+        seen[label] = seen.get(label, 0) + 1
+        labels.append(label if seen[label] == 1 else f"{label} ({seen[label]})")
+    return labels
+
+
+def _evaluate_fleet_org(label, org, check_selection, plan, thresholds, user_sample_size):
+    domain = str(org.get("domain") or "").strip()
+    api_token = str(org.get("api_token") or "").strip()
+    outcome = {"org": label, "domain": domain, "run_id": None, "error": None}
+    if not domain or not api_token:
+        outcome["error"] = "Missing domain or api_token."
+        return outcome, []
+    token_valid, token_message = _validate_okta_api_token(domain, api_token)
+    if not token_valid:
+        outcome["error"] = token_message
+        return outcome, []
+    try:
+        result, run_id, _ = _run_evaluation(
+            domain,
+            api_token,
+            check_selection,
+            plan,
+            thresholds=thresholds,
+            user_sample_size=user_sample_size,
+        )
+    except Exception as exc:
+        logger.exception("Fleet evaluation failed for %s.", domain)
+        outcome["error"] = str(exc) or exc.__class__.__name__
+        return outcome, []
+    outcome.update(
+        {
+            "run_id": run_id,
+            "overall_score": result.get("overall_score"),
+            "readiness_band": result.get("readiness_band"),
+            "validation_summary": result.get("validation_summary"),
+            "identity_risk_estimates": result.get("identity_risk_estimates"),
+        }
+    )
+    return outcome, result.get("security_validations") or []
+
+
+def _run_fleet_evaluation(orgs, check_selection="", thresholds=None, workers=None, user_sample_size=None):
+    """
+    Evaluate every org in orgs ([{"domain", "api_token", "name"?}]) and store a "fleet" run
+    with the posture matrix and every org's validations (tagged with "org"). Each org's evaluation is also stored
+    as its own evaluate run; run_ids the store no longer holds are reported as None.
+    """
+    resolve_evaluate_thresholds(thresholds)
+    plan = plan_security_checks(check_selection)
+    if not plan["checks"]:
+        raise ValueError(f"No OktaEvaluate checks match '{check_selection}'.")
+    labels = _fleet_org_labels(orgs)
+    workers = max(1, min(workers or FLEET_WORKERS, len(orgs) or 1))
+    logger.info("Running OktaEvaluate for %s org(s) with %s worker(s).", len(orgs), workers)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="oktaevaluate-fleet") as executor:
+        outcomes = list(
+            executor.map(
+                lambda pair: _evaluate_fleet_org(pair[0], pair[1], check_selection, plan, thresholds, user_sample_size),
+                zip(labels, orgs),
+            )
+        )
+    matrix = build_fleet_posture_matrix(
+        {outcome["org"]: validations for outcome, validations in outcomes if not outcome["error"]}
+    )
+    org_results = [outcome for outcome, _ in outcomes]
+    failed_orgs = [outcome["org"] for outcome in org_results if outcome["error"]]
+    run_id = save_run(
+        "fleet",
+        {
+            "orgs": org_results,
+            "matrix": matrix["rows"],
+            # One list for every org, so /api/v1/runs/<fleet run_id>/validations pages it like an evaluate run.
+            "validations": [
+                {"org": outcome["org"], **validation}
+                for outcome, validations in outcomes
+                if not outcome["error"]
+                for validation in validations
+            ],
+        },
+        org_count=len(orgs),
+        failed_orgs=failed_orgs,
+        check_selection=check_selection,
+        fleet_summary=matrix["summary"],
+        elapsed_seconds=round(time.perf_counter() - started, 3),
+    )
+    # Without OKTAVERSE_RUN_DIR the in-memory store keeps RUN_STORE_MAX_RUNS runs, so a large
+    # fleet evicts its own earliest org runs; those orgs are only kept inside the fleet run.
+    evicted_orgs = [
+        outcome["org"] for outcome in org_results
+        if outcome["run_id"] and get_run(outcome["run_id"]) is None
+    ]
+    for outcome in org_results:
+        if outcome["org"] in evicted_orgs:
+            outcome["run_id"] = None
+    if evicted_orgs:
+        logger.warning(
+            "%s org run(s) of fleet run %s were evicted from the run store; their validations are "
+            "kept in the fleet run. Set OKTAVERSE_RUN_DIR to keep every org run.",
+            len(evicted_orgs),
+            run_id,
+        )
+    return {
+        "run_id": run_id,
+        "orgs": org_results,
+        "failed_orgs": failed_orgs,
+        "matrix_orgs": matrix["orgs"],
+        "summary": matrix["summary"],
+        "matrix": matrix["rows"],
+    }
+
+
+def _fleet_matrix_csv_bytes(orgs, rows):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["Check ID", "Title", "Severity", "Failed", *orgs])
+    for row in rows:
+        writer.writerow(
+            [row.get("check_id"), row.get("title"), row.get("severity"), row.get("failed")]
+            + [row["statuses"].get(org) or "" for org in orgs]
+        )
+    return output.getvalue().encode("utf-8-sig")
+
+
+# ---------------------------------------------------
+# JSON API (v1)
+# ---------------------------------------------------
+API_DEFAULT_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+
+# Run kinds that can answer each resource when "latest" is used as the run_id.
+_API_RESOURCE_KINDS = {
+    "diffs": ("compare",),
+    "matches": ("compare",),
+    "categories": ("compare",),
+    "sections": ("snapshot", "evaluate"),
+    "validations": ("evaluate",),
+    "datasets": ("evaluate",),
+    "matrix": ("fleet",),
+}
+
+
+def _api_error(message, status):
+    return jsonify({"error": message}), status
+
+
+def _api_resolve_run(run_id, resource=None):
+    if run_id == "latest":
+        return latest_run(_API_RESOURCE_KINDS.get(resource))
+    return get_run(run_id)
+
+
+def _api_multi_arg(name):
+    """Query values given as repeated params and/or comma-separated lists."""
+    values = []
+    for raw in request.args.getlist(name):
+        values.extend(part.strip() for part in raw.split(",") if part.strip())
+    return values
+
+
+def _api_label(value):
+    # "🔴 Critical" and "critical" both normalize to "critical"
+    return re.sub(r"^[^\w]+", "", str(value or "")).strip().lower()
+
+
+def _api_encode_cursor(offset):
+    return base64.urlsafe_b64encode(f"o:{offset}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _api_decode_cursor(cursor):
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, offset = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").split(":", 1)
+        offset = int(offset)
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError("Invalid cursor.")
+    if prefix != "o" or offset < 0:
+        raise ValueError("Invalid cursor.")
+    return offset
+
+
+def _api_filter_rows(rows, filters):
+    """
+    filters: {row field: [accepted values]}; values are matched case-insensitively
+    and ignore the priority emoji, so "critical" matches "🔴 Critical".
+    """
+    active = {
+        field: {_api_label(value) for value in values}
+        for field, values in filters.items()
+        if values
+    }
+    if not active:
+        return rows
+    return [
+        row for row in rows
+        if all(_api_label(row.get(field)) in accepted for field, accepted in active.items())
+    ]
+
+
+def _api_page(run, items, **extra):
+    try:
+        limit = int(request.args.get("limit", API_DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit must be an integer.")
+    limit = max(1, min(limit, API_MAX_PAGE_SIZE))
+    offset = _api_decode_cursor(request.args.get("cursor"))
+
+    page = items[offset:offset + limit]
+    fields = _api_multi_arg("fields")
+    if fields:
+        page = [{field: item.get(field) for field in fields if field in item} for item in page]
+    else:
+        page = [dict(item) for item in page]
+
+    next_offset = offset + limit
+    return jsonify(
+        {
+            "run_id": run.get("run_id"),
+            "total": len(items),
+            "count": len(page),
+            "next_cursor": _api_encode_cursor(next_offset) if next_offset < len(items) else None,
+            **extra,
+            "items": page,
+        }
+    )
+
+
+def _api_run_resource(run_id, resource):
+    run = _api_resolve_run(run_id, resource)
+    if not run:
+        return None, _api_error(f"Run '{run_id}' not found.", 404)
+    if resource not in (run.get("data") or {}):
+        return None, _api_error(f"Run '{run.get('run_id')}' ({run.get('kind')}) has no {resource}.", 404)
+    return run, None
+
+
+@app.route("/api/v1/runs", methods=["GET"])
+def api_list_runs():
+    kind = (request.args.get("kind") or "").strip().lower() or None
+    return jsonify({"runs": list_runs(kind)})
+
+
+@app.route("/api/v1/runs/<run_id>", methods=["GET"])
+def api_get_run(run_id):
+    run = _api_resolve_run(run_id)
+    if not run:
+        return _api_error(f"Run '{run_id}' not found.", 404)
+    return jsonify(run_metadata(run))
+
+
+@app.route("/api/v1/runs/<run_id>/diffs", methods=["GET"])
+def api_run_diffs(run_id):
+    run, error = _api_run_resource(run_id, "diffs")
+    if error:
+        return error
+    rows = _api_filter_rows(
+        run["data"]["diffs"],
+        {
+            "Category": _api_multi_arg("category"),
+            "Priority": _api_multi_arg("priority"),
+            "Difference Type": _api_multi_arg("difference_type"),
+        },
+    )
+    try:
+        return _api_page(run, rows)
+    except ValueError as exc:
+        return _api_error(str(exc), 400)
+
+
+@app.route("/api/v1/runs/<run_id>/matches", methods=["GET"])
+def api_run_matches(run_id):
+    run, error = _api_run_resource(run_id, "matches")
+    if error:
+        return error
+    rows = _api_filter_rows(run["data"]["matches"], {"Category": _api_multi_arg("category")})
+    # Diff-only runs only keep a sample of their matches; say so next to the run-wide count.
+    counts = (
+        {"match_count": run.get("match_count"), "sampled_match_count": run.get("sampled_match_count")}
+        if run.get("diff_only")
+        else {}
+    )
+    try:
+        return _api_page(run, rows, **counts)
+    except ValueError as exc:
+        return _api_error(str(exc), 400)
+
+
+@app.route("/api/v1/runs/<run_id>/report/<category_key>", methods=["GET"])
+def api_run_report_rows(run_id, category_key):
+    """Offset-addressed display rows for the compare report's virtual scroller."""
+    run, error = _api_run_resource(run_id, "categories")
+    if error:
+        return error
+    result = run["data"]["categories"].get(category_key)
+    if result is None:
+        return _api_error(f"Category '{category_key}' not found.", 404)
+    try:
+        offset = max(0, int(request.args.get("offset", 0)))
+        limit = int(request.args.get("limit", REPORT_PAGE_SIZE))
+    except ValueError:
+        return _api_error("offset and limit must be integers.", 400)
+    limit = max(1, min(limit, API_MAX_PAGE_SIZE))
+
+    rows, total = _category_display_rows(
+        result["diffs"],
+        result["matches"],
+        offset=offset,
+        limit=limit,
+        query=request.args.get("q", ""),
+    )
+    return jsonify(
+        {
+            "run_id": run.get("run_id"),
+            "category": category_key,
+            "total": total,
+            "offset": offset,
+            "columns": REPORT_COLUMNS,
+            "rows": [[row.get(col, "") for col in REPORT_COLUMNS] for row in rows],
+        }
+    )
+
+
+@app.route("/api/v1/runs/<run_id>/sections", methods=["GET"])
+def api_run_sections(run_id):
+    run, error = _api_run_resource(run_id, "sections")
+    if error:
+        return error
+    sections = [
+        {
+            "id": section.get("id"),
+            "title": section.get("title"),
+            "description": section.get("description"),
+            "columns": section.get("columns") or [],
+            "row_count": len(section.get("rows") or []),
+        }
+        for section in run["data"]["sections"]
+    ]
+    try:
+        return _api_page(run, sections)
+    except ValueError as exc:
+        return _api_error(str(exc), 400)
+
+
+@app.route("/api/v1/runs/<run_id>/sections/<section_id>/rows", methods=["GET"])
+def api_run_section_rows(run_id, section_id):
+    run, error = _api_run_resource(run_id, "sections")
+    if error:
+        return error
+    section = _section_map(run["data"]["sections"]).get(section_id)
+    if section is None:
+        return _api_error(f"Section '{section_id}' not found.", 404)
+    rows = _api_filter_rows(section.get("rows") or [], {"Entry Type": _api_multi_arg("entry_type")})
+    try:
+        return _api_page(run, rows)
+    except ValueError as exc:
+        return _api_error(str(exc), 400)
+
+
+@app.route("/api/v1/runs/<run_id>/validations", methods=["GET"])
+def api_run_validations(run_id):
+    run, error = _api_run_resource(run_id, "validations")
+    if error:
+        return error
+    rows = _api_filter_rows(
+        run["data"]["validations"],
+        {
+            "status": _api_multi_arg("status"),
+            "severity": _api_multi_arg("severity"),
+            "org": _api_multi_arg("org"),
+        },
+    )
+    check_prefixes = [prefix.upper() for prefix in _api_multi_arg("check_id")]
+    if check_prefixes:
+        rows = [
+            row for row in rows
+            if str(row.get("check_id") or "").upper().startswith(tuple(check_prefixes))
+        ]
+    try:
+        return _api_page(run, rows)
+    except ValueError as exc:
+        return _api_error(str(exc), 400)
+
+
+@app.route("/api/v1/runs/<run_id>/matrix", methods=["GET"])
+def api_run_matrix(run_id):
+    run, error = _api_run_resource(run_id, "matrix")
+    if error:
+        return error
+    rows = _api_filter_rows(run["data"]["matrix"], {"severity": _api_multi_arg("severity")})
+    check_prefixes = [prefix.upper() for prefix in _api_multi_arg("check_id")]
+    if check_prefixes:
+        rows = [
+            row for row in rows
+            if str(row.get("check_id") or "").upper().startswith(tuple(check_prefixes))
+        ]
+    if request.args.get("failed", "").strip().lower() in {"1", "true", "yes"}:
+        rows = [row for row in rows if row.get("failed")]
+    try:
+        return _api_page(run, rows)
+    except ValueError as exc:
+        return _api_error(str(exc), 400)
+
+
+def _reevaluate_selection(run, check_selection=None):
+    """
+    Checks a re-evaluation of the stored run may run: the requested selection capped at
+    the run's own selection (the default), whose sections and inventories it must hold.
+    Raises ValueError when the selection needs data the run did not collect.
+    """
+    stored_selection = run.get("check_selection") or ""
+    if check_selection is None or not str(check_selection).strip():
+        check_selection = stored_selection
+    check_ids = selected_check_ids(check_selection)
+    if stored_selection:
+        stored_ids = set(selected_check_ids(stored_selection))
+        capped_ids = [check_id for check_id in check_ids if check_id in stored_ids]
+        if not capped_ids:
+            raise ValueError(
+                f"No checks in '{check_selection}' were part of this run's selection '{stored_selection}'."
+            )
+        if capped_ids != check_ids:
+            check_selection = ",".join(capped_ids)
+    elif not check_ids:
+        raise ValueError(f"No OktaEvaluate checks match '{check_selection}'.")
+
+    data = run.get("data") or {}
+    plan = plan_security_checks(check_selection)
+    stored_sections = {section.get("id") for section in data.get("sections") or []}
+    stored_datasets = data.get("datasets") or {}
+    missing = [section_id for section_id in plan["sections"] if section_id not in stored_sections]
+    missing += [key for key in plan["context"] if key not in stored_datasets]
+    if missing:
+        raise ValueError(
+            f"Run {run.get('run_id')} did not collect the data these checks need: {', '.join(missing)}."
+        )
+    return check_selection
+
+
+def _reevaluate_run(run, thresholds=None, check_selection=None):
+    """
+    Re-run the evaluate checks and summary against a stored evaluate run's sections and
+    datasets with threshold overrides. Stores the result as a new evaluate run.
+    """
+    data = run.get("data") or {}
+    check_selection = _reevaluate_selection(run, check_selection)
+    check_timings = {}
+    result = build_evaluate_summary(
+        data.get("sections") or [],
+        run.get("domain") or "",
+        extra_context=data.get("datasets") or {},
+        selection=check_selection,
+        timings=check_timings,
+        thresholds=thresholds,
+    )
+    previous_status = {
+        (item.get("check_id"), item.get("title")): item.get("status")
+        for item in data.get("validations") or []
+    }
+    changed = [
+        {
+            "check_id": item.get("check_id"),
+            "title": item.get("title"),
+            "previous_status": previous_status.get((item.get("check_id"), item.get("title"))),
+            "status": item.get("status"),
+        }
+        for item in result.get("security_validations") or []
+        if previous_status.get((item.get("check_id"), item.get("title"))) != item.get("status")
+    ]
+    run_id = save_run(
+        "evaluate",
+        {
+            "sections": data.get("sections") or [],
+            "validations": result.get("security_validations") or [],
+            "evaluation": result,
+            "datasets": data.get("datasets") or {},
+        },
+        domain=run.get("domain") or "",
+        section_count=len(data.get("sections") or []),
+        validation_count=len(result.get("security_validations") or []),
+        check_selection=check_selection,
+        check_timings=check_timings,
+        threshold_overrides=result.get("threshold_overrides") or {},
+        reevaluated_from=run.get("run_id"),
+    )
+    return {
+        "run_id": run_id,
+        "reevaluated_from": run.get("run_id"),
+        "threshold_overrides": result.get("threshold_overrides") or {},
+        "overall_score": result.get("overall_score"),
+        "readiness_band": result.get("readiness_band"),
+        "validation_summary": result.get("validation_summary"),
+        "changed_validations": changed,
+    }
+
+
+@app.route("/api/v1/runs/<run_id>/reevaluate", methods=["POST"])
+def api_run_reevaluate(run_id):
+    """Body: {"thresholds": {name: value}, "checks": "IDs or prefixes"}; both optional."""
+    run, error = _api_run_resource(run_id, "datasets")
+    if error:
+        return error
+    body = request.get_json(silent=True) or {}
+    thresholds = body.get("thresholds") or {}
+    if not isinstance(thresholds, dict):
+        return _api_error("thresholds must be an object of threshold name to value.", 400)
+    checks = body.get("checks")
+    try:
+        result = _reevaluate_run(run, thresholds=thresholds, check_selection=checks)
+    except ValueError as exc:
+        return _api_error(str(exc), 400)
+    return jsonify(result)
+
+
 @app.route("/migrate", methods=["GET", "POST"])
 def okta_migrate():
     if request.method == "POST":
@@ -4943,6 +2386,71 @@ def assets(filename):
     return send_from_directory("templates/static", filename)
 
 
+def _threshold_args(threshold_args):
+    thresholds = {}
+    for arg in threshold_args:
+        name, separator, value = arg.partition("=")
+        if not separator:
+            raise click.BadParameter(f"Expected NAME=VALUE, got '{arg}'.", param_hint="--threshold")
+        thresholds[name.strip()] = value.strip()
+    return thresholds
+
+
+@app.cli.command("reevaluate")
+@click.argument("run_id", default="latest")
+@click.option("--threshold", "-t", "threshold_args", multiple=True, metavar="NAME=VALUE",
+              help="Override an evaluate threshold, e.g. -t session_lifetime_minutes=60. Repeatable.")
+@click.option("--checks", default=None, help="Check IDs or prefixes to run (default: the stored run's selection).")
+def reevaluate_command(run_id, threshold_args, checks):
+    """Re-evaluate a stored evaluate run with different thresholds (needs OKTAVERSE_RUN_DIR across processes)."""
+    run = latest_run("evaluate") if run_id == "latest" else get_run(run_id)
+    if not run or "datasets" not in (run.get("data") or {}):
+        raise click.ClickException(f"No stored evaluate run with datasets found for '{run_id}'.")
+    try:
+        result = _reevaluate_run(run, thresholds=_threshold_args(threshold_args), check_selection=checks)
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(json.dumps(result, indent=2, default=str))
+
+
+@app.cli.command("evaluate-fleet")
+@click.argument("orgs_file", type=click.File("r"))
+@click.option("--checks", default="", help="Check IDs or prefixes to run (default: all).")
+@click.option("--threshold", "-t", "threshold_args", multiple=True, metavar="NAME=VALUE",
+              help="Override an evaluate threshold for every org. Repeatable.")
+@click.option("--workers", type=int, default=None, help="Orgs evaluated concurrently (default: OKTAVERSE_FLEET_WORKERS or 4).")
+@click.option("--csv", "csv_file", type=click.File("wb"), default=None, help="Also write the check x org matrix as CSV.")
+@click.option("--user-sample", type=click.IntRange(min=1), default=None,
+              help="Enrich a stratified sample of this many users per org (admins always included).")
+def evaluate_fleet_command(orgs_file, checks, threshold_args, workers, csv_file, user_sample):
+    """
+    Evaluate many orgs listed in ORGS_FILE, a JSON list of {"domain", "api_token", "name"}
+    objects. "api_token_env" names an environment variable holding the token instead.
+    """
+    try:
+        orgs = json.load(orgs_file)
+    except ValueError as exc:
+        raise click.ClickException(f"Could not parse {orgs_file.name}: {exc}")
+    if not isinstance(orgs, list) or not all(isinstance(org, dict) for org in orgs):
+        raise click.ClickException("The orgs file must contain a JSON list of objects.")
+    for org in orgs:
+        if not org.get("api_token") and org.get("api_token_env"):
+            org["api_token"] = os.environ.get(org["api_token_env"]) or ""
+    try:
+        result = _run_fleet_evaluation(
+            orgs,
+            check_selection=checks,
+            thresholds=_threshold_args(threshold_args),
+            workers=workers,
+            user_sample_size=user_sample,
+        )
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+    if csv_file:
+        csv_file.write(_fleet_matrix_csv_bytes(result["matrix_orgs"], result["matrix"]))
+    click.echo(json.dumps({key: value for key, value in result.items() if key != "matrix"}, indent=2, default=str))
+
+
 # ---------------------------------------------------
 # Run App
 # ---------------------------------------------------
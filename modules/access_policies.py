@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_access_policies import get_access_policies, get_access_policy_rules
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -166,7 +167,7 @@ def compare_access_policies(envA_domain, envA_token, envB_domain, envB_token, li
     policiesB = get_access_policies(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_normalize_policy_name(policy): policy for policy in policiesA}
     dictB = {_normalize_policy_name(policy): policy for policy in policiesB}
@@ -1,3 +1,4 @@
+from modules.compare_rows import match_rows
 from scripts.extract_admin_roles import get_admin_users, get_admin_groups, get_admin_apps
 
 
@@ -17,7 +18,7 @@ def compare_admin_assignments(envA_domain, envA_token, envB_domain, envB_token,
     Returns (diffs, matches).
     """
     diffs = []
-    matches = []
+    matches = match_rows()
     adminsA = get_admin_users(envA_domain, envA_token) or []
     adminsB = get_admin_users(envB_domain, envB_token) or []
 
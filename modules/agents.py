@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_agents import get_agent_pools_with_settings
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -33,7 +34,7 @@ def compare_agents(envA_domain, envA_token, envB_domain, envB_token, limit_per_p
     poolsB = get_agent_pools_with_settings(baseB, envB_token, limit_per_pool_type=limit_per_pool_type) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_agent_pool_key(pool): pool for pool in poolsA}
     dictB = {_agent_pool_key(pool): pool for pool in poolsB}
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_api_tokens import get_api_tokens_with_metadata
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -33,7 +34,7 @@ def compare_api_tokens(envA_domain, envA_token, envB_domain, envB_token, limit=2
     tokensB = get_api_tokens_with_metadata(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_token_name(token): token for token in tokensA}
     dictB = {_token_name(token): token for token in tokensB}
@@ -1,9 +1,10 @@
 import requests
+from modules.compare_rows import match_rows
 from scripts.extract_applications import (
     get_applications,
-    get_application_groups,
     get_application_features,
 )
+from scripts.extract_app_group_assignments import get_app_group_assignments, assigned_group_names
 
 
 def _normalize_app_name(app):
@@ -24,26 +25,6 @@ def _app_display_name(app):
     return f"{name} ({app_type})"
 
 
-def _extract_group_names(groups):
-    names = set()
-    if not groups:
-        return names
-    for g in groups:
-        if isinstance(g, str):
-            names.add(g)
-            continue
-        if isinstance(g, dict):
-            # common shapes: group object from Okta extractors
-            profile = g.get("profile") or {}
-            if isinstance(profile, dict) and profile.get("name"):
-                names.add(profile.get("name"))
-            elif g.get("name"):
-                names.add(g.get("name"))
-            elif g.get("id"):
-                names.add(g.get("id"))
-    return names
-
-
 def _is_profile_source(base, token, app_id, cache):
     if not app_id:
         return False
@@ -116,27 +97,9 @@ def _extra_app(label, extra_env):
     }
 
 
-def _compare_app_group_assignments(app_name, appA, appB, baseA, tokenA, baseB, tokenB, diffs, matches):
-    app_id_A = appA.get("id")
-    app_id_B = appB.get("id")
-
-    groupsA = []
-    groupsB = []
-
-    try:
-        if app_id_A:
-            groupsA = get_application_groups(baseA, tokenA, app_id_A) or []
-    except Exception:
-        groupsA = []
-
-    try:
-        if app_id_B:
-            groupsB = get_application_groups(baseB, tokenB, app_id_B) or []
-    except Exception:
-        groupsB = []
-
-    namesA = _extract_group_names(groupsA)
-    namesB = _extract_group_names(groupsB)
+def _compare_app_group_assignments(app_name, appA, appB, assignmentsA, assignmentsB, diffs, matches):
+    namesA = set(assigned_group_names(assignmentsA, appA.get("id")))
+    namesB = set(assigned_group_names(assignmentsB, appB.get("id")))
 
     if namesA != namesB:
         diffs.append({
@@ -166,12 +129,13 @@ def compare_applications(
     envA_token,
     envB_domain,
     envB_token,
-    compare_group_assignments=False,
+    compare_group_assignments=True,
     app_limit=200,
 ):
     """
     Compare applications between Env A and Env B.
-    Compares application names and, optionally, group assignments for matching apps.
+    Compares application names and, unless disabled, group assignments for matching apps
+    using one app/group assignment map per environment.
     Returns (diffs, matches).
     """
     baseA = f"https://{envA_domain}"
@@ -181,13 +145,17 @@ def compare_applications(
     appsB = get_applications(baseB, envB_token, limit=app_limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
     profile_source_cache_a = {}
     profile_source_cache_b = {}
 
     dictA = {_app_key(a): a for a in appsA}
     dictB = {_app_key(b): b for b in appsB}
 
+    if compare_group_assignments:
+        assignmentsA = get_app_group_assignments(baseA, envA_token, apps=appsA)
+        assignmentsB = get_app_group_assignments(baseB, envB_token, apps=appsB)
+
     # Compare A -> B
     for key, appA in dictA.items():
         label = _app_display_name(appA)
@@ -217,10 +185,8 @@ def compare_applications(
                 app_name=label,
                 appA=appA,
                 appB=appB,
-                baseA=baseA,
-                tokenA=envA_token,
-                baseB=baseB,
-                tokenB=envB_token,
+                assignmentsA=assignmentsA,
+                assignmentsB=assignmentsB,
                 diffs=diffs,
                 matches=matches
             )
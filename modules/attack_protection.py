@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_attack_protection import get_attack_protection_bundle
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -138,7 +139,7 @@ def compare_attack_protection(envA_domain, envA_token, envB_domain, envB_token,
     bundleB = get_attack_protection_bundle(envB_domain, envB_token, limit=limit) or {}
 
     diffs = []
-    matches = []
+    matches = match_rows()
     category = "Access Controls - Attack Protection"
 
     singleton_checks = [
@@ -1,3 +1,4 @@
+from modules.compare_rows import match_rows
 from scripts.extract_authenticators import get_authenticators
 
 
@@ -26,7 +27,7 @@ def compare_authenticators(envA_domain, envA_token, envB_domain, envB_token, lim
     authB = get_authenticators(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_auth_key(a): a for a in authA}
     dictB = {_auth_key(b): b for b in authB}
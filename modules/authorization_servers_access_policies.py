@@ -1,10 +1,7 @@
 import json
 
-from scripts.extract_authorization_servers import (
-    get_authorization_servers,
-    get_authorization_server_policies,
-    get_authorization_server_policy_rules,
-)
+from modules.compare_rows import match_rows
+from scripts.extract_authorization_servers import get_authorization_server_tree
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
 
@@ -35,33 +32,35 @@ def _rules_signature(rules):
     return _signature(normalized)
 
 
-def compare_authorization_servers_access_policies(envA_domain, envA_token, envB_domain, envB_token, limit=200):
+def compare_authorization_servers_access_policies(
+    envA_domain, envA_token, envB_domain, envB_token, limit=200, treeA=None, treeB=None
+):
     """
     Compare authorization server access policies by authorization server name.
+    treeA / treeB: optional prefetched get_authorization_server_tree results.
     Returns (diffs, matches).
     """
     baseA = f"https://{envA_domain}"
     baseB = f"https://{envB_domain}"
 
-    serversA = get_authorization_servers(baseA, envA_token, limit=limit) or []
-    serversB = get_authorization_servers(baseB, envB_token, limit=limit) or []
+    if treeA is None:
+        treeA = get_authorization_server_tree(baseA, envA_token, parts=("policies",), limit=limit)
+    if treeB is None:
+        treeB = get_authorization_server_tree(baseB, envB_token, parts=("policies",), limit=limit)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
-    dictA = {s.get("name") or s.get("id"): s for s in serversA}
-    dictB = {s.get("name") or s.get("id"): s for s in serversB}
+    dictA = {n["server"].get("name") or n["server"].get("id"): n for n in treeA}
+    dictB = {n["server"].get("name") or n["server"].get("id"): n for n in treeB}
 
-    for name, serverA in dictA.items():
+    for name, nodeA in dictA.items():
         if name not in dictB:
             continue
 
-        serverB = dictB[name]
-        policiesA = get_authorization_server_policies(baseA, envA_token, serverA.get("id"), limit=limit) or []
-        policiesB = get_authorization_server_policies(baseB, envB_token, serverB.get("id"), limit=limit) or []
-
-        polA_map = {p.get("name") or p.get("id"): p for p in policiesA}
-        polB_map = {p.get("name") or p.get("id"): p for p in policiesB}
+        nodeB = dictB[name]
+        polA_map = {e["policy"].get("name") or e["policy"].get("id"): e for e in nodeA["policies"]}
+        polB_map = {e["policy"].get("name") or e["policy"].get("id"): e for e in nodeB["policies"]}
 
         for pol_name, polA in polA_map.items():
             if pol_name not in polB_map:
@@ -79,14 +78,7 @@ def compare_authorization_servers_access_policies(envA_domain, envA_token, envB_
                 continue
 
             polB = polB_map[pol_name]
-            rulesA = get_authorization_server_policy_rules(
-                baseA, envA_token, serverA.get("id"), polA.get("id"), limit=limit
-            )
-            rulesB = get_authorization_server_policy_rules(
-                baseB, envB_token, serverB.get("id"), polB.get("id"), limit=limit
-            )
-
-            if _rules_signature(rulesA) != _rules_signature(rulesB):
+            if _rules_signature(polA["rules"]) != _rules_signature(polB["rules"]):
                 diffs.append({
                     "Category": "Authorization Servers - Access Policies",
                     "Object": name,
@@ -1,10 +1,7 @@
 import json
 
-from scripts.extract_authorization_servers import (
-    get_authorization_servers,
-    get_authorization_server_claims,
-    get_authorization_server_scopes,
-)
+from modules.compare_rows import match_rows
+from scripts.extract_authorization_servers import get_authorization_server_tree
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
 
@@ -29,24 +26,29 @@ def _normalize_named(items, name_key="name"):
     return normalized
 
 
-def compare_authorization_servers_settings(envA_domain, envA_token, envB_domain, envB_token, limit=200):
+def compare_authorization_servers_settings(
+    envA_domain, envA_token, envB_domain, envB_token, limit=200, treeA=None, treeB=None
+):
     """
     Compare authorization servers by name; if match, compare settings, claims, and scopes.
+    treeA / treeB: optional prefetched get_authorization_server_tree results.
     Returns (diffs, matches).
     """
     baseA = f"https://{envA_domain}"
     baseB = f"https://{envB_domain}"
 
-    serversA = get_authorization_servers(baseA, envA_token, limit=limit) or []
-    serversB = get_authorization_servers(baseB, envB_token, limit=limit) or []
+    if treeA is None:
+        treeA = get_authorization_server_tree(baseA, envA_token, parts=("claims", "scopes"), limit=limit)
+    if treeB is None:
+        treeB = get_authorization_server_tree(baseB, envB_token, parts=("claims", "scopes"), limit=limit)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
-    dictA = {s.get("name") or s.get("id"): s for s in serversA}
-    dictB = {s.get("name") or s.get("id"): s for s in serversB}
+    dictA = {n["server"].get("name") or n["server"].get("id"): n for n in treeA}
+    dictB = {n["server"].get("name") or n["server"].get("id"): n for n in treeB}
 
-    for name, serverA in dictA.items():
+    for name, nodeA in dictA.items():
         if name not in dictB:
             diffs.append({
                 "Category": "Authorization Servers - Settings",
@@ -61,8 +63,8 @@ def compare_authorization_servers_settings(envA_domain, envA_token, envB_domain,
             })
             continue
 
-        serverB = dictB[name]
-        if _signature(serverA) != _signature(serverB):
+        nodeB = dictB[name]
+        if _signature(nodeA["server"]) != _signature(nodeB["server"]):
             diffs.append({
                 "Category": "Authorization Servers - Settings",
                 "Object": name,
@@ -82,9 +84,7 @@ def compare_authorization_servers_settings(envA_domain, envA_token, envB_domain,
                 "Value": "Match"
             })
 
-        claimsA = get_authorization_server_claims(baseA, envA_token, serverA.get("id"), limit=limit)
-        claimsB = get_authorization_server_claims(baseB, envB_token, serverB.get("id"), limit=limit)
-        if _signature(_normalize_named(claimsA)) != _signature(_normalize_named(claimsB)):
+        if _signature(_normalize_named(nodeA["claims"])) != _signature(_normalize_named(nodeB["claims"])):
             diffs.append({
                 "Category": "Authorization Servers - Settings",
                 "Object": name,
@@ -104,9 +104,7 @@ def compare_authorization_servers_settings(envA_domain, envA_token, envB_domain,
                 "Value": "Match"
             })
 
-        scopesA = get_authorization_server_scopes(baseA, envA_token, serverA.get("id"), limit=limit)
-        scopesB = get_authorization_server_scopes(baseB, envB_token, serverB.get("id"), limit=limit)
-        if _signature(_normalize_named(scopesA)) != _signature(_normalize_named(scopesB)):
+        if _signature(_normalize_named(nodeA["scopes"])) != _signature(_normalize_named(nodeB["scopes"])):
             diffs.append({
                 "Category": "Authorization Servers - Settings",
                 "Object": name,
@@ -1,6 +1,7 @@
 import json
 
-from scripts.extract_brands import get_brands, get_brand_email_templates
+from modules.compare_rows import match_rows
+from scripts.extract_brands import get_brand_tree
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
 
@@ -81,30 +82,34 @@ def _template_preview(rows, key):
     return f"{len(values)} variants"
 
 
-def compare_brand_email_templates(envA_domain, envA_token, envB_domain, envB_token, limit=200):
+def compare_brand_email_templates(
+    envA_domain, envA_token, envB_domain, envB_token, limit=200, treeA=None, treeB=None
+):
     """
     Compare brand email templates for matching brand names only.
+    treeA / treeB: optional prefetched get_brand_tree results.
     Returns (diffs, matches).
     """
     baseA = f"https://{envA_domain}"
     baseB = f"https://{envB_domain}"
 
-    brandsA = get_brands(baseA, envA_token, limit=limit) or []
-    brandsB = get_brands(baseB, envB_token, limit=limit) or []
+    if treeA is None:
+        treeA = get_brand_tree(baseA, envA_token, parts=("email_templates",), limit=limit)
+    if treeB is None:
+        treeB = get_brand_tree(baseB, envB_token, parts=("email_templates",), limit=limit)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
-    dictA = {_brand_key(b): b for b in brandsA}
-    dictB = {_brand_key(b): b for b in brandsB}
+    dictA = {_brand_key(n["brand"]): n for n in treeA}
+    dictB = {_brand_key(n["brand"]): n for n in treeB}
 
-    for name, brandA in dictA.items():
+    for name, nodeA in dictA.items():
         if name not in dictB:
             continue
 
-        brandB = dictB[name]
-        templatesA = get_brand_email_templates(baseA, envA_token, brandA.get("id"), limit=limit) or {}
-        templatesB = get_brand_email_templates(baseB, envB_token, brandB.get("id"), limit=limit) or {}
+        templatesA = nodeA["email_templates"]
+        templatesB = dictB[name]["email_templates"]
         customizationsA_map = templatesA.get("customizations") or {}
         customizationsB_map = templatesB.get("customizations") or {}
         defaultsA_map = templatesA.get("defaults") or {}
@@ -1,7 +1,8 @@
 import json
 import logging
 
-from scripts.extract_brands import get_brands, get_brand_pages
+from modules.compare_rows import match_rows
+from scripts.extract_brands import get_brand_tree
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,30 +34,34 @@ def _widget_customizations_signature(page):
     return json.dumps(_sanitize(customizations), sort_keys=True, default=str)
 
 
-def compare_brand_pages(envA_domain, envA_token, envB_domain, envB_token, limit=200):
+def compare_brand_pages(
+    envA_domain, envA_token, envB_domain, envB_token, limit=200, treeA=None, treeB=None
+):
     """
     Compare brand pages (sign-in and error) for matching brand names only.
+    treeA / treeB: optional prefetched get_brand_tree results.
     Returns (diffs, matches).
     """
     baseA = f"https://{envA_domain}"
     baseB = f"https://{envB_domain}"
 
-    brandsA = get_brands(baseA, envA_token, limit=limit) or []
-    brandsB = get_brands(baseB, envB_token, limit=limit) or []
+    if treeA is None:
+        treeA = get_brand_tree(baseA, envA_token, parts=("pages",), limit=limit)
+    if treeB is None:
+        treeB = get_brand_tree(baseB, envB_token, parts=("pages",), limit=limit)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
-    dictA = {_brand_key(b): b for b in brandsA}
-    dictB = {_brand_key(b): b for b in brandsB}
+    dictA = {_brand_key(n["brand"]): n for n in treeA}
+    dictB = {_brand_key(n["brand"]): n for n in treeB}
 
-    for name, brandA in dictA.items():
+    for name, nodeA in dictA.items():
         if name not in dictB:
             continue
 
-        brandB = dictB[name]
-        pagesA = get_brand_pages(baseA, envA_token, brandA.get("id"))
-        pagesB = get_brand_pages(baseB, envB_token, brandB.get("id"))
+        pagesA = nodeA["pages"]
+        pagesB = dictB[name]["pages"]
 
         for page_key, label in (("sign_in", "Sign-In Page"), ("error", "Error Page")):
             if page_key == "sign_in":
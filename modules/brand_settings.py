@@ -1,4 +1,5 @@
-from scripts.extract_brands import get_brands, get_brand_themes
+from modules.compare_rows import match_rows
+from scripts.extract_brands import get_brand_tree
 
 
 def _brand_key(brand):
@@ -41,24 +42,30 @@ def _brand_settings(brand):
     }
 
 
-def compare_brand_settings(envA_domain, envA_token, envB_domain, envB_token, limit=200):
+def compare_brand_settings(
+    envA_domain, envA_token, envB_domain, envB_token, limit=200, treeA=None, treeB=None
+):
     """
     Compare brand settings between Env A and Env B (theme logo/primary/secondary colors).
+    treeA / treeB: optional prefetched get_brand_tree results.
     Returns (diffs, matches).
     """
     baseA = f"https://{envA_domain}"
     baseB = f"https://{envB_domain}"
 
-    brandsA = get_brands(baseA, envA_token, limit=limit) or []
-    brandsB = get_brands(baseB, envB_token, limit=limit) or []
+    if treeA is None:
+        treeA = get_brand_tree(baseA, envA_token, parts=("themes",), limit=limit)
+    if treeB is None:
+        treeB = get_brand_tree(baseB, envB_token, parts=("themes",), limit=limit)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
-    dictA = {_brand_key(b): b for b in brandsA}
-    dictB = {_brand_key(b): b for b in brandsB}
+    dictA = {_brand_key(n["brand"]): n for n in treeA}
+    dictB = {_brand_key(n["brand"]): n for n in treeB}
 
-    for name, brandA in dictA.items():
+    for name, nodeA in dictA.items():
+        brandA = nodeA["brand"]
         if name not in dictB:
             diffs.append({
                 "Category": "Brand Settings",
@@ -73,9 +80,9 @@ def compare_brand_settings(envA_domain, envA_token, envB_domain, envB_token, lim
             })
             continue
 
-        brandB = dictB[name]
-        themeA = _pick_theme(get_brand_themes(baseA, envA_token, brandA.get("id")) or [])
-        themeB = _pick_theme(get_brand_themes(baseB, envB_token, brandB.get("id")) or [])
+        brandB = dictB[name]["brand"]
+        themeA = _pick_theme(nodeA["themes"])
+        themeB = _pick_theme(dictB[name]["themes"])
 
         settingsA = _brand_settings(brandA)
         settingsB = _brand_settings(brandB)
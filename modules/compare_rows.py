@@ -0,0 +1,149 @@
+import logging
+import os
+import random
+import sys
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+)
+logger = logging.getLogger("okta_compare")
+
+# Fields whose short string values repeat across many rows (category names, difference
+# types, priorities, "Exists"/"Missing"...); those values are interned when compacting.
+SHARED_VALUE_FIELDS = frozenset({
+    "Category",
+    "Attribute",
+    "Env A Value",
+    "Env B Value",
+    "Value",
+    "Difference Type",
+    "Impact",
+    "Priority",
+})
+SHARED_VALUE_MAX_LENGTH = 64
+
+# Matches kept per compare function in diff-only mode; the rest are only counted.
+COMPARE_MATCH_SAMPLE_SIZE = int(os.environ.get("OKTAVERSE_MATCH_SAMPLE") or 0) or 25
+
+# Key tuple -> (keys, {key: position}); rows with the same keys share one layout.
+_LAYOUTS = {}
+
+# Match sample size while a diff-only compare runs (None: keep every match).
+_MATCH_SAMPLE_SIZE = ContextVar("okta_compare_match_sample_size", default=None)
+
+
+class CompareRow(Mapping):
+    """Read-only diff / match record: a shared key layout plus a tuple of values."""
+
+    __slots__ = ("_layout", "_values")
+
+    def __init__(self, layout, values):
+        self._layout = layout
+        self._values = values
+
+    def __getitem__(self, key):
+        return self._values[self._layout[1][key]]
+
+    def get(self, key, default=None):
+        position = self._layout[1].get(key)
+        return default if position is None else self._values[position]
+
+    def __contains__(self, key):
+        return key in self._layout[1]
+
+    def __iter__(self):
+        return iter(self._layout[0])
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"CompareRow({dict(self)!r})"
+
+
+class MatchTally(list):
+    """
+    Match list for diff-only compares: counts every appended match (total) but keeps
+    only a uniform random sample of sample_size of them.
+    """
+
+    __slots__ = ("total", "_sample_size", "_random")
+
+    def __init__(self, sample_size):
+        super().__init__()
+        self.total = 0
+        self._sample_size = sample_size
+        self._random = random.Random(0)
+
+    def append(self, row):
+        self.total += 1
+        if len(self) < self._sample_size:
+            super().append(row)
+            return
+        position = self._random.randrange(self.total)
+        if position < self._sample_size:
+            self[position] = row
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __iadd__(self, rows):
+        self.extend(rows)
+        return self
+
+
+def _layout(keys):
+    layout = _LAYOUTS.get(keys)
+    if layout is None:
+        layout = _LAYOUTS.setdefault(keys, (keys, {key: position for position, key in enumerate(keys)}))
+    return layout
+
+
+def _shared_value(key, value):
+    if key in SHARED_VALUE_FIELDS and type(value) is str and len(value) <= SHARED_VALUE_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def compact_row(row):
+    """CompareRow holding the same keys and values as the row dict."""
+    if isinstance(row, CompareRow):
+        return row
+    return CompareRow(_layout(tuple(row)), tuple(_shared_value(key, value) for key, value in row.items()))
+
+
+def compact_rows(rows):
+    return [compact_row(row) for row in rows or []]
+
+
+@contextmanager
+def diff_only_matches(sample_size=COMPARE_MATCH_SAMPLE_SIZE):
+    """Within the block, compare functions count matches and keep only a sample of them."""
+    token = _MATCH_SAMPLE_SIZE.set(max(0, int(sample_size)))
+    try:
+        yield
+    finally:
+        _MATCH_SAMPLE_SIZE.reset(token)
+
+
+def match_rows():
+    """Empty match list for a compare function (a MatchTally inside diff_only_matches)."""
+    sample_size = _MATCH_SAMPLE_SIZE.get()
+    return [] if sample_size is None else MatchTally(sample_size)
+
+
+def match_count(matches):
+    """Number of matches a compare function found, including those not kept."""
+    return getattr(matches, "total", len(matches or []))
+
+
+def row_json_default(value):
+    """json default= hook writing compact rows as objects (anything else as str)."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
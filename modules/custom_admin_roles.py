@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_admin_roles import get_custom_admin_roles
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -29,7 +30,7 @@ def compare_custom_admin_roles(envA_domain, envA_token, envB_domain, envB_token,
     rolesB = get_custom_admin_roles(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {r.get("label") or r.get("name") or r.get("id"): r for r in rolesA}
     dictB = {r.get("label") or r.get("name") or r.get("id"): r for r in rolesB}
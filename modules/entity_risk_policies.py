@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_entity_risk_policies import get_entity_risk_policies, get_entity_risk_policy_rules
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -52,7 +53,7 @@ def compare_entity_risk_policies(envA_domain, envA_token, envB_domain, envB_toke
     policiesA = get_entity_risk_policies(envA_domain, envA_token, limit=limit) or []
     policiesB = get_entity_risk_policies(envB_domain, envB_token, limit=limit) or []
     diffs = []
-    matches = []
+    matches = match_rows()
     dictA = {_normalize_policy_name(policy): policy for policy in policiesA}
     dictB = {_normalize_policy_name(policy): policy for policy in policiesB}
 
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_event_hooks import get_event_hooks
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -33,7 +34,7 @@ def compare_event_hooks(envA_domain, envA_token, envB_domain, envB_token, limit=
     hooksB = get_event_hooks(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_event_hook_key(h): h for h in hooksA}
     dictB = {_event_hook_key(h): h for h in hooksB}
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_group_push_mappings import get_group_push_mappings
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -49,7 +50,7 @@ def compare_group_push_mappings(envA_domain, envA_token, envB_domain, envB_token
     mappingsB = get_group_push_mappings(envB_domain, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_mapping_key(mapping): mapping for mapping in mappingsA}
     dictB = {_mapping_key(mapping): mapping for mapping in mappingsB}
@@ -1,4 +1,5 @@
 import requests
+from modules.compare_rows import match_rows
 from scripts.extract_group_rules import (
     get_groups_map,
     get_group_rules
@@ -26,7 +27,7 @@ def compare_group_rules(envA_domain, envA_token, envB_domain, envB_token):
     rulesB = get_group_rules(baseB, envB_token)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     # Convert rule sets into comparable dictionaries
     dictA = {r["name"]: r for r in rulesA}
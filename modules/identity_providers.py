@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_identity_providers import get_identity_providers
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -30,7 +31,7 @@ def compare_identity_providers(envA_domain, envA_token, envB_domain, envB_token,
     idpsB = get_identity_providers(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {i.get("name") or i.get("id"): i for i in idpsA}
     dictB = {i.get("name") or i.get("id"): i for i in idpsB}
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_idp_discovery_policies import (
     get_idp_discovery_policies,
     get_idp_discovery_policy_rules,
@@ -36,7 +37,7 @@ def compare_idp_discovery_policies(envA_domain, envA_token, envB_domain, envB_to
     policiesB = get_idp_discovery_policies(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_normalize_policy_name(p): p for p in policiesA}
     dictB = {_normalize_policy_name(p): p for p in policiesB}
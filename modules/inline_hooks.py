@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_inline_hooks import get_inline_hooks
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -33,7 +34,7 @@ def compare_inline_hooks(envA_domain, envA_token, envB_domain, envB_token, limit
     hooksB = get_inline_hooks(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_inline_hook_key(h): h for h in hooksA}
     dictB = {_inline_hook_key(h): h for h in hooksB}
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_mfa_policies import get_mfa_policies, get_mfa_policy_rules
 
 
@@ -38,7 +39,7 @@ def compare_mfa_policies(envA_domain, envA_token, envB_domain, envB_token, limit
     policiesB = get_mfa_policies(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_normalize_policy_name(p): p for p in policiesA}
     dictB = {_normalize_policy_name(p): p for p in policiesB}
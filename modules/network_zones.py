@@ -1,3 +1,4 @@
+from modules.compare_rows import match_rows
 from scripts.extract_network_zones import get_network_zones
 
 def compare_network_zones(envA_domain, envA_token, envB_domain, envB_token):
@@ -13,7 +14,7 @@ def compare_network_zones(envA_domain, envA_token, envB_domain, envB_token):
     zonesB = get_network_zones(baseB, envB_token)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {z["name"]: z for z in zonesA}
     dictB = {z["name"]: z for z in zonesB}
@@ -0,0 +1,3026 @@
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from modules.oktasnapshot_guide import SNAPSHOT_SECTIONS
+from modules.oktasnapshot_normalize import normalize_section_rows
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+)
+logger = logging.getLogger("okta_compare")
+
+EVALUATE_WORKERS = int(os.environ.get("OKTAVERSE_EVALUATE_WORKERS") or 0) or min(8, os.cpu_count() or 1)
+
+_CHECK_EXECUTOR = ThreadPoolExecutor(max_workers=EVALUATE_WORKERS, thread_name_prefix="oktaevaluate")
+
+SNAPSHOT_SECTION_TITLES = dict(SNAPSHOT_SECTIONS)
+
+# Tunable check thresholds. Runs can override them (see resolve_evaluate_thresholds) to
+# re-evaluate stored datasets without re-crawling the tenant.
+EVALUATE_THRESHOLDS = {
+    "session_lifetime_minutes": 120,
+    "min_password_length": 12,
+    "min_password_history": 24,
+    "max_lockout_attempts": 10,
+    "password_age_days": 90,
+    "unused_account_days": 91,
+    "token_rotation_days": 90,
+    "stale_group_push_days": 90,
+    "weak_mfa_factors": ["SMS", "Voice", "Security Question", "Email"],
+    "weak_authenticator_keys": ["email", "phone", "security_question"],
+}
+
+
+def resolve_evaluate_thresholds(overrides=None):
+    """
+    EVALUATE_THRESHOLDS with overrides applied. List thresholds accept a list or a
+    comma-separated string. Raises ValueError for unknown names or invalid values.
+    """
+    thresholds = dict(EVALUATE_THRESHOLDS)
+    for name, value in (overrides or {}).items():
+        if name not in EVALUATE_THRESHOLDS:
+            raise ValueError(f"Unknown evaluate threshold '{name}'. Known thresholds: {', '.join(EVALUATE_THRESHOLDS)}.")
+        if isinstance(EVALUATE_THRESHOLDS[name], list):
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(",") if item.strip()]
+            if not isinstance(value, (list, tuple)):
+                raise ValueError(f"Threshold '{name}' must be a list or comma-separated string.")
+            thresholds[name] = [str(item) for item in value]
+            continue
+        try:
+            thresholds[name] = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Threshold '{name}' must be an integer, got {value!r}.") from None
+    return thresholds
+
+
+def _thresholds(extra_context):
+    return extra_context.get("thresholds") or EVALUATE_THRESHOLDS
+
+
+def _minutes_label(minutes):
+    if minutes % 60 == 0:
+        hours = minutes // 60
+        return f"{hours} hour{'' if hours == 1 else 's'}"
+    return f"{minutes} minutes"
+
+
+def _index_section(section):
+    """
+    Lookup tables over a section's (row, raw) records, in row order. Partitions keyed by
+    entry type use None for all records.
+    """
+    rows = section.get("rows") or []
+    raw = section.get("raw") or [{} for _ in rows]
+    index = {
+        "by_entry_type": {None: []},
+        "inactive_by_entry_type": {None: []},
+        "rules_by_policy": {},
+        "by_status": {},
+        "by_name": {},
+        "by_setting": {},
+    }
+    for record in zip(rows, raw):
+        row = record[0]
+        entry_type = str(row.get("Entry Type") or "").strip()
+        status = str(row.get("Status") or "").strip().upper()
+        partitions = [index["by_entry_type"]]
+        if _looks_like_inactive(status):
+            partitions.append(index["inactive_by_entry_type"])
+        for partition in partitions:
+            partition[None].append(record)
+            if entry_type:
+                partition.setdefault(entry_type, []).append(record)
+        if entry_type == "Rule":
+            index["rules_by_policy"].setdefault(str(row.get("Policy Name") or "").strip(), []).append(record)
+        index["by_status"].setdefault(status, []).append(record)
+        index["by_name"].setdefault(str(row.get("Name") or "").strip().lower(), []).append(record)
+        index["by_setting"].setdefault(str(row.get("Setting") or "").strip().lower(), row)
+    return index
+
+
+def _section_map(sections):
+    """
+    Sections by id, each with an "index" of lookup tables built once per evaluation.
+    Sections built without the typed "raw" payload are normalized here; their policy and
+    rule payloads are empty, since those are read from the API objects behind the rows.
+    """
+    section_by_id = {}
+    for section in sections or []:
+        if "index" not in section:
+            section = dict(section)
+            if "raw" not in section:
+                raw = normalize_section_rows(section.get("id"), section.get("rows"))
+                if raw is not None:
+                    section["raw"] = raw
+            section["index"] = _index_section(section)
+        section_by_id[section.get("id")] = section
+    return section_by_id
+
+
+def _section_index(section_by_id, section_id):
+    section = section_by_id.get(section_id)
+    if section is None:
+        return _index_section({})
+    if "index" in section:
+        return section["index"]
+    return _section_map([section])[section.get("id")]["index"]
+
+
+def _find_setting_value(section_by_id, section_id, setting_name):
+    row = _section_index(section_by_id, section_id)["by_setting"].get(setting_name.strip().lower())
+    return row.get("Value") if row else None
+
+
+def _status_from_boolish_enabled(value):
+    if value is None:
+        return "Info"
+    normalized = str(value).strip().lower()
+    if normalized in {"enabled", "yes", "true"}:
+        return "Pass"
+    if normalized in {"disabled", "not enabled", "no", "false"}:
+        return "Fail"
+    return "Info"
+
+
+CHECK_PREFIX_LEGEND = [
+    {"prefix": "ORG", "meaning": "Organization Settings"},
+    {"prefix": "SEC", "meaning": "Security General Settings"},
+    {"prefix": "GRP", "meaning": "Groups"},
+    {"prefix": "GRR", "meaning": "Group Rules"},
+    {"prefix": "NET", "meaning": "Network Zones"},
+    {"prefix": "AUT", "meaning": "Authenticators"},
+    {"prefix": "MFA", "meaning": "Authenticator Enrollment Policies"},
+    {"prefix": "PWD", "meaning": "Password Policies"},
+    {"prefix": "APP", "meaning": "Applications and App Sign-On"},
+    {"prefix": "SES", "meaning": "Global Session Policies"},
+    {"prefix": "POL", "meaning": "Cross-Policy and Risk Policy Checks"},
+    {"prefix": "IDP", "meaning": "Identity Providers and IdP Discovery"},
+    {"prefix": "AS", "meaning": "Authorization Servers"},
+    {"prefix": "CAR", "meaning": "Custom Admin Roles"},
+    {"prefix": "RST", "meaning": "Resource Sets"},
+    {"prefix": "ADM", "meaning": "Admin Accounts and Admin Governance"},
+    {"prefix": "GAD", "meaning": "Global Admin Accounts"},
+    {"prefix": "API", "meaning": "API Tokens"},
+    {"prefix": "BRD", "meaning": "Brand Settings"},
+    {"prefix": "TOR", "meaning": "Trusted Origins"},
+    {"prefix": "EVH", "meaning": "Event Hooks"},
+    {"prefix": "INH", "meaning": "Inline Hooks"},
+    {"prefix": "ATP", "meaning": "Attack Protection"},
+    {"prefix": "RLM", "meaning": "Realms"},
+    {"prefix": "PRF", "meaning": "Profile Schema and Mappings"},
+    {"prefix": "GPM", "meaning": "Group Push Mappings"},
+    {"prefix": "USR", "meaning": "User and Service Account Risk"},
+]
+
+
+CHECK_ID_BY_TITLE = {
+    "Organization Support Metadata Completeness": "ORG-01",
+    "Password Changed Notifications": "SEC-01",
+    "Suspicious Activity Reporting for End Users": "SEC-02",
+    "New Sign-On Notifications": "SEC-03",
+    "Factor Enrollment Notifications": "SEC-04",
+    "Factor Reset Notifications": "SEC-05",
+    "ThreatInsight Blocking": "SEC-06",
+    "Groups Missing Description": "GRP-01",
+    "Disabled Group Rules": "GRR-01",
+    "Blocklisted Network Zone Presence": "NET-01",
+    "Network Zones Defined But Not Used In Policies": "NET-02",
+    "Trusted Network Zones Without Entries": "NET-03",
+    "Weak Authenticators Enabled": "AUT-01",
+    "Phishing-Resistant Authenticator Availability": "AUT-02",
+    "Weaker Factors in MFA Enrollment Policies": "MFA-01",
+    "Optional Factors in MFA Enrollment Policies": "MFA-02",
+    "Required Authenticator in MFA Enrollment Policies": "MFA-03",
+    "Password Policy Strength": "PWD-01",
+    "SAML Authentication Supported but Disabled Apps": "APP-01",
+    "Applications Assigned to Everyone": "APP-02",
+    "Password-Based Application Sign-On Modes Present": "APP-03",
+    "App Sign-On Policy Catch-All Deny": "APP-04",
+    "Session Lifetime <= 2 Hours": "SES-01",
+    "High-Risk Request MFA Every Sign-In": "POL-01",
+    "New Device MFA Every Sign-In": "POL-02",
+    "Admin Console MFA Every Sign-In": "POL-03",
+    "Entity Risk Policy Rule Coverage": "POL-04",
+    "Identity Threat Protection Policy Rule Coverage": "POL-05",
+    "Inactive Identity Providers": "IDP-01",
+    "Inactive IdP Discovery Rules": "IDP-02",
+    "Authorization Servers Without Automatic Key Rotation": "AS-01",
+    "Authorization Server Access Rules With Broad Client Scope": "AS-02",
+    "Custom Admin Roles Missing Description": "CAR-01",
+    "Resource Sets Without Resources": "RST-01",
+    "Resource Sets Without Bindings": "RST-02",
+    "Admin Public Client Applications Present": "ADM-01",
+    "No MFA - Admin Account": "ADM-02",
+    "Pending MFA - Admin Account": "ADM-03",
+    "No MFA Enforced - Admin Account": "ADM-04",
+    "SSO Bypass - Admin": "ADM-05",
+    "SSO Bypass + No MFA - Admin": "ADM-06",
+    "Old Password - Admin Account": "ADM-07",
+    "Old Password - Admin Service Account": "ADM-08",
+    "Unused Admin Account": "ADM-09",
+    "Unused Admin Service Account": "ADM-10",
+    "Unused Administrative Roles": "ADM-11",
+    "Service Account with Console Access - Admin": "ADM-12",
+    "Old Password, No MFA, Unused Admin Accounts": "ADM-13",
+    "Old Password, No MFA, Unused Admin Service Accounts": "ADM-14",
+    "Unrotated and Unused Keys and Tokens - Admin": "ADM-15",
+    "Unrotated Keys and Tokens - Admin": "ADM-16",
+    "Unused Keys and Tokens - Admins": "ADM-17",
+    "No MFA - Global Admin Account": "GAD-01",
+    "Pending MFA - Global Admin Account": "GAD-02",
+    "No MFA Enforced - Global Admin Account": "GAD-03",
+    "Old Password - Global Admin Account": "GAD-04",
+    "Old Password - Global Admin Service Account": "GAD-05",
+    "Unused Global Admin Account": "GAD-06",
+    "Unused Global Admin Service Account": "GAD-07",
+    "Excessive Number of Super Admins": "GAD-08",
+    "Super Admin with API Token": "GAD-09",
+    "API Tokens Without Network Restrictions": "API-01",
+    "Brands Missing Custom Privacy Policy URL": "BRD-01",
+    "Insecure Trusted Origins": "TOR-01",
+    "Unverified Event Hooks": "EVH-01",
+    "Event Hooks Without Authentication Scheme": "EVH-02",
+    "Inactive Event Hooks": "EVH-03",
+    "Inline Hooks Without Authentication Scheme": "INH-01",
+    "Inactive Inline Hooks": "INH-02",
+    "Attack Protection Controls Not Enforcing": "ATP-01",
+    "Inactive Realms": "RLM-01",
+    "Realm Default Assignment Coverage": "RLM-02",
+    "Sensitive Writable Profile Attributes": "PRF-01",
+    "Empty Profile Mappings": "PRF-02",
+    "Inactive Group Push Mappings": "GPM-01",
+    "Stale Group Push Mappings": "GPM-02",
+    "No MFA - Account": "USR-01",
+    "Pending MFA": "USR-02",
+    "SSO Bypass - Account": "USR-03",
+    "SSO Bypass + No MFA - Account": "USR-04",
+    "Old Password - Account": "USR-05",
+    "Old Password - Service Account": "USR-06",
+    "Unused Account": "USR-07",
+    "Unused Service Account": "USR-08",
+    "Partially Off-boarded User": "USR-09",
+    "Service Account with Console Access - Account": "USR-10",
+    "Old Password, No MFA, Unused Accounts": "USR-11",
+    "Old Password, No MFA, Unused Service Accounts": "USR-12",
+    "Unrotated and Unused Keys and Tokens - Account": "USR-13",
+    "Unrotated Keys and Tokens - Account": "USR-14",
+    "Unused Keys and Tokens - Account": "USR-15",
+}
+
+
+def _validation(title, status, summary, items=None, severity=None):
+    check_id = CHECK_ID_BY_TITLE.get(title, "")
+    return {
+        "check_id": check_id,
+        "title": title,
+        "status": status,
+        "severity": severity,
+        "summary": summary,
+        "items": items or [],
+    }
+
+
+def _password_policy_weaknesses(raw, thresholds):
+    weaknesses = []
+    min_len = raw.get("min_length")
+    if min_len is not None and min_len < thresholds["min_password_length"]:
+        weaknesses.append(f"minimum length {min_len} (< {thresholds['min_password_length']})")
+
+    for label, minimum in (raw.get("character_minimums") or {}).items():
+        if minimum == 0:
+            weaknesses.append(f"{label.lower()} requirement is 0")
+
+    if raw.get("common_password_restriction_disabled"):
+        weaknesses.append("common password restriction disabled")
+    if raw.get("username_exclusion_disabled"):
+        weaknesses.append("username exclusion disabled")
+
+    if raw.get("min_age_minutes") == 0:
+        weaknesses.append("minimum password age is 0")
+
+    history_count = raw.get("history_count")
+    if history_count is not None and history_count < thresholds["min_password_history"]:
+        weaknesses.append(f"password history {history_count} (< {thresholds['min_password_history']})")
+
+    lockout_attempts = raw.get("lockout_attempts")
+    if lockout_attempts is not None and lockout_attempts > thresholds["max_lockout_attempts"]:
+        weaknesses.append(f"lockout attempts threshold {lockout_attempts} (> {thresholds['max_lockout_attempts']})")
+
+    return weaknesses
+
+
+def _section_records(section_by_id, section_id, entry_type=None, inactive=False):
+    """(row, raw) pairs for a section, optionally limited to one Entry Type and/or inactive rows."""
+    partitions = _section_index(section_by_id, section_id)[
+        "inactive_by_entry_type" if inactive else "by_entry_type"
+    ]
+    return partitions.get(entry_type) or []
+
+
+def _section_rows(section_by_id, section_id, entry_type=None, inactive=False):
+    if entry_type is None and not inactive:
+        return (section_by_id.get(section_id) or {}).get("rows") or []
+    return [row for row, _ in _section_records(section_by_id, section_id, entry_type, inactive)]
+
+
+def _row_map(rows, key_field="Setting", value_field="Value"):
+    mapping = {}
+    for row in rows or []:
+        key = row.get(key_field)
+        if key:
+            mapping[str(key)] = row.get(value_field)
+    return mapping
+
+
+def _blankish(value):
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value.strip() == "" or value.strip().lower() in {"not available", "none", "null"}
+    if isinstance(value, (list, dict, tuple, set)):
+        return len(value) == 0
+    return False
+
+
+def _text(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return str(value or "")
+
+
+def _contains_token(value, tokens):
+    haystack = _text(value).lower()
+    return any(token.lower() in haystack for token in tokens)
+
+
+def _looks_like_inactive(status):
+    return str(status or "").strip().upper() not in {"ACTIVE", "ENABLED", "VERIFIED"}
+
+
+def _parse_iso_datetime(value):
+    if value in (None, ""):
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    if text.endswith("Z"):
+        text = f"{text[:-1]}+00:00"
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _days_since(value):
+    parsed = _parse_iso_datetime(value)
+    if not parsed:
+        return None
+    return (datetime.now(timezone.utc) - parsed.astimezone(timezone.utc)).days
+
+
+def _user_display_name(user):
+    profile = user.get("profile") or {}
+    display_name = (profile.get("displayName") or "").strip()
+    if display_name:
+        return display_name
+    full_name = " ".join(
+        part.strip()
+        for part in [profile.get("firstName") or "", profile.get("lastName") or ""]
+        if str(part).strip()
+    ).strip()
+    if full_name:
+        return full_name
+    return str(profile.get("login") or user.get("id") or "Unknown User")
+
+
+def _user_identifier(user):
+    profile = user.get("profile") or {}
+    login = profile.get("login") or profile.get("email") or user.get("id") or "Unknown User"
+    display_name = _user_display_name(user)
+    if display_name and display_name != login:
+        return f"{login} ({display_name})"
+    return str(login)
+
+
+def _user_provider_type(user):
+    credentials = user.get("credentials") or {}
+    provider = credentials.get("provider") or {}
+    return str(provider.get("type") or "").strip().upper()
+
+
+def _user_role_types(user):
+    role_types = set()
+    for role in user.get("roles") or []:
+        role_type = str(role.get("type") or role.get("label") or role.get("name") or "").strip().upper()
+        if role_type:
+            role_types.add(role_type)
+    return role_types
+
+
+def _pending_factor_types(user):
+    factor_types = set()
+    for factor in user.get("factors") or []:
+        status = str(factor.get("status") or "").strip().upper()
+        if status not in {"PENDING", "PENDING_ACTIVATION"}:
+            continue
+        factor_type = str(factor.get("factorType") or factor.get("factor") or "").strip()
+        provider = str(factor.get("provider") or "").strip()
+        label = f"{factor_type} ({provider})" if provider else factor_type
+        if label:
+            factor_types.add(label)
+    return factor_types
+
+
+def _is_active_token(token):
+    return str(token.get("status") or "").strip().upper() == "ACTIVE"
+
+
+def _token_name(token):
+    return str(token.get("name") or token.get("label") or token.get("id") or "Unknown Token")
+
+
+# Login/email/name tokens that mark a likely non-human account.
+_SERVICE_ACCOUNT_PATTERN = (
+    r"(?:^|[\W_])"
+    r"(?:svc|service|bot|automation|api|daemon|integration|system|noreply|nonhuman|robot|ci|cd|etl|job)"
+    r"(?:[\W_]|$)"
+)
+_UNUSED_USER_STATUSES = ["ACTIVE", "PROVISIONED", "RECOVERY", "LOCKED_OUT", "PASSWORD_EXPIRED", "STAGED"]
+_FEDERATED_PROVIDERS = ["FEDERATION", "SOCIAL"]
+
+# User fields the identity-risk checks read; the user inventory is projected to these at ingest.
+_USER_RISK_FIELDS = (
+    "id",
+    "status",
+    "created",
+    "activated",
+    "lastLogin",
+    "passwordChanged",
+    "profile.login",
+    "profile.email",
+    "profile.displayName",
+    "profile.firstName",
+    "profile.lastName",
+    "profile.title",
+    "profile.department",
+    "credentials.provider",
+    "credentials.password",
+)
+
+_USER_RISK_COLUMNS = [
+    "user_id",
+    "status",
+    "provider",
+    "is_admin",
+    "is_super_admin",
+    "has_mfa",
+    "has_pending_factor",
+    "has_password",
+    "token_count",
+    "password_changed",
+    "last_login",
+]
+_USER_RISK_DTYPES = {
+    "is_admin": bool,
+    "is_super_admin": bool,
+    "has_mfa": bool,
+    "has_pending_factor": bool,
+    "has_password": bool,
+    "token_count": "int64",
+}
+
+
+def _days_since_column(values, now):
+    """Whole days elapsed since each ISO timestamp; NaN where missing or unparseable."""
+    parsed = pd.to_datetime(pd.Series(values, dtype="object"), utc=True, errors="coerce", format="ISO8601")
+    return (now - parsed).dt.days.astype("float64")
+
+
+def _int_text(days):
+    return days.fillna(0).astype("int64").astype(str)
+
+
+def _has_factor(user, statuses):
+    for factor in user.get("factors") or []:
+        if str(factor.get("status") or "").strip().upper() not in statuses:
+            continue
+        if str(factor.get("factorType") or factor.get("factor") or "").strip() or str(factor.get("provider") or "").strip():
+            return True
+    return False
+
+
+def _service_account_text(user):
+    profile = user.get("profile") or {}
+    return " ".join(
+        str(value or "")
+        for value in [
+            profile.get("login"),
+            profile.get("email"),
+            profile.get("displayName"),
+            profile.get("firstName"),
+            profile.get("lastName"),
+            profile.get("title"),
+            profile.get("department"),
+        ]
+    ).lower()
+
+
+def _is_unnamed(user):
+    profile = user.get("profile") or {}
+    return not str(profile.get("firstName") or "").strip() and not str(profile.get("lastName") or "").strip()
+
+
+def _positions(mask):
+    return mask.to_numpy().nonzero()[0].tolist()
+
+
+def _user_risk_table(users, api_tokens, now, thresholds=EVALUATE_THRESHOLDS):
+    """
+    One row per user with the attributes the identity-risk detections need.
+    Dates are parsed once per column and the detection flags are vectorized; labels and
+    other per-user text are only built for users that can appear in a finding.
+    """
+    users = users or []
+    token_counts = {}
+    for token in api_tokens or []:
+        if _is_active_token(token) and token.get("userId"):
+            token_counts[token["userId"]] = token_counts.get(token["userId"], 0) + 1
+
+    records = []
+    for user in users:
+        role_types = _user_role_types(user)
+        records.append((
+            user.get("id"),
+            str(user.get("status") or "").strip().upper(),
+            _user_provider_type(user),
+            bool(role_types),
+            "SUPER_ADMIN" in role_types,
+            _has_factor(user, {"ACTIVE"}),
+            _has_factor(user, {"PENDING", "PENDING_ACTIVATION"}),
+            bool((user.get("credentials") or {}).get("password")),
+            token_counts.get(user.get("id"), 0),
+            user.get("passwordChanged"),
+            user.get("lastLogin"),
+        ))
+    table = pd.DataFrame.from_records(records, columns=_USER_RISK_COLUMNS).astype(_USER_RISK_DTYPES)
+    table["password_days"] = _days_since_column(table.pop("password_changed"), now)
+    table["last_login_days"] = _days_since_column(table.pop("last_login"), now)
+
+    federated = table["provider"].isin(_FEDERATED_PROVIDERS)
+    table["pending_mfa"] = ~table["has_mfa"] & table["has_pending_factor"]
+    table["direct_access"] = ~federated & ((table["provider"] != "") | table["has_password"])
+    table["old_password"] = ~federated & (table["password_days"] >= thresholds["password_age_days"])
+
+    # Without a last login, fall back to activation (or creation when activation is missing/today).
+    unused_status = table["status"].isin(_UNUSED_USER_STATUSES)
+    inactivity_days = table["last_login_days"].copy()
+    fallback = unused_status & inactivity_days.isna()
+    if fallback.any():
+        fallback_users = [users[pos] for pos in _positions(fallback)]
+        activated_days = _days_since_column([user.get("activated") for user in fallback_users], now)
+        created_days = _days_since_column([user.get("created") for user in fallback_users], now)
+        inactivity_days[fallback] = activated_days.where(
+            activated_days.notna() & (activated_days != 0), created_days
+        ).to_numpy()
+    table["unused"] = unused_status & (inactivity_days >= thresholds["unused_account_days"])
+
+    # Service-account status only qualifies old-password, unused and direct-access findings.
+    table["service_account"] = False
+    service_candidates = table["old_password"] | table["unused"] | table["direct_access"]
+    if service_candidates.any():
+        candidate_users = [users[pos] for pos in _positions(service_candidates)]
+        by_name = pd.Series([_service_account_text(user) for user in candidate_users], dtype="object").str.contains(
+            _SERVICE_ACCOUNT_PATTERN, regex=True
+        )
+        unnamed = pd.Series([_is_unnamed(user) for user in candidate_users], dtype=bool)
+        has_tokens = table.loc[service_candidates, "token_count"].to_numpy() > 0
+        table.loc[service_candidates, "service_account"] = by_name.to_numpy(dtype=bool) | (has_tokens & unnamed.to_numpy())
+
+    table["label"] = ""
+    table["pending_factors"] = ""
+    listed = (
+        ~table["has_mfa"] | table["old_password"] | table["unused"] | table["direct_access"]
+        | table["is_admin"] | (table["token_count"] > 0)
+    )
+    if listed.any():
+        table.loc[listed, "label"] = [_user_identifier(users[pos]) for pos in _positions(listed)]
+    if table["pending_mfa"].any():
+        table.loc[table["pending_mfa"], "pending_factors"] = [
+            ", ".join(sorted(_pending_factor_types(users[pos]))) for pos in _positions(table["pending_mfa"])
+        ]
+    return table
+
+
+def _token_risk_table(user_table, api_tokens, now):
+    """One row per active API token joined to its owner, in user then token order."""
+    columns = {"user_id": [], "token_seq": [], "token_name": [], "last_updated": [], "created": []}
+    for seq, token in enumerate(api_tokens or []):
+        if not _is_active_token(token) or not token.get("userId"):
+            continue
+        columns["user_id"].append(token.get("userId"))
+        columns["token_seq"].append(seq)
+        columns["token_name"].append(_token_name(token))
+        columns["last_updated"].append(token.get("lastUpdated"))
+        columns["created"].append(token.get("created"))
+    tokens = pd.DataFrame({name: pd.Series(values, dtype="object") for name, values in columns.items()})
+    last_updated_days = _days_since_column(tokens.pop("last_updated"), now)
+    created_days = _days_since_column(tokens.pop("created"), now)
+    tokens["age_days"] = last_updated_days.where(last_updated_days.notna(), created_days)
+
+    owners = user_table[["user_id", "label", "is_admin", "is_super_admin", "unused"]].copy()
+    owners["user_pos"] = range(len(owners))
+    owners = owners[owners["user_id"].notna()]
+    table = owners.merge(tokens, on="user_id", how="inner")
+    return table.sort_values(["user_pos", "token_seq"], kind="stable").reset_index(drop=True)
+
+
+
+# Identity-risk rates reported with confidence intervals when users were sampled.
+_IDENTITY_RISK_RATE_METRICS = [
+    ("no_mfa", "No MFA"),
+    ("unused", "Unused accounts"),
+    ("old_password", "Old passwords"),
+]
+_CONFIDENCE_Z = 1.96
+
+
+def _wilson_interval(rate, n, z=_CONFIDENCE_Z):
+    if n <= 0:
+        return 0.0, 1.0
+    denominator = 1 + z * z / n
+    center = (rate + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def _identity_risk_estimates(extra_context, thresholds):
+    """
+    Tenant-wide identity-risk rates from a stratified user sample (see
+    get_sampled_users_with_security_context). Admins (sampleStratum None) are counted
+    exactly; each stratum's rate is weighted by its population. The 95% interval is a
+    Wilson interval on the design effective sample size.
+    """
+    sample = extra_context.get("user_sample")
+    if not sample:
+        return None
+    users = extra_context.get("all_users") or []
+    table = _user_risk_table(users, extra_context.get("api_tokens"), pd.Timestamp.now(tz="UTC"), thresholds)
+    table["no_mfa"] = ~table["has_mfa"]
+    table["stratum"] = [user.get("sampleStratum") for user in users]
+    admins = table[table["stratum"].isna()]
+    sampled = table[table["stratum"].notna()]
+    strata_population = {key: entry["population"] for key, entry in (sample.get("strata") or {}).items()}
+    population = len(admins) + sum(strata_population.values())
+
+    metrics = []
+    for metric, label in _IDENTITY_RISK_RATE_METRICS:
+        estimated = float(admins[metric].sum())
+        variance = 0.0
+        for key, group in sampled.groupby("stratum")[metric]:
+            size = strata_population.get(key, len(group))
+            rate = float(group.mean())
+            estimated += size * rate
+            if len(group) > 1:
+                variance += size * size * (1 - len(group) / size) * rate * (1 - rate) / (len(group) - 1)
+        rate = estimated / population if population else 0.0
+        rate_variance = variance / (population * population) if population else 0.0
+        effective_n = rate * (1 - rate) / rate_variance if rate_variance > 0 else len(table)
+        low, high = _wilson_interval(rate, effective_n)
+        metrics.append(
+            {
+                "metric": metric,
+                "label": label,
+                "rate_pct": round(rate * 100, 1),
+                "ci_low_pct": round(low * 100, 1),
+                "ci_high_pct": round(high * 100, 1),
+                "estimated_users": round(estimated),
+                "admins_affected": int(admins[metric].sum()),
+            }
+        )
+    return {
+        "population": population,
+        "sample_size": len(sampled),
+        "admins": len(admins),
+        "confidence_pct": 95,
+        "strata": sample.get("strata") or {},
+        "metrics": metrics,
+    }
+
+def _role_binding_keys(binding_role):
+    keys = set()
+    if isinstance(binding_role, dict):
+        for value in [binding_role.get("id"), binding_role.get("type"), binding_role.get("label"), binding_role.get("name")]:
+            if value:
+                keys.add(str(value).strip())
+                keys.add(str(value).strip().upper())
+    elif binding_role:
+        keys.add(str(binding_role).strip())
+        keys.add(str(binding_role).strip().upper())
+    return keys
+
+
+def _custom_role_usage_map(custom_roles, resource_set_bindings):
+    usage = {}
+    for role in custom_roles or []:
+        keys = set()
+        for value in [role.get("id"), role.get("label"), role.get("name")]:
+            if value:
+                keys.add(str(value).strip())
+                keys.add(str(value).strip().upper())
+        usage[str(role.get("id") or role.get("label") or role.get("name") or "")] = {
+            "role": role,
+            "keys": keys,
+            "used": False,
+        }
+
+    for binding in resource_set_bindings or []:
+        binding_keys = _role_binding_keys(binding.get("role"))
+        if not binding_keys:
+            continue
+        for role_usage in usage.values():
+            if role_usage["keys"] & binding_keys:
+                role_usage["used"] = True
+
+    return usage
+
+
+def _tenant_mfa_enforcement_gaps(section_by_id):
+    mfa_policy_rows = _section_records(section_by_id, "mfa-enrollment-policies", entry_type="Policy")
+    auth_rule_rows = _section_records(section_by_id, "authentication-policies", entry_type="Rule")
+
+    optional_enrollment = any(raw["optional_factors"] for _, raw in mfa_policy_rows)
+    auth_requires_mfa = any(raw["requires_mfa"] for _, raw in auth_rule_rows)
+
+    return {
+        "optional_enrollment": optional_enrollment,
+        "auth_requires_mfa": auth_requires_mfa,
+        "has_data": bool(mfa_policy_rows or auth_rule_rows),
+    }
+
+
+def _identity_validation(title, severity, records, warning_summary, pass_summary, empty_summary=None, data_available=True):
+    if records:
+        return _validation(title, "Fail", warning_summary(records), records[:20], severity=severity)
+    if not data_available and empty_summary:
+        return _validation(title, "Pass", empty_summary, severity=severity)
+    return _validation(title, "Pass", pass_summary, severity=severity)
+
+
+def _unsupported_ispm_validations():
+    return []
+
+
+def _check_catch_all_deny(section_by_id, extra_context):
+    validations = []
+
+    # Validation 1: Catch-all/default rule deny posture in authentication/app sign-on policies
+    auth_rule_rows = _section_records(section_by_id, "authentication-policies", entry_type="Rule")
+
+    policy_map = {}
+    for row, raw in auth_rule_rows:
+        policy_name = row.get("Policy Name") or "Unknown Policy"
+        rule_name = (row.get("Rule Name") or "").strip()
+        if not rule_name:
+            continue
+        bucket = policy_map.setdefault(policy_name, {"catch_all_found": False, "catch_all_denied": False, "details": []})
+        is_catch_all = any(token in rule_name.lower() for token in ["catch", "default", "all"])
+        is_deny, deny_path = raw["deny"], raw["deny_path"]
+        if is_catch_all:
+            bucket["catch_all_found"] = True
+            if is_deny:
+                bucket["catch_all_denied"] = True
+            bucket["details"].append(
+                {
+                    "rule_name": rule_name,
+                    "status": row.get("Status"),
+                    "deny": is_deny,
+                    "deny_path": deny_path,
+                }
+            )
+
+    missing_or_not_deny = []
+    passing = []
+    for policy_name, result in policy_map.items():
+        if result["catch_all_found"] and result["catch_all_denied"]:
+            passing.append(policy_name)
+        else:
+            missing_or_not_deny.append(
+                {
+                    "policy": policy_name,
+                    "issue": "Catch-all/default rule not found or not set to deny",
+                    "details": result["details"],
+                }
+            )
+
+    if not policy_map:
+        validations.append(_validation(
+            "App Sign-On Policy Catch-All Deny",
+            "Pass",
+            "No authentication/app sign-on policy rule data was available to validate catch-all deny posture.",
+            severity="High",
+        ))
+    elif missing_or_not_deny:
+        validations.append(_validation(
+            "App Sign-On Policy Catch-All Deny",
+            "Fail",
+            f"{len(missing_or_not_deny)} policy(s) may not have a catch-all/default deny rule configured.",
+            [f"{item['policy']}: {item['issue']}" for item in missing_or_not_deny],
+            severity="High",
+        ))
+    else:
+        validations.append(_validation(
+            "App Sign-On Policy Catch-All Deny",
+            "Pass",
+            f"Validated catch-all/default deny posture for {len(passing)} authentication/app sign-on policy(ies).",
+            [f"{name}: catch-all/default deny detected" for name in passing[:8]],
+            severity="High",
+        ))
+    return validations
+
+
+def _check_session_lifetime(section_by_id, extra_context):
+    validations = []
+
+    # Validation 2: Session timeout > 2 hours in global session policies
+    session_rule_rows = _section_records(section_by_id, "global-session-policies", entry_type="Rule")
+    limit_minutes = _thresholds(extra_context)["session_lifetime_minutes"]
+    timeout_violations = []
+    for row, raw in session_rule_rows:
+        for duration in raw["session_durations"]:
+            if duration["minutes"] <= limit_minutes:
+                continue
+            timeout_violations.append(
+                {
+                    "policy": row.get("Policy Name") or "Unknown Policy",
+                    "rule": row.get("Rule Name") or "Unnamed Rule",
+                    "path": duration["path"],
+                    "minutes": round(duration["minutes"], 2),
+                    "raw": f"{duration['value']} ({duration['unit']})",
+                }
+            )
+
+    if not session_rule_rows:
+        validations.append(_validation(
+            "Session Lifetime <= 2 Hours",
+            "Pass",
+            "No global session policy rule data was available to validate session timeout settings.",
+            severity="High",
+        ))
+    elif timeout_violations:
+        policy_count = len({(v["policy"]) for v in timeout_violations})
+        validations.append(_validation(
+            "Session Lifetime <= 2 Hours",
+            "Fail",
+            f"Session lifetime duration is more than {_minutes_label(limit_minutes)} on {policy_count} policy(s).",
+            [
+                f"{v['policy']} / {v['rule']}: {v['path']} = {v['raw']} (~{int(v['minutes'])} min)"
+                for v in timeout_violations[:20]
+            ],
+            severity="High",
+        ))
+    else:
+        validations.append(_validation(
+            "Session Lifetime <= 2 Hours",
+            "Pass",
+            f"No session timeout values above {_minutes_label(limit_minutes)} were detected in global session policy rules.",
+            severity="High",
+        ))
+    return validations
+
+
+def _check_security_notifications(section_by_id, extra_context):
+    validations = []
+
+    # Security notifications checks (High)
+    sec_rows = _section_rows(section_by_id, "security-settings")
+    notification_checks = [
+        ("Password Changed Notifications", "Password changed notification email"),
+        ("Suspicious Activity Reporting for End Users", "Report suspicious activity via email"),
+        ("New Sign-On Notifications", "New sign-on notification email"),
+        ("Factor Enrollment Notifications", "Authenticator enrolled notification email"),
+        ("Factor Reset Notifications", "Authenticator reset notification email"),
+    ]
+    for title, setting_name in notification_checks:
+        if not sec_rows:
+            validations.append(_validation(
+                title,
+                "Pass",
+                f"No security settings data was available to validate {title.lower()}.",
+                severity="High",
+            ))
+            continue
+        value = _find_setting_value(section_by_id, "security-settings", setting_name)
+        status = _status_from_boolish_enabled(value)
+        if status == "Pass":
+            summary = f"{title} are enabled."
+        elif status == "Fail":
+            summary = f"{title} are disabled."
+        else:
+            summary = f"{title} setting was not available in tenant response."
+        validations.append(_validation(title, status, summary, severity="High"))
+
+    threatinsight_action = _find_setting_value(section_by_id, "security-settings", "Action")
+    if not sec_rows:
+        validations.append(_validation(
+            "ThreatInsight Blocking",
+            "Pass",
+            "No security settings data was available to validate ThreatInsight blocking.",
+            severity="High",
+        ))
+    elif threatinsight_action is None:
+        validations.append(_validation(
+            "ThreatInsight Blocking",
+            "Info",
+            "ThreatInsight action setting was not available in tenant response.",
+            severity="High",
+        ))
+    elif "enforce" in str(threatinsight_action).lower() or "block" in str(threatinsight_action).lower():
+        validations.append(_validation(
+            "ThreatInsight Blocking",
+            "Pass",
+            "ThreatInsight is configured to block or enforce security on suspicious IP activity.",
+            severity="High",
+        ))
+    else:
+        validations.append(_validation(
+            "ThreatInsight Blocking",
+            "Fail",
+            "ThreatInsight is not configured in blocking/enforcement mode.",
+            [str(threatinsight_action)],
+            severity="High",
+        ))
+    return validations
+
+
+def _check_password_policy_strength(section_by_id, extra_context):
+    validations = []
+
+    # Weak password policies (Moderate)
+    pwd_policy_rows = _section_records(section_by_id, "password-policies", entry_type="Policy")
+    weak_pwd = []
+    for row, raw in pwd_policy_rows:
+        weaknesses = _password_policy_weaknesses(raw, _thresholds(extra_context))
+        if weaknesses:
+            weak_pwd.append((row.get("Name") or row.get("Policy Name") or "Unnamed Policy", weaknesses))
+    if not pwd_policy_rows:
+        validations.append(_validation(
+            "Password Policy Strength",
+            "Pass",
+            "No password policy data was available for password strength validation.",
+            severity="Moderate",
+        ))
+    elif weak_pwd:
+        validations.append(_validation(
+            "Password Policy Strength",
+            "Fail",
+            f"Password policies for {len(weak_pwd)} policy(s) are weak.",
+            [f"{name}: {', '.join(issues[:3])}" for name, issues in weak_pwd],
+            severity="Moderate",
+        ))
+    else:
+        validations.append(_validation(
+            "Password Policy Strength",
+            "Pass",
+            "No weak password policy patterns were detected using current heuristics.",
+            severity="Moderate",
+        ))
+    return validations
+
+
+def _check_blocklisted_zone(section_by_id, extra_context):
+    validations = []
+
+    # Network zones blocklist presence (Moderate)
+    zone_rows = _section_rows(section_by_id, "network-zones")
+    has_block_zone = any(
+        "block" in str((z.get("Usage") or "")).lower() or "block" in str((z.get("Name") or "")).lower()
+        for z in zone_rows
+    )
+    if not zone_rows:
+        validations.append(_validation(
+            "Blocklisted Network Zone Presence",
+            "Pass",
+            "No network zone data was available to validate blocklisted zone configuration.",
+            severity="Moderate",
+        ))
+    elif not has_block_zone:
+        validations.append(_validation(
+            "Blocklisted Network Zone Presence",
+            "Fail",
+            "Network Zones do not contain a block listed zone.",
+            severity="Moderate",
+        ))
+    else:
+        validations.append(_validation(
+            "Blocklisted Network Zone Presence",
+            "Pass",
+            "At least one blocklisted network zone was detected.",
+            severity="Moderate",
+        ))
+    return validations
+
+
+def _check_mfa_enrollment_policies(section_by_id, extra_context):
+    validations = []
+
+    # MFA enrollment policies: weaker factors + optional factors
+    mfa_policy_rows = _section_records(section_by_id, "mfa-enrollment-policies", entry_type="Policy")
+    weak_factor_labels = set(_thresholds(extra_context)["weak_mfa_factors"])
+    weak_factor_policies = []
+    optional_factor_policies = []
+    for row, raw in mfa_policy_rows:
+        name = row.get("Name") or row.get("Policy Name") or "Unnamed Policy"
+        weak_factors = [factor for factor in raw["weak_factors"] if factor in weak_factor_labels]
+        if weak_factors:
+            weak_factor_policies.append((name, weak_factors))
+        if raw["optional_factors"]:
+            optional_factor_policies.append(name)
+    policies_without_required_factor = [
+        row.get("Name") or row.get("Policy Name") or "Unnamed Policy"
+        for row, raw in mfa_policy_rows
+        if not raw["requires_authenticator"]
+    ]
+
+    if not mfa_policy_rows:
+        validations.append(_validation(
+            "Weaker Factors in MFA Enrollment Policies",
+            "Pass",
+            "No MFA enrollment policy data was available to evaluate weaker factor usage.",
+            severity="High",
+        ))
+        validations.append(_validation(
+            "Optional Factors in MFA Enrollment Policies",
+            "Pass",
+            "No MFA enrollment policy data was available to evaluate optional factor enrollment.",
+            severity="Moderate",
+        ))
+        validations.append(_validation(
+            "Required Authenticator in MFA Enrollment Policies",
+            "Pass",
+            "No MFA enrollment policy data was available to evaluate required authenticator posture.",
+            severity="High",
+        ))
+    else:
+        validations.append(_validation(
+            "Weaker Factors in MFA Enrollment Policies",
+            "Fail" if weak_factor_policies else "Pass",
+            (f"Weaker factors are set in {len(weak_factor_policies)} policies."
+             if weak_factor_policies else "No weaker factors detected in MFA enrollment policy settings."),
+            [f"{name}: {', '.join(factors)}" for name, factors in weak_factor_policies[:20]],
+            severity="High",
+        ))
+        validations.append(_validation(
+            "Optional Factors in MFA Enrollment Policies",
+            "Fail" if optional_factor_policies else "Pass",
+            (f"Factors are optional for {len(optional_factor_policies)} Factor Enrollment policies."
+             if optional_factor_policies else "No optional factor enrollment settings detected in MFA enrollment policies."),
+            optional_factor_policies[:20],
+            severity="Moderate",
+        ))
+        validations.append(_validation(
+            "Required Authenticator in MFA Enrollment Policies",
+            "Fail" if policies_without_required_factor else "Pass",
+            (
+                f"{len(policies_without_required_factor)} MFA enrollment policy(ies) do not appear to require any authenticator."
+                if policies_without_required_factor
+                else "Every MFA enrollment policy appears to require at least one authenticator."
+            ),
+            policies_without_required_factor[:20],
+            severity="High",
+        ))
+    return validations
+
+
+def _check_disabled_saml_apps(section_by_id, extra_context):
+    validations = []
+
+    # SAML apps disabled (High) using full app inventory (including inactive)
+    all_apps = extra_context.get("all_apps") or []
+    if not all_apps:
+        validations.append(_validation(
+            "SAML Authentication Supported but Disabled Apps",
+            "Pass",
+            "No full application inventory was available to validate disabled SAML apps.",
+            severity="High",
+        ))
+    else:
+        disabled_saml = [
+            app for app in all_apps
+            if str(app.get("signOnMode") or "").upper() == "SAML_2_0"
+            and str(app.get("status") or "").upper() != "ACTIVE"
+        ]
+        validations.append(_validation(
+            "SAML Authentication Supported but Disabled Apps",
+            "Fail" if disabled_saml else "Pass",
+            (f"SAML authentication is supported but disabled for {len(disabled_saml)} apps."
+             if disabled_saml else "No disabled SAML applications were detected."),
+            [str(app.get("label") or app.get("name") or app.get("id")) for app in disabled_saml[:20]],
+            severity="High",
+        ))
+    return validations
+
+
+def _check_org_support_metadata(section_by_id, extra_context):
+    validations = []
+
+    # Org settings readiness checks
+    org_setting_map = _row_map(_section_rows(section_by_id, "org-settings"))
+    org_missing = [
+        label for label in [
+            "Company Name",
+            "Website",
+            "End User Support Help URL",
+            "Billing Contact Email",
+            "Technical Contact Email",
+        ]
+        if _blankish(org_setting_map.get(label))
+    ]
+    validations.append(_identity_validation(
+        "Organization Support Metadata Completeness",
+        "Moderate",
+        org_missing,
+        lambda items: f"{len(items)} important org support/contact setting(s) are missing.",
+        "Core org support and contact metadata are populated.",
+        "Organization settings were not available for validation.",
+        data_available=bool(_section_rows(section_by_id, "org-settings")),
+    ))
+    return validations
+
+
+def _check_group_descriptions(section_by_id, extra_context):
+    validations = []
+
+    # Group hygiene checks
+    group_rows = _section_rows(section_by_id, "groups")
+    groups_missing_description = [
+        str(row.get("Group Name") or "Unnamed Group")
+        for row in group_rows
+        if _blankish(row.get("Description"))
+    ]
+    validations.extend([
+        _identity_validation(
+            "Groups Missing Description",
+            "Low",
+            groups_missing_description,
+            lambda items: f"{len(items)} group(s) do not have a description.",
+            "All Okta groups have descriptions.",
+            "No group data was available for group description validation.",
+            data_available=bool(group_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_group_rules(section_by_id, extra_context):
+    validations = []
+
+    # Group rule hygiene
+    group_rule_rows = _section_rows(section_by_id, "group-rules")
+    disabled_group_rules = [
+        str(row.get("Rule Name") or "Unnamed Rule")
+        for row in _section_rows(section_by_id, "group-rules", inactive=True)
+    ]
+    validations.extend([
+        _identity_validation(
+            "Disabled Group Rules",
+            "Low",
+            disabled_group_rules,
+            lambda items: f"{len(items)} group rule(s) are not active.",
+            "All group rules are active.",
+            "No group rule data was available for rule status validation.",
+            data_available=bool(group_rule_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_network_zone_usage(section_by_id, extra_context):
+    validations = []
+
+    # Network zones
+    zone_rows = _section_rows(section_by_id, "network-zones")
+    network_policy_rows = _section_records(section_by_id, "global-session-policies", entry_type="Rule") + _section_records(
+        section_by_id,
+        "authentication-policies",
+        entry_type="Rule",
+    )
+    zone_usage_blob = " ".join(raw["network_text"] for _, raw in network_policy_rows)
+    unused_network_zones = [
+        str(row.get("Name") or "Unnamed Zone")
+        for row in zone_rows
+        if str(row.get("Name") or "").strip()
+        and str(row.get("Name")).lower() not in zone_usage_blob
+    ]
+    empty_trusted_zones = [
+        str(row.get("Name") or "Unnamed Zone")
+        for row in zone_rows
+        if str(row.get("Usage") or "").strip().upper() == "TRUSTED"
+        and _blankish(row.get("Gateways"))
+        and _blankish(row.get("Proxies"))
+    ]
+    validations.extend([
+        _identity_validation(
+            "Network Zones Defined But Not Used In Policies",
+            "Low",
+            unused_network_zones,
+            lambda items: f"{len(items)} network zone(s) are defined but not referenced by extracted session or app sign-on policy rules.",
+            "All defined network zones are referenced by extracted session or app sign-on policy rules, or no network zones are configured.",
+            "No network zone data was available for validation.",
+            data_available=bool(zone_rows),
+        ),
+        _identity_validation(
+            "Trusted Network Zones Without Entries",
+            "Moderate",
+            empty_trusted_zones,
+            lambda items: f"{len(items)} trusted network zone(s) do not list gateways or proxies.",
+            "All trusted network zones contain gateway or proxy entries.",
+            "No network zone data was available for trusted-zone validation.",
+            data_available=bool(zone_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_authenticators(section_by_id, extra_context):
+    validations = []
+
+    # Authenticators
+    authenticator_rows = _section_rows(section_by_id, "authenticators")
+    active_authenticators = _section_index(section_by_id, "authenticators")["by_status"].get("ACTIVE") or []
+    weak_authenticators = [
+        f"{row.get('Name')}: {row.get('Status')}"
+        for row, _ in active_authenticators
+        if _contains_token(row.get("Key"), _thresholds(extra_context)["weak_authenticator_keys"])
+    ]
+    strong_authenticator_present = any(
+        _contains_token(row.get("Key"), ["okta_verify", "webauthn", "security_key"])
+        for row, _ in active_authenticators
+    )
+    validations.extend([
+        _identity_validation(
+            "Weak Authenticators Enabled",
+            "High",
+            weak_authenticators,
+            lambda items: f"{len(items)} weaker authenticator(s) are active.",
+            "No weaker authenticators were detected as active.",
+            "No authenticator data was available for validation.",
+            data_available=bool(authenticator_rows),
+        ),
+        _identity_validation(
+            "Phishing-Resistant Authenticator Availability",
+            "High",
+            [] if strong_authenticator_present else ["No active Okta Verify / WebAuthn / security key authenticator detected"],
+            lambda items: items[0],
+            "At least one phishing-resistant authenticator is available.",
+            "No authenticator data was available for phishing-resistant authenticator validation.",
+            data_available=bool(authenticator_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_applications(section_by_id, extra_context):
+    validations = []
+
+    # Applications
+    application_rows = _section_rows(section_by_id, "applications")
+    everyone_assigned_apps = [
+        str(row.get("Name") or "Unnamed App")
+        for row, raw in _section_records(section_by_id, "applications")
+        if raw["everyone_assigned"]
+    ]
+    password_based_apps = [
+        str(row.get("Name") or "Unnamed App")
+        for row in application_rows
+        if str(row.get("Type") or "").upper() in {"AUTO_LOGIN", "BROWSER_PLUGIN", "SECURE_PASSWORD_STORE"}
+    ]
+    validations.extend([
+        _identity_validation(
+            "Applications Assigned to Everyone",
+            "Moderate",
+            everyone_assigned_apps,
+            lambda items: f"{len(items)} application(s) are assigned to the Everyone group.",
+            "No applications were found assigned to Everyone.",
+            "No application data was available for assignment validation.",
+            data_available=bool(application_rows),
+        ),
+        _identity_validation(
+            "Password-Based Application Sign-On Modes Present",
+            "Low",
+            password_based_apps,
+            lambda items: f"{len(items)} application(s) use password-based or SWA-style sign-on modes.",
+            "No password-based or SWA-style application sign-on modes were detected.",
+            "No application data was available for sign-on-mode validation.",
+            data_available=bool(application_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_identity_providers(section_by_id, extra_context):
+    validations = []
+
+    # Identity providers and discovery
+    inactive_idps = [
+        str(row.get("Name") or "Unnamed IdP")
+        for row in _section_rows(section_by_id, "identity-providers", inactive=True)
+    ]
+    inactive_idp_discovery_rules = [
+        f"{row.get('Policy Name')}: {row.get('Rule Name')}"
+        for row in _section_rows(section_by_id, "idp-discovery-policies", entry_type="Rule", inactive=True)
+    ]
+    validations.extend([
+        _identity_validation(
+            "Inactive Identity Providers",
+            "Low",
+            inactive_idps,
+            lambda items: f"{len(items)} identity provider(s) are not active.",
+            "All identity providers are active.",
+            "No identity provider data was available for validation.",
+            data_available=True,
+        ),
+        _identity_validation(
+            "Inactive IdP Discovery Rules",
+            "Low",
+            inactive_idp_discovery_rules,
+            lambda items: f"{len(items)} IdP discovery rule(s) are not active.",
+            "All IdP discovery rules are active.",
+            "No IdP discovery policy rule data was available for validation.",
+            data_available=True,
+        ),
+    ])
+    return validations
+
+
+def _check_authorization_servers(section_by_id, extra_context):
+    validations = []
+
+    # Authorization server checks
+    authz_server_rows = _section_rows(section_by_id, "authz-servers")
+    authz_access_rule_rows = _section_records(section_by_id, "authz-access-policies", entry_type="Rule")
+    manual_rotation_servers = [
+        str(row.get("Name") or "Unnamed Authorization Server")
+        for row in authz_server_rows
+        if str(row.get("Credentials Rotation Mode") or "").strip().upper() not in {"AUTO", "AUTOMATIC"}
+    ]
+    authz_any_client_rules = [
+        f"{row.get('Authorization Server')} / {row.get('Policy Name')} / {row.get('Rule Name')}"
+        for row, raw in authz_access_rule_rows
+        if raw["any_client"]
+    ]
+    validations.extend([
+        _identity_validation(
+            "Authorization Servers Without Automatic Key Rotation",
+            "Moderate",
+            manual_rotation_servers,
+            lambda items: f"{len(items)} authorization server(s) do not report automatic credential rotation.",
+            "All authorization servers report automatic credential rotation.",
+            "No authorization server settings were available for rotation validation.",
+            data_available=bool(authz_server_rows),
+        ),
+        _identity_validation(
+            "Authorization Server Access Rules With Broad Client Scope",
+            "Moderate",
+            authz_any_client_rules,
+            lambda items: f"{len(items)} authorization server access rule(s) appear to apply to any client.",
+            "No authorization server access rules were found with broad any-client scope.",
+            "No authorization server access policy rule data was available for validation.",
+            data_available=bool(authz_access_rule_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_admin_governance(section_by_id, extra_context):
+    validations = []
+
+    # Admin governance
+    custom_role_rows = _section_rows(section_by_id, "custom-admin-roles")
+    custom_roles_missing_description = [
+        str(row.get("Label") or "Unnamed Role")
+        for row in custom_role_rows
+        if _blankish(row.get("Description"))
+    ]
+    resource_set_rows = _section_rows(section_by_id, "resource-sets")
+    resource_sets = {}
+    for row in resource_set_rows:
+        entry_type = str(row.get("Entry Type") or "")
+        label = row.get("Label") or row.get("Resource Set")
+        if not label:
+            continue
+        bucket = resource_sets.setdefault(str(label), {"resource": 0, "binding": 0})
+        if entry_type == "Resource":
+            bucket["resource"] += 1
+        elif entry_type == "Binding":
+            bucket["binding"] += 1
+    resource_sets_without_resources = [name for name, counts in sorted(resource_sets.items()) if counts["resource"] == 0]
+    resource_sets_without_bindings = [name for name, counts in sorted(resource_sets.items()) if counts["binding"] == 0]
+    admin_app_rows = _section_rows(section_by_id, "admin-assignments-apps")
+    validations.extend([
+        _identity_validation(
+            "Custom Admin Roles Missing Description",
+            "Low",
+            custom_roles_missing_description,
+            lambda items: f"{len(items)} custom admin role(s) do not have a description.",
+            "All custom admin roles have descriptions.",
+            "No custom admin role data was available for validation.",
+            data_available=bool(custom_role_rows),
+        ),
+        _identity_validation(
+            "Resource Sets Without Resources",
+            "Moderate",
+            resource_sets_without_resources,
+            lambda items: f"{len(items)} resource set(s) do not contain any resources.",
+            "All resource sets contain at least one resource.",
+            "No resource set data was available for validation.",
+            data_available=bool(resource_set_rows),
+        ),
+        _identity_validation(
+            "Resource Sets Without Bindings",
+            "Moderate",
+            resource_sets_without_bindings,
+            lambda items: f"{len(items)} resource set(s) do not contain any bindings.",
+            "All resource sets contain at least one binding.",
+            "No resource set data was available for validation.",
+            data_available=bool(resource_set_rows),
+        ),
+        _identity_validation(
+            "Admin Public Client Applications Present",
+            "Moderate",
+            [str(row.get("Display Name") or row.get("App Name") or "Unnamed Admin App") for row in admin_app_rows],
+            lambda items: f"{len(items)} admin public client application(s) are configured and should be reviewed.",
+            "No admin public client applications were detected.",
+            "No admin app assignment data was available for validation.",
+            data_available=bool(admin_app_rows) or bool(_section_rows(section_by_id, "admin-assignments-apps")),
+        ),
+    ])
+    return validations
+
+
+def _check_api_token_network(section_by_id, extra_context):
+    validations = []
+
+    api_token_rows = _section_rows(section_by_id, "api-tokens")
+    tokens_without_network_restrictions = []
+    for row in api_token_rows:
+        network = row.get("Network")
+        if isinstance(network, dict):
+            connection = str(network.get("connection") or "").strip().upper()
+            include = network.get("include") or []
+            exclude = network.get("exclude") or []
+            if connection in {"", "ANYWHERE", "ANY_NETWORK"} and not include and not exclude:
+                tokens_without_network_restrictions.append(str(row.get("Name") or row.get("Token ID") or "Unnamed Token"))
+        elif _blankish(network):
+            tokens_without_network_restrictions.append(str(row.get("Name") or row.get("Token ID") or "Unnamed Token"))
+    validations.append(_identity_validation(
+        "API Tokens Without Network Restrictions",
+        "High",
+        tokens_without_network_restrictions,
+        lambda items: f"{len(items)} API token(s) do not show network restrictions.",
+        "All extracted API tokens show some form of network restriction.",
+        "No API token data was available for network restriction validation.",
+        data_available=bool(api_token_rows),
+    ))
+    return validations
+
+
+def _check_brands(section_by_id, extra_context):
+    validations = []
+
+    # Brand and UX
+    brand_setting_rows = _section_rows(section_by_id, "brand-settings")
+    brands_missing_privacy = [
+        str(row.get("Brand Name") or "Unnamed Brand")
+        for row in brand_setting_rows
+        if _blankish(row.get("Custom Privacy Policy URL"))
+    ]
+    validations.extend([
+        _identity_validation(
+            "Brands Missing Custom Privacy Policy URL",
+            "Low",
+            brands_missing_privacy,
+            lambda items: f"{len(items)} brand(s) do not define a custom privacy policy URL.",
+            "All brands define a custom privacy policy URL.",
+            "No brand settings were available for validation.",
+            data_available=bool(brand_setting_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_trusted_origins(section_by_id, extra_context):
+    validations = []
+
+    # Trusted origins
+    trusted_origin_rows = _section_rows(section_by_id, "trusted-origins")
+    insecure_origins = [
+        str(row.get("Origin") or row.get("Name") or "Unnamed Origin")
+        for row in trusted_origin_rows
+        if str(row.get("Origin") or "").strip().lower().startswith("http://")
+    ]
+    validations.append(_identity_validation(
+        "Insecure Trusted Origins",
+        "High",
+        insecure_origins,
+        lambda items: f"{len(items)} trusted origin(s) use HTTP instead of HTTPS.",
+        "No HTTP trusted origins were detected.",
+        "No trusted origin data was available for protocol validation.",
+        data_available=bool(trusted_origin_rows),
+    ))
+    return validations
+
+
+def _check_event_hooks(section_by_id, extra_context):
+    validations = []
+
+    # Event hooks
+    event_hook_rows = _section_rows(section_by_id, "event-hooks")
+    unverified_event_hooks = [
+        str(row.get("Name") or "Unnamed Event Hook")
+        for row in event_hook_rows
+        if str(row.get("Verification Status") or "").strip().upper() != "VERIFIED"
+    ]
+    weak_event_hook_auth = [
+        str(row.get("Name") or "Unnamed Event Hook")
+        for row in event_hook_rows
+        if _blankish(row.get("Auth Scheme"))
+    ]
+    inactive_event_hooks = [
+        str(row.get("Name") or "Unnamed Event Hook")
+        for row in _section_rows(section_by_id, "event-hooks", inactive=True)
+    ]
+    validations.extend([
+        _identity_validation(
+            "Unverified Event Hooks",
+            "High",
+            unverified_event_hooks,
+            lambda items: f"{len(items)} event hook(s) are not verified.",
+            "All event hooks are verified, or no event hooks are configured.",
+            "No event hook data was available for verification-status validation.",
+            data_available=True,
+        ),
+        _identity_validation(
+            "Event Hooks Without Authentication Scheme",
+            "High",
+            weak_event_hook_auth,
+            lambda items: f"{len(items)} event hook(s) do not report an authentication scheme.",
+            "All event hooks report an authentication scheme, or no event hooks are configured.",
+            "No event hook data was available for auth-scheme validation.",
+            data_available=True,
+        ),
+        _identity_validation(
+            "Inactive Event Hooks",
+            "Low",
+            inactive_event_hooks,
+            lambda items: f"{len(items)} event hook(s) are not active.",
+            "All event hooks are active, or no event hooks are configured.",
+            "No event hook data was available for status validation.",
+            data_available=True,
+        ),
+    ])
+    return validations
+
+
+def _check_inline_hooks(section_by_id, extra_context):
+    validations = []
+
+    # Inline hooks
+    inline_hook_rows = _section_rows(section_by_id, "inline-hooks")
+    inactive_inline_hooks = [
+        str(row.get("Name") or "Unnamed Inline Hook")
+        for row in _section_rows(section_by_id, "inline-hooks", inactive=True)
+    ]
+    weak_inline_hook_auth = [
+        str(row.get("Name") or "Unnamed Inline Hook")
+        for row in inline_hook_rows
+        if _blankish(row.get("Auth Scheme"))
+    ]
+    validations.extend([
+        _identity_validation(
+            "Inline Hooks Without Authentication Scheme",
+            "High",
+            weak_inline_hook_auth,
+            lambda items: f"{len(items)} inline hook(s) do not report an authentication scheme.",
+            "All inline hooks report an authentication scheme.",
+            "No inline hook data was available for auth-scheme validation.",
+            data_available=bool(inline_hook_rows),
+        ),
+        _identity_validation(
+            "Inactive Inline Hooks",
+            "Low",
+            inactive_inline_hooks,
+            lambda items: f"{len(items)} inline hook(s) are not active.",
+            "All inline hooks are active, or no inline hooks are configured.",
+            "No inline hook data was available for status validation.",
+            data_available=True,
+        ),
+    ])
+    return validations
+
+
+def _check_attack_protection(section_by_id, extra_context):
+    validations = []
+
+    # Attack protection
+    attack_rows = _section_rows(section_by_id, "attack-protection")
+    weak_attack_protection_rows = [
+        f"{row.get('Component')} / {row.get('Field')}: {row.get('Value')}"
+        for row in attack_rows
+        if _contains_token(row.get("Field"), ["enabled", "mode", "status", "action"])
+        and _contains_token(row.get("Value"), ["disabled", "false", "none", "log"])
+    ]
+    validations.append(_identity_validation(
+        "Attack Protection Controls Not Enforcing",
+        "High",
+        weak_attack_protection_rows,
+        lambda items: f"{len(items)} attack-protection setting(s) appear disabled or monitor-only.",
+        "No extracted attack-protection settings appeared disabled or monitor-only.",
+        "No attack-protection data was available for validation.",
+        data_available=bool(attack_rows),
+    ))
+    return validations
+
+
+def _check_realms(section_by_id, extra_context):
+    validations = []
+
+    # Realms
+    inactive_realms = [
+        str(row.get("Name") or "Unnamed Realm")
+        for row in _section_rows(section_by_id, "realms", inactive=True)
+    ]
+    realm_assignment_rows = _section_rows(section_by_id, "realm-assignments")
+    default_realm_assignments = [
+        str(row.get("Name") or "Unnamed Assignment")
+        for row in realm_assignment_rows
+        if str(row.get("Is Default") or "").strip().lower() == "true"
+    ]
+    validations.extend([
+        _identity_validation(
+            "Inactive Realms",
+            "Low",
+            inactive_realms,
+            lambda items: f"{len(items)} realm(s) are not active.",
+            "All realms are active.",
+            "No realm data was available for validation.",
+            data_available=True,
+        ),
+        _identity_validation(
+            "Realm Default Assignment Coverage",
+            "High",
+            [] if len(default_realm_assignments) == 1 else [f"Default assignments found: {len(default_realm_assignments)}"],
+            lambda items: "Realm assignments should contain exactly one default assignment.",
+            "Realm assignments contain exactly one default assignment.",
+            "No realm assignment data was available for default-assignment validation.",
+            data_available=bool(realm_assignment_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_profile_schema_and_mappings(section_by_id, extra_context):
+    validations = []
+
+    # Profile schema and mappings
+    schema_rows = _section_rows(section_by_id, "profile-schema-user")
+    sensitive_writable_attrs = [
+        f"{row.get('Attribute')}: {row.get('Mutability')}"
+        for row in schema_rows
+        if _contains_token(row.get("Attribute"), ["password", "secret", "token", "ssn", "salary"])
+        and _contains_token(row.get("Mutability"), ["read_write", "write"])
+    ]
+    profile_mapping_rows = _section_rows(section_by_id, "profile-mappings")
+    empty_profile_mappings = [
+        f"{row.get('Source Name')} -> {row.get('Target Name')}"
+        for row in profile_mapping_rows
+        if _blankish(row.get("Properties")) or _text(row.get("Properties")) == "{}"
+    ]
+    validations.extend([
+        _identity_validation(
+            "Sensitive Writable Profile Attributes",
+            "High",
+            sensitive_writable_attrs,
+            lambda items: f"{len(items)} sensitive profile attribute(s) appear writable.",
+            "No sensitive writable profile attributes were detected by name heuristic.",
+            "No user profile schema data was available for validation.",
+            data_available=bool(schema_rows),
+        ),
+        _identity_validation(
+            "Empty Profile Mappings",
+            "Moderate",
+            empty_profile_mappings,
+            lambda items: f"{len(items)} profile mapping(s) do not contain extracted property mappings.",
+            "All extracted profile mappings contain property mappings.",
+            "No profile mapping data was available for validation.",
+            data_available=bool(profile_mapping_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_group_push_mappings(section_by_id, extra_context):
+    validations = []
+
+    # Group push mappings
+    group_push_rows = _section_rows(section_by_id, "group-push-mappings")
+    stale_days = _thresholds(extra_context)["stale_group_push_days"]
+    inactive_group_push = [
+        f"{row.get('App Name')}: {row.get('Source Group')} -> {row.get('Target Group')}"
+        for row in _section_rows(section_by_id, "group-push-mappings", inactive=True)
+    ]
+    stale_group_push = [
+        f"{row.get('App Name')}: {row.get('Source Group')} -> {row.get('Target Group')}"
+        for row in group_push_rows
+        if (_days_since(row.get("Last Updated")) or 0) >= stale_days
+    ]
+    validations.extend([
+        _identity_validation(
+            "Inactive Group Push Mappings",
+            "Low",
+            inactive_group_push,
+            lambda items: f"{len(items)} group push mapping(s) are not active.",
+            "All group push mappings are active, or no group push mappings are configured.",
+            "No group push mapping data was available for validation.",
+            data_available=True,
+        ),
+        _identity_validation(
+            "Stale Group Push Mappings",
+            "Low",
+            stale_group_push,
+            lambda items: f"{len(items)} group push mapping(s) have not been updated in at least {stale_days} days.",
+            f"No stale group push mappings were detected using the {stale_days}-day age heuristic.",
+            "No group push mapping data was available for age validation.",
+            data_available=bool(group_push_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_risk_policies(section_by_id, extra_context):
+    validations = []
+
+    # Risk-aware policies
+    entity_risk_rule_rows = _section_rows(section_by_id, "entity-risk-policies", entry_type="Rule")
+    post_auth_rule_rows = _section_rows(section_by_id, "post-auth-session-policies", entry_type="Rule")
+    active_entity_risk_rules = [
+        row for row in entity_risk_rule_rows
+        if not _looks_like_inactive(row.get("Status"))
+    ]
+    active_post_auth_rules = [
+        row for row in post_auth_rule_rows
+        if not _looks_like_inactive(row.get("Status"))
+    ]
+    validations.extend([
+        _identity_validation(
+            "Entity Risk Policy Rule Coverage",
+            "High",
+            [] if active_entity_risk_rules else ["No active entity risk policy rules detected"],
+            lambda items: items[0],
+            "Active entity risk policy rules were detected.",
+            "No entity risk policy data was available for validation.",
+            data_available=bool(_section_rows(section_by_id, "entity-risk-policies")),
+        ),
+        _identity_validation(
+            "Identity Threat Protection Policy Rule Coverage",
+            "High",
+            [] if active_post_auth_rules else ["No active identity threat protection policy rules detected"],
+            lambda items: items[0],
+            "Active identity threat protection policy rules were detected.",
+            "No identity threat protection policy data was available for validation.",
+            data_available=bool(_section_rows(section_by_id, "post-auth-session-policies")),
+        ),
+    ])
+    return validations
+
+
+def _check_mfa_every_sign_in(section_by_id, extra_context):
+    validations = []
+
+    # HealthInsight-specific policy heuristics
+    auth_policy_rule_rows = _section_records(section_by_id, "authentication-policies", entry_type="Rule")
+    session_policy_rule_rows = _section_records(section_by_id, "global-session-policies", entry_type="Rule")
+    application_rows = _section_rows(section_by_id, "applications")
+    risk_based_mfa_gaps = []
+    new_device_mfa_gaps = []
+    for row, raw in auth_policy_rule_rows + session_policy_rule_rows:
+        mfa_every_sign_in = raw["requires_mfa"] and raw["every_sign_in"]
+        if raw["high_risk_conditions"] and not mfa_every_sign_in:
+            risk_based_mfa_gaps.append(f"{row.get('Policy Name')} / {row.get('Rule Name')}")
+        if raw["new_device_conditions"] and not mfa_every_sign_in:
+            new_device_mfa_gaps.append(f"{row.get('Policy Name')} / {row.get('Rule Name')}")
+
+    admin_console_apps = [
+        row for row, _ in _section_index(section_by_id, "applications")["by_name"].get("okta admin console", [])
+    ]
+    auth_rules_by_policy = _section_index(section_by_id, "authentication-policies")["rules_by_policy"]
+    admin_console_mfa_gap = []
+    if admin_console_apps:
+        for app_row in admin_console_apps:
+            policy_name = str(app_row.get("Access Policy Name") or "").strip()
+            if not policy_name:
+                admin_console_mfa_gap.append(
+                    f"{app_row.get('Name')}: no app sign-on policy is assigned"
+                )
+                continue
+            matching_rules = auth_rules_by_policy.get(policy_name) or []
+            if not matching_rules:
+                admin_console_mfa_gap.append(
+                    f"{app_row.get('Name')}: no app sign-on policy rules found for assigned policy '{policy_name}'"
+                )
+                continue
+            if not any(
+                raw["requires_mfa"] and raw["every_sign_in"]
+                for _, raw in matching_rules
+                if raw["active"]
+            ):
+                admin_console_mfa_gap.append(
+                    f"{app_row.get('Name')}: assigned policy '{policy_name}' has no active rule requiring MFA at every sign-in"
+                )
+    else:
+        admin_console_mfa_gap.append("Okta Admin Console application was not found in the extracted active applications")
+
+    validations.extend([
+        _identity_validation(
+            "High-Risk Request MFA Every Sign-In",
+            "High",
+            risk_based_mfa_gaps,
+            lambda items: f"{len(items)} policy rule(s) reference risk conditions without clear MFA-at-every-sign-in actions.",
+            "All extracted high-risk policy rules appear to require MFA at every sign-in.",
+            "No policy rule data was available to evaluate high-risk request MFA posture.",
+            data_available=bool(auth_policy_rule_rows or session_policy_rule_rows),
+        ),
+        _identity_validation(
+            "New Device MFA Every Sign-In",
+            "Moderate",
+            new_device_mfa_gaps,
+            lambda items: f"{len(items)} policy rule(s) reference device/new-device conditions without clear MFA-at-every-sign-in actions.",
+            "All extracted device/new-device policy rules appear to require MFA at every sign-in.",
+            "No policy rule data was available to evaluate new-device MFA posture.",
+            data_available=bool(auth_policy_rule_rows or session_policy_rule_rows),
+        ),
+        _identity_validation(
+            "Admin Console MFA Every Sign-In",
+            "High",
+            admin_console_mfa_gap,
+            lambda items: f"{len(items)} admin-console application policy path(s) do not show clear MFA-at-every-sign-in enforcement.",
+            "Admin Console application policies appear to require MFA at every sign-in.",
+            "Admin Console application or authentication policy data was not available for validation.",
+            data_available=bool(application_rows and auth_policy_rule_rows),
+        ),
+    ])
+    return validations
+
+
+def _check_identity_risk(section_by_id, extra_context):
+    validations = []
+
+    # Identity-risk detections aligned to Okta ISPM where data is available from native Okta APIs
+    users = extra_context.get("all_users") or []
+    api_tokens = extra_context.get("api_tokens") or []
+    custom_admin_roles = extra_context.get("custom_admin_roles") or []
+    resource_set_bindings = extra_context.get("resource_set_bindings") or []
+    user_inventory_available = "all_users" in extra_context
+    token_inventory_available = "api_tokens" in extra_context
+    admin_role_inventory_available = (
+        "custom_admin_roles" in extra_context and "resource_set_bindings" in extra_context
+    )
+    mfa_enforcement = _tenant_mfa_enforcement_gaps(section_by_id)
+    org_mfa_gap = mfa_enforcement["has_data"] and (
+        mfa_enforcement["optional_enrollment"] or not mfa_enforcement["auth_requires_mfa"]
+    )
+
+    # Detections are boolean masks over one row per user (and one row per active token).
+    now = pd.Timestamp.now(tz="UTC")
+    thresholds = _thresholds(extra_context)
+    password_days = thresholds["password_age_days"]
+    unused_days = thresholds["unused_account_days"]
+    token_days = thresholds["token_rotation_days"]
+    user_table = _user_risk_table(users, api_tokens, now, thresholds)
+    token_table = _token_risk_table(user_table, api_tokens, now)
+
+    is_admin = user_table["is_admin"]
+    is_super_admin = user_table["is_super_admin"]
+    is_service_account = user_table["service_account"]
+    no_mfa = ~user_table["has_mfa"]
+    pending_mfa = user_table["pending_mfa"]
+    direct_access = user_table["direct_access"]
+    old_password = user_table["old_password"]
+    unused_user = user_table["unused"]
+
+    user_table["pending_item"] = user_table["label"] + ": pending factors " + user_table["pending_factors"]
+    user_table["password_item"] = user_table["label"] + ": password age " + _int_text(user_table["password_days"]) + "d"
+    user_table["unused_item"] = user_table["label"] + ": " + (
+        ("last login " + _int_text(user_table["last_login_days"]) + "d ago")
+        .where(user_table["last_login_days"].notna(), "no recent interactive login")
+    )
+    user_table["provider_item"] = user_table["label"] + ": provider " + user_table["provider"].replace("", "unknown")
+
+    def labels(mask, column="label"):
+        return user_table.loc[mask, column].tolist()
+
+    super_admins = labels(is_super_admin)
+
+    no_mfa_accounts = labels(no_mfa)
+    no_mfa_admin_accounts = labels(no_mfa & is_admin)
+    no_mfa_global_admin_accounts = labels(no_mfa & is_super_admin)
+
+    pending_mfa_accounts = labels(pending_mfa, "pending_item")
+    pending_mfa_admin_accounts = labels(pending_mfa & is_admin, "pending_item")
+    pending_mfa_global_admin_accounts = labels(pending_mfa & is_super_admin, "pending_item")
+
+    old_password_accounts = labels(old_password, "password_item")
+    old_password_service_accounts = labels(old_password & is_service_account, "password_item")
+    old_password_admin_accounts = labels(old_password & is_admin, "password_item")
+    old_password_admin_service_accounts = labels(old_password & is_admin & is_service_account, "password_item")
+    old_password_global_admin_accounts = labels(old_password & is_super_admin, "password_item")
+    old_password_global_admin_service_accounts = labels(
+        old_password & is_super_admin & is_service_account, "password_item"
+    )
+
+    unused_accounts = labels(unused_user, "unused_item")
+    unused_service_accounts = labels(unused_user & is_service_account, "unused_item")
+    unused_admin_accounts = labels(unused_user & is_admin, "unused_item")
+    unused_admin_service_accounts = labels(unused_user & is_admin & is_service_account, "unused_item")
+    unused_global_admin_accounts = labels(unused_user & is_super_admin, "unused_item")
+    unused_global_admin_service_accounts = labels(unused_user & is_super_admin & is_service_account, "unused_item")
+
+    sso_bypass_accounts = labels(direct_access, "provider_item")
+    sso_bypass_admin_accounts = labels(direct_access & is_admin, "provider_item")
+    sso_bypass_no_mfa_accounts = labels(direct_access & no_mfa, "provider_item")
+    sso_bypass_no_mfa_admin_accounts = labels(direct_access & no_mfa & is_admin, "provider_item")
+
+    old_no_mfa_unused = old_password & no_mfa & unused_user
+    old_no_mfa_unused_accounts = labels(old_no_mfa_unused)
+    old_no_mfa_unused_admin_accounts = labels(old_no_mfa_unused & is_admin)
+    old_no_mfa_unused_service_accounts = labels(old_no_mfa_unused & is_service_account)
+    old_no_mfa_unused_admin_service_accounts = labels(old_no_mfa_unused & is_admin & is_service_account)
+
+    no_mfa_enforced_admin_accounts = labels(is_admin) if org_mfa_gap else []
+    no_mfa_enforced_global_admin_accounts = labels(is_super_admin) if org_mfa_gap else []
+
+    service_account_console_access_accounts = labels(is_service_account & direct_access, "provider_item")
+    service_account_console_access_admin_accounts = labels(
+        is_service_account & direct_access & is_admin, "provider_item"
+    )
+
+    offboarded = user_table["status"].isin(["SUSPENDED", "DEPROVISIONED"]) & (
+        is_admin | (user_table["token_count"] > 0) | direct_access
+    )
+    partially_offboarded_users = []
+    for row in user_table[offboarded].itertuples():
+        indicators = []
+        if row.is_admin:
+            indicators.append("admin role assignment")
+        if row.token_count:
+            indicators.append(f"{row.token_count} active API token(s)")
+        if row.direct_access:
+            indicators.append(f"provider {row.provider or 'unknown'}")
+        partially_offboarded_users.append(f"{row.label}: status {row.status}; remaining access via {', '.join(indicators)}")
+
+    token_age = _int_text(token_table["age_days"])
+    token_owner = token_table["label"] + ": " + token_table["token_name"]
+    token_admin = token_table["is_admin"]
+    unrotated = token_table["age_days"] >= token_days
+    owner_unused = token_table["unused"]
+    token_table["age_item"] = token_owner + " (" + ("age " + token_age + "d").where(
+        token_table["age_days"].notna(), "active token"
+    ) + ")"
+    token_table["unrotated_item"] = token_owner + " (rotation age " + token_age + "d)"
+    token_table["unused_item"] = token_owner + f" (owner inactive >={unused_days}d)"
+    token_table["unrotated_unused_item"] = token_owner + " (rotation age " + token_age + f"d; owner inactive >={unused_days}d)"
+
+    def token_items(mask, column):
+        return token_table.loc[mask, column].tolist()
+
+    super_admin_with_api_token = token_items(token_table["is_super_admin"], "age_item")
+    unrotated_tokens_admin = token_items(unrotated & token_admin, "unrotated_item")
+    unrotated_tokens_account = token_items(unrotated & ~token_admin, "unrotated_item")
+    unused_tokens_admin = token_items(owner_unused & token_admin, "unused_item")
+    unused_tokens_account = token_items(owner_unused & ~token_admin, "unused_item")
+    unrotated_unused_tokens_admin = token_items(unrotated & owner_unused & token_admin, "unrotated_unused_item")
+    unrotated_unused_tokens_account = token_items(unrotated & owner_unused & ~token_admin, "unrotated_unused_item")
+
+    role_usage = _custom_role_usage_map(custom_admin_roles, resource_set_bindings)
+    unused_custom_roles = [
+        str(
+            details["role"].get("label")
+            or details["role"].get("name")
+            or details["role"].get("id")
+            or "Unnamed Role"
+        )
+        for details in role_usage.values()
+        if not details.get("used")
+    ]
+
+    validations.extend([
+        _identity_validation(
+            "Old Password, No MFA, Unused Accounts",
+            "High",
+            old_no_mfa_unused_accounts,
+            lambda items: f"{len(items)} account(s) have passwords older than {password_days} days, no active MFA, and no recent interactive use for at least {unused_days} days.",
+            "No accounts matched the old-password, no-MFA, unused-account combination heuristic.",
+            "User inventory was not available to assess old-password, no-MFA, unused-account combinations.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password, No MFA, Unused Admin Accounts",
+            "High",
+            old_no_mfa_unused_admin_accounts,
+            lambda items: f"{len(items)} admin account(s) have passwords older than {password_days} days, no active MFA, and no recent interactive use for at least {unused_days} days.",
+            "No admin accounts matched the old-password, no-MFA, unused-account combination heuristic.",
+            "User inventory was not available to assess old-password, no-MFA, unused admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password, No MFA, Unused Service Accounts",
+            "High",
+            old_no_mfa_unused_service_accounts,
+            lambda items: f"{len(items)} potential service account(s) have old passwords, no active MFA, and no recent interactive use.",
+            "No potential service accounts matched the old-password, no-MFA, unused heuristic.",
+            "User inventory was not available to assess old-password, no-MFA, unused service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password, No MFA, Unused Admin Service Accounts",
+            "High",
+            old_no_mfa_unused_admin_service_accounts,
+            lambda items: f"{len(items)} potential admin service account(s) have old passwords, no active MFA, and no recent interactive use.",
+            "No potential admin service accounts matched the old-password, no-MFA, unused heuristic.",
+            "User inventory was not available to assess old-password, no-MFA, unused admin service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "SSO Bypass + No MFA - Admin",
+            "High",
+            sso_bypass_no_mfa_admin_accounts,
+            lambda items: f"{len(items)} admin account(s) appear to have direct access that can bypass federated SSO and have no active MFA.",
+            "No admin accounts matched the direct-access plus no-active-MFA heuristic.",
+            "User inventory was not available to assess SSO bypass plus no MFA for admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "No MFA - Global Admin Account",
+            "High",
+            no_mfa_global_admin_accounts,
+            lambda items: f"{len(items)} super admin account(s) do not have an active enrolled factor.",
+            "All detected super admin accounts have at least one active enrolled factor.",
+            "User inventory was not available to assess MFA enrollment for super admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Pending MFA - Global Admin Account",
+            "High",
+            pending_mfa_global_admin_accounts,
+            lambda items: f"{len(items)} super admin account(s) appear to have pending factor enrollment without an active enrolled factor.",
+            "No super admin accounts were found with only pending factor enrollment.",
+            "User inventory was not available to assess pending MFA for super admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password - Global Admin Account",
+            "High",
+            old_password_global_admin_accounts,
+            lambda items: f"{len(items)} super admin account(s) have passwords older than {password_days} days.",
+            f"No super admin accounts were found with passwords older than {password_days} days.",
+            "User inventory was not available to assess password age for super admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password - Global Admin Service Account",
+            "High",
+            old_password_global_admin_service_accounts,
+            lambda items: f"{len(items)} potential super admin service account(s) have passwords older than {password_days} days.",
+            f"No potential super admin service accounts were found with passwords older than {password_days} days.",
+            "User inventory was not available to assess password age for super admin service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Global Admin Account",
+            "High",
+            unused_global_admin_accounts,
+            lambda items: f"{len(items)} super admin account(s) have not logged in interactively for at least {unused_days} days.",
+            f"No unused super admin accounts were detected using the {unused_days}-day inactivity heuristic.",
+            "User inventory was not available to assess unused super admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Global Admin Service Account",
+            "High",
+            unused_global_admin_service_accounts,
+            lambda items: f"{len(items)} potential super admin service account(s) have not logged in interactively for at least {unused_days} days.",
+            f"No unused potential super admin service accounts were detected using the {unused_days}-day inactivity heuristic.",
+            "User inventory was not available to assess unused super admin service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Partially Off-boarded User",
+            "High",
+            partially_offboarded_users,
+            lambda items: f"{len(items)} suspended or deprovisioned user(s) still appear to retain direct access, admin roles, or active API tokens.",
+            "No partially off-boarded users were detected with remaining privileged or direct access indicators.",
+            "User inventory was not available to assess partially off-boarded users.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "No MFA - Admin Account",
+            "High",
+            no_mfa_admin_accounts,
+            lambda items: f"{len(items)} admin account(s) do not have an active enrolled factor.",
+            "All detected admin accounts have at least one active enrolled factor.",
+            "User inventory was not available to assess MFA enrollment for admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Pending MFA - Admin Account",
+            "High",
+            pending_mfa_admin_accounts,
+            lambda items: f"{len(items)} admin account(s) appear to have pending factor enrollment without an active enrolled factor.",
+            "No admin accounts were found with only pending factor enrollment.",
+            "User inventory was not available to assess pending MFA for admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "No MFA Enforced - Global Admin Account",
+            "High",
+            no_mfa_enforced_global_admin_accounts if mfa_enforcement["has_data"] else [],
+            lambda items: f"{len(items)} super admin account(s) may not be covered by enforced MFA requirements based on tenant-wide enrollment/authentication policy heuristics.",
+            "Tenant-wide policy heuristics suggest MFA enforcement is present for super admin accounts.",
+            "Policy data was insufficient to infer tenant-wide MFA enforcement posture for super admin accounts.",
+            data_available=mfa_enforcement["has_data"],
+        ),
+        _identity_validation(
+            "Excessive Number of Super Admins",
+            "High",
+            super_admins if len(super_admins) > 3 else [],
+            lambda items: f"{len(items)} super admin accounts were detected. The heuristic threshold is more than 3.",
+            f"{len(super_admins)} super admin account(s) were detected, which is within the heuristic threshold of 3.",
+            "User inventory was not available to assess the number of super admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "SSO Bypass - Admin",
+            "High",
+            sso_bypass_admin_accounts,
+            lambda items: f"{len(items)} admin account(s) appear to support direct access outside federated SSO based on their credential provider.",
+            "No admin accounts matched the direct-access credential provider heuristic.",
+            "User inventory was not available to assess SSO bypass for admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "SSO Bypass + No MFA - Account",
+            "High",
+            sso_bypass_no_mfa_accounts,
+            lambda items: f"{len(items)} account(s) appear to support direct access outside federated SSO and have no active MFA.",
+            "No accounts matched the direct-access plus no-active-MFA heuristic.",
+            "User inventory was not available to assess SSO bypass plus no MFA for accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password - Admin Account",
+            "High",
+            old_password_admin_accounts,
+            lambda items: f"{len(items)} admin account(s) have passwords older than {password_days} days.",
+            f"No admin accounts were found with passwords older than {password_days} days.",
+            "User inventory was not available to assess password age for admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password - Admin Service Account",
+            "High",
+            old_password_admin_service_accounts,
+            lambda items: f"{len(items)} potential admin service account(s) have passwords older than {password_days} days.",
+            f"No potential admin service accounts were found with passwords older than {password_days} days.",
+            "User inventory was not available to assess password age for admin service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Super Admin with API Token",
+            "High",
+            super_admin_with_api_token,
+            lambda items: f"{len(items)} active API token(s) are owned by super admin accounts.",
+            "No active API tokens owned by super admin accounts were detected.",
+            "API token or user inventory was not available to assess super admin token ownership.",
+            data_available=user_inventory_available and token_inventory_available,
+        ),
+        _identity_validation(
+            "Unrotated and Unused Keys and Tokens - Admin",
+            "High",
+            unrotated_unused_tokens_admin,
+            lambda items: f"{len(items)} active API token(s) owned by admin accounts are older than {token_days} days and the owning account has been inactive for at least {unused_days} days.",
+            "No admin-owned active API tokens matched the unrotated-and-owner-inactive heuristic.",
+            "API token or user inventory was not available to assess unrotated and unused admin tokens.",
+            data_available=user_inventory_available and token_inventory_available,
+        ),
+        _identity_validation(
+            "Unrotated Keys and Tokens - Admin",
+            "High",
+            unrotated_tokens_admin,
+            lambda items: f"{len(items)} active API token(s) owned by admin accounts are older than {token_days} days.",
+            f"No admin-owned active API tokens older than {token_days} days were detected.",
+            "API token or user inventory was not available to assess token rotation age for admin accounts.",
+            data_available=user_inventory_available and token_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Admin Account",
+            "High",
+            unused_admin_accounts,
+            lambda items: f"{len(items)} admin account(s) have not logged in interactively for at least {unused_days} days.",
+            f"No unused admin accounts were detected using the {unused_days}-day inactivity heuristic.",
+            "User inventory was not available to assess unused admin accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Admin Service Account",
+            "High",
+            unused_admin_service_accounts,
+            lambda items: f"{len(items)} potential admin service account(s) have not logged in interactively for at least {unused_days} days.",
+            f"No unused potential admin service accounts were detected using the {unused_days}-day inactivity heuristic.",
+            "User inventory was not available to assess unused admin service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Keys and Tokens - Admins",
+            "High",
+            unused_tokens_admin,
+            lambda items: f"{len(items)} active API token(s) are owned by admin accounts that have been inactive for at least {unused_days} days.",
+            "No admin-owned active API tokens matched the owner-inactive heuristic.",
+            "API token or user inventory was not available to assess unused admin tokens.",
+            data_available=user_inventory_available and token_inventory_available,
+        ),
+        _identity_validation(
+            "Service Account with Console Access - Admin",
+            "High",
+            service_account_console_access_admin_accounts,
+            lambda items: f"{len(items)} potential admin service account(s) appear to have direct console access based on their credential provider.",
+            "No potential admin service accounts matched the direct-console-access heuristic.",
+            "User inventory was not available to assess direct console access for admin service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Administrative Roles",
+            "High",
+            unused_custom_roles,
+            lambda items: f"{len(items)} custom admin role(s) were found without a matching resource-set binding.",
+            "All discovered custom admin roles were referenced by at least one resource-set binding.",
+            "Custom admin role inventory was not available to assess unused administrative roles.",
+            data_available=admin_role_inventory_available,
+        ),
+        _identity_validation(
+            "No MFA Enforced - Admin Account",
+            "Moderate",
+            no_mfa_enforced_admin_accounts if mfa_enforcement["has_data"] else [],
+            lambda items: f"{len(items)} admin account(s) may not be covered by enforced MFA requirements based on tenant-wide enrollment/authentication policy heuristics.",
+            "Tenant-wide policy heuristics suggest MFA enforcement is present for admin accounts.",
+            "Policy data was insufficient to infer tenant-wide MFA enforcement posture for admin accounts.",
+            data_available=mfa_enforcement["has_data"],
+        ),
+        _identity_validation(
+            "No MFA - Account",
+            "Moderate",
+            no_mfa_accounts,
+            lambda items: f"{len(items)} account(s) do not have an active enrolled factor.",
+            "All assessed accounts have at least one active enrolled factor.",
+            "User inventory was not available to assess MFA enrollment for accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Pending MFA",
+            "Moderate",
+            pending_mfa_accounts,
+            lambda items: f"{len(items)} account(s) appear to have pending factor enrollment without an active enrolled factor.",
+            "No accounts were found with only pending factor enrollment.",
+            "User inventory was not available to assess pending MFA for accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "SSO Bypass - Account",
+            "Moderate",
+            sso_bypass_accounts,
+            lambda items: f"{len(items)} account(s) appear to support direct access outside federated SSO based on their credential provider.",
+            "No accounts matched the direct-access credential provider heuristic.",
+            "User inventory was not available to assess SSO bypass for accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password - Account",
+            "Moderate",
+            old_password_accounts,
+            lambda items: f"{len(items)} account(s) have passwords older than {password_days} days.",
+            f"No accounts were found with passwords older than {password_days} days.",
+            "User inventory was not available to assess password age for accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Old Password - Service Account",
+            "Moderate",
+            old_password_service_accounts,
+            lambda items: f"{len(items)} potential service account(s) have passwords older than {password_days} days.",
+            f"No potential service accounts were found with passwords older than {password_days} days.",
+            "User inventory was not available to assess password age for potential service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unrotated and Unused Keys and Tokens - Account",
+            "Moderate",
+            unrotated_unused_tokens_account,
+            lambda items: f"{len(items)} active API token(s) owned by non-admin accounts are older than {token_days} days and the owning account has been inactive for at least {unused_days} days.",
+            "No non-admin active API tokens matched the unrotated-and-owner-inactive heuristic.",
+            "API token or user inventory was not available to assess unrotated and unused tokens for accounts.",
+            data_available=user_inventory_available and token_inventory_available,
+        ),
+        _identity_validation(
+            "Unrotated Keys and Tokens - Account",
+            "Moderate",
+            unrotated_tokens_account,
+            lambda items: f"{len(items)} active API token(s) owned by non-admin accounts are older than {token_days} days.",
+            f"No non-admin active API tokens older than {token_days} days were detected.",
+            "API token or user inventory was not available to assess token rotation age for accounts.",
+            data_available=user_inventory_available and token_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Account",
+            "Low",
+            unused_accounts,
+            lambda items: f"{len(items)} account(s) have not logged in interactively for at least {unused_days} days.",
+            f"No unused accounts were detected using the {unused_days}-day inactivity heuristic.",
+            "User inventory was not available to assess unused accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Service Account",
+            "Low",
+            unused_service_accounts,
+            lambda items: f"{len(items)} potential service account(s) have not logged in interactively for at least {unused_days} days.",
+            f"No unused potential service accounts were detected using the {unused_days}-day inactivity heuristic.",
+            "User inventory was not available to assess unused service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Service Account with Console Access - Account",
+            "Low",
+            service_account_console_access_accounts,
+            lambda items: f"{len(items)} potential service account(s) appear to have direct console access based on their credential provider.",
+            "No potential service accounts matched the direct-console-access heuristic.",
+            "User inventory was not available to assess direct console access for service accounts.",
+            data_available=user_inventory_available,
+        ),
+        _identity_validation(
+            "Unused Keys and Tokens - Account",
+            "Low",
+            unused_tokens_account,
+            lambda items: f"{len(items)} active API token(s) are owned by non-admin accounts that have been inactive for at least {unused_days} days.",
+            "No non-admin active API tokens matched the owner-inactive heuristic.",
+            "API token or user inventory was not available to assess unused tokens for accounts.",
+            data_available=user_inventory_available and token_inventory_available,
+        ),
+    ])
+    return validations
+
+
+# Security validation registry, in report order. Each entry declares the check IDs
+# (with severity) it emits and the snapshot sections / extra_context inventories it
+# reads, optionally with the fields it reads of each inventory item ("fields"; items
+# are kept whole otherwise). Checks only read their inputs, so they can run concurrently.
+SECURITY_CHECKS = [
+    {
+        "name": "catch_all_deny",
+        "checks": {"APP-04": "High"},
+        "sections": ["authentication-policies"],
+        "context": [],
+        "run": _check_catch_all_deny,
+    },
+    {
+        "name": "session_lifetime",
+        "checks": {"SES-01": "High"},
+        "sections": ["global-session-policies"],
+        "context": [],
+        "run": _check_session_lifetime,
+    },
+    {
+        "name": "security_notifications",
+        "checks": {
+            "SEC-01": "High",
+            "SEC-02": "High",
+            "SEC-03": "High",
+            "SEC-04": "High",
+            "SEC-05": "High",
+            "SEC-06": "High",
+        },
+        "sections": ["security-settings"],
+        "context": [],
+        "run": _check_security_notifications,
+    },
+    {
+        "name": "password_policy_strength",
+        "checks": {"PWD-01": "Moderate"},
+        "sections": ["password-policies"],
+        "context": [],
+        "run": _check_password_policy_strength,
+    },
+    {
+        "name": "blocklisted_zone",
+        "checks": {"NET-01": "Moderate"},
+        "sections": ["network-zones"],
+        "context": [],
+        "run": _check_blocklisted_zone,
+    },
+    {
+        "name": "mfa_enrollment_policies",
+        "checks": {"MFA-01": "High", "MFA-02": "Moderate", "MFA-03": "High"},
+        "sections": ["mfa-enrollment-policies"],
+        "context": [],
+        "run": _check_mfa_enrollment_policies,
+    },
+    {
+        "name": "disabled_saml_apps",
+        "checks": {"APP-01": "High"},
+        "sections": [],
+        "context": ["all_apps"],
+        "fields": {"all_apps": ("id", "name", "label", "status", "signOnMode")},
+        "run": _check_disabled_saml_apps,
+    },
+    {
+        "name": "org_support_metadata",
+        "checks": {"ORG-01": "Moderate"},
+        "sections": ["org-settings"],
+        "context": [],
+        "run": _check_org_support_metadata,
+    },
+    {
+        "name": "group_descriptions",
+        "checks": {"GRP-01": "Low"},
+        "sections": ["groups"],
+        "context": [],
+        "run": _check_group_descriptions,
+    },
+    {
+        "name": "group_rules",
+        "checks": {"GRR-01": "Low"},
+        "sections": ["group-rules"],
+        "context": [],
+        "run": _check_group_rules,
+    },
+    {
+        "name": "network_zone_usage",
+        "checks": {"NET-02": "Low", "NET-03": "Moderate"},
+        "sections": ["network-zones", "global-session-policies", "authentication-policies"],
+        "context": [],
+        "run": _check_network_zone_usage,
+    },
+    {
+        "name": "authenticators",
+        "checks": {"AUT-01": "High", "AUT-02": "High"},
+        "sections": ["authenticators"],
+        "context": [],
+        "run": _check_authenticators,
+    },
+    {
+        "name": "applications",
+        "checks": {"APP-02": "Moderate", "APP-03": "Low"},
+        "sections": ["applications"],
+        "context": [],
+        "run": _check_applications,
+    },
+    {
+        "name": "identity_providers",
+        "checks": {"IDP-01": "Low", "IDP-02": "Low"},
+        "sections": ["identity-providers", "idp-discovery-policies"],
+        "context": [],
+        "run": _check_identity_providers,
+    },
+    {
+        "name": "authorization_servers",
+        "checks": {"AS-01": "Moderate", "AS-02": "Moderate"},
+        "sections": ["authz-servers", "authz-access-policies"],
+        "context": [],
+        "run": _check_authorization_servers,
+    },
+    {
+        "name": "admin_governance",
+        "checks": {
+            "CAR-01": "Low",
+            "RST-01": "Moderate",
+            "RST-02": "Moderate",
+            "ADM-01": "Moderate",
+        },
+        "sections": ["custom-admin-roles", "resource-sets", "admin-assignments-apps"],
+        "context": [],
+        "run": _check_admin_governance,
+    },
+    {
+        "name": "api_token_network",
+        "checks": {"API-01": "High"},
+        "sections": ["api-tokens"],
+        "context": [],
+        "run": _check_api_token_network,
+    },
+    {
+        "name": "brands",
+        "checks": {"BRD-01": "Low"},
+        "sections": ["brand-settings"],
+        "context": [],
+        "run": _check_brands,
+    },
+    {
+        "name": "trusted_origins",
+        "checks": {"TOR-01": "High"},
+        "sections": ["trusted-origins"],
+        "context": [],
+        "run": _check_trusted_origins,
+    },
+    {
+        "name": "event_hooks",
+        "checks": {"EVH-01": "High", "EVH-02": "High", "EVH-03": "Low"},
+        "sections": ["event-hooks"],
+        "context": [],
+        "run": _check_event_hooks,
+    },
+    {
+        "name": "inline_hooks",
+        "checks": {"INH-01": "High", "INH-02": "Low"},
+        "sections": ["inline-hooks"],
+        "context": [],
+        "run": _check_inline_hooks,
+    },
+    {
+        "name": "attack_protection",
+        "checks": {"ATP-01": "High"},
+        "sections": ["attack-protection"],
+        "context": [],
+        "run": _check_attack_protection,
+    },
+    {
+        "name": "realms",
+        "checks": {"RLM-01": "Low", "RLM-02": "High"},
+        "sections": ["realms", "realm-assignments"],
+        "context": [],
+        "run": _check_realms,
+    },
+    {
+        "name": "profile_schema_and_mappings",
+        "checks": {"PRF-01": "High", "PRF-02": "Moderate"},
+        "sections": ["profile-schema-user", "profile-mappings"],
+        "context": [],
+        "run": _check_profile_schema_and_mappings,
+    },
+    {
+        "name": "group_push_mappings",
+        "checks": {"GPM-01": "Low", "GPM-02": "Low"},
+        "sections": ["group-push-mappings"],
+        "context": [],
+        "run": _check_group_push_mappings,
+    },
+    {
+        "name": "risk_policies",
+        "checks": {"POL-04": "High", "POL-05": "High"},
+        "sections": ["entity-risk-policies", "post-auth-session-policies"],
+        "context": [],
+        "run": _check_risk_policies,
+    },
+    {
+        "name": "mfa_every_sign_in",
+        "checks": {"POL-01": "High", "POL-02": "Moderate", "POL-03": "High"},
+        "sections": ["authentication-policies", "global-session-policies", "applications"],
+        "context": [],
+        "run": _check_mfa_every_sign_in,
+    },
+    {
+        "name": "identity_risk",
+        "checks": {
+            "USR-11": "High",
+            "ADM-13": "High",
+            "USR-12": "High",
+            "ADM-14": "High",
+            "ADM-06": "High",
+            "GAD-01": "High",
+            "GAD-02": "High",
+            "GAD-04": "High",
+            "GAD-05": "High",
+            "GAD-06": "High",
+            "GAD-07": "High",
+            "USR-09": "High",
+            "ADM-02": "High",
+            "ADM-03": "High",
+            "GAD-03": "High",
+            "GAD-08": "High",
+            "ADM-05": "High",
+            "USR-04": "High",
+            "ADM-07": "High",
+            "ADM-08": "High",
+            "GAD-09": "High",
+            "ADM-15": "High",
+            "ADM-16": "High",
+            "ADM-09": "High",
+            "ADM-10": "High",
+            "ADM-17": "High",
+            "ADM-12": "High",
+            "ADM-11": "High",
+            "ADM-04": "Moderate",
+            "USR-01": "Moderate",
+            "USR-02": "Moderate",
+            "USR-03": "Moderate",
+            "USR-05": "Moderate",
+            "USR-06": "Moderate",
+            "USR-13": "Moderate",
+            "USR-14": "Moderate",
+            "USR-07": "Low",
+            "USR-08": "Low",
+            "USR-10": "Low",
+            "USR-15": "Low",
+        },
+        "sections": ["mfa-enrollment-policies", "authentication-policies"],
+        "context": ["all_users", "api_tokens", "custom_admin_roles", "resource_set_bindings"],
+        "fields": {"all_users": _USER_RISK_FIELDS},
+        "run": _check_identity_risk,
+    },
+]
+
+SECURITY_CHECK_BY_NAME = {entry["name"]: entry for entry in SECURITY_CHECKS}
+
+
+def _check_id_selected(check_id, selection):
+    check_id = str(check_id or "").upper()
+    for selector in selection:
+        if check_id == selector or check_id.startswith(f"{selector}-"):
+            return True
+    return False
+
+
+def _normalize_selection(selection):
+    if isinstance(selection, str):
+        selection = selection.split(",")
+    return [str(item).strip().upper() for item in (selection or []) if str(item).strip()]
+
+
+def select_security_checks(selection=None):
+    """
+    Registry entries that emit at least one selected check.
+    selection: check IDs ("ADM-02") and/or prefixes ("ADM"), as a list or comma-separated
+    string. Every check is selected when empty.
+    """
+    selection = _normalize_selection(selection)
+    if not selection:
+        return list(SECURITY_CHECKS)
+    return [
+        entry for entry in SECURITY_CHECKS
+        if any(_check_id_selected(check_id, selection) for check_id in entry["checks"])
+    ]
+
+
+def selected_check_ids(selection=None):
+    """Check IDs the selection runs, in registry order (every check when empty)."""
+    selection = _normalize_selection(selection)
+    return [
+        check_id
+        for entry in select_security_checks(selection)
+        for check_id in entry["checks"]
+        if not selection or _check_id_selected(check_id, selection)
+    ]
+
+
+def plan_security_checks(selection=None):
+    """
+    Data dependencies of the selected checks:
+    {"checks": [check names], "sections": [snapshot section ids], "context": [extra_context keys],
+    "fields": {extra_context key: [field paths] or None}}, where None keeps whole items.
+    """
+    entries = select_security_checks(selection)
+    sections = []
+    context = []
+    fields = {}
+    for entry in entries:
+        sections.extend(section_id for section_id in entry["sections"] if section_id not in sections)
+        context.extend(key for key in entry["context"] if key not in context)
+        for key in entry["context"]:
+            declared = (entry.get("fields") or {}).get(key)
+            if declared is None or (key in fields and fields[key] is None):
+                fields[key] = None
+                continue
+            paths = fields.setdefault(key, [])
+            paths.extend(path for path in declared if path not in paths)
+    return {
+        "checks": [entry["name"] for entry in entries],
+        "sections": sections,
+        "context": context,
+        "fields": fields,
+    }
+
+
+def _run_timed_check(entry, section_by_id, extra_context):
+    started = time.perf_counter()
+    results = entry["run"](section_by_id, extra_context)
+    return results, time.perf_counter() - started
+
+
+def run_security_validations(sections, extra_context=None, selection=None, timings=None, thresholds=None):
+    """
+    Run the selected security checks concurrently and return their validations in
+    registry order. When a timings dict is passed it is filled with seconds per check.
+    thresholds: optional overrides of EVALUATE_THRESHOLDS.
+    """
+    section_by_id = _section_map(sections)
+    extra_context = {**(extra_context or {}), "thresholds": resolve_evaluate_thresholds(thresholds)}
+    selected = _normalize_selection(selection)
+    entries = select_security_checks(selected)
+
+    futures = [
+        _CHECK_EXECUTOR.submit(_run_timed_check, entry, section_by_id, extra_context)
+        for entry in entries
+    ]
+    validations = []
+    for entry, future in zip(entries, futures):
+        results, elapsed = future.result()
+        if timings is not None:
+            timings[entry["name"]] = round(elapsed, 4)
+        if elapsed >= 1:
+            logger.info("OktaEvaluate check %s took %.2fs.", entry["name"], elapsed)
+        validations.extend(
+            result for result in results
+            if not selected or _check_id_selected(result.get("check_id"), selected)
+        )
+    validations.extend(_unsupported_ispm_validations())
+    return validations
+
+
+def build_validation_summary(validations):
+    summary = {
+        "assessed": 0,
+        "high": 0,
+        "medium": 0,
+        "low": 0,
+        "high_passed": 0,
+        "medium_passed": 0,
+        "low_passed": 0,
+        "high_failed": 0,
+        "medium_failed": 0,
+        "low_failed": 0,
+        "passed": 0,
+        "pass_pct": 0,
+        "high_pass_pct": 0,
+        "medium_pass_pct": 0,
+        "low_pass_pct": 0,
+    }
+    for check in validations or []:
+        summary["assessed"] += 1
+
+        severity = str(check.get("severity") or "").strip().lower()
+        status = str(check.get("status") or "").strip().lower()
+        if severity == "high":
+            summary["high"] += 1
+            if status == "pass":
+                summary["high_passed"] += 1
+            if status == "fail":
+                summary["high_failed"] += 1
+        elif severity in {"moderate", "medium"}:
+            summary["medium"] += 1
+            if status == "pass":
+                summary["medium_passed"] += 1
+            if status == "fail":
+                summary["medium_failed"] += 1
+        elif severity == "low":
+            summary["low"] += 1
+            if status == "pass":
+                summary["low_passed"] += 1
+            if status == "fail":
+                summary["low_failed"] += 1
+
+        if status == "pass":
+            summary["passed"] += 1
+
+    if summary["assessed"]:
+        summary["pass_pct"] = round((summary["passed"] / summary["assessed"]) * 100)
+    if summary["high"]:
+        summary["high_pass_pct"] = round((summary["high_passed"] / summary["high"]) * 100)
+    if summary["medium"]:
+        summary["medium_pass_pct"] = round((summary["medium_passed"] / summary["medium"]) * 100)
+    if summary["low"]:
+        summary["low_pass_pct"] = round((summary["low_passed"] / summary["low"]) * 100)
+
+    return summary
+
+
+
+def build_fleet_posture_matrix(validations_by_org):
+    """
+    Check x org posture matrix for a fleet evaluation.
+    validations_by_org: {org label: security_validations of that org's evaluate run}
+    """
+    orgs = list(validations_by_org)
+    rows = {}
+    for org, validations in validations_by_org.items():
+        for check in validations or []:
+            key = (check.get("check_id"), check.get("title"))
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    "check_id": check.get("check_id"),
+                    "title": check.get("title"),
+                    "severity": check.get("severity"),
+                    "statuses": {name: None for name in orgs},
+                    "passed": 0,
+                    "failed": 0,
+                    "failed_orgs": [],
+                }
+            status = check.get("status")
+            row["statuses"][org] = status
+            if str(status or "").strip().lower() == "pass":
+                row["passed"] += 1
+            elif str(status or "").strip().lower() == "fail":
+                row["failed"] += 1
+                row["failed_orgs"].append(org)
+    return {
+        "orgs": orgs,
+        "rows": list(rows.values()),
+        "org_summaries": {org: build_validation_summary(validations) for org, validations in validations_by_org.items()},
+        "summary": build_validation_summary(
+            [check for validations in validations_by_org.values() for check in validations or []]
+        ),
+    }
+
+def build_evaluate_summary(sections, domain, extra_context=None, selection=None, timings=None, thresholds=None):
+    section_by_id = _section_map(sections)
+    threshold_overrides = {
+        name: value
+        for name, value in resolve_evaluate_thresholds(thresholds).items()
+        if value != EVALUATE_THRESHOLDS[name]
+    }
+    total_sections = len(sections or [])
+    populated_sections = sum(1 for s in (sections or []) if s.get("rows"))
+    empty_sections = total_sections - populated_sections
+    total_rows = sum(len(s.get("rows") or []) for s in (sections or []))
+
+    readiness_groups = [
+        {
+            "name": "Core Access Controls",
+            "section_ids": [
+                "groups",
+                "group-rules",
+                "network-zones",
+                "authenticators",
+                "password-policies",
+                "global-session-policies",
+                "authentication-policies",
+                "mfa-enrollment-policies",
+            ],
+        },
+        {
+            "name": "Identity Federation",
+            "section_ids": [
+                "identity-providers",
+                "idp-discovery-policies",
+                "profile-mappings",
+            ],
+        },
+        {
+            "name": "Platform Security & Settings",
+            "section_ids": [
+                "org-settings",
+                "security-settings",
+                "trusted-origins",
+            ],
+        },
+        {
+            "name": "Admin Delegation",
+            "section_ids": [
+                "custom-admin-roles",
+                "resource-sets",
+                "admin-assignments-users",
+                "admin-assignments-groups",
+                "admin-assignments-apps",
+            ],
+        },
+        {
+            "name": "Branding & End-User Experience",
+            "section_ids": [
+                "brand-settings",
+                "brand-pages",
+                "brand-email-templates",
+            ],
+        },
+    ]
+
+    group_results = []
+    score_total = 0
+    score_max = 0
+    for group in readiness_groups:
+        items = []
+        present = 0
+        collected = 0
+        for section_id in group["section_ids"]:
+            section = section_by_id.get(section_id)
+            if section is None:
+                # Section was not needed by the selected checks, so it was never fetched.
+                items.append(
+                    {
+                        "id": section_id,
+                        "title": SNAPSHOT_SECTION_TITLES.get(section_id) or section_id,
+                        "row_count": 0,
+                        "status": "Not Collected",
+                    }
+                )
+                continue
+            collected += 1
+            row_count = len(section.get("rows") or [])
+            has_data = row_count > 0
+            present += int(has_data)
+            items.append(
+                {
+                    "id": section_id,
+                    "title": section.get("title") or section_id,
+                    "row_count": row_count,
+                    "status": "Present" if has_data else "Not Found / Empty",
+                }
+            )
+        total = collected
+        pct = round((present / total) * 100) if total else 0
+        score_total += present
+        score_max += total
+        if not total:
+            risk = "Not Collected"
+        elif pct >= 85:
+            risk = "Low"
+        elif pct >= 60:
+            risk = "Medium"
+        else:
+            risk = "High"
+        group_results.append(
+            {
+                "name": group["name"],
+                "present": present,
+                "total": total,
+                "pct": pct,
+                "risk": risk,
+                "items": items,
+            }
+        )
+
+    overall_score = round((score_total / score_max) * 100) if score_max else 0
+    if not score_max:
+        readiness_band = "Not Collected"
+    elif overall_score >= 85:
+        readiness_band = "Ready"
+    elif overall_score >= 65:
+        readiness_band = "Needs Review"
+    else:
+        readiness_band = "High Attention"
+
+    recommendations = []
+    if empty_sections:
+        recommendations.append(
+            f"{empty_sections} snapshot sections returned no data. Verify API permissions and tenant feature availability."
+        )
+    if score_max and overall_score < 85:
+        recommendations.append(
+            "Run OktaCompare against the target environment before cutover to confirm policy, app, and IdP parity."
+        )
+    if "custom-admin-roles" in section_by_id and not section_by_id["custom-admin-roles"].get("rows"):
+        recommendations.append(
+            "Review admin delegation model manually if custom admin roles/resource sets are not configured in this tenant."
+        )
+    if "brand-pages" in section_by_id and not section_by_id["brand-pages"].get("rows"):
+        recommendations.append(
+            "Validate end-user branding pages and email templates before go-live if branded experiences are in scope."
+        )
+    if not recommendations:
+        recommendations.append("Tenant configuration coverage looks healthy. Proceed with detailed migration validation.")
+
+    security_validations = run_security_validations(
+        list(section_by_id.values()),
+        extra_context=extra_context,
+        selection=selection,
+        timings=timings,
+        thresholds=thresholds,
+    )
+    validation_summary = build_validation_summary(security_validations)
+
+    return {
+        "domain": domain,
+        "generated_at": datetime.now(ZoneInfo("Australia/Brisbane")).strftime("%Y-%m-%d %H:%M:%S %Z"),
+        "total_sections": total_sections,
+        "populated_sections": populated_sections,
+        "empty_sections": empty_sections,
+        "total_rows": total_rows,
+        "overall_score": overall_score,
+        "readiness_band": readiness_band,
+        "groups": group_results,
+        "check_prefix_legend": CHECK_PREFIX_LEGEND,
+        "check_selection": ", ".join(_normalize_selection(selection)),
+        "threshold_overrides": threshold_overrides,
+        "identity_risk_estimates": _identity_risk_estimates(extra_context or {}, resolve_evaluate_thresholds(thresholds)),
+        "security_validations": security_validations,
+        "validation_summary": validation_summary,
+        "recommendations": recommendations,
+    }
@@ -1,5 +1,6 @@
 import logging
 
+from modules.oktasnapshot_normalize import normalize_section_rows
 from scripts.oktasnapshot_org_settings import get_org_settings
 from scripts.oktasnapshot_security_settings import get_security_settings
 from scripts.oktasnapshot_groups import get_groups_view
@@ -9,7 +10,7 @@ from scripts.oktasnapshot_identity_providers import get_identity_providers
 from scripts.oktasnapshot_authenticators import get_authenticators_view
 from scripts.oktasnapshot_authorization_server_settings import get_authorization_server_settings_view
 from scripts.oktasnapshot_authorization_server_access_policies import get_authorization_server_access_policies_view
-from scripts.oktasnapshot_applications import get_applications
+from scripts.oktasnapshot_applications import APPLICATION_VIEW_FIELDS, get_applications
 from scripts.oktasnapshot_password_policies import get_password_policies
 from scripts.oktasnapshot_global_session_policies import get_global_session_policies
 from scripts.oktasnapshot_authentication_policies import get_authentication_policies
@@ -34,6 +35,13 @@ from scripts.oktasnapshot_group_push_mappings import get_group_push_mappings_vie
 from scripts.oktasnapshot_entity_risk_policies import get_entity_risk_policies_view
 from scripts.oktasnapshot_post_auth_session_policies import get_post_auth_session_policies_view
 from scripts.oktasnapshot_agents import get_agents_view
+from scripts.extract_applications import get_applications as get_all_applications
+from scripts.extract_app_group_assignments import get_app_group_assignments
+from scripts.extract_groups import get_groups
+from scripts.extract_authorization_servers import get_authorization_server_tree
+from scripts.extract_brands import get_brand_tree
+from scripts.extract_api_tokens import get_api_tokens_with_metadata
+from scripts.extract_admin_roles import get_custom_admin_roles
 
 logging.basicConfig(
     level=logging.INFO,
@@ -52,14 +60,18 @@ def _key_value_rows(values):
     return rows
 
 
-def _section(section_id, title, rows, description=None):
-    return {
+def _section(section_id, title, rows, description=None, sources=None):
+    section = {
         "id": section_id,
         "title": title,
         "description": description or "",
         "rows": rows or [],
         "columns": list((rows or [{}])[0].keys()) if rows else [],
     }
+    raw = normalize_section_rows(section_id, section["rows"], sources)
+    if raw is not None:
+        section["raw"] = raw
+    return section
 
 
 def _row_identifier(row):
@@ -97,191 +109,276 @@ def _export_rows_from_sections(sections):
     return export_rows
 
 
-def build_oktasnapshot_guide(domain, api_token):
-    logger.info("Building OktaView guide for %s.", domain)
+# Snapshot sections in display order.
+SNAPSHOT_SECTIONS = [
+    ("org-settings", "Organization Settings"),
+    ("security-settings", "Security General Settings"),
+    ("groups", "Groups"),
+    ("group-rules", "Group Rules"),
+    ("network-zones", "Network Zones"),
+    ("identity-providers", "Identity Providers"),
+    ("authenticators", "Authenticators"),
+    ("authz-servers", "Authorization Servers - Settings"),
+    ("authz-claims", "Authorization Server Claims"),
+    ("authz-scopes", "Authorization Server Scopes"),
+    ("authz-access-policies", "Authorization Servers - Access Policies"),
+    ("applications", "Applications"),
+    ("password-policies", "Password Policies"),
+    ("global-session-policies", "Global Session Policies"),
+    ("authentication-policies", "Authentication Policies"),
+    ("mfa-enrollment-policies", "MFA Enrollment Policies"),
+    ("idp-discovery-policies", "IDP Discovery Policies"),
+    ("profile-enrollment-policies", "Profile Enrollment Policies"),
+    ("entity-risk-policies", "Entity Risk Policies"),
+    ("post-auth-session-policies", "Identity Threat Protection Policies"),
+    ("brand-settings", "Brand Settings"),
+    ("brand-pages", "Brand Pages"),
+    ("brand-email-templates", "Brand Email Templates"),
+    ("custom-admin-roles", "Custom Admin Roles"),
+    ("resource-sets", "Resource Sets"),
+    ("admin-assignments-users", "Admin Assignments - Users"),
+    ("admin-assignments-groups", "Admin Assignments - Groups"),
+    ("admin-assignments-apps", "Admin Assignments - Apps"),
+    ("api-tokens", "API Tokens"),
+    ("realms", "Realms"),
+    ("realm-assignments", "Realm Assignments"),
+    ("profile-schema-user", "Profile Schema - User"),
+    ("profile-mappings", "Profile Mappings"),
+    ("trusted-origins", "Trusted Origins"),
+    ("event-hooks", "Event Hooks"),
+    ("inline-hooks", "Inline Hooks"),
+    ("attack-protection", "Access Controls - Attack Protection"),
+    ("group-push-mappings", "Group Push Mappings"),
+    ("agents", "Agents"),
+]
+
+SNAPSHOT_SECTION_IDS = [section_id for section_id, _ in SNAPSHOT_SECTIONS]
 
-    org_settings = get_org_settings(domain, api_token) or {}
-    security_settings = get_security_settings(domain, api_token) or []
-    groups = get_groups_view(domain, api_token) or []
-    group_rules = get_group_rules_view(domain, api_token) or []
-    network_zones = get_network_zones(domain, api_token) or []
-    identity_providers = get_identity_providers(domain, api_token) or []
-    authenticators = get_authenticators_view(domain, api_token) or []
-    authz_servers, authz_claims, authz_scopes = get_authorization_server_settings_view(domain, api_token)
-    authz_access_policies, authz_access_policy_rules = get_authorization_server_access_policies_view(
-        domain, api_token
-    )
-    applications = get_applications(domain, api_token) or []
-    password_policies, password_policy_rules = get_password_policies(domain, api_token)
-    global_session_policies, global_session_rules = get_global_session_policies(domain, api_token)
-    authentication_policies, authentication_rules = get_authentication_policies(domain, api_token)
-    mfa_policies, mfa_policy_rules = get_mfa_enrollment_policies(domain, api_token)
-    idp_discovery_policies, idp_discovery_rules = get_idp_discovery_policies_view(domain, api_token)
-    profile_enrollment_policies, profile_enrollment_rules = get_profile_enrollment_policies_view(domain, api_token)
-    brand_settings = get_brand_settings_view(domain, api_token) or []
-    brand_pages = get_brand_pages_view(domain, api_token) or []
-    brand_email_templates = get_brand_email_templates_view(domain, api_token) or []
-    custom_admin_roles = get_custom_admin_roles_view(domain, api_token) or []
-    resource_sets, resource_set_resources, resource_set_bindings = get_resource_sets_view(domain, api_token)
-    admin_users, admin_groups, admin_apps = get_admin_assignments_view(domain, api_token)
-    api_tokens = get_api_tokens_view(domain, api_token) or []
-    realms = get_realms_view(domain, api_token) or []
-    realm_assignments = get_realm_assignments_view(domain, api_token) or []
-    profile_schema_user = get_profile_schema_user_view(domain, api_token) or []
-    profile_mappings = get_profile_mappings_view(domain, api_token) or []
-    trusted_origins = get_trusted_origins_view(domain, api_token) or []
-    event_hooks = get_event_hooks_view(domain, api_token) or []
-    inline_hooks = get_inline_hooks_view(domain, api_token) or []
-    attack_protection = get_attack_protection_view(domain, api_token) or []
-    group_push_mappings = get_group_push_mappings_view(domain, api_token) or []
-    entity_risk_policies, entity_risk_rules = get_entity_risk_policies_view(domain, api_token)
-    post_auth_policies, post_auth_rules = get_post_auth_session_policies_view(domain, api_token)
-    agents = get_agents_view(domain, api_token) or []
 
-    authz_access_combined = []
-    for row in authz_access_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        authz_access_combined.append(combined)
-    for row in authz_access_policy_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        authz_access_combined.append(combined)
+def _entry_rows(*groups):
+    """Merge (entry_type, rows) groups into one list tagged with "Entry Type"."""
+    combined = []
+    for entry_type, rows in groups:
+        for row in rows or []:
+            item = dict(row)
+            item["Entry Type"] = entry_type
+            combined.append(item)
+    return combined
 
-    password_combined = []
-    for row in password_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        password_combined.append(combined)
-    for row in password_policy_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        password_combined.append(combined)
 
-    global_session_combined = []
-    for row in global_session_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        global_session_combined.append(combined)
-    for row in global_session_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        global_session_combined.append(combined)
+def _entry_sources(sources, *entry_types):
+    """API objects behind _entry_rows(...) rows of the same entry types, in the same order."""
+    return [source for entry_type in entry_types for source in sources.get(entry_type) or []]
 
-    authentication_combined = []
-    for row in authentication_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        authentication_combined.append(combined)
-    for row in authentication_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        authentication_combined.append(combined)
 
-    mfa_combined = []
-    for row in mfa_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        mfa_combined.append(combined)
-    for row in mfa_policy_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        mfa_combined.append(combined)
+def _collect_section_rows(domain, api_token, wanted, datasets=None, sources=None):
+    """
+    Fetch rows for the wanted sections. Returns {section_id: rows}.
+    datasets: optional dict that receives the raw inventories fetched along the way
+    (all_apps, app_group_assignments, api_tokens, custom_admin_roles, resource_set_bindings).
+    sources: optional dict that receives {section_id: [API object per row]} for the policy
+    sections whose typed payloads are read from the policy and rule objects.
+    """
+    sources = {} if sources is None else sources
+    rows = {}
+    # The group inventory backs both the groups section and app group assignments;
+    # the authorization server and brand trees each back several sections.
+    shared = {}
 
-    idp_discovery_combined = []
-    for row in idp_discovery_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        idp_discovery_combined.append(combined)
-    for row in idp_discovery_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        idp_discovery_combined.append(combined)
+    def all_groups():
+        if "groups" not in shared:
+            shared["groups"] = get_groups(domain, api_token) or []
+        return shared["groups"]
 
-    profile_enrollment_combined = []
-    for row in profile_enrollment_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        profile_enrollment_combined.append(combined)
+    def authz_tree():
+        if "authz_tree" not in shared:
+            shared["authz_tree"] = get_authorization_server_tree(domain, api_token)
+        return shared["authz_tree"]
 
-    entity_risk_combined = []
-    for row in entity_risk_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        entity_risk_combined.append(combined)
-    for row in entity_risk_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        entity_risk_combined.append(combined)
+    def brand_tree():
+        if "brand_tree" not in shared:
+            shared["brand_tree"] = get_brand_tree(domain, api_token)
+        return shared["brand_tree"]
 
-    post_auth_combined = []
-    for row in post_auth_policies:
-        combined = dict(row)
-        combined["Entry Type"] = "Policy"
-        post_auth_combined.append(combined)
-    for row in post_auth_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        post_auth_combined.append(combined)
-    for row in profile_enrollment_rules:
-        combined = dict(row)
-        combined["Entry Type"] = "Rule"
-        profile_enrollment_combined.append(combined)
+    if wanted("org-settings"):
+        rows["org-settings"] = _key_value_rows(get_org_settings(domain, api_token) or {})
+    if wanted("security-settings"):
+        rows["security-settings"] = get_security_settings(domain, api_token) or []
+    if wanted("groups"):
+        rows["groups"] = get_groups_view(domain, api_token, groups=all_groups()) or []
+    if wanted("group-rules"):
+        rows["group-rules"] = get_group_rules_view(domain, api_token) or []
+    if wanted("network-zones"):
+        rows["network-zones"] = get_network_zones(domain, api_token) or []
+    if wanted("identity-providers"):
+        rows["identity-providers"] = get_identity_providers(domain, api_token) or []
+    if wanted("authenticators"):
+        rows["authenticators"] = get_authenticators_view(domain, api_token) or []
+    if wanted("authz-servers", "authz-claims", "authz-scopes"):
+        authz_servers, authz_claims, authz_scopes = get_authorization_server_settings_view(
+            domain, api_token, tree=authz_tree()
+        )
+        rows["authz-servers"] = authz_servers
+        rows["authz-claims"] = authz_claims
+        rows["authz-scopes"] = authz_scopes
+    if wanted("authz-access-policies"):
+        authz_access_policies, authz_access_policy_rules = get_authorization_server_access_policies_view(
+            domain, api_token, tree=authz_tree()
+        )
+        rows["authz-access-policies"] = _entry_rows(
+            ("Policy", authz_access_policies),
+            ("Rule", authz_access_policy_rules),
+        )
+    if wanted("applications"):
+        if datasets is None:
+            rows["applications"] = get_applications(domain, api_token, groups=all_groups()) or []
+        else:
+            datasets["all_apps"] = get_all_applications(
+                domain, api_token, limit=200, fields=APPLICATION_VIEW_FIELDS
+            ) or []
+            datasets["app_group_assignments"] = get_app_group_assignments(
+                domain,
+                api_token,
+                apps=[app for app in datasets["all_apps"] if app.get("status") == "ACTIVE"],
+                groups=all_groups(),
+            )
+            rows["applications"] = get_applications(
+                domain,
+                api_token,
+                apps=datasets["all_apps"],
+                assignments=datasets["app_group_assignments"],
+            ) or []
+    if wanted("password-policies"):
+        policy_sources = {}
+        password_policies, password_policy_rules = get_password_policies(domain, api_token, sources=policy_sources)
+        rows["password-policies"] = _entry_rows(("Policy", password_policies), ("Rule", password_policy_rules))
+        sources["password-policies"] = _entry_sources(policy_sources, "Policy", "Rule")
+    if wanted("global-session-policies"):
+        policy_sources = {}
+        global_session_policies, global_session_rules = get_global_session_policies(
+            domain, api_token, sources=policy_sources
+        )
+        rows["global-session-policies"] = _entry_rows(
+            ("Policy", global_session_policies),
+            ("Rule", global_session_rules),
+        )
+        sources["global-session-policies"] = _entry_sources(policy_sources, "Policy", "Rule")
+    if wanted("authentication-policies"):
+        policy_sources = {}
+        authentication_policies, authentication_rules = get_authentication_policies(
+            domain, api_token, sources=policy_sources
+        )
+        rows["authentication-policies"] = _entry_rows(
+            ("Policy", authentication_policies),
+            ("Rule", authentication_rules),
+        )
+        sources["authentication-policies"] = _entry_sources(policy_sources, "Policy", "Rule")
+    if wanted("mfa-enrollment-policies"):
+        policy_sources = {}
+        mfa_policies, mfa_policy_rules = get_mfa_enrollment_policies(domain, api_token, sources=policy_sources)
+        rows["mfa-enrollment-policies"] = _entry_rows(("Policy", mfa_policies), ("Rule", mfa_policy_rules))
+        sources["mfa-enrollment-policies"] = _entry_sources(policy_sources, "Policy", "Rule")
+    if wanted("idp-discovery-policies"):
+        idp_discovery_policies, idp_discovery_rules = get_idp_discovery_policies_view(domain, api_token)
+        rows["idp-discovery-policies"] = _entry_rows(
+            ("Policy", idp_discovery_policies),
+            ("Rule", idp_discovery_rules),
+        )
+    if wanted("profile-enrollment-policies"):
+        profile_enrollment_policies, profile_enrollment_rules = get_profile_enrollment_policies_view(
+            domain, api_token
+        )
+        rows["profile-enrollment-policies"] = _entry_rows(
+            ("Policy", profile_enrollment_policies),
+            ("Rule", profile_enrollment_rules),
+        )
+    if wanted("brand-settings"):
+        rows["brand-settings"] = get_brand_settings_view(domain, api_token, tree=brand_tree()) or []
+    if wanted("brand-pages"):
+        rows["brand-pages"] = get_brand_pages_view(domain, api_token, tree=brand_tree()) or []
+    if wanted("brand-email-templates"):
+        rows["brand-email-templates"] = get_brand_email_templates_view(domain, api_token, tree=brand_tree()) or []
+    if wanted("custom-admin-roles"):
+        if datasets is None:
+            rows["custom-admin-roles"] = get_custom_admin_roles_view(domain, api_token) or []
+        else:
+            datasets["custom_admin_roles"] = get_custom_admin_roles(domain, api_token, limit=200) or []
+            rows["custom-admin-roles"] = get_custom_admin_roles_view(
+                domain, api_token, roles=datasets["custom_admin_roles"]
+            ) or []
+    if wanted("resource-sets"):
+        raw_bindings = None if datasets is None else datasets.setdefault("resource_set_bindings", [])
+        resource_sets, resource_set_resources, resource_set_bindings = get_resource_sets_view(
+            domain, api_token, raw_bindings=raw_bindings
+        )
+        rows["resource-sets"] = _entry_rows(
+            ("Resource Set", resource_sets),
+            ("Resource", resource_set_resources),
+            ("Binding", resource_set_bindings),
+        )
+    if wanted("admin-assignments-users", "admin-assignments-groups", "admin-assignments-apps"):
+        admin_users, admin_groups, admin_apps = get_admin_assignments_view(domain, api_token)
+        rows["admin-assignments-users"] = admin_users
+        rows["admin-assignments-groups"] = admin_groups
+        rows["admin-assignments-apps"] = admin_apps
+    if wanted("api-tokens"):
+        if datasets is None:
+            rows["api-tokens"] = get_api_tokens_view(domain, api_token) or []
+        else:
+            datasets["api_tokens"] = get_api_tokens_with_metadata(domain, api_token, limit=200) or []
+            rows["api-tokens"] = get_api_tokens_view(domain, api_token, tokens=datasets["api_tokens"]) or []
+    if wanted("realms"):
+        rows["realms"] = get_realms_view(domain, api_token) or []
+    if wanted("realm-assignments"):
+        rows["realm-assignments"] = get_realm_assignments_view(domain, api_token) or []
+    if wanted("profile-schema-user"):
+        rows["profile-schema-user"] = get_profile_schema_user_view(domain, api_token) or []
+    if wanted("profile-mappings"):
+        rows["profile-mappings"] = get_profile_mappings_view(domain, api_token) or []
+    if wanted("trusted-origins"):
+        rows["trusted-origins"] = get_trusted_origins_view(domain, api_token) or []
+    if wanted("event-hooks"):
+        rows["event-hooks"] = get_event_hooks_view(domain, api_token) or []
+    if wanted("inline-hooks"):
+        rows["inline-hooks"] = get_inline_hooks_view(domain, api_token) or []
+    if wanted("attack-protection"):
+        rows["attack-protection"] = get_attack_protection_view(domain, api_token) or []
+    if wanted("group-push-mappings"):
+        rows["group-push-mappings"] = get_group_push_mappings_view(domain, api_token) or []
+    if wanted("entity-risk-policies"):
+        entity_risk_policies, entity_risk_rules = get_entity_risk_policies_view(domain, api_token)
+        rows["entity-risk-policies"] = _entry_rows(("Policy", entity_risk_policies), ("Rule", entity_risk_rules))
+    if wanted("post-auth-session-policies"):
+        post_auth_policies, post_auth_rules = get_post_auth_session_policies_view(domain, api_token)
+        rows["post-auth-session-policies"] = _entry_rows(("Policy", post_auth_policies), ("Rule", post_auth_rules))
+    if wanted("agents"):
+        rows["agents"] = get_agents_view(domain, api_token) or []
+
+    return rows
 
-    resource_sets_combined = []
-    for row in resource_sets:
-        combined = dict(row)
-        combined["Entry Type"] = "Resource Set"
-        resource_sets_combined.append(combined)
-    for row in resource_set_resources:
-        combined = dict(row)
-        combined["Entry Type"] = "Resource"
-        resource_sets_combined.append(combined)
-    for row in resource_set_bindings:
-        combined = dict(row)
-        combined["Entry Type"] = "Binding"
-        resource_sets_combined.append(combined)
 
+def build_oktasnapshot_guide(domain, api_token, section_ids=None, datasets=None):
+    """
+    Build snapshot sections and export rows.
+    section_ids: optional iterable of section ids to collect; other sections are not
+    fetched and are left out of the result.
+    datasets: optional dict that receives the raw inventories behind the sections, keyed
+    like OktaEvaluate's extra_context, so callers can reuse them instead of re-fetching.
+    """
+    logger.info("Building OktaView guide for %s.", domain)
+    requested = None if section_ids is None else set(section_ids)
+
+    def wanted(*ids):
+        return requested is None or any(section_id in requested for section_id in ids)
+
+    sources_by_section = {}
+    rows_by_section = _collect_section_rows(
+        domain, api_token, wanted, datasets=datasets, sources=sources_by_section
+    )
     sections = [
-        _section("org-settings", "Organization Settings", _key_value_rows(org_settings)),
-        _section("security-settings", "Security General Settings", security_settings),
-        _section("groups", "Groups", groups),
-        _section("group-rules", "Group Rules", group_rules),
-        _section("network-zones", "Network Zones", network_zones),
-        _section("identity-providers", "Identity Providers", identity_providers),
-        _section("authenticators", "Authenticators", authenticators),
-        _section("authz-servers", "Authorization Servers - Settings", authz_servers),
-        _section("authz-claims", "Authorization Server Claims", authz_claims),
-        _section("authz-scopes", "Authorization Server Scopes", authz_scopes),
-        _section("authz-access-policies", "Authorization Servers - Access Policies", authz_access_combined),
-        _section("applications", "Applications", applications),
-        _section("password-policies", "Password Policies", password_combined),
-        _section("global-session-policies", "Global Session Policies", global_session_combined),
-        _section("authentication-policies", "Authentication Policies", authentication_combined),
-        _section("mfa-enrollment-policies", "MFA Enrollment Policies", mfa_combined),
-        _section("idp-discovery-policies", "IDP Discovery Policies", idp_discovery_combined),
-        _section("profile-enrollment-policies", "Profile Enrollment Policies", profile_enrollment_combined),
-        _section("entity-risk-policies", "Entity Risk Policies", entity_risk_combined),
-        _section("post-auth-session-policies", "Identity Threat Protection Policies", post_auth_combined),
-        _section("brand-settings", "Brand Settings", brand_settings),
-        _section("brand-pages", "Brand Pages", brand_pages),
-        _section("brand-email-templates", "Brand Email Templates", brand_email_templates),
-        _section("custom-admin-roles", "Custom Admin Roles", custom_admin_roles),
-        _section("resource-sets", "Resource Sets", resource_sets_combined),
-        _section("admin-assignments-users", "Admin Assignments - Users", admin_users),
-        _section("admin-assignments-groups", "Admin Assignments - Groups", admin_groups),
-        _section("admin-assignments-apps", "Admin Assignments - Apps", admin_apps),
-        _section("api-tokens", "API Tokens", api_tokens),
-        _section("realms", "Realms", realms),
-        _section("realm-assignments", "Realm Assignments", realm_assignments),
-        _section("profile-schema-user", "Profile Schema - User", profile_schema_user),
-        _section("profile-mappings", "Profile Mappings", profile_mappings),
-        _section("trusted-origins", "Trusted Origins", trusted_origins),
-        _section("event-hooks", "Event Hooks", event_hooks),
-        _section("inline-hooks", "Inline Hooks", inline_hooks),
-        _section("attack-protection", "Access Controls - Attack Protection", attack_protection),
-        _section("group-push-mappings", "Group Push Mappings", group_push_mappings),
-        _section("agents", "Agents", agents),
+        _section(section_id, title, rows_by_section.get(section_id), sources=sources_by_section.get(section_id))
+        for section_id, title in SNAPSHOT_SECTIONS
+        if section_id in rows_by_section and wanted(section_id)
     ]
 
     export_rows = _export_rows_from_sections(sections)
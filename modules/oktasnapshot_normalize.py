@@ -0,0 +1,290 @@
+import json
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+)
+logger = logging.getLogger("okta_compare")
+
+
+def _as_dict(value):
+    return value if isinstance(value, dict) else {}
+
+
+def _int_setting(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _walk_nested(value, path=""):
+    if isinstance(value, dict):
+        for key, nested in value.items():
+            next_path = f"{path}.{key}" if path else str(key)
+            yield from _walk_nested(nested, next_path)
+    elif isinstance(value, list):
+        for idx, nested in enumerate(value):
+            next_path = f"{path}[{idx}]"
+            yield from _walk_nested(nested, next_path)
+    else:
+        yield path, value
+
+
+def _text(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return str(value or "")
+
+
+def _contains_token(value, tokens):
+    haystack = _text(value).lower()
+    return any(token.lower() in haystack for token in tokens)
+
+
+def _looks_like_inactive(status):
+    return str(status or "").strip().upper() not in {"ACTIVE", "ENABLED", "VERIFIED"}
+
+
+def _is_deny_action(actions):
+    for path, value in _walk_nested(actions):
+        if isinstance(value, str) and value.strip().lower() == "deny":
+            return True, path
+    for path, value in _walk_nested(actions):
+        if isinstance(value, str) and "deny" in value.strip().lower():
+            return True, path
+    return False, ""
+
+
+def _session_durations(actions):
+    """Every session/idle/lifetime duration in actions, converted to minutes."""
+    durations = []
+    for path, value in _walk_nested(actions):
+        if not isinstance(value, (int, float)):
+            continue
+        p = path.lower()
+        if "session" not in p and "idle" not in p and "lifetime" not in p:
+            continue
+
+        minutes = None
+        unit = None
+        if "minute" in p:
+            minutes = float(value)
+            unit = "minutes"
+        elif "second" in p:
+            minutes = float(value) / 60.0
+            unit = "seconds"
+        elif "hour" in p:
+            minutes = float(value) * 60.0
+            unit = "hours"
+        elif any(k in p for k in ["maxsession", "idle", "lifetime"]):
+            # Fallback heuristic: assume minutes for session timeout-like fields without explicit unit
+            minutes = float(value)
+            unit = "assumed-minutes"
+
+        if minutes is not None:
+            durations.append({"path": path, "value": value, "unit": unit, "minutes": minutes})
+    return durations
+
+
+def _actions_reference_mfa(actions):
+    positive_strings = {
+        "mfa",
+        "multifactor",
+        "promptforfactor",
+        "phishing_resistant",
+        "authenticator",
+        "factor",
+        "password / idp + another factor",
+    }
+    positive_paths = {"mfa", "factor", "authenticator", "challenge"}
+    for path, value in _walk_nested(actions):
+        path_l = path.lower()
+        value_l = str(value).strip().lower()
+        if any(token in path_l for token in positive_paths):
+            return True
+        if any(token in value_l for token in positive_strings):
+            return True
+    return False
+
+
+def _actions_reference_every_sign_in(actions):
+    positive_values = {
+        "every sign in",
+        "every sign-in",
+        "every sign-in attempt",
+        "at every sign in",
+        "at every sign-in",
+        "always",
+        "every_time",
+        "everytime",
+        "per_session",
+    }
+    for path, value in _walk_nested(actions):
+        path_l = path.lower()
+        value_l = str(value).strip().lower()
+        if any(token in path_l for token in ["prompt", "reauth", "factorlifetime", "mfalifetime"]):
+            if any(token in value_l for token in positive_values):
+                return True
+        if any(token in value_l for token in positive_values):
+            return True
+    return False
+
+
+def _policy_rule_raw(rule):
+    """Payload of a sign-on / authentication policy rule object."""
+    actions = _as_dict(rule.get("actions"))
+    rule_conditions = _as_dict(rule.get("conditions"))
+    conditions = {
+        key: rule_conditions.get(key, {})
+        for key in ("people", "network", "authContext", "risk", "riskScore", "identityProvider")
+    }
+    is_deny, deny_path = _is_deny_action(actions)
+    return {
+        "active": not _looks_like_inactive(rule.get("status")),
+        "actions": actions,
+        "deny": is_deny,
+        "deny_path": deny_path,
+        "session_durations": _session_durations(actions),
+        "requires_mfa": _actions_reference_mfa(actions),
+        "every_sign_in": _actions_reference_every_sign_in(actions),
+        "high_risk_conditions": _contains_token(conditions, ['"high"', "risk", "high"]),
+        "new_device_conditions": _contains_token(conditions, ["new device", "new_device", "behavior", "device"]),
+        "network_text": json.dumps(conditions["network"], sort_keys=True, default=str).lower(),
+    }
+
+
+# Password complexity settings -> the labels used in weakness summaries.
+_CHARACTER_MINIMUMS = {
+    "minLowerCase": "Lower case letters",
+    "minUpperCase": "Upper case letters",
+    "minNumber": "Numbers",
+    "minSymbol": "Symbols",
+}
+
+
+def _password_policy_raw(policy):
+    """Payload of a PASSWORD policy object, read from settings.password."""
+    password = _as_dict(_as_dict(policy.get("settings")).get("password"))
+    complexity = _as_dict(password.get("complexity"))
+    age = _as_dict(password.get("age"))
+    lockout = _as_dict(password.get("lockout"))
+    common_exclude = _as_dict(_as_dict(complexity.get("dictionary")).get("common")).get("exclude")
+    exclude_username = complexity.get("excludeUsername")
+    return {
+        "min_length": _int_setting(complexity.get("minLength")),
+        "character_minimums": {
+            label: _int_setting(complexity.get(key)) for key, label in _CHARACTER_MINIMUMS.items()
+        },
+        "common_password_restriction_disabled": common_exclude is not None and not common_exclude,
+        "username_exclusion_disabled": exclude_username is not None and not exclude_username,
+        "min_age_minutes": _int_setting(age.get("minAgeMinutes")),
+        "history_count": _int_setting(age.get("historyCount")),
+        "lockout_attempts": _int_setting(lockout.get("maxAttempts")),
+    }
+
+
+def _mfa_enrollment_policy_raw(policy):
+    """Payload of an MFA_ENROLL policy object, read from its settings."""
+    settings = _as_dict(policy.get("settings"))
+    weak_tokens = {
+        "sms": "SMS",
+        "voice": "Voice",
+        "call": "Voice",
+        "security_question": "Security Question",
+        "question": "Security Question",
+        "email": "Email",
+    }
+    optional_factors = False
+    requires_authenticator = False
+    weak_factor_hits = set()
+    for path, value in _walk_nested(settings):
+        if isinstance(value, str):
+            v = value.strip().upper()
+            optional_factors = optional_factors or v == "OPTIONAL"
+            requires_authenticator = requires_authenticator or v == "REQUIRED"
+        p = path.lower()
+        matched = None
+        for token, label in weak_tokens.items():
+            if token in p:
+                matched = label
+                break
+        if not matched:
+            continue
+        if isinstance(value, str):
+            if value.strip().upper() in {"OPTIONAL", "REQUIRED", "ACTIVE", "ENABLED"}:
+                weak_factor_hits.add(matched)
+        elif isinstance(value, bool) and value:
+            weak_factor_hits.add(matched)
+    return {
+        "settings": settings,
+        "optional_factors": optional_factors,
+        "requires_authenticator": requires_authenticator,
+        "weak_factors": sorted(weak_factor_hits),
+    }
+
+
+def _policy_rows_normalizer(policy_raw=None, rule_raw=None):
+    """
+    Normalizer for Policy/Rule sections, built from the policy or rule object behind each
+    row; entry types without a builder get an empty payload.
+    """
+    def normalize(row, source):
+        entry_type = row.get("Entry Type")
+        if entry_type == "Policy" and policy_raw:
+            return policy_raw(source or {})
+        if entry_type == "Rule" and rule_raw:
+            return rule_raw(source or {})
+        return {}
+    return normalize
+
+
+def _application_raw(row, source=None):
+    groups = row.get("Groups")
+    if isinstance(groups, str):
+        group_names = [name.strip() for name in groups.split(",") if name.strip()]
+    elif isinstance(groups, (list, tuple)):
+        group_names = [str(name) for name in groups]
+    else:
+        group_names = []
+    return {
+        "groups": group_names,
+        "everyone_assigned": _contains_token(groups, ["Everyone"]),
+    }
+
+
+def _authz_access_raw(row, source=None):
+    """Access rule rows are read from their display conditions; policy rows get no payload."""
+    if row.get("Entry Type") != "Rule":
+        return {}
+    return {"any_client": _contains_token(row.get("Conditions"), ["Any client", "Any"])}
+
+
+# section_id -> per-row builder of the typed payload that OktaEvaluate checks read.
+SECTION_NORMALIZERS = {
+    "authentication-policies": _policy_rows_normalizer(rule_raw=_policy_rule_raw),
+    "global-session-policies": _policy_rows_normalizer(rule_raw=_policy_rule_raw),
+    "password-policies": _policy_rows_normalizer(policy_raw=_password_policy_raw),
+    "mfa-enrollment-policies": _policy_rows_normalizer(policy_raw=_mfa_enrollment_policy_raw),
+    "authz-access-policies": _authz_access_raw,
+    "applications": _application_raw,
+}
+
+
+def normalize_section_rows(section_id, rows, sources=None):
+    """
+    Typed payloads for a section's display rows, one per row in the same order.
+    sources: the API objects behind the rows, in row order; policy and rule payloads are
+    read from them, so rows without a source get empty values.
+    Returns None for sections without a normalizer.
+    """
+    normalizer = SECTION_NORMALIZERS.get(section_id)
+    if normalizer is None:
+        return None
+    rows = rows or []
+    sources = list(sources or [])
+    sources += [None] * (len(rows) - len(sources))
+    return [normalizer(row, source) for row, source in zip(rows, sources)]
@@ -0,0 +1,175 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+)
+logger = logging.getLogger("okta_compare")
+
+# Parallel layout of the OktaSnapshot PDF.
+#   1. Sections are packed into parts of roughly equal weight (large sections are
+#      split into row slices), and each part is laid out by WeasyPrint in a worker
+#      process that keeps one pre-parsed stylesheet and font configuration.
+#   2. The table of contents is laid out once the page count of every part is known.
+#   3. Parts are merged with pypdf, and page numbers are stamped from a transparent
+#      overlay document so numbering runs across the merged file.
+PDF_WORKERS = int(os.environ.get("OKTAVERSE_PDF_WORKERS") or 0) or (os.cpu_count() or 1)
+PDF_MAX_PART_CELLS = 6000
+
+# Parts are numbered by the overlay, so their own footers are suppressed.
+_PART_CSS = "@page { @bottom-right { content: none; } }"
+
+_WORKER = {}
+_POOL = {"executor": None, "stylesheet": None}
+_POOL_LOCK = threading.Lock()
+
+
+def pdf_merge_available():
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _init_worker(stylesheet_text):
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    font_config = FontConfiguration()
+    _WORKER["font_config"] = font_config
+    _WORKER["stylesheets"] = [
+        CSS(string=stylesheet_text, font_config=font_config),
+        CSS(string=_PART_CSS, font_config=font_config),
+    ]
+    _WORKER["overlay_stylesheets"] = [CSS(string=stylesheet_text, font_config=font_config)]
+
+
+def _layout_part(html, overlay=False):
+    """
+    Lay out one HTML part in a worker.
+    Returns (pdf_bytes, page_count, {anchor: page_index within the part}).
+    """
+    from weasyprint import HTML
+
+    stylesheets = _WORKER["overlay_stylesheets"] if overlay else _WORKER["stylesheets"]
+    document = HTML(string=html).render(font_config=_WORKER["font_config"], stylesheets=stylesheets)
+    anchors = {}
+    for page_index, page in enumerate(document.pages):
+        for anchor in page.anchors:
+            anchors.setdefault(anchor, page_index)
+    return document.write_pdf(), len(document.pages), anchors
+
+
+def _get_pool(stylesheet_text):
+    with _POOL_LOCK:
+        if _POOL["executor"] is not None and _POOL["stylesheet"] != stylesheet_text:
+            _POOL["executor"].shutdown(wait=False)
+            _POOL["executor"] = None
+        if _POOL["executor"] is None:
+            # spawn: the web process is threaded, so forking it is not safe.
+            _POOL["executor"] = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(stylesheet_text,),
+            )
+            _POOL["stylesheet"] = stylesheet_text
+            logger.info("Started PDF layout pool with %s worker(s).", PDF_WORKERS)
+        return _POOL["executor"]
+
+
+def _row_weight(section, row):
+    return max(1, len(section.get("columns") or row or {}))
+
+
+def plan_pdf_parts(sections, workers=PDF_WORKERS):
+    """
+    Split sections into ordered parts for independent layout.
+    Returns a list of parts; each part is a list of
+    {"section", "rows", "continued"} items.
+    """
+    total = sum(
+        _row_weight(section, row)
+        for section in sections
+        for row in (section.get("rows") or [])
+    ) + len(sections)
+    # A few parts per worker keeps the pool busy when part sizes vary.
+    target = min(PDF_MAX_PART_CELLS, max(1, total // max(1, workers * 3)))
+
+    parts = []
+    current = []
+    weight = 0
+    for section in sections:
+        rows = section.get("rows") or []
+        if not rows:
+            current.append({"section": section, "rows": [], "continued": False})
+            weight += 1
+            continue
+        start = 0
+        while start < len(rows):
+            end = start
+            chunk_weight = 0
+            while end < len(rows) and (end == start or weight + chunk_weight < target):
+                chunk_weight += _row_weight(section, rows[end])
+                end += 1
+            current.append({"section": section, "rows": rows[start:end], "continued": start > 0})
+            weight += chunk_weight
+            start = end
+            if weight >= target:
+                parts.append(current)
+                current = []
+                weight = 0
+    if current:
+        parts.append(current)
+    return parts
+
+
+def layout_parts(html_parts, stylesheet_text):
+    """Lay out HTML parts concurrently. Returns _layout_part results in input order."""
+    executor = _get_pool(stylesheet_text)
+    return list(executor.map(_layout_part, html_parts))
+
+
+def layout_overlay(page_count, stylesheet_text):
+    """Transparent pages that carry only the running page-number footer."""
+    html = (
+        "<!DOCTYPE html><html><body>"
+        + "".join(
+            '<div style="height:1px;{}"></div>'.format("break-before:page;" if idx else "")
+            for idx in range(page_count)
+        )
+        + "</body></html>"
+    )
+    executor = _get_pool(stylesheet_text)
+    pdf, _, _ = executor.submit(_layout_part, html, True).result()
+    return pdf
+
+
+def merge_pdf_parts(part_pdfs, overlay_pdf=None, outline=None):
+    """
+    Concatenate PDFs, stamp the overlay page-for-page and add outline entries
+    [(title, page_index)]. Returns the merged PDF bytes.
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for pdf in part_pdfs:
+        writer.append(PdfReader(BytesIO(pdf)), import_outline=False)
+
+    if overlay_pdf:
+        overlay = PdfReader(BytesIO(overlay_pdf))
+        for page, stamp in zip(writer.pages, overlay.pages):
+            page.merge_page(stamp)
+
+    for title, page_index in outline or []:
+        writer.add_outline_item(title, page_index)
+
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
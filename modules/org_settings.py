@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_org_settings import get_org_settings
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "expiresAt", "subdomain"}
@@ -31,7 +32,7 @@ def compare_org_settings(envA_domain, envA_token, envB_domain, envB_token):
     settingsB = get_org_settings(baseB, envB_token)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     if not settingsA and not settingsB:
         return diffs, matches
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_post_auth_session_policies import (
     get_post_auth_session_policies,
     get_post_auth_session_policy_rules,
@@ -55,7 +56,7 @@ def compare_post_auth_session_policies(envA_domain, envA_token, envB_domain, env
     policiesA = get_post_auth_session_policies(envA_domain, envA_token, limit=limit) or []
     policiesB = get_post_auth_session_policies(envB_domain, envB_token, limit=limit) or []
     diffs = []
-    matches = []
+    matches = match_rows()
     dictA = {_normalize_policy_name(policy): policy for policy in policiesA}
     dictB = {_normalize_policy_name(policy): policy for policy in policiesB}
 
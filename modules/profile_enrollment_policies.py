@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_profile_enrollment_policies import (
     get_profile_enrollment_policies,
     get_profile_enrollment_policy_rules,
@@ -169,7 +170,7 @@ def compare_profile_enrollment_policies(envA_domain, envA_token, envB_domain, en
     policiesB = get_profile_enrollment_policies(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_normalize_policy_name(policy): policy for policy in policiesA}
     dictB = {_normalize_policy_name(policy): policy for policy in policiesB}
@@ -1,6 +1,7 @@
 import json
 import logging
 
+from modules.compare_rows import match_count, match_rows
 from scripts.extract_profile_mappings import (
     get_idp_app_user_types,
     get_profile_mappings,
@@ -66,7 +67,7 @@ def compare_profile_mappings(envA_domain, envA_token, envB_domain, envB_token, l
     )
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     mappingsA = get_profile_mappings(baseA, envA_token) or []
     mappingsB = get_profile_mappings(baseB, envB_token) or []
@@ -173,6 +174,6 @@ def compare_profile_mappings(envA_domain, envA_token, envB_domain, envB_token, l
     logger.info(
         "Profile mapping compare complete: diffs=%s matches=%s.",
         len(diffs),
-        len(matches),
+        match_count(matches),
     )
     return diffs, matches
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_profile_schema import get_user_type_id, get_user_profile_schemas
 
 _SKIP_KEYS = {"id", "_links", "links"}
@@ -44,7 +45,7 @@ def compare_user_profile_schema(envA_domain, envA_token, envB_domain, envB_token
     propsB = _collect_properties(schemasB)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     for name, attrA in propsA.items():
         if name not in propsB:
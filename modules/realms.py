@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_realms import get_realms, get_realm_assignments
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -39,7 +40,7 @@ def compare_realms(envA_domain, envA_token, envB_domain, envB_token, limit=200):
     realmsB = get_realms(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_realm_name(r): r for r in realmsA}
     dictB = {_realm_name(r): r for r in realmsB}
@@ -130,7 +131,7 @@ def compare_realm_assignments(envA_domain, envA_token, envB_domain, envB_token,
     assignmentsB = get_realm_assignments(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_assignment_name(a): a for a in assignmentsA}
     dictB = {_assignment_name(a): a for a in assignmentsB}
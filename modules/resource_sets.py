@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_admin_roles import get_resource_sets
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastUpdated", "lastUpdatedBy", "_embedded"}
@@ -29,7 +30,7 @@ def compare_resource_sets(envA_domain, envA_token, envB_domain, envB_token, limi
     setsB = get_resource_sets(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {s.get("label") or s.get("name") or s.get("id"): s for s in setsA}
     dictB = {s.get("label") or s.get("name") or s.get("id"): s for s in setsB}
@@ -0,0 +1,139 @@
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from modules.compare_rows import row_json_default
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+)
+logger = logging.getLogger("okta_compare")
+
+# Completed compare / snapshot / evaluate runs, oldest first.
+RUN_STORE_MAX_RUNS = 20
+
+# Optional directory where runs are also written as JSON files, so they outlive the
+# in-memory store and can be loaded by other processes (e.g. the reevaluate CLI).
+RUN_STORE_DIR = os.environ.get("OKTAVERSE_RUN_DIR") or ""
+
+_RUNS = OrderedDict()
+_RUNS_LOCK = threading.Lock()
+_RUN_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _write_run(run):
+    path = os.path.join(RUN_STORE_DIR, f"{run['kind']}-{run['run_id']}.json")
+    try:
+        os.makedirs(RUN_STORE_DIR, exist_ok=True)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as handle:
+            json.dump(run, handle, default=row_json_default)
+        os.replace(f"{path}.tmp", path)
+    except (OSError, TypeError, ValueError):
+        logger.exception("Could not write run %s to %s.", run["run_id"], RUN_STORE_DIR)
+
+
+def _read_run(path):
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        logger.exception("Could not read stored run %s.", path)
+        return None
+
+
+def _stored_run_paths(pattern):
+    if not RUN_STORE_DIR:
+        return []
+    paths = glob.glob(os.path.join(RUN_STORE_DIR, pattern))
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def run_metadata(run):
+    return {key: value for key, value in (run or {}).items() if key != "data"}
+
+
+# Callbacks run with each run dropped from the in-memory store, e.g. the background PDF
+# export cache releasing the PDFs of evicted snapshot / evaluate runs.
+_EVICTION_HOOKS = []
+
+
+def register_eviction_hook(hook):
+    """Call hook(run) whenever a run is dropped from the store."""
+    _EVICTION_HOOKS.append(hook)
+    return hook
+
+
+def save_run(kind, data, **meta):
+    """
+    Store the results of a completed run and return its run_id.
+    kind: "compare", "snapshot" or "evaluate"
+    data: dict of result collections (diffs, matches, sections, validations...)
+    """
+    run_id = uuid.uuid4().hex
+    run = {
+        "run_id": run_id,
+        "kind": kind,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **meta,
+        "data": data or {},
+    }
+    evicted = []
+    with _RUNS_LOCK:
+        _RUNS[run_id] = run
+        while len(_RUNS) > RUN_STORE_MAX_RUNS:
+            _, old_run = _RUNS.popitem(last=False)
+            evicted.append(old_run)
+
+    for old_run in evicted:
+        logger.info("Evicting stored %s run %s.", old_run.get("kind"), old_run.get("run_id"))
+        for hook in _EVICTION_HOOKS:
+            try:
+                hook(old_run)
+            except Exception:
+                logger.exception("Run eviction hook failed for %s", old_run.get("run_id"))
+
+    if RUN_STORE_DIR:
+        _write_run(run)
+    logger.info("Stored %s run %s.", kind, run_id)
+    return run_id
+
+
+def get_run(run_id):
+    """Run by id from memory, falling back to RUN_STORE_DIR when configured."""
+    with _RUNS_LOCK:
+        run = _RUNS.get(run_id)
+    if run is None and _RUN_ID_PATTERN.match(str(run_id or "")):
+        for path in _stored_run_paths(f"*-{run_id}.json"):
+            return _read_run(path)
+    return run
+
+
+def latest_run(kinds=None):
+    """Most recent run, optionally restricted to one kind or a tuple of kinds."""
+    if isinstance(kinds, str):
+        kinds = (kinds,)
+    with _RUNS_LOCK:
+        for run in reversed(_RUNS.values()):
+            if not kinds or run.get("kind") in kinds:
+                return run
+    for path in _stored_run_paths("*.json"):
+        if not kinds or os.path.basename(path).split("-", 1)[0] in kinds:
+            return _read_run(path)
+    return None
+
+
+def list_runs(kind=None):
+    with _RUNS_LOCK:
+        runs = list(_RUNS.values())
+    return [
+        run_metadata(run)
+        for run in reversed(runs)
+        if not kind or run.get("kind") == kind
+    ]
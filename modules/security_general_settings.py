@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_security_settings import get_security_general_settings
 
 _SKIP_KEYS = {"_links", "created", "lastUpdated"}
@@ -26,7 +27,7 @@ def compare_security_general_settings(envA_domain, envA_token, envB_domain, envB
     settingsB = get_security_general_settings(envB_domain, envB_token)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     checks = [
         ("Threats Configuration", "threats_configuration"),
@@ -1,5 +1,6 @@
 import requests
 import json
+from modules.compare_rows import match_rows
 from scripts.extract_session_policies import (
     get_session_policies,
     get_policy_rules
@@ -38,7 +39,7 @@ def compare_session_policies(envA_domain, envA_token, envB_domain, envB_token):
     policiesB = get_session_policies(baseB, envB_token)
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {p["name"]: p for p in policiesA}
     dictB = {p["name"]: p for p in policiesB}
@@ -1,5 +1,6 @@
 import json
 
+from modules.compare_rows import match_rows
 from scripts.extract_trusted_origins import get_trusted_origins
 
 _SKIP_KEYS = {"id", "_links", "links", "created", "createdBy", "lastedUpdated", "lastedUpdatedBy"}
@@ -33,7 +34,7 @@ def compare_trusted_origins(envA_domain, envA_token, envB_domain, envB_token, li
     originsB = get_trusted_origins(baseB, envB_token, limit=limit) or []
 
     diffs = []
-    matches = []
+    matches = match_rows()
 
     dictA = {_origin_key(o): o for o in originsA}
     dictB = {_origin_key(o): o for o in originsB}
@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from scripts.oktasnapshot_utils import ensure_domain_str
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+)
+logger = logging.getLogger("okta_compare")
+
+# Optional SQLite file holding per-entity detail responses between runs. Entries are
+# keyed by (org, entity type, id) and only served while the entity's lastUpdated from
+# the list response still matches the one stored with them.
+DETAIL_CACHE_PATH = os.environ.get("OKTAVERSE_DETAIL_CACHE") or ""
+
+_CONNECTION = None
+_LOCK = threading.Lock()
+
+
+def _connection():
+    global _CONNECTION
+    if _CONNECTION is None:
+        directory = os.path.dirname(DETAIL_CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _CONNECTION = sqlite3.connect(DETAIL_CACHE_PATH, check_same_thread=False)
+        _CONNECTION.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "org TEXT NOT NULL, entity_type TEXT NOT NULL, entity_id TEXT NOT NULL, "
+            "last_updated TEXT NOT NULL, payload TEXT NOT NULL, stored_at TEXT NOT NULL, "
+            "PRIMARY KEY (org, entity_type, entity_id))"
+        )
+        _CONNECTION.commit()
+    return _CONNECTION
+
+
+def _org_key(domain_url):
+    return ensure_domain_str(domain_url).split("://", 1)[1].rstrip("/").lower()
+
+
+def _lookup(org, entity_type, entity_id, last_updated):
+    with _LOCK:
+        row = _connection().execute(
+            "SELECT payload FROM details WHERE org = ? AND entity_type = ? AND entity_id = ? AND last_updated = ?",
+            (org, entity_type, entity_id, last_updated),
+        ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def _store(org, entity_type, entity_id, last_updated, payload):
+    with _LOCK:
+        connection = _connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                org,
+                entity_type,
+                entity_id,
+                last_updated,
+                json.dumps(payload, default=str),
+                datetime.now(timezone.utc).isoformat(),
+            ),
+        )
+        connection.commit()
+
+
+def cached_detail(domain_url, entity_type, entity_id, last_updated, fetch):
+    """
+    fetch() unless the cache holds entity_id's detail for the same lastUpdated.
+    Entities without an id or lastUpdated are always fetched; empty or failed
+    fetches are not stored.
+    """
+    if not DETAIL_CACHE_PATH or not entity_id or not last_updated:
+        return fetch()
+    org = _org_key(domain_url)
+    try:
+        cached = _lookup(org, entity_type, str(entity_id), str(last_updated))
+    except (sqlite3.Error, OSError, ValueError):
+        logger.exception("Could not read %s %s from the detail cache.", entity_type, entity_id)
+        return fetch()
+    if cached is not None:
+        return cached
+
+    detail = fetch()
+    if detail:
+        try:
+            _store(org, entity_type, str(entity_id), str(last_updated), detail)
+        except (sqlite3.Error, OSError, TypeError, ValueError):
+            logger.exception("Could not write %s %s to the detail cache.", entity_type, entity_id)
+    return detail
@@ -2,6 +2,8 @@ import logging
 import requests
 from urllib.parse import urlparse
 
+from scripts.oktasnapshot_utils import rate_limited_get
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(name)s - %(message)s",
@@ -18,7 +20,7 @@ def _ensure_domain_str(domain_url):
 
 def _get_json(url, headers, error_label):
     try:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
     except requests.RequestException as exc:
         logger.warning("%s: request failed (%s)", error_label, exc)
         return None, None
@@ -225,6 +227,7 @@ def get_binding_members(domain_url, api_token, resource_set_id, binding_id, limi
 
 
 def get_admin_users(domain_url, api_token):
+    """Admin assignment listing, or None when it could not be fetched."""
     headers = {
         "Authorization": f"SSWS {api_token}",
         "Accept": "application/json",
@@ -236,11 +239,13 @@ def get_admin_users(domain_url, api_token):
     data, _ = _get_json(url, headers, "Error fetching admin assignments")
     if isinstance(data, list):
         return data
-    logger.error("Unexpected response format for admin assignments: %s", type(data))
-    return []
+    if data is not None:
+        logger.error("Unexpected response format for admin assignments: %s", type(data))
+    return None
 
 
 def get_admin_groups(domain_url, api_token):
+    """Admin group listing, or None when it could not be fetched."""
     headers = {
         "Authorization": f"SSWS {api_token}",
         "Accept": "application/json",
@@ -252,8 +257,9 @@ def get_admin_groups(domain_url, api_token):
     data, _ = _get_json(url, headers, "Error fetching admin groups")
     if isinstance(data, list):
         return data
-    logger.error("Unexpected response format for admin groups: %s", type(data))
-    return []
+    if data is not None:
+        logger.error("Unexpected response format for admin groups: %s", type(data))
+    return None
 
 
 def get_admin_apps(domain_url, api_token):
@@ -1,6 +1,6 @@
 import logging
 
-import requests
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -39,7 +39,7 @@ def get_agent_pools(domain_url, api_token, limit_per_pool_type=200, pool_type=No
         if next_after:
             params["after"] = next_after
 
-        resp = requests.get(url, headers=headers, params=params)
+        resp = rate_limited_get(url, headers=headers, params=params)
         if resp.status_code != 200:
             logger.error("Error fetching agent pools: %s %s", resp.status_code, resp.text)
             break
@@ -78,7 +78,7 @@ def get_agent_pool_update_settings(domain_url, api_token, pool_id):
     base = _ensure_domain_str(domain_url).rstrip("/")
     url = f"{base}/api/v1/agentPools/{pool_id}/updates/settings"
 
-    resp = requests.get(url, headers=_headers(api_token))
+    resp = rate_limited_get(url, headers=_headers(api_token))
     if resp.status_code != 200:
         logger.error(
             "Error fetching agent pool update settings for %s: %s %s",
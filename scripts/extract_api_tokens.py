@@ -1,5 +1,7 @@
 import logging
-import requests
+
+from scripts.detail_cache import cached_detail
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,7 +30,7 @@ def get_api_tokens(domain_url, api_token, limit=200):
 
     tokens = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching API tokens: %s %s", resp.status_code, resp.text)
             break
@@ -67,7 +69,7 @@ def get_api_token_metadata(domain_url, api_token, api_token_id):
     base = _ensure_domain_str(domain_url).rstrip("/")
     url = f"{base}/api/v1/api-tokens/{api_token_id}"
 
-    resp = requests.get(url, headers=headers)
+    resp = rate_limited_get(url, headers=headers)
     if resp.status_code != 200:
         logger.error("Error fetching API token metadata for %s: %s %s", api_token_id, resp.status_code, resp.text)
         return None
@@ -86,8 +88,13 @@ def get_api_tokens_with_metadata(domain_url, api_token, limit=200):
     enriched = []
     for token in tokens:
         token_id = token.get("id")
-        metadata = get_api_token_metadata(domain_url, api_token, token_id) or {}
-        combined = dict(token)
-        combined.update(metadata)
-        enriched.append(combined)
+        metadata = cached_detail(
+            domain_url,
+            "api-token",
+            token_id,
+            token.get("lastUpdated"),
+            lambda: get_api_token_metadata(domain_url, api_token, token_id),
+        ) or {}
+        # The list item is always fresh; a cached payload only fills in what it lacks.
+        enriched.append({**metadata, **token})
     return enriched
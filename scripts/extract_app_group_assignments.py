@@ -0,0 +1,88 @@
+import logging
+
+from scripts.extract_applications import get_applications
+from scripts.extract_groups import get_groups
+from scripts.oktasnapshot_utils import ensure_domain_str, get_paginated, fetch_concurrently
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s %(levelname)s %(name)s - %(message)s",
+)
+logger = logging.getLogger("okta_compare")
+
+
+def _headers(api_token):
+    return {
+        "Authorization": f"SSWS {api_token}",
+        "Accept": "application/json",
+    }
+
+
+def _group_name(group):
+    profile = group.get("profile") or {}
+    return profile.get("name") or group.get("name") or group.get("id")
+
+
+def get_app_group_assignments(domain_url, api_token, apps=None, groups=None):
+    """
+    App <-> group assignment map for one org, crawled in whichever direction needs fewer
+    requests: /apps/{id}/groups per app or /groups/{id}/apps per group.
+    apps / groups: optional prefetched inventories; apps limits which apps are mapped.
+    Returns {"direction": "app" | "group", "app_groups": {app_id: [group_id]},
+    "group_names": {group_id: name}}.
+    """
+    base = ensure_domain_str(domain_url).rstrip("/")
+    if apps is None:
+        apps = get_applications(base, api_token, limit=200) or []
+    if groups is None:
+        groups = get_groups(base, api_token) or []
+    group_names = {group["id"]: _group_name(group) for group in groups if group.get("id")}
+    app_groups = {app["id"]: [] for app in apps if app.get("id")}
+
+    direction = "group" if len(group_names) < len(app_groups) else "app"
+    logger.info(
+        "Indexing app group assignments for %s app(s) and %s group(s) by %s.",
+        len(app_groups),
+        len(group_names),
+        direction,
+    )
+    if direction == "group":
+        assigned_apps = fetch_concurrently(
+            lambda group_id: get_paginated(
+                f"{base}/api/v1/groups/{group_id}/apps?limit=200",
+                _headers(api_token),
+                f"Error fetching applications for group {group_id}",
+            ) or [],
+            group_names,
+        )
+        for group_id, group_apps in zip(group_names, assigned_apps):
+            for app in group_apps:
+                if app.get("id") in app_groups:
+                    app_groups[app["id"]].append(group_id)
+    else:
+        assignments = fetch_concurrently(
+            lambda app_id: get_paginated(
+                f"{base}/api/v1/apps/{app_id}/groups?limit=200",
+                _headers(api_token),
+                f"Error fetching groups for app {app_id}",
+            ) or [],
+            app_groups,
+        )
+        for app_id, app_assignments in zip(app_groups, assignments):
+            for assignment in app_assignments:
+                group_id = assignment.get("id")
+                if not group_id:
+                    continue
+                app_groups[app_id].append(group_id)
+                if group_id not in group_names:
+                    group_names[group_id] = _group_name(assignment)
+    return {"direction": direction, "app_groups": app_groups, "group_names": group_names}
+
+
+def assigned_group_names(assignments, app_id):
+    """Sorted, de-duplicated names of the groups assigned to app_id."""
+    group_names = assignments.get("group_names") or {}
+    return sorted({
+        str(group_names.get(group_id) or group_id)
+        for group_id in (assignments.get("app_groups") or {}).get(app_id) or []
+    })
@@ -1,7 +1,8 @@
 import logging
-import requests
 from urllib.parse import urlparse
 
+from scripts.oktasnapshot_utils import rate_limited_get, project_fields
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(name)s - %(message)s",
@@ -30,10 +31,11 @@ def _ensure_domain_str(domain_url):
     return f"{parsed.scheme}://{parsed.netloc}"
 
 
-def get_applications(domain_url, api_token, limit=200):
+def get_applications(domain_url, api_token, limit=200, fields=None):
     """
     Fetch all Okta applications from the given domain using the provided API token.
     Handles pagination via the Link header. Returns a list of application dicts.
+    fields: optional dotted field paths to keep of each application (see project_fields).
     """
     headers = {
         'Authorization': f"SSWS {api_token}",
@@ -50,7 +52,7 @@ def get_applications(domain_url, api_token, limit=200):
     while url:
         page += 1
         logger.info("Requesting applications page %s.", page)
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching applications: %s %s", resp.status_code, resp.text)
             break
@@ -62,7 +64,7 @@ def get_applications(domain_url, api_token, limit=200):
             break
 
         if isinstance(data, list):
-            apps.extend(data)
+            apps.extend(project_fields(data, fields))
             logger.info(
                 "Fetched %s application(s) from page %s; accumulated total=%s.",
                 len(data),
@@ -72,7 +74,7 @@ def get_applications(domain_url, api_token, limit=200):
         else:
             # unexpected shape, attempt to handle common wrapper
             if isinstance(data, dict) and 'applications' in data and isinstance(data['applications'], list):
-                apps.extend(data['applications'])
+                apps.extend(project_fields(data['applications'], fields))
                 logger.info(
                     "Fetched %s application(s) from wrapped page %s; accumulated total=%s.",
                     len(data['applications']),
@@ -118,7 +120,7 @@ def get_application_groups(domain_url, api_token, app_id):
     page = 0
     while url:
         page += 1
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error(
                 "Error fetching groups for app %s: %s %s",
@@ -178,7 +180,7 @@ def get_application_features(domain_url, api_token, app_id):
     url = f"{base}/api/v1/apps/{app_id}/features"
 
     try:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
     except Exception as exc:
         logger.error("Error fetching features for app %s: %s", app_id, exc)
         return []
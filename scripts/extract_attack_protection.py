@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,7 +16,7 @@ def _ensure_domain_str(domain_url):
 
 
 def _get_json(url, headers, error_label):
-    resp = requests.get(url, headers=headers)
+    resp = rate_limited_get(url, headers=headers)
     if resp.status_code != 200:
         logger.error("%s: %s %s", error_label, resp.status_code, resp.text)
         return None
@@ -29,7 +30,7 @@ def _get_json(url, headers, error_label):
 def _get_paginated(url, headers, error_label):
     items = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("%s: %s %s", error_label, resp.status_code, resp.text)
             break
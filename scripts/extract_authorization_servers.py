@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import fetch_concurrently, rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,7 +17,7 @@ def _ensure_domain_str(domain_url):
 
 
 def _get_json(url, headers, error_label):
-    resp = requests.get(url, headers=headers)
+    resp = rate_limited_get(url, headers=headers)
     if resp.status_code != 200:
         logger.error("%s: %s %s", error_label, resp.status_code, resp.text)
         return None, resp
@@ -185,3 +186,44 @@ def get_authorization_server_policy_rules(domain_url, api_token, server_id, poli
             url = None
 
     return rules
+
+
+AUTHORIZATION_SERVER_TREE_PARTS = ("claims", "scopes", "policies")
+
+
+def get_authorization_server_tree(domain_url, api_token, parts=AUTHORIZATION_SERVER_TREE_PARTS, limit=200):
+    """
+    Authorization servers with their claims, scopes and access policies (each with its rules).
+    The per-server lists are fetched concurrently, then the rules of every policy.
+    parts: per-server lists to fetch; the others are left empty.
+    Returns [{"server", "claims", "scopes", "policies": [{"policy", "rules"}]}] in server order.
+    """
+    fetchers = {
+        "claims": get_authorization_server_claims,
+        "scopes": get_authorization_server_scopes,
+        "policies": get_authorization_server_policies,
+    }
+    servers = get_authorization_servers(domain_url, api_token, limit=limit) or []
+    tree = [{"server": server, "claims": [], "scopes": [], "policies": []} for server in servers]
+
+    tasks = [(node, part) for node in tree for part in parts if part in fetchers]
+    results = fetch_concurrently(
+        lambda task: fetchers[task[1]](domain_url, api_token, task[0]["server"].get("id"), limit=limit) or [],
+        tasks,
+    )
+    for (node, part), items in zip(tasks, results):
+        if part == "policies":
+            node[part] = [{"policy": policy, "rules": []} for policy in items]
+        else:
+            node[part] = items
+
+    rule_tasks = [(node, entry) for node in tree for entry in node["policies"]]
+    rules = fetch_concurrently(
+        lambda task: get_authorization_server_policy_rules(
+            domain_url, api_token, task[0]["server"].get("id"), task[1]["policy"].get("id"), limit=limit
+        ) or [],
+        rule_tasks,
+    )
+    for (_, entry), items in zip(rule_tasks, rules):
+        entry["rules"] = items
+    return tree
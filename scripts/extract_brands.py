@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import fetch_concurrently, rate_limited_get
 from urllib.parse import quote
 
 logging.basicConfig(
@@ -17,7 +18,7 @@ def _ensure_domain_str(domain_url):
 
 
 def _get_json(url, headers, error_label):
-    resp = requests.get(url, headers=headers)
+    resp = rate_limited_get(url, headers=headers)
     if resp.status_code != 200:
         if resp.status_code == 404:
             label = str(error_label).replace("Error fetching ", "").strip()
@@ -102,68 +103,32 @@ def get_brand_themes(domain_url, api_token, brand_id, limit=200):
     return themes
 
 
-def get_brand_pages(domain_url, api_token, brand_id):
-    """
-    Fetch sign-in and error page settings for a brand.
-    Returns dict with keys: sign_in, error.
-    """
-    headers = {
+def _headers(api_token):
+    return {
         "Authorization": f"SSWS {api_token}",
         "Accept": "application/json",
     }
 
-    logger.info("Fetching brand pages for brand_id=%s.", brand_id)
-    domain_url = _ensure_domain_str(domain_url)
-    base = domain_url.rstrip("/")
 
-    sign_in_url = f"{base}/api/v1/brands/{brand_id}/pages/sign-in/customized"
-    error_url = f"{base}/api/v1/brands/{brand_id}/pages/error/customized"
-
-    sign_in, _ = _get_json(sign_in_url, headers, f"Error fetching sign-in page for brand {brand_id}")
-    error, _ = _get_json(error_url, headers, f"Error fetching error page for brand {brand_id}")
-
-    def _needs_page_content(payload):
-        if not isinstance(payload, dict):
-            return True
-        return not (payload.get("pageContent") or payload.get("htmlContent"))
-
-    if _needs_page_content(sign_in):
-        default_sign_in_url = f"{base}/api/v1/brands/{brand_id}/pages/sign-in/default"
-        default_sign_in, _ = _get_json(
-            default_sign_in_url, headers, f"Error fetching default sign-in page for brand {brand_id}"
-        )
-        if isinstance(default_sign_in, dict):
-            sign_in = default_sign_in
-
-    if _needs_page_content(error):
-        default_error_url = f"{base}/api/v1/brands/{brand_id}/pages/error/default"
-        default_error, _ = _get_json(
-            default_error_url, headers, f"Error fetching default error page for brand {brand_id}"
-        )
-        if isinstance(default_error, dict):
-            error = default_error
+def _needs_page_content(payload):
+    if not isinstance(payload, dict):
+        return True
+    return not (payload.get("pageContent") or payload.get("htmlContent"))
 
-    return {
-        "sign_in": sign_in or {},
-        "error": error or {},
-    }
 
+def _get_page(base, headers, brand_id, page, variant):
+    label = "sign-in" if page == "sign-in" else "error"
+    prefix = "default " if variant == "default" else ""
+    data, _ = _get_json(
+        f"{base}/api/v1/brands/{brand_id}/pages/{page}/{variant}",
+        headers,
+        f"Error fetching {prefix}{label} page for brand {brand_id}",
+    )
+    return data
 
-def get_brand_email_templates(domain_url, api_token, brand_id, limit=200):
-    """
-    Fetch email templates and their customizations for a brand.
-    Returns dict mapping template_name -> customizations list.
-    """
-    headers = {
-        "Authorization": f"SSWS {api_token}",
-        "Accept": "application/json",
-    }
 
-    logger.info("Fetching email templates for brand_id=%s.", brand_id)
-    domain_url = _ensure_domain_str(domain_url)
-    base = domain_url.rstrip("/")
+def _get_email_template_list(base, headers, brand_id, limit):
     url = f"{base}/api/v1/brands/{brand_id}/templates/email?limit={limit}"
-
     templates = []
     while url:
         data, resp = _get_json(url, headers, f"Error fetching email templates for brand {brand_id}")
@@ -181,41 +146,158 @@ def get_brand_email_templates(domain_url, api_token, brand_id, limit=200):
             url = next_link.split(";")[0].strip("<>")
         else:
             url = None
+    return templates
 
-    template_customizations = {}
-    template_defaults = {}
-    for template in templates:
-        name = template.get("name") or template.get("templateName") or template.get("id")
-        if not name:
-            continue
-
-        safe_name = quote(str(name), safe="")
-        cust_url = f"{base}/api/v1/brands/{brand_id}/templates/email/{safe_name}/customizations?limit={limit}"
-        data, _ = _get_json(
-            cust_url,
-            headers,
-            f"Error fetching email customizations for template {name} (brand {brand_id})",
-        )
-        if isinstance(data, list):
-            template_customizations[name] = data
-        elif data is None:
-            template_customizations[name] = []
-        else:
-            logger.error("Unexpected response format for email customizations: %s", type(data))
-            template_customizations[name] = []
-
-        default_url = f"{base}/api/v1/brands/{brand_id}/templates/email/{safe_name}/default-content"
-        default_data, _ = _get_json(
-            default_url,
-            headers,
-            f"Error fetching default content for template {name} (brand {brand_id})",
-        )
-        if isinstance(default_data, dict):
-            template_defaults[name] = default_data
-        else:
-            template_defaults[name] = None
 
-    return {
-        "customizations": template_customizations,
-        "defaults": template_defaults,
-    }
+def _get_email_customizations(base, headers, brand_id, name, limit):
+    safe_name = quote(str(name), safe="")
+    data, _ = _get_json(
+        f"{base}/api/v1/brands/{brand_id}/templates/email/{safe_name}/customizations?limit={limit}",
+        headers,
+        f"Error fetching email customizations for template {name} (brand {brand_id})",
+    )
+    if isinstance(data, list):
+        return data
+    if data is not None:
+        logger.error("Unexpected response format for email customizations: %s", type(data))
+    return []
+
+
+def _get_email_default_content(base, headers, brand_id, name):
+    safe_name = quote(str(name), safe="")
+    data, _ = _get_json(
+        f"{base}/api/v1/brands/{brand_id}/templates/email/{safe_name}/default-content",
+        headers,
+        f"Error fetching default content for template {name} (brand {brand_id})",
+    )
+    return data if isinstance(data, dict) else None
+
+
+def _run_steps(steps):
+    """Run (fetch, store) steps concurrently, storing each result in step order."""
+    results = fetch_concurrently(lambda step: step[0](), steps)
+    for (_, store), result in zip(steps, results):
+        store(result)
+
+
+def _crawl_brands(base, api_token, brands, parts, limit):
+    """
+    Fetch the wanted parts of every brand's subtree in three concurrent rounds:
+    themes, customized pages and template lists; then page defaults and template
+    customizations; then default content for templates without customizations.
+    """
+    headers = _headers(api_token)
+    tree = [
+        {
+            "brand": brand,
+            "themes": [],
+            "pages": {"sign_in": {}, "error": {}},
+            "email_templates": {"customizations": {}, "defaults": {}},
+        }
+        for brand in brands
+    ]
+    pages = {}
+    template_names = {}
+
+    def store(mapping, key, only_dict=False):
+        def _store(value):
+            if not only_dict or isinstance(value, dict):
+                mapping[key] = value
+        return _store
+
+    first = []
+    for index, node in enumerate(tree):
+        brand_id = node["brand"].get("id")
+        if "themes" in parts:
+            first.append((
+                lambda brand_id=brand_id: get_brand_themes(base, api_token, brand_id, limit=limit) or [],
+                store(node, "themes"),
+            ))
+        if "pages" in parts:
+            for page in ("sign-in", "error"):
+                first.append((
+                    lambda brand_id=brand_id, page=page: _get_page(base, headers, brand_id, page, "customized"),
+                    store(pages, (index, page)),
+                ))
+        if "email_templates" in parts:
+            first.append((
+                lambda brand_id=brand_id: _get_email_template_list(base, headers, brand_id, limit),
+                store(template_names, index),
+            ))
+    _run_steps(first)
+
+    second = []
+    for index, node in enumerate(tree):
+        brand_id = node["brand"].get("id")
+        for page in ("sign-in", "error") if "pages" in parts else ():
+            if _needs_page_content(pages[(index, page)]):
+                second.append((
+                    lambda brand_id=brand_id, page=page: _get_page(base, headers, brand_id, page, "default"),
+                    store(pages, (index, page), only_dict=True),
+                ))
+        customizations = node["email_templates"]["customizations"]
+        for template in template_names.get(index) or []:
+            name = template.get("name") or template.get("templateName") or template.get("id")
+            if not name:
+                continue
+            second.append((
+                lambda brand_id=brand_id, name=name: _get_email_customizations(base, headers, brand_id, name, limit),
+                store(customizations, name),
+            ))
+    _run_steps(second)
+
+    third = []
+    for index, node in enumerate(tree):
+        brand_id = node["brand"].get("id")
+        if "pages" in parts:
+            node["pages"] = {
+                "sign_in": pages[(index, "sign-in")] or {},
+                "error": pages[(index, "error")] or {},
+            }
+        templates = node["email_templates"]
+        for name, customizations in templates["customizations"].items():
+            # Default content only stands in for templates without customizations.
+            if not customizations:
+                third.append((
+                    lambda brand_id=brand_id, name=name: _get_email_default_content(base, headers, brand_id, name),
+                    store(templates["defaults"], name),
+                ))
+    _run_steps(third)
+    return tree
+
+
+BRAND_TREE_PARTS = ("themes", "pages", "email_templates")
+
+
+def get_brand_tree(domain_url, api_token, parts=BRAND_TREE_PARTS, limit=200):
+    """
+    Brands with their themes, sign-in/error pages and email templates, crawled concurrently.
+    parts: subtrees to fetch; the others are left empty.
+    Returns [{"brand", "themes", "pages": {"sign_in", "error"},
+    "email_templates": {"customizations", "defaults"}}] in brand order.
+    """
+    logger.info("Crawling brands (%s).", ", ".join(parts))
+    base = _ensure_domain_str(domain_url).rstrip("/")
+    brands = get_brands(base, api_token, limit=limit) or []
+    return _crawl_brands(base, api_token, brands, parts, limit)
+
+
+def get_brand_pages(domain_url, api_token, brand_id):
+    """
+    Fetch sign-in and error page settings for a brand.
+    Returns dict with keys: sign_in, error.
+    """
+    logger.info("Fetching brand pages for brand_id=%s.", brand_id)
+    base = _ensure_domain_str(domain_url).rstrip("/")
+    return _crawl_brands(base, api_token, [{"id": brand_id}], ("pages",), 200)[0]["pages"]
+
+
+def get_brand_email_templates(domain_url, api_token, brand_id, limit=200):
+    """
+    Fetch email templates and their customizations for a brand.
+    Returns dict with keys: customizations (template_name -> customizations list) and
+    defaults (template_name -> default content, for templates without customizations).
+    """
+    logger.info("Fetching email templates for brand_id=%s.", brand_id)
+    base = _ensure_domain_str(domain_url).rstrip("/")
+    return _crawl_brands(base, api_token, [{"id": brand_id}], ("email_templates",), limit)[0]["email_templates"]
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,7 +23,7 @@ def get_entity_risk_policies(domain_url, api_token, limit=200):
 
     policies = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching entity risk policies: %s %s", resp.status_code, resp.text)
             break
@@ -52,7 +53,7 @@ def get_entity_risk_policy_rules(domain_url, api_token, policy_id):
 
     rules = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching entity risk policy rules for %s: %s %s", policy_id, resp.status_code, resp.text)
             break
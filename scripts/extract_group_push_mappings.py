@@ -1,6 +1,7 @@
 import logging
-import requests
 
+from scripts.detail_cache import cached_detail
+from scripts.oktasnapshot_utils import rate_limited_get
 from scripts.extract_applications import get_applications
 
 logging.basicConfig(
@@ -39,7 +40,7 @@ def get_group_push_mappings_for_app(domain_url, api_token, app_id, limit=200):
 
     mappings = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching group push mappings for %s: %s %s", app_id, resp.status_code, resp.text)
             break
@@ -72,7 +73,7 @@ def get_group_push_mapping_by_id(domain_url, api_token, app_id, mapping_id):
     logger.info("Fetching group push mapping detail for app_id=%s mapping_id=%s.", app_id, mapping_id)
     base = _ensure_domain_str(domain_url).rstrip("/")
     url = f"{base}/api/v1/apps/{app_id}/group-push/mappings/{mapping_id}"
-    resp = requests.get(url, headers=_headers(api_token))
+    resp = rate_limited_get(url, headers=_headers(api_token))
     if resp.status_code != 200:
         logger.error(
             "Error fetching group push mapping detail for %s/%s: %s %s",
@@ -99,9 +100,15 @@ def get_group_push_mappings(domain_url, api_token, limit=200):
         mappings = get_group_push_mappings_for_app(domain_url, api_token, app_id, limit=limit) or []
         for mapping in mappings:
             mapping_id = mapping.get("id")
-            detail = get_group_push_mapping_by_id(domain_url, api_token, app_id, mapping_id) or {}
-            combined = dict(mapping)
-            combined.update(detail)
+            detail = cached_detail(
+                domain_url,
+                "group-push-mapping",
+                mapping_id,
+                mapping.get("lastUpdated"),
+                lambda: get_group_push_mapping_by_id(domain_url, api_token, app_id, mapping_id),
+            ) or {}
+            # The list item is always fresh; a cached payload only fills in what it lacks.
+            combined = {**detail, **mapping}
             combined["_app"] = {
                 "id": app_id,
                 "label": app.get("label"),
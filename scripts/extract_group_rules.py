@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,7 +29,7 @@ def get_groups_map(domain_url, api_token):
     while url:
         page += 1
         logger.info("Requesting groups page %s for group-rule name resolution.", page)
-        response = requests.get(url, headers=headers)
+        response = rate_limited_get(url, headers=headers)
         if response.status_code != 200:
             logger.error("Error fetching groups: %s", response.status_code)
             break
@@ -67,7 +68,7 @@ def get_group_rules(domain_url, api_token):
     while url:
         page += 1
         logger.info("Requesting group rules page %s.", page)
-        response = requests.get(url, headers=headers)
+        response = rate_limited_get(url, headers=headers)
         if response.status_code != 200:
             logger.error("Error fetching group rules: %s", response.status_code)
             break
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,7 +29,7 @@ def get_groups(domain_url, api_token):
     url = domain_url + '/api/v1/groups'
 
     while url:
-        response = requests.get(url, headers=headers)
+        response = rate_limited_get(url, headers=headers)
         if response.status_code != 200:
             logger.error(
                 "Error fetching groups: %s %s",
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,7 +32,7 @@ def get_mfa_policies(domain_url, api_token, limit=200):
 
     policies = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching MFA policies: %s %s", resp.status_code, resp.text)
             break
@@ -73,7 +74,7 @@ def get_mfa_policy_rules(domain_url, api_token, policy_id):
 
     rules = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching MFA policy rules for %s: %s %s", policy_id, resp.status_code, resp.text)
             break
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,7 +29,7 @@ def get_network_zones(domain_url, api_token):
     url = base + "/api/v1/zones"
 
     while url:
-        response = requests.get(url, headers=headers)
+        response = rate_limited_get(url, headers=headers)
         if response.status_code != 200:
             logger.error("Error fetching network zones: %s", response.status_code)
             break
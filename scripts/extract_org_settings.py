@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,7 +26,7 @@ def get_org_settings(domain_url, api_token):
     base = _ensure_domain_str(domain_url).rstrip("/")
     url = f"{base}/api/v1/org"
 
-    resp = requests.get(url, headers=headers)
+    resp = rate_limited_get(url, headers=headers)
     if resp.status_code != 200:
         logger.error("Error fetching org general settings: %s %s", resp.status_code, resp.text)
         return None
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,7 +17,7 @@ def _ensure_domain_str(domain_url):
 
 
 def _get_json(url, headers, error_label):
-    resp = requests.get(url, headers=headers)
+    resp = rate_limited_get(url, headers=headers)
     if resp.status_code != 200:
         logger.error("%s: %s %s", error_label, resp.status_code, resp.text)
         return None
@@ -91,7 +92,7 @@ def get_profile_mappings(domain_url, api_token, limit=200):
         seen_urls.add(url)
         page += 1
         logger.info("Requesting profile mappings page %s.", page)
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching profile mappings: %s %s", resp.status_code, resp.text)
             break
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,7 +32,7 @@ def get_session_policies(domain_url, api_token):
     url = base + "/api/v1/policies?type=OKTA_SIGN_ON"
 
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching session policies: %s", resp.status_code)
             break
@@ -64,7 +65,7 @@ def get_policy_rules(domain_url, api_token, policy_id):
     url = base + f"/api/v1/policies/{policy_id}/rules"
 
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching policy rules for %s: %s", policy_id, resp.status_code)
             break
@@ -1,5 +1,6 @@
 import logging
-import requests
+
+from scripts.oktasnapshot_utils import rate_limited_get
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,7 +28,7 @@ def get_trusted_origins(domain_url, api_token, limit=200):
 
     origins = []
     while url:
-        resp = requests.get(url, headers=headers)
+        resp = rate_limited_get(url, headers=headers)
         if resp.status_code != 200:
             logger.error("Error fetching trusted origins: %s %s", resp.status_code, resp.text)
             break
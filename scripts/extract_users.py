@@ -1,7 +1,18 @@
 import logging
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 from urllib.parse import quote
 
-from scripts.oktasnapshot_utils import ensure_domain_str, get_paginated
+from scripts.extract_admin_roles import (
+    get_admin_users,
+    get_admin_groups,
+    get_resource_sets,
+    get_resource_set_bindings,
+    get_binding_members,
+)
+from scripts.oktasnapshot_utils import FANOUT_WORKERS, ensure_domain_str, fetch_concurrently, get_page, get_paginated
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,14 +28,39 @@ def _headers(api_token):
     }
 
 
-def get_users(domain_url, api_token, limit=200, search=None):
+# Sharded user crawl: the user space is split by status and then, for shards that span
+# more than one page, into created date ranges until USER_CRAWL_MAX_SHARDS is reached.
+# OKTAVERSE_USER_SHARDS=1 keeps the single list + DEPROVISIONED search crawl.
+USER_CRAWL_MAX_SHARDS = int(os.environ.get("OKTAVERSE_USER_SHARDS") or 32)
+USER_SHARD_SPLIT_PARTS = 4
+USER_STATUSES = [
+    "ACTIVE",
+    "STAGED",
+    "PROVISIONED",
+    "RECOVERY",
+    "PASSWORD_EXPIRED",
+    "LOCKED_OUT",
+    "SUSPENDED",
+    "DEPROVISIONED",
+]
+_USER_CRAWL_EPOCH = datetime(2009, 1, 1, tzinfo=timezone.utc)
+_USER_SHARD_MIN_SPAN = timedelta(hours=1)
+# Fields the crawl (shard splits, de-duplication) and sampling read, kept under any projection.
+_USER_CRAWL_FIELDS = ("id", "status", "created", "lastUpdated", "credentials.provider.type")
+
+
+def _user_fields(fields):
+    return (*fields, *_USER_CRAWL_FIELDS) if fields else None
+
+
+def get_users(domain_url, api_token, limit=200, search=None, fields=None):
     base = ensure_domain_str(domain_url).rstrip("/")
     url = f"{base}/api/v1/users?limit={limit}"
     if search:
         safe_chars = '()" '
         url = f"{url}&search={quote(search, safe=safe_chars)}"
     logger.info("Fetching users from %s.", url)
-    users = get_paginated(url, _headers(api_token), "Error fetching users") or []
+    users = get_paginated(url, _headers(api_token), "Error fetching users", fields=fields) or []
     if search:
         logger.info("Fetched %s user(s) for search=%s.", len(users), search)
     else:
@@ -32,9 +68,132 @@ def get_users(domain_url, api_token, limit=200, search=None):
     return users
 
 
-def get_all_users(domain_url, api_token, limit=200, include_deprovisioned=True):
+def _okta_time(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+def _shard_search(shard):
+    status, start, end = shard
+    search = f'status eq "{status}"'
+    if start is not None:
+        search = f'{search} and created ge "{_okta_time(start)}" and created lt "{_okta_time(end)}"'
+    return search
+
+
+def _parse_created(user):
+    try:
+        return datetime.fromisoformat(str(user.get("created") or "").replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _split_shard(shard, now, sample, parts):
+    """
+    Split the shard's created range into up to `parts` ranges, cut at quantiles of the
+    created dates in `sample` (its first page), or in half when the sample gives no usable
+    cut. Returns None once the range is too narrow to split.
+    """
+    status, start, end = shard
+    if start is None:
+        start, end = _USER_CRAWL_EPOCH, now + timedelta(days=1)
+    if end - start < 2 * _USER_SHARD_MIN_SPAN:
+        return None
+    created = sorted(c for c in map(_parse_created, sample) if c is not None)
+    cuts = []
+    for index in range(1, parts):
+        if not created:
+            break
+        cut = created[len(created) * index // parts]
+        previous = cuts[-1] if cuts else start
+        if cut - previous >= _USER_SHARD_MIN_SPAN and end - cut >= _USER_SHARD_MIN_SPAN:
+            cuts.append(cut)
+    if not cuts:
+        cuts = [start + (end - start) / 2]
+    bounds = [start, *cuts, end]
+    return [(status, bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def _user_shard_url(base, limit, shard):
+    # Sorting by login keeps the first page a spread sample of the shard's created dates.
+    safe_chars = '()" '
+    search = quote(_shard_search(shard), safe=safe_chars)
+    return f"{base}/api/v1/users?limit={limit}&search={search}&sortBy=profile.login&sortOrder=asc"
+
+
+def get_users_sharded(domain_url, api_token, limit=200, include_deprovisioned=True, max_shards=None, fields=None):
+    """
+    All users, crawled as disjoint status / created-range search shards on FANOUT_WORKERS
+    threads. A shard whose first page has a next link is split (up to USER_SHARD_SPLIT_PARTS
+    ways, at quantiles of that page's created dates) while fewer than max_shards exist;
+    otherwise the rest of it is paged through. Users seen in more than one shard (status
+    changed mid-crawl) keep the most recently updated record.
+    fields: optional dotted field paths to keep of each user (see project_fields).
+    """
+    base = ensure_domain_str(domain_url).rstrip("/")
+    headers = _headers(api_token)
+    fields = _user_fields(fields)
+    max_shards = max_shards or USER_CRAWL_MAX_SHARDS
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    statuses = [s for s in USER_STATUSES if include_deprovisioned or s != "DEPROVISIONED"]
+    shard_count = len(statuses)
+    results = {}
+    with ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="okta-users") as executor:
+        pending = {}
+
+        def label(shard):
+            return f"Error fetching users for search={_shard_search(shard)}"
+
+        def probe(shard):
+            future = executor.submit(
+                get_page, _user_shard_url(base, limit, shard), headers, label(shard), fields=fields
+            )
+            pending[future] = (shard, "first")
+
+        for status in statuses:
+            probe((status, None, None))
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                shard, step = pending.pop(future)
+                if step == "rest":
+                    results[shard].extend(future.result() or [])
+                    continue
+                users, next_url = future.result()
+                users = users or []
+                parts = min(USER_SHARD_SPLIT_PARTS, max_shards - shard_count + 1)
+                ranges = _split_shard(shard, now, users, parts) if next_url and parts > 1 else None
+                if ranges:
+                    shard_count += len(ranges) - 1
+                    for part in ranges:
+                        probe(part)
+                    continue
+                results[shard] = users
+                if next_url:
+                    rest = executor.submit(get_paginated, next_url, headers, label(shard), fields=fields)
+                    pending[rest] = (shard, "rest")
+
     users = {}
-    primary_users = get_users(domain_url, api_token, limit=limit) or []
+    order = {status: index for index, status in enumerate(USER_STATUSES)}
+    for shard in sorted(results, key=lambda s: (order[s[0]], s[1] or _USER_CRAWL_EPOCH)):
+        for user in results[shard]:
+            user_id = user.get("id")
+            if not user_id:
+                continue
+            current = users.get(user_id)
+            if current is None or str(user.get("lastUpdated") or "") >= str(current.get("lastUpdated") or ""):
+                users[user_id] = user
+    logger.info("Fetched %s unique user(s) from %s shard(s).", len(users), len(results))
+    return list(users.values())
+
+
+def get_all_users(domain_url, api_token, limit=200, include_deprovisioned=True, fields=None):
+    if USER_CRAWL_MAX_SHARDS > 1:
+        return get_users_sharded(
+            domain_url, api_token, limit=limit, include_deprovisioned=include_deprovisioned, fields=fields
+        )
+    fields = _user_fields(fields)
+    users = {}
+    primary_users = get_users(domain_url, api_token, limit=limit, fields=fields) or []
     logger.info("Processing %s primary user record(s).", len(primary_users))
     for user in primary_users:
         user_id = user.get("id")
@@ -47,6 +206,7 @@ def get_all_users(domain_url, api_token, limit=200, include_deprovisioned=True):
             api_token,
             limit=limit,
             search='status eq "DEPROVISIONED"',
+            fields=fields,
         ) or []
         logger.info("Processing %s deprovisioned user record(s).", len(deprov_users))
         for user in deprov_users:
@@ -81,23 +241,244 @@ def get_user_roles(domain_url, api_token, user_id):
     return roles
 
 
-def get_users_with_security_context(domain_url, api_token, limit=200):
-    users = get_all_users(domain_url, api_token, limit=limit, include_deprovisioned=True) or []
+# Labels the admin listings use for the standard roles, mapped to the role types
+# returned by /api/v1/users/{id}/roles.
+STANDARD_ADMIN_ROLE_TYPES = {
+    "SUPER ADMINISTRATOR": "SUPER_ADMIN",
+    "ORGANIZATION ADMINISTRATOR": "ORG_ADMIN",
+    "APPLICATION ADMINISTRATOR": "APP_ADMIN",
+    "GROUP ADMINISTRATOR": "USER_ADMIN",
+    "HELP DESK ADMINISTRATOR": "HELP_DESK_ADMIN",
+    "READ-ONLY ADMINISTRATOR": "READ_ONLY_ADMIN",
+    "MOBILE ADMINISTRATOR": "MOBILE_ADMIN",
+    "API ACCESS MANAGEMENT ADMINISTRATOR": "API_ACCESS_MANAGEMENT_ADMIN",
+    "REPORT ADMINISTRATOR": "REPORT_ADMIN",
+    "GROUP MEMBERSHIP ADMINISTRATOR": "GROUP_MEMBERSHIP_ADMIN",
+}
+
+
+def _listed_roles(item, assignment_type):
+    """Role assignments of an admin listing entry, shaped like /api/v1/users/{id}/roles items."""
+    roles = []
+    for key in ("roles", "adminRoles", "assignedRoles", "roleAssignments", "roleAssignment", "role"):
+        value = item.get(key)
+        if not value:
+            continue
+        for role in value if isinstance(value, list) else [value]:
+            if isinstance(role, dict):
+                label = role.get("label") or role.get("name") or role.get("type") or role.get("roleType") or role.get("id")
+                role_type = role.get("type") or role.get("roleType")
+            else:
+                label = role
+                role_type = None
+            if not label:
+                continue
+            role_type = role_type or STANDARD_ADMIN_ROLE_TYPES.get(str(label).strip().upper()) or str(label).strip().upper()
+            roles.append({"type": role_type, "label": label, "assignmentType": assignment_type})
+    # Listed as an admin without role details: still an admin assignment.
+    return roles or [{"type": "ADMIN", "label": "Administrator", "assignmentType": assignment_type}]
+
+
+def _member_link(member):
+    """("users" | "groups", id) from a resource-set binding member's self link."""
+    href = str((((member.get("_links") or {}).get("self") or {}).get("href")) or "")
+    for kind in ("users", "groups"):
+        marker = f"/api/v1/{kind}/"
+        if marker in href:
+            return kind, href.split(marker, 1)[1].split("/", 1)[0].split("?", 1)[0]
+    return None, None
+
+
+def get_admin_role_index(domain_url, api_token):
+    """
+    user_id -> admin role assignments, built from the bulk admin listings (direct and
+    group admins) and resource-set bindings instead of one roles call per user. Group
+    assignments are expanded through group membership, fetched once per group.
+    Returns None when the admin listings failed or came back empty (every org has a
+    super admin), so callers fall back to per-user role lookups.
+    """
+    admins = get_admin_users(domain_url, api_token)
+    admin_groups = get_admin_groups(domain_url, api_token)
+    if admins is None or admin_groups is None or not (admins or admin_groups):
+        logger.warning(
+            "Admin listings for %s were unavailable or empty; falling back to per-user role lookups.",
+            domain_url,
+        )
+        return None
+
+    base = ensure_domain_str(domain_url).rstrip("/")
+    group_members = {}
+
+    def members_of(group_id):
+        if group_id not in group_members:
+            members = get_paginated(
+                f"{base}/api/v1/groups/{group_id}/users?limit=200",
+                _headers(api_token),
+                f"Error fetching members of admin group {group_id}",
+            ) or []
+            group_members[group_id] = [member.get("id") for member in members if member.get("id")]
+        return group_members[group_id]
+
+    index = {}
+    for admin in admins:
+        if admin.get("userId"):
+            index.setdefault(admin["userId"], []).extend(_listed_roles(admin, "USER"))
+    for group in admin_groups:
+        group_id = group.get("groupId")
+        if not group_id:
+            continue
+        roles = _listed_roles(group, "GROUP")
+        for user_id in members_of(group_id):
+            index.setdefault(user_id, []).extend(roles)
+
+    for resource_set in get_resource_sets(domain_url, api_token, limit=200) or []:
+        resource_set_id = resource_set.get("id")
+        if not resource_set_id:
+            continue
+        for binding in get_resource_set_bindings(domain_url, api_token, resource_set_id, limit=200) or []:
+            if not binding.get("id"):
+                continue
+            role = binding.get("role")
+            label = (role.get("label") or role.get("id")) if isinstance(role, dict) else role
+            for member in get_binding_members(domain_url, api_token, resource_set_id, binding["id"], limit=200) or []:
+                kind, member_id = _member_link(member)
+                if kind == "users":
+                    assigned = [(member_id, "USER")]
+                elif kind == "groups":
+                    assigned = [(user_id, "GROUP") for user_id in members_of(member_id)]
+                else:
+                    continue
+                for user_id, assignment_type in assigned:
+                    index.setdefault(user_id, []).append({
+                        "type": "CUSTOM",
+                        "label": label or binding.get("label") or binding["id"],
+                        "assignmentType": assignment_type,
+                        "resourceSet": resource_set_id,
+                    })
+    logger.info(
+        "Indexed admin roles for %s user(s) (%s group membership lookup(s)).",
+        len(index),
+        len(group_members),
+    )
+    return index
+
+
+def _user_role_index(domain_url, api_token, users):
+    """user_id -> role assignments from one /api/v1/users/{id}/roles call per (non-deprovisioned) user."""
+    user_ids = [
+        user.get("id") for user in users
+        if user.get("id") and str(user.get("status") or "").upper() != "DEPROVISIONED"
+    ]
+    roles = fetch_concurrently(lambda user_id: get_user_roles(domain_url, api_token, user_id), user_ids)
+    return {user_id: user_roles for user_id, user_roles in zip(user_ids, roles) if user_roles}
+
+
+def _role_index(domain_url, api_token, users):
+    role_index = get_admin_role_index(domain_url, api_token)
+    if role_index is None:
+        role_index = _user_role_index(domain_url, api_token, users)
+    return role_index
+
+
+def _with_security_context(domain_url, api_token, user, role_index):
+    user_id = user.get("id")
+    status = str(user.get("status") or "").upper()
+    factors = []
+    roles = []
+    if user_id and status != "DEPROVISIONED":
+        factors = get_user_factors(domain_url, api_token, user_id) or []
+        roles = list(role_index.get(user_id) or [])
+    combined = dict(user)
+    combined["factors"] = factors
+    combined["roles"] = roles
+    return combined
+
+
+def get_users_with_security_context(domain_url, api_token, limit=200, fields=None):
+    users = get_all_users(domain_url, api_token, limit=limit, include_deprovisioned=True, fields=fields) or []
+    role_index = _role_index(domain_url, api_token, users)
     logger.info("Enriching %s user(s) with factors and role context.", len(users))
     enriched = []
     for idx, user in enumerate(users, start=1):
-        user_id = user.get("id")
-        status = str(user.get("status") or "").upper()
-        factors = []
-        roles = []
         if idx == 1 or idx % 25 == 0:
-            logger.info("User enrichment progress: processing user %s/%s (user_id=%s, status=%s).", idx, len(users), user_id, status)
-        if user_id and status != "DEPROVISIONED":
-            factors = get_user_factors(domain_url, api_token, user_id) or []
-            roles = get_user_roles(domain_url, api_token, user_id) or []
-        combined = dict(user)
-        combined["factors"] = factors
-        combined["roles"] = roles
-        enriched.append(combined)
+            logger.info(
+                "User enrichment progress: processing user %s/%s (user_id=%s, status=%s).",
+                idx,
+                len(users),
+                user.get("id"),
+                str(user.get("status") or "").upper(),
+            )
+        enriched.append(_with_security_context(domain_url, api_token, user, role_index))
     logger.info("Completed user security-context enrichment for %s user(s).", len(enriched))
     return enriched
+
+
+def user_sample_stratum(user):
+    """Sampling stratum of a user: STATUS/PROVIDER_TYPE."""
+    provider = ((user.get("credentials") or {}).get("provider") or {}).get("type")
+    return f"{str(user.get('status') or '').upper() or 'UNKNOWN'}/{str(provider or '').upper() or 'UNKNOWN'}"
+
+
+def _allocate_sample(stratum_sizes, sample_size):
+    """
+    Proportional allocation (largest remainder) of sample_size across strata, with at
+    least two users per stratum so each stratum's variance can be estimated.
+    """
+    population = sum(stratum_sizes.values())
+    if sample_size >= population:
+        return dict(stratum_sizes)
+    shares = {key: sample_size * size / population for key, size in stratum_sizes.items()}
+    allocation = {key: int(share) for key, share in shares.items()}
+    remainder = sample_size - sum(allocation.values())
+    for key in sorted(shares, key=lambda k: shares[k] - allocation[k], reverse=True)[:remainder]:
+        allocation[key] += 1
+    return {key: min(stratum_sizes[key], max(count, 2)) for key, count in allocation.items()}
+
+
+def get_sampled_users_with_security_context(domain_url, api_token, sample_size, limit=200, seed=None, fields=None):
+    """
+    Stratified random sample of users (by status and provider type) enriched with factors
+    and roles. Admins are always included and enriched. Returns (users, sample) where
+    each user carries "sampleStratum" (None for admins) and sample describes the strata.
+    """
+    users = get_all_users(domain_url, api_token, limit=limit, include_deprovisioned=True, fields=fields) or []
+    role_index = _role_index(domain_url, api_token, users)
+    admin_ids = set(role_index)
+    admins = [user for user in users if user.get("id") in admin_ids]
+    strata = {}
+    for user in users:
+        if user.get("id") not in admin_ids:
+            strata.setdefault(user_sample_stratum(user), []).append(user)
+
+    allocation = _allocate_sample({key: len(members) for key, members in strata.items()}, max(0, int(sample_size)))
+    rng = random.Random(seed)
+    selected = [(user, None) for user in admins]
+    for key, members in strata.items():
+        selected.extend((user, key) for user in rng.sample(members, allocation[key]))
+    logger.info(
+        "Sampling %s of %s user(s) across %s stratum/strata plus %s admin(s) for security-context enrichment.",
+        len(selected) - len(admins),
+        len(users) - len(admins),
+        len(strata),
+        len(admins),
+    )
+
+    enriched = []
+    for idx, (user, key) in enumerate(selected, start=1):
+        if idx == 1 or idx % 25 == 0:
+            logger.info("Sampled user enrichment progress: processing user %s/%s.", idx, len(selected))
+        combined = _with_security_context(domain_url, api_token, user, role_index)
+        combined["sampleStratum"] = key
+        enriched.append(combined)
+
+    sample = {
+        "sample_size": int(sample_size),
+        "population": len(users),
+        "admins": len(admins),
+        "seed": seed,
+        "strata": {
+            key: {"population": len(members), "sampled": allocation[key]}
+            for key, members in sorted(strata.items())
+        },
+    }
+    return enriched, sample
@@ -38,9 +38,11 @@ def _network_label(network, zone_map):
     }
 
 
-def get_api_tokens_view(domain_url, api_token):
+def get_api_tokens_view(domain_url, api_token, tokens=None):
+    """tokens: optional prefetched API tokens with metadata; fetched when omitted."""
     logger.info("Fetching API tokens for OktaView.")
-    tokens = get_api_tokens_with_metadata(domain_url, api_token) or []
+    if tokens is None:
+        tokens = get_api_tokens_with_metadata(domain_url, api_token) or []
     zone_map = _zone_name_map(domain_url, api_token)
     rows = []
     for token in tokens:
@@ -1,7 +1,8 @@
 import json
 import logging
 
-from scripts.oktasnapshot_utils import ensure_domain_str, get_paginated, get_json
+from scripts.extract_app_group_assignments import get_app_group_assignments, assigned_group_names
+from scripts.oktasnapshot_utils import ensure_domain_str, get_paginated, get_json, fetch_concurrently
 
 logging.basicConfig(
     level=logging.INFO,
@@ -9,6 +10,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger("okta_compare")
 
+# Application fields read by this view (and by the app group assignment index built for it).
+APPLICATION_VIEW_FIELDS = (
+    "id",
+    "name",
+    "label",
+    "status",
+    "signOnMode",
+    "features",
+    "settings",
+    "visibility.appLinks",
+    "credentials.userNameTemplate",
+    "credentials.oauthClient",
+    "_links.logo",
+    "_links.accessPolicy",
+)
+
 
 def _headers(api_token):
     return {
@@ -17,19 +34,6 @@ def _headers(api_token):
     }
 
 
-def _get_group_names(base, api_token, app_id):
-    url = f"{base}/api/v1/apps/{app_id}/groups"
-    groups = get_paginated(url, _headers(api_token), "Fetching application groups") or []
-    names = []
-    for group in groups:
-        profile = group.get("profile") or {}
-        if profile.get("name"):
-            names.append(profile.get("name"))
-        elif group.get("name"):
-            names.append(group.get("name"))
-    return ", ".join(sorted(set(names)))
-
-
 def _format_attribute_statements(statements):
     if not statements:
         return ""
@@ -157,33 +161,48 @@ def _get_app_settings(app):
     return {"Application Settings": app_settings}
 
 
-def _get_policy_name(base, api_token, policy_href, cache):
-    if not policy_href:
+def _policy_id(app):
+    policy_href = (((app.get("_links", {}) or {}).get("accessPolicy", {}) or {}).get("href"))
+    return policy_href.split("/")[-1] if policy_href else ""
+
+
+def _get_policy_name(base, api_token, policy_id):
+    if not policy_id:
         return ""
-    policy_id = policy_href.split("/")[-1]
-    if policy_id in cache:
-        return cache[policy_id]
     data = get_json(f"{base}/api/v1/policies/{policy_id}", _headers(api_token), "Fetching access policy")
     name = data.get("name") if isinstance(data, dict) else ""
-    cache[policy_id] = name or ""
-    return cache[policy_id]
+    return name or ""
 
 
-def get_applications(domain_url, api_token):
+def get_applications(domain_url, api_token, apps=None, groups=None, assignments=None):
+    """
+    apps: optional prefetched application inventory (any status); only ACTIVE apps are listed.
+    groups / assignments: optional prefetched group inventory and app group assignment map
+    (see get_app_group_assignments).
+    """
     base = ensure_domain_str(domain_url).rstrip("/")
     logger.info("Fetching applications for OktaView.")
-    url = f'{base}/api/v1/apps?filter=status eq "ACTIVE"&limit=200'
-    apps = get_paginated(url, _headers(api_token), "Fetching applications") or []
+    if apps is None:
+        url = f'{base}/api/v1/apps?filter=status eq "ACTIVE"&limit=200'
+        apps = get_paginated(url, _headers(api_token), "Fetching applications", fields=APPLICATION_VIEW_FIELDS) or []
+    else:
+        apps = [app for app in apps if app.get("status") == "ACTIVE"]
+    if assignments is None:
+        assignments = get_app_group_assignments(base, api_token, apps=apps, groups=groups)
+    # Access policies are shared by many apps, so each distinct policy is resolved once.
+    policy_ids = list(dict.fromkeys(policy_id for policy_id in map(_policy_id, apps) if policy_id))
+    logger.info("Resolving %s access policy name(s) for %s application(s).", len(policy_ids), len(apps))
+    policy_names = dict(
+        zip(policy_ids, fetch_concurrently(lambda policy_id: _get_policy_name(base, api_token, policy_id), policy_ids))
+    )
     rows = []
-    policy_cache = {}
     for app in apps:
         credentials = app.get("credentials", {}) or {}
         user_name_template = credentials.get("userNameTemplate", {}) or {}
         sign_on_mode = app.get("signOnMode")
         links = app.get("_links", {}) or {}
         logo = (links.get("logo") or [{}])[0] or {}
-        access_policy = links.get("accessPolicy", {}) or {}
-        access_policy_name = _get_policy_name(base, api_token, access_policy.get("href"), policy_cache)
+        access_policy_name = policy_names.get(_policy_id(app), "")
         settings = _get_app_settings(app)
         row = {}
         row["Name"] = app.get("label")
@@ -191,7 +210,7 @@ def get_applications(domain_url, api_token):
         row["Type"] = sign_on_mode
         for key, value in settings.items():
             row[key] = value
-        row["Groups"] = _get_group_names(base, api_token, app.get("id"))
+        row["Groups"] = ", ".join(assigned_group_names(assignments, app.get("id")))
         if sign_on_mode != "BOOKMARK":
             row["Okta Internal Name"] = app.get("name")
             row["Username Format"] = user_name_template.get("template")
@@ -1,10 +1,6 @@
 import logging
 
-from scripts.extract_authorization_servers import (
-    get_authorization_servers,
-    get_authorization_server_policies,
-    get_authorization_server_policy_rules,
-)
+from scripts.extract_authorization_servers import get_authorization_server_tree
 from scripts.oktasnapshot_utils import ensure_domain_str, get_json
 
 logging.basicConfig(
@@ -14,10 +10,12 @@ logging.basicConfig(
 logger = logging.getLogger("okta_compare")
 
 
-def get_authorization_server_access_policies_view(domain_url, api_token):
+def get_authorization_server_access_policies_view(domain_url, api_token, tree=None):
+    """tree: optional prefetched get_authorization_server_tree result."""
     logger.info("Fetching authorization server access policies for OktaView.")
     base = ensure_domain_str(domain_url).rstrip("/")
-    servers = get_authorization_servers(domain_url, api_token) or []
+    if tree is None:
+        tree = get_authorization_server_tree(domain_url, api_token, parts=("policies",))
     policy_rows = []
     rule_rows = []
     app_cache = {}
@@ -134,11 +132,10 @@ def get_authorization_server_access_policies_view(domain_url, api_token):
             parts.append(f"Inline hook: {hook_id}")
         return "; ".join(parts) if parts else "None"
 
-    for server in servers:
-        server_id = server.get("id")
-        server_name = server.get("name")
-        policies = get_authorization_server_policies(domain_url, api_token, server_id) or []
-        for policy in policies:
+    for node in tree:
+        server_name = node["server"].get("name")
+        for entry in node["policies"]:
+            policy = entry["policy"]
             policy_id = policy.get("id")
             policy_name = policy.get("name")
             policy_rows.append({
@@ -151,8 +148,7 @@ def get_authorization_server_access_policies_view(domain_url, api_token):
                 "Conditions": _format_conditions(_replace_client_ids(policy.get("conditions"))),
             })
 
-            rules = get_authorization_server_policy_rules(domain_url, api_token, server_id, policy_id) or []
-            for rule in rules:
+            for rule in entry["rules"]:
                 rule_rows.append({
                     "Authorization Server": server_name,
                     "Policy Name": policy_name,
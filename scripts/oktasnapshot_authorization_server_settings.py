@@ -1,10 +1,6 @@
 import logging
 
-from scripts.extract_authorization_servers import (
-    get_authorization_servers,
-    get_authorization_server_claims,
-    get_authorization_server_scopes,
-)
+from scripts.extract_authorization_servers import get_authorization_server_tree
 
 logging.basicConfig(
     level=logging.INFO,
@@ -13,14 +9,17 @@ logging.basicConfig(
 logger = logging.getLogger("okta_compare")
 
 
-def get_authorization_server_settings_view(domain_url, api_token):
+def get_authorization_server_settings_view(domain_url, api_token, tree=None):
+    """tree: optional prefetched get_authorization_server_tree result."""
     logger.info("Fetching authorization server settings for OktaView.")
-    servers = get_authorization_servers(domain_url, api_token) or []
+    if tree is None:
+        tree = get_authorization_server_tree(domain_url, api_token, parts=("claims", "scopes"))
     server_rows = []
     claim_rows = []
     scope_rows = []
 
-    for server in servers:
+    for node in tree:
+        server = node["server"]
         server_id = server.get("id")
         server_name = server.get("name")
         server_rows.append({
@@ -33,8 +32,7 @@ def get_authorization_server_settings_view(domain_url, api_token):
             "Credentials Rotation Mode": (server.get("credentials", {}) or {}).get("signing", {}).get("rotationMode"),
         })
 
-        claims = get_authorization_server_claims(domain_url, api_token, server_id) or []
-        for claim in claims:
+        for claim in node["claims"]:
             claim_rows.append({
                 "Authorization Server": server_name,
                 "Claim Name": claim.get("name"),
@@ -45,8 +43,7 @@ def get_authorization_server_settings_view(domain_url, api_token):
                 "Include In Token Type": claim.get("conditions", {}).get("scopes"),
             })
 
-        scopes = get_authorization_server_scopes(domain_url, api_token, server_id) or []
-        for scope in scopes:
+        for scope in node["scopes"]:
             scope_rows.append({
                 "Authorization Server": server_name,
                 "Scope Name": scope.get("name"),
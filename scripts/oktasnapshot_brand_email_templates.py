@@ -1,6 +1,6 @@
 import logging
 
-from scripts.extract_brands import get_brands, get_brand_email_templates
+from scripts.extract_brands import get_brand_tree
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,14 +31,15 @@ def _extract_subject_body(customization):
     return subject, body
 
 
-def get_brand_email_templates_view(domain_url, api_token):
+def get_brand_email_templates_view(domain_url, api_token, tree=None):
+    """tree: optional prefetched get_brand_tree result."""
     logger.info("Fetching brand email templates for OktaView.")
-    brands = get_brands(domain_url, api_token) or []
+    if tree is None:
+        tree = get_brand_tree(domain_url, api_token, parts=("email_templates",))
     rows = []
-    for brand in brands:
-        brand_id = brand.get("id")
-        brand_name = brand.get("name")
-        templates_bundle = get_brand_email_templates(domain_url, api_token, brand_id) or {}
+    for node in tree:
+        brand_name = node["brand"].get("name")
+        templates_bundle = node["email_templates"]
         customizations_map = templates_bundle.get("customizations") or {}
         defaults_map = templates_bundle.get("defaults") or {}
 
@@ -1,6 +1,6 @@
 import logging
 
-from scripts.extract_brands import get_brands, get_brand_pages
+from scripts.extract_brands import get_brand_tree
 
 logging.basicConfig(
     level=logging.INFO,
@@ -9,14 +9,15 @@ logging.basicConfig(
 logger = logging.getLogger("okta_compare")
 
 
-def get_brand_pages_view(domain_url, api_token):
+def get_brand_pages_view(domain_url, api_token, tree=None):
+    """tree: optional prefetched get_brand_tree result."""
     logger.info("Fetching brand pages for OktaView.")
-    brands = get_brands(domain_url, api_token) or []
+    if tree is None:
+        tree = get_brand_tree(domain_url, api_token, parts=("pages",))
     rows = []
-    for brand in brands:
-        brand_id = brand.get("id")
-        brand_name = brand.get("name")
-        pages = get_brand_pages(domain_url, api_token, brand_id) or {}
+    for node in tree:
+        brand_name = node["brand"].get("name")
+        pages = node["pages"]
         sign_in = pages.get("sign_in") or {}
         error_page = pages.get("error") or {}
 
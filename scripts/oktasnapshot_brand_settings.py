@@ -1,6 +1,6 @@
 import logging
 
-from scripts.extract_brands import get_brands, get_brand_themes
+from scripts.extract_brands import get_brand_tree
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,14 +18,15 @@ def _pick_theme(themes):
     return themes[0]
 
 
-def get_brand_settings_view(domain_url, api_token):
+def get_brand_settings_view(domain_url, api_token, tree=None):
+    """tree: optional prefetched get_brand_tree result."""
     logger.info("Fetching brand settings for OktaView.")
-    brands = get_brands(domain_url, api_token) or []
+    if tree is None:
+        tree = get_brand_tree(domain_url, api_token, parts=("themes",))
     rows = []
-    for brand in brands:
-        brand_id = brand.get("id")
-        themes = get_brand_themes(domain_url, api_token, brand_id) or []
-        theme = _pick_theme(themes) or {}
+    for node in tree:
+        brand = node["brand"]
+        theme = _pick_theme(node["themes"]) or {}
         rows.append({
             "Brand Name": brand.get("name"),
             "Remove Powered By Okta": brand.get("removePoweredByOkta"),
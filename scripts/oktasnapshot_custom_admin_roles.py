@@ -9,9 +9,11 @@ logging.basicConfig(
 logger = logging.getLogger("okta_compare")
 
 
-def get_custom_admin_roles_view(domain_url, api_token):
+def get_custom_admin_roles_view(domain_url, api_token, roles=None):
+    """roles: optional prefetched custom admin roles; fetched when omitted."""
     logger.info("Fetching custom admin roles for OktaView.")
-    roles = get_custom_admin_roles(domain_url, api_token) or []
+    if roles is None:
+        roles = get_custom_admin_roles(domain_url, api_token) or []
     rows = []
     for role in roles:
         rows.append({
@@ -21,7 +21,8 @@ def _get_rules(base, api_token, policy_id):
     return get_paginated(url, _headers(api_token), "Error fetching session policy rules") or []
 
 
-def get_global_session_policies(domain_url, api_token):
+def get_global_session_policies(domain_url, api_token, sources=None):
+    """sources: optional dict that receives the policy and rule objects behind the rows, keyed "Policy" / "Rule"."""
     base = ensure_domain_str(domain_url).rstrip("/")
     logger.info("Fetching global session policies for OktaView.")
     url = f"{base}/api/v1/policies?type=OKTA_SIGN_ON"
@@ -42,6 +43,8 @@ def get_global_session_policies(domain_url, api_token):
             "Conditions": policy.get("conditions"),
             "Rules": ", ".join([r.get("name") for r in rules if r.get("name")]),
         })
+        if sources is not None:
+            sources.setdefault("Policy", []).append(policy)
 
         for rule in rules:
             conditions = rule.get("conditions", {}) or {}
@@ -60,5 +63,7 @@ def get_global_session_policies(domain_url, api_token):
                 "Conditions IdentityProvider": conditions.get("identityProvider", {}),
                 "Actions": rule.get("actions", {}),
             })
+            if sources is not None:
+                sources.setdefault("Rule", []).append(rule)
 
     return policy_rows, rule_rows
@@ -9,9 +9,11 @@ logging.basicConfig(
 logger = logging.getLogger("okta_compare")
 
 
-def get_groups_view(domain_url, api_token):
+def get_groups_view(domain_url, api_token, groups=None):
+    """groups: optional prefetched group inventory."""
     logger.info("Fetching groups for OktaView.")
-    groups = get_groups(domain_url, api_token) or []
+    if groups is None:
+        groups = get_groups(domain_url, api_token) or []
     rows = []
     for group in groups:
         if group.get("type") != "OKTA_GROUP":
@@ -21,7 +21,8 @@ def _get_rules(base, api_token, policy_id):
     return get_paginated(url, _headers(api_token), "Error fetching MFA enrollment policy rules") or []
 
 
-def get_mfa_enrollment_policies(domain_url, api_token):
+def get_mfa_enrollment_policies(domain_url, api_token, sources=None):
+    """sources: optional dict that receives the policy and rule objects behind the rows, keyed "Policy" / "Rule"."""
     base = ensure_domain_str(domain_url).rstrip("/")
     logger.info("Fetching MFA enrollment policies for OktaView.")
     url = f"{base}/api/v1/policies?type=MFA_ENROLL"
@@ -41,6 +42,8 @@ def get_mfa_enrollment_policies(domain_url, api_token):
             "Conditions": policy.get("conditions"),
             "Settings": policy.get("settings"),
         })
+        if sources is not None:
+            sources.setdefault("Policy", []).append(policy)
 
         for rule in rules:
             conditions = rule.get("conditions", {}) or {}
@@ -59,5 +62,7 @@ def get_mfa_enrollment_policies(domain_url, api_token):
                 "Conditions IdentityProvider": conditions.get("identityProvider", {}),
                 "Actions": rule.get("actions", {}),
             })
+            if sources is not None:
+                sources.setdefault("Rule", []).append(rule)
 
     return policy_rows, rule_rows
@@ -136,7 +136,8 @@ def _breached_label_map():
     }
 
 
-def get_password_policies(domain_url, api_token):
+def get_password_policies(domain_url, api_token, sources=None):
+    """sources: optional dict that receives the policy and rule objects behind the rows, keyed "Policy" / "Rule"."""
     base = ensure_domain_str(domain_url).rstrip("/")
     logger.info("Fetching password policies for OktaView.")
     url = f"{base}/api/v1/policies?type=PASSWORD"
@@ -168,6 +169,8 @@ def get_password_policies(domain_url, api_token):
             ),
             "Rules": ", ".join([r.get("name") for r in rules if r.get("name")]),
         })
+        if sources is not None:
+            sources.setdefault("Policy", []).append(policy)
 
         for rule in rules:
             rule_rows.append({
@@ -181,5 +184,7 @@ def get_password_policies(domain_url, api_token):
                 "Conditions Network": (rule.get("conditions", {}) or {}).get("network", {}),
                 "Actions": rule.get("actions", {}),
             })
+            if sources is not None:
+                sources.setdefault("Rule", []).append(rule)
 
     return policy_rows, rule_rows
@@ -9,7 +9,8 @@ logging.basicConfig(
 logger = logging.getLogger("okta_compare")
 
 
-def get_resource_sets_view(domain_url, api_token):
+def get_resource_sets_view(domain_url, api_token, raw_bindings=None):
+    """raw_bindings: optional list that receives the unformatted binding objects."""
     logger.info("Fetching resource sets for OktaView.")
     sets = get_resource_sets(domain_url, api_token) or []
     set_rows = []
@@ -34,6 +35,8 @@ def get_resource_sets_view(domain_url, api_token):
             })
 
         bindings = get_resource_set_bindings(domain_url, api_token, set_id) or []
+        if raw_bindings is not None:
+            raw_bindings.extend(bindings)
         for binding in bindings:
             binding_rows.append({
                 "Resource Set": label,
@@ -1,4 +1,11 @@
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlsplit
+
 import requests
 
 logging.basicConfig(
@@ -7,6 +14,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger("okta_compare")
 
+# Per-org request budget: at most HOST_MAX_CONCURRENT_REQUESTS requests in flight per Okta
+# host, and requests to a host wait for the X-Rate-Limit-Reset time once the remaining
+# count drops to RATE_LIMIT_RESERVE or a 429 is returned.
+HOST_MAX_CONCURRENT_REQUESTS = int(os.environ.get("OKTAVERSE_HOST_CONCURRENCY") or 0) or 4
+RATE_LIMIT_RESERVE = 2
+RATE_LIMIT_MAX_WAIT_SECONDS = 60
+RATE_LIMIT_MAX_RETRIES = 3
+
+# Threads used by fetch_concurrently; requests still queue on the per-host budget above.
+FANOUT_WORKERS = int(os.environ.get("OKTAVERSE_FANOUT_WORKERS") or 0) or HOST_MAX_CONCURRENT_REQUESTS
+
+_HOST_BUDGETS = {}
+_HOST_BUDGETS_LOCK = threading.Lock()
+
 
 def ensure_domain_str(domain_url):
     """Ensure domain_url is a valid HTTPS string."""
@@ -15,6 +36,120 @@ def ensure_domain_str(domain_url):
     return domain_url if domain_url.startswith(("http://", "https://")) else f"https://{domain_url}"
 
 
+def _host_budget(url):
+    host = urlsplit(url).netloc.lower()
+    with _HOST_BUDGETS_LOCK:
+        budget = _HOST_BUDGETS.get(host)
+        if budget is None:
+            budget = {
+                "host": host,
+                "slots": threading.BoundedSemaphore(HOST_MAX_CONCURRENT_REQUESTS),
+                "resume_at": 0.0,
+                "requests": 0,
+            }
+            _HOST_BUDGETS[host] = budget
+        return budget
+
+
+def _rate_limit_wait(headers, default):
+    """Seconds until the X-Rate-Limit-Reset epoch in headers, capped at RATE_LIMIT_MAX_WAIT_SECONDS."""
+    try:
+        wait = float(headers.get("X-Rate-Limit-Reset")) - time.time() + 1
+    except (TypeError, ValueError):
+        wait = default
+    return max(0.0, min(wait, RATE_LIMIT_MAX_WAIT_SECONDS))
+
+
+def _defer_budget(budget, wait_seconds):
+    """Push the budget's resume_at out to wait_seconds from now (never earlier)."""
+    with _HOST_BUDGETS_LOCK:
+        budget["resume_at"] = max(budget["resume_at"], time.time() + wait_seconds)
+
+
+def rate_limited_get(url, headers=None, **kwargs):
+    """
+    requests.get within the per-host request budget. Waits out exhausted rate limits and
+    retries 429 responses up to RATE_LIMIT_MAX_RETRIES times; returns the last response.
+    """
+    budget = _host_budget(url)
+    attempt = 0
+    while True:
+        delay = budget["resume_at"] - time.time()
+        if delay > 0:
+            logger.info("Rate limit budget for %s exhausted; waiting %.1fs.", budget["host"], delay)
+            time.sleep(delay)
+        with budget["slots"]:
+            with _HOST_BUDGETS_LOCK:
+                budget["requests"] += 1
+            resp = requests.get(url, headers=headers, **kwargs)
+        if resp.status_code == 429:
+            _defer_budget(budget, _rate_limit_wait(resp.headers, 2 ** attempt))
+            if attempt < RATE_LIMIT_MAX_RETRIES:
+                attempt += 1
+                logger.warning("Rate limited by %s (429); retry %s of %s.", budget["host"], attempt, RATE_LIMIT_MAX_RETRIES)
+                continue
+            return resp
+        try:
+            remaining = int(resp.headers.get("X-Rate-Limit-Remaining"))
+        except (TypeError, ValueError):
+            remaining = None
+        if remaining is not None and remaining <= RATE_LIMIT_RESERVE:
+            _defer_budget(budget, _rate_limit_wait(resp.headers, 1))
+        return resp
+
+
+def host_request_count(domain_url):
+    """Requests sent to domain_url's host through rate_limited_get so far (429 retries included)."""
+    return _host_budget(ensure_domain_str(domain_url))["requests"]
+
+
+def fetch_concurrently(fetch, items, workers=None):
+    """[fetch(item) for item in items], run on up to FANOUT_WORKERS threads; results keep item order."""
+    items = list(items)
+    workers = min(workers or FANOUT_WORKERS, len(items))
+    if workers <= 1:
+        return [fetch(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="okta-fanout") as executor:
+        return list(executor.map(fetch, items))
+
+
+@lru_cache(maxsize=None)
+def _field_tree(fields):
+    tree = {}
+    for path in fields:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+            if node is True:
+                break
+        else:
+            node[parts[-1]] = True
+    return tree
+
+
+def _project(value, tree):
+    if isinstance(value, list):
+        return [_project(item, tree) for item in value]
+    if not isinstance(value, dict):
+        return value
+    return {
+        key: value[key] if subtree is True else _project(value[key], subtree)
+        for key, subtree in tree.items()
+        if key in value
+    }
+
+
+def project_fields(items, fields):
+    """
+    Keep only the dotted field paths in fields (e.g. "profile.login") of each item; a path
+    keeps the whole value under it. Missing fields are left out. fields=None keeps everything.
+    """
+    if not fields:
+        return items
+    return _project(items, _field_tree(tuple(fields)))
+
+
 def _request_label(error_label):
     label = str(error_label or "").strip()
     if label.lower().startswith("error fetching "):
@@ -28,7 +163,7 @@ def get_json(url, headers, error_label):
     request_label = _request_label(error_label)
     logger.info("Fetching %s: requesting %s", request_label, url)
     try:
-        resp = requests.get(url, headers=headers, timeout=30)
+        resp = rate_limited_get(url, headers=headers, timeout=30)
     except requests.RequestException as exc:
         logger.error("%s: request failed for %s (%s)", error_label, url, exc)
         return None
@@ -51,7 +186,33 @@ def _next_link(headers):
     return None
 
 
-def get_paginated(url, headers, error_label):
+def get_page(url, headers, error_label, fields=None):
+    """
+    One page of a list endpoint. Returns (items, next_url); items is None when the request fails.
+    fields: optional projection applied to each item as the page is decoded (see project_fields).
+    """
+    request_label = _request_label(error_label)
+    logger.info("Fetching %s: requesting first page from %s", request_label, url)
+    try:
+        resp = rate_limited_get(url, headers=headers, timeout=30)
+    except requests.RequestException as exc:
+        logger.error("%s: request failed for %s (%s)", error_label, url, exc)
+        return None, None
+    if resp.status_code != 200:
+        logger.error("%s: %s %s", error_label, resp.status_code, resp.text)
+        return None, None
+    try:
+        data = resp.json()
+    except ValueError:
+        logger.error("Invalid JSON received for %s", error_label)
+        return None, None
+    if not isinstance(data, list):
+        logger.error("Unexpected response format for %s: %s", error_label, type(data))
+        return None, None
+    return project_fields(data, fields), _next_link(resp.headers)
+
+
+def get_paginated(url, headers, error_label, fields=None):
     items = []
     page = 0
     seen_urls = set()
@@ -64,7 +225,7 @@ def get_paginated(url, headers, error_label):
         page += 1
         logger.info("Fetching %s: requesting page %s from %s", request_label, page, url)
         try:
-            resp = requests.get(url, headers=headers, timeout=30)
+            resp = rate_limited_get(url, headers=headers, timeout=30)
         except requests.RequestException as exc:
             logger.error("%s: request failed on page %s (%s)", error_label, page, exc)
             break
@@ -79,7 +240,7 @@ def get_paginated(url, headers, error_label):
         if not isinstance(data, list):
             logger.error("Unexpected response format for %s: %s", error_label, type(data))
             break
-        items.extend(data)
+        items.extend(project_fields(data, fields))
         logger.info(
             "Fetching %s: fetched %s item(s) from page %s; accumulated total=%s",
             request_label,